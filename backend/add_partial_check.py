@@ -1,21 +1,15 @@
-with open('soloModeHandler.js', 'r') as f:
-    content = f.read()
+#!/usr/bin/env python3
+"""Add the 500 ms partial-vs-final check to soloModeHandler.js (same patch set as apply_fixes.py)
 
-# Find and insert the check after "Final transcript from Google Speech"
-marker = '// Final transcript from Google Speech - send immediately (restored simple approach)'
-insertion = '''// Final transcript from Google Speech - send immediately (restored simple approach)
-                  // CRITICAL: Check if partial has more text than final
-                  if (latestPartialText && latestPartialText.length > transcriptText.length && (Date.now() - latestPartialTime) < 500) {
-                    console.log(`[SoloMode] ⚠️ Using partial instead of final (${transcriptText.length} → ${latestPartialText.length} chars)`);
-                    transcriptText = latestPartialText;
-                  }
-                  latestPartialText = '';'''
+The patches live in tools/patching/solo_mode.py (set "partial-check") and are applied
+by the single-pass runner. Extra arguments are passed through, e.g.:
 
-if marker in content:
-    content = content.replace(marker, insertion)
-    with open('soloModeHandler.js', 'w') as f:
-        f.write(content)
-    print('OK')
-else:
-    print('Marker not found')
+    python add_partial_check.py soloModeHandler.js soloModeHandler.js.backup2 --dry-run --timing
+"""
 
+import sys
+
+from tools.patching import main
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:], default_set='partial-check', default_targets=['soloModeHandler.js']))
@@ -1,28 +1,15 @@
-import re
+#!/usr/bin/env python3
+"""Prefer a recent, longer partial over a truncated final in soloModeHandler.js
 
-with open('soloModeHandler.js', 'r') as f:
-    content = f.read()
+The patches live in tools/patching/solo_mode.py (set "partial-check") and are applied
+by the single-pass runner. Extra arguments are passed through, e.g.:
 
-# 1. Add tracking variables
-content = content.replace(
-    'let currentPartialText = \'\'; // Track current partial text for delayed translations\n              \n              // EXTREME SPEED:',
-    'let currentPartialText = \'\'; // Track current partial text for delayed translations\n              \n              // CRITICAL: Track latest partial to prevent word loss\n              let latestPartialText = \'\'; // Most recent partial text from Google Speech\n              let latestPartialTime = 0; // Timestamp of latest partial\n              \n              // EXTREME SPEED:'
-)
+    python apply_fixes.py soloModeHandler.js soloModeHandler.js.backup2 --dry-run --timing
+"""
 
-# 2. Add partial tracking
-content = content.replace(
-    '                if (isPartial) {\n                  // Live partial transcript',
-    '                if (isPartial) {\n                  // Track latest partial\n                  if (!latestPartialText || transcriptText.length > latestPartialText.length) {\n                    latestPartialText = transcriptText;\n                    latestPartialTime = Date.now();\n                  }\n                  // Live partial transcript'
-)
+import sys
 
-# 3. Add check in final handler
-content = content.replace(
-    '                } else {\n                  // Final transcript from Google Speech - send immediately (restored simple approach)\n                  console.log(`[SoloMode] 📝 FINAL Transcript (raw): "${transcriptText.substring(0, 50)}..."`);',
-    '                } else {\n                  // Final transcript from Google Speech\n                  // CRITICAL: Check if partial has more text than final\n                  if (latestPartialText && latestPartialText.length > transcriptText.length && (Date.now() - latestPartialTime) < 500) {\n                    console.log(`[SoloMode] ⚠️ Using partial instead of final (${transcriptText.length} → ${latestPartialText.length} chars)`);\n                    transcriptText = latestPartialText;\n                  }\n                  latestPartialText = \'\';\n                  console.log(`[SoloMode] 📝 FINAL Transcript (raw): "${transcriptText.substring(0, 50)}..."`);'
-)
-
-with open('soloModeHandler.js', 'w') as f:
-    f.write(content)
-
-print('OK')
+from tools.patching import main
 
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:], default_set='partial-check', default_targets=['soloModeHandler.js']))
@@ -10,10 +10,11 @@
  * - Debugging and quality analysis
  *
  * ARCHITECTURE:
- * - Circular ring buffer for memory efficiency
- * - Timestamp-based chunk tracking
- * - Automatic expiration of old chunks (> 1500ms)
- * - Thread-safe operations for concurrent access
+ * - One preallocated PCM ring per stream (utils/pcmRingBuffer.js), sized for
+ *   bufferDurationMs at the stream's sample rate plus headroom
+ * - Chunk timestamps/offsets in typed arrays; O(1) timestamp → offset lookup
+ * - Reads are zero-copy views into the ring; flush()/getAudioRange() make one copy
+ * - Chunks older than bufferDurationMs expire on the next add/read (no timer)
  *
  * INTEGRATION:
  * Every audio chunk passes through addChunk() BEFORE being sent to Google Speech.
@@ -21,6 +22,11 @@
  */
 
 import { EventEmitter } from 'events';
+import { PcmRingBuffer } from './utils/pcmRingBuffer.js';
+
+// Ring size = bufferDurationMs of audio at the sample rate, times this (room for one
+// more capture block and bursty arrival; a burst beyond it drops the oldest audio first)
+const CAPACITY_HEADROOM = 1.1;
 
 export class AudioBufferManager extends EventEmitter {
   constructor(options = {}) {
@@ -30,19 +36,16 @@ export class AudioBufferManager extends EventEmitter {
     this.bufferDurationMs = options.bufferDurationMs || 1500; // Rolling window duration
     this.flushDurationMs = options.flushDurationMs || 600;    // Duration to flush on natural final
     this.maxChunks = options.maxChunks || 200;                // Safety limit: max chunks in buffer
+    this.sampleRate = options.sampleRate || 24000;            // LINEAR16 mono, matches the frontend capture
     this.enableMetrics = options.enableMetrics !== false;     // Enable metrics collection
     this.logger = options.logger || console;                  // Logger instance
 
-    // Circular ring buffer: stores {chunk, timestamp, metadata}
-    this.buffer = [];
-    this.bufferIndex = 0; // Current write position in circular buffer
+    // Preallocated PCM ring: bytes + per-chunk metadata in typed arrays
+    this.fixedCapacityBytes = options.capacityBytes || null;
+    this.allocateRing();
     this.totalChunksReceived = 0;
     this.totalBytesReceived = 0;
 
-    // Chunk tracking
-    this.oldestChunkTimestamp = null;
-    this.newestChunkTimestamp = null;
-
     // Metrics
     this.metrics = {
       chunksAdded: 0,
@@ -53,13 +56,44 @@ export class AudioBufferManager extends EventEmitter {
       bufferUtilization: 0, // Percentage of buffer capacity used
     };
 
-    // Cleanup timer for expired chunks
-    this.cleanupInterval = setInterval(() => this._cleanupExpiredChunks(), 500); // Clean every 500ms
-
     this.logger.info('[AudioBuffer] 🎵 AudioBufferManager initialized', {
       bufferDurationMs: this.bufferDurationMs,
       flushDurationMs: this.flushDurationMs,
       maxChunks: this.maxChunks,
+      capacityBytes: this.capacityBytes,
+    });
+  }
+
+  /**
+   * Size and allocate the ring for the current sample rate
+   * @private
+   */
+  allocateRing() {
+    this.capacityBytes = this.fixedCapacityBytes ||
+      Math.ceil((this.sampleRate * 2 * this.bufferDurationMs / 1000) * CAPACITY_HEADROOM);
+    this.ring = new PcmRingBuffer({
+      capacityBytes: this.capacityBytes,
+      maxChunks: this.maxChunks,
+      windowMs: this.bufferDurationMs
+    });
+  }
+
+  /**
+   * Match the stream's actual sample rate (known once the stream is initialized);
+   * reallocates the ring when the rate changes, dropping any buffered audio
+   * @param {number} sampleRate - LINEAR16 sample rate in Hz
+   */
+  setSampleRate(sampleRate) {
+    if (!sampleRate || sampleRate === this.sampleRate) return;
+    const previousRate = this.sampleRate;
+    this.sampleRate = sampleRate;
+    this.ring.release();
+    this.allocateRing();
+
+    this.logger.info('[AudioBuffer] 🎚️ Ring resized for sample rate', {
+      previousRate,
+      sampleRate,
+      capacityBytes: this.capacityBytes,
     });
   }
 
@@ -67,7 +101,7 @@ export class AudioBufferManager extends EventEmitter {
    * Add audio chunk to rolling buffer
    * CRITICAL: Call this for EVERY audio chunk before sending to STT
    *
-   * @param {Buffer} audioChunk - Raw PCM audio data
+   * @param {Buffer} audioChunk - Raw PCM audio data (copied into the ring)
    * @param {Object} metadata - Optional metadata {chunkId, source, sampleRate, etc.}
    */
   addChunk(audioChunk, metadata = {}) {
@@ -79,55 +113,34 @@ export class AudioBufferManager extends EventEmitter {
     const timestamp = Date.now();
     const chunkSize = audioChunk.length;
 
-    // Create chunk entry
-    const entry = {
-      chunk: Buffer.from(audioChunk), // Copy to prevent external modification
-      timestamp,
-      metadata: {
-        ...metadata,
-        chunkId: metadata.chunkId || `chunk_${this.totalChunksReceived}`,
-        size: chunkSize,
-      },
-    };
-
-    // Add to circular buffer
-    if (this.buffer.length < this.maxChunks) {
-      // Buffer not full yet - append
-      this.buffer.push(entry);
-    } else {
-      // Buffer full - overwrite oldest (circular)
-      this.buffer[this.bufferIndex] = entry;
-      this.bufferIndex = (this.bufferIndex + 1) % this.maxChunks;
-    }
+    this._cleanupExpiredChunks(timestamp);
+    const seq = this.ring.write(audioChunk, timestamp);
 
     // Update tracking
     this.totalChunksReceived++;
     this.totalBytesReceived += chunkSize;
-    this.newestChunkTimestamp = timestamp;
-
-    if (this.oldestChunkTimestamp === null) {
-      this.oldestChunkTimestamp = timestamp;
-    }
 
     // Update metrics
     if (this.enableMetrics) {
       this.metrics.chunksAdded++;
       this.metrics.averageChunkSize = this.totalBytesReceived / this.totalChunksReceived;
-      this.metrics.bufferUtilization = (this.buffer.length / this.maxChunks) * 100;
+      this.metrics.bufferUtilization = (this.ring.chunkCount / this.maxChunks) * 100;
     }
 
-    // Emit event for monitoring
-    this.emit('chunk_added', {
-      chunkId: entry.metadata.chunkId,
-      size: chunkSize,
-      timestamp,
-      bufferSize: this.buffer.length,
-    });
+    // Emit event for monitoring (only built when someone listens)
+    if (this.listenerCount('chunk_added') > 0) {
+      this.emit('chunk_added', {
+        chunkId: metadata.chunkId || `chunk_${seq}`,
+        size: chunkSize,
+        timestamp,
+        bufferSize: this.ring.chunkCount,
+      });
+    }
 
     // Debug logging (throttled)
     if (this.totalChunksReceived % 100 === 0) {
       this.logger.debug('[AudioBuffer] 📊 Buffer status', {
-        chunks: this.buffer.length,
+        chunks: this.ring.chunkCount,
         totalReceived: this.totalChunksReceived,
         bufferDurationMs: this.getBufferDurationMs(),
         utilizationPercent: this.metrics.bufferUtilization.toFixed(1),
@@ -139,69 +152,73 @@ export class AudioBufferManager extends EventEmitter {
    * Get audio chunks from the last N milliseconds
    * Used for recovery operations and flush
    *
+   * Returns zero-copy views into the ring (one, or two when the window wraps),
+   * valid until new audio overwrites them - Buffer.concat() the result to keep it.
+   *
    * @param {number} durationMs - Duration to extract (e.g., 600ms for flush)
    * @param {number} endTimestamp - Optional end timestamp (defaults to now)
-   * @returns {Buffer[]} Array of audio chunks
+   * @returns {Buffer[]} Audio in chronological order
    */
   getRecentAudio(durationMs, endTimestamp = null) {
     const now = endTimestamp || Date.now();
     const startTimestamp = now - durationMs;
 
-    const chunks = this.buffer
-      .filter(entry => entry.timestamp >= startTimestamp && entry.timestamp <= now)
-      .sort((a, b) => a.timestamp - b.timestamp) // Ensure chronological order
-      .map(entry => entry.chunk);
+    this._cleanupExpiredChunks();
+    const { views, chunks, bytes } = this.ring.views(startTimestamp, now);
 
     if (this.enableMetrics) {
-      this.metrics.chunksExtracted += chunks.length;
+      this.metrics.chunksExtracted += chunks;
     }
 
     this.logger.info('[AudioBuffer] 🎵 Extracted recent audio', {
       durationMs,
-      chunksExtracted: chunks.length,
-      totalBytes: chunks.reduce((sum, chunk) => sum + chunk.length, 0),
+      chunksExtracted: chunks,
+      totalBytes: bytes,
       startTime: new Date(startTimestamp).toISOString(),
       endTime: new Date(now).toISOString(),
     });
 
     this.emit('audio_extracted', {
       durationMs,
-      chunksExtracted: chunks.length,
+      chunksExtracted: chunks,
       startTimestamp,
       endTimestamp: now,
     });
 
-    return chunks;
+    return views;
   }
 
   /**
    * Flush operation: Get last N ms of audio for resubmission
    * Typically used on natural finals to send last 600ms
    *
-   * @returns {Buffer} Concatenated audio buffer
+   * @returns {Buffer} Audio buffer (a copy, safe to keep)
    */
   flush() {
-    const chunks = this.getRecentAudio(this.flushDurationMs);
+    const now = Date.now();
+    this._cleanupExpiredChunks(now);
+    const { views, chunks, bytes } = this.ring.views(now - this.flushDurationMs, now);
 
-    if (chunks.length === 0) {
+    if (chunks === 0) {
       this.logger.warn('[AudioBuffer] ⚠️ Flush operation found no audio chunks');
       return Buffer.alloc(0);
     }
 
-    const flushedAudio = Buffer.concat(chunks);
+    const flushedAudio = Buffer.concat(views, bytes);
 
     if (this.enableMetrics) {
+      this.metrics.chunksExtracted += chunks;
       this.metrics.flushOperations++;
     }
 
     this.logger.info('[AudioBuffer] 🚀 Flush operation completed', {
-      chunksFlush: chunks.length,
+      chunksFlush: chunks,
       totalBytes: flushedAudio.length,
       durationMs: this.flushDurationMs,
     });
 
     this.emit('flush', {
-      chunks: chunks.length,
+      chunks,
       bytes: flushedAudio.length,
       durationMs: this.flushDurationMs,
     });
@@ -215,23 +232,20 @@ export class AudioBufferManager extends EventEmitter {
    *
    * @param {number} startTimestamp - Start time (ms)
    * @param {number} endTimestamp - End time (ms)
-   * @returns {Buffer} Concatenated audio buffer
+   * @returns {Buffer} Audio buffer (a copy, safe to keep)
    */
   getAudioRange(startTimestamp, endTimestamp) {
-    const chunks = this.buffer
-      .filter(entry => entry.timestamp >= startTimestamp && entry.timestamp <= endTimestamp)
-      .sort((a, b) => a.timestamp - b.timestamp)
-      .map(entry => entry.chunk);
+    this._cleanupExpiredChunks();
+    const audio = this.ring.copy(startTimestamp, endTimestamp);
 
-    if (chunks.length === 0) {
+    if (audio.length === 0) {
       this.logger.warn('[AudioBuffer] ⚠️ No audio found in range', {
         start: new Date(startTimestamp).toISOString(),
         end: new Date(endTimestamp).toISOString(),
       });
-      return Buffer.alloc(0);
     }
 
-    return Buffer.concat(chunks);
+    return audio;
   }
 
   /**
@@ -239,17 +253,21 @@ export class AudioBufferManager extends EventEmitter {
    * Useful for monitoring and debugging
    */
   getStatus() {
+    this._cleanupExpiredChunks();
     const durationMs = this.getBufferDurationMs();
+    const { oldestTimestamp, newestTimestamp } = this.ring;
 
     return {
-      chunks: this.buffer.length,
+      chunks: this.ring.chunkCount,
       maxChunks: this.maxChunks,
-      utilizationPercent: (this.buffer.length / this.maxChunks) * 100,
+      utilizationPercent: (this.ring.chunkCount / this.maxChunks) * 100,
       durationMs,
       targetDurationMs: this.bufferDurationMs,
-      oldestChunkAge: this.oldestChunkTimestamp ? Date.now() - this.oldestChunkTimestamp : 0,
-      newestChunkAge: this.newestChunkTimestamp ? Date.now() - this.newestChunkTimestamp : 0,
-      totalBytesStored: this.buffer.reduce((sum, entry) => sum + entry.chunk.length, 0),
+      oldestChunkAge: oldestTimestamp !== null ? Date.now() - oldestTimestamp : 0,
+      newestChunkAge: newestTimestamp !== null ? Date.now() - newestTimestamp : 0,
+      totalBytesStored: this.ring.byteCount,
+      capacityBytes: this.capacityBytes,
+      chunksOverwritten: this.ring.overwritten, // Lost to capacity/maxChunks before aging out
       metrics: { ...this.metrics },
     };
   }
@@ -258,48 +276,23 @@ export class AudioBufferManager extends EventEmitter {
    * Get actual duration covered by current buffer
    */
   getBufferDurationMs() {
-    if (this.buffer.length === 0) return 0;
-
-    const timestamps = this.buffer.map(entry => entry.timestamp);
-    const oldest = Math.min(...timestamps);
-    const newest = Math.max(...timestamps);
-
-    return newest - oldest;
+    if (this.ring.chunkCount === 0) return 0;
+    return this.ring.newestTimestamp - this.ring.oldestTimestamp;
   }
 
   /**
-   * Cleanup expired chunks (older than bufferDurationMs)
-   * Runs automatically via interval timer
+   * Drop chunks older than bufferDurationMs
+   * Runs on every add and read (O(expired chunks))
+   *
+   * @param {number} now - Current time (ms)
    */
-  _cleanupExpiredChunks() {
-    if (this.buffer.length === 0) return;
-
-    const now = Date.now();
-    const expirationThreshold = now - this.bufferDurationMs;
-
-    const originalLength = this.buffer.length;
-    this.buffer = this.buffer.filter(entry => entry.timestamp > expirationThreshold);
-    const removed = originalLength - this.buffer.length;
+  _cleanupExpiredChunks(now = Date.now()) {
+    const removed = this.ring.expire(now);
 
     if (removed > 0) {
       if (this.enableMetrics) {
         this.metrics.chunksExpired += removed;
       }
-
-      // Update oldest timestamp
-      if (this.buffer.length > 0) {
-        const timestamps = this.buffer.map(entry => entry.timestamp);
-        this.oldestChunkTimestamp = Math.min(...timestamps);
-      } else {
-        this.oldestChunkTimestamp = null;
-      }
-
-      // Too noisy for standard debug
-      // this.logger.debug('[AudioBuffer] 🧹 Cleaned up expired chunks', {
-      //   removed,
-      //   remaining: this.buffer.length,
-      // });
-
       this.emit('chunks_expired', { count: removed });
     }
   }
@@ -309,12 +302,7 @@ export class AudioBufferManager extends EventEmitter {
    * Use when resetting stream or ending session
    */
   clear() {
-    const previousSize = this.buffer.length;
-
-    this.buffer = [];
-    this.bufferIndex = 0;
-    this.oldestChunkTimestamp = null;
-    this.newestChunkTimestamp = null;
+    const previousSize = this.ring.clear();
 
     this.logger.info('[AudioBuffer] 🗑️ Buffer cleared', {
       chunksCleared: previousSize,
@@ -344,12 +332,8 @@ export class AudioBufferManager extends EventEmitter {
    * Call when session ends
    */
   destroy() {
-    if (this.cleanupInterval) {
-      clearInterval(this.cleanupInterval);
-      this.cleanupInterval = null;
-    }
-
     this.clear();
+    this.ring.release();
     this.removeAllListeners();
 
     this.logger.info('[AudioBuffer] 🛑 AudioBufferManager destroyed', {
@@ -366,7 +350,7 @@ export class AudioBufferManager extends EventEmitter {
       ...this.metrics,
       totalChunksReceived: this.totalChunksReceived,
       totalBytesReceived: this.totalBytesReceived,
-      currentBufferSize: this.buffer.length,
+      currentBufferSize: this.ring.chunkCount,
       bufferDurationMs: this.getBufferDurationMs(),
       targetDurationMs: this.bufferDurationMs,
     };
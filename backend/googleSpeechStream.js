@@ -23,6 +23,17 @@ import { TRANSCRIPTION_LANGUAGES, getTranscriptionLanguageCode, isTranscriptionS
 import AudioBufferManager from './audioBufferManager.js';
 import { normalizePunctuation } from './transcriptionCleanup.js';
 import { resolveModel } from './entitlements/index.js';
+import { getGlossaryMatcher } from './utils/glossaryMatcher.js';
+import {
+  DEFAULT_HANDOFF_DRAIN_MS,
+  DEFAULT_HANDOFF_OVERLAP_MS,
+  RecognizerHandoff,
+  resultTimeline
+} from './utils/recognizerHandoff.js';
+import { observeRestartResultGap, recordHandoffRetired, recordRecognizerRestart } from './utils/metrics.js';
+
+// Priming writes stay under the 25 KB StreamingRecognize request limit
+const PRIME_WRITE_BYTES = 16384;
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -64,10 +75,6 @@ export class GoogleSpeechStream {
     });
 
     // Listen to audio buffer events for monitoring
-    this.audioBufferManager.on('chunk_added', (data) => {
-      // Optional: emit events for external monitoring
-    });
-
     this.audioBufferManager.on('flush', (data) => {
       console.log(`[GoogleSpeech] 🎵 Audio buffer flushed: ${data.chunks} chunks, ${data.bytes} bytes`);
     });
@@ -116,6 +123,22 @@ export class GoogleSpeechStream {
     // Track the latest partial transcript so we can force-commit it if the
     // stream restarts before a FINAL result arrives.
     this.lastPartialTranscript = '';
+
+    // WARM HANDOFF (STT_WARM_HANDOFF=true): at the time limits, open a standby recognizer
+    // primed with recent audio from the buffer before the current one is closed
+    // (see handoffStream() and utils/recognizerHandoff.js)
+    this.warmHandoff = false;
+    this.handoff = null;             // RecognizerHandoff until the standby's first final gets through
+    this.outgoingStream = null;      // Recognizer still finishing its utterance after a handoff
+    this.handoffDrainTimer = null;
+    this.streamOriginMs = null;      // Audio position of the first byte sent to the current recognizer
+    this.lastFinalTimeline = null;   // Positions of the current recognizer's last final
+    this.pendingRestart = null;      // { mode, startedAt } until the first result after a restart
+
+    // WORD TIMELINE (STT_WORD_TIMELINE=true): every result carries its position on the
+    // stream's audio timeline in meta.timeline, finals with word offsets
+    // (core/engine/segmentAssembler.js)
+    this.wordTimeline = false;
   }
 
   /**
@@ -128,6 +151,26 @@ export class GoogleSpeechStream {
     // Store initialization options for startStream
     this.initOptions = options;
 
+    // Size the recovery ring for the audio this stream actually receives
+    this.audioBufferManager.setSampleRate(options.sampleRateHertz || 24000);
+
+    // Warm handoff primes the standby with buffered audio, so it needs LINEAR16 byte positions.
+    // Recovery streams (punctuation disabled) live for a few seconds and never hit the limits.
+    this.warmHandoff = (options.warmHandoff ?? process.env.STT_WARM_HANDOFF === 'true') &&
+      (options.encoding || 'LINEAR16') === 'LINEAR16' &&
+      !options.disablePunctuation;
+    this.handoffOverlapMs = Math.min(
+      options.handoffOverlapMs || parseInt(process.env.STT_HANDOFF_OVERLAP_MS, 10) || DEFAULT_HANDOFF_OVERLAP_MS,
+      this.audioBufferManager.bufferDurationMs
+    );
+    this.handoffDrainMs = options.handoffDrainMs || parseInt(process.env.STT_HANDOFF_DRAIN_MS, 10) || DEFAULT_HANDOFF_DRAIN_MS;
+    this.wordTimeline = (options.wordTimeline ?? process.env.STT_WORD_TIMELINE === 'true') &&
+      (options.encoding || 'LINEAR16') === 'LINEAR16' &&
+      !options.disablePunctuation;
+    if (this.warmHandoff) {
+      console.log(`[GoogleSpeech] 🔁 Warm handoff ENABLED: ${this.handoffOverlapMs}ms overlap, ${this.handoffDrainMs}ms drain`);
+    }
+
     // PHASE 7: Resolve STT routing if entitlements provided
     if (options.entitlements) {
       try {
@@ -149,8 +192,17 @@ export class GoogleSpeechStream {
     // Create Speech client with authentication options
     const clientOptions = {};
 
+    // Local recognizer (benchmarks): GOOGLE_SPEECH_API_ENDPOINT=host:port over plaintext gRPC
+    if (process.env.GOOGLE_SPEECH_API_ENDPOINT) {
+      const [host, port] = process.env.GOOGLE_SPEECH_API_ENDPOINT.split(':');
+      const { grpc } = await import('google-gax');
+      console.log(`[GoogleSpeech] Using local recognizer at ${process.env.GOOGLE_SPEECH_API_ENDPOINT} (no authentication)`);
+      clientOptions.apiEndpoint = host;
+      clientOptions.port = Number(port) || 443;
+      clientOptions.sslCreds = grpc.credentials.createInsecure();
+    }
     // Option 1: API Key (simpler, if provided)
-    if (process.env.GOOGLE_SPEECH_API_KEY) {
+    else if (process.env.GOOGLE_SPEECH_API_KEY) {
       console.log('[GoogleSpeech] Using API Key authentication');
       clientOptions.apiKey = process.env.GOOGLE_SPEECH_API_KEY;
     }
@@ -217,6 +269,8 @@ export class GoogleSpeechStream {
 
     console.log(`[GoogleSpeech] Starting stream #${this.restartCount}...`);
     this.startTime = Date.now();
+    this.streamOriginMs = null;
+    this.lastFinalTimeline = null;
     this.isActive = true;
     this.isRestarting = false;
 
@@ -236,6 +290,12 @@ export class GoogleSpeechStream {
       alternativeLanguageCodes: [],
     };
 
+    // Word offsets let a warm handoff split the overlap between recognizers by audio time,
+    // and the segment assembler commit segments by audio time
+    if (this.warmHandoff || this.wordTimeline) {
+      requestConfig.enableWordTimeOffsets = true;
+    }
+
     // PHASE 7: Merge parameters from STT routing (Provider-defined params)
     if (this.sttRouting && this.sttRouting.params) {
       console.log(`[GoogleSpeech] 🔧 Applying STT routing parameters: ${JSON.stringify(this.sttRouting.params)}`);
@@ -335,6 +395,8 @@ export class GoogleSpeechStream {
           }
         ]
       };
+      // Start loading the glossary used to log recognized terms before results arrive
+      getGlossaryMatcher();
       console.log(`[GoogleSpeech] ✅ PhraseSet ENABLED (v1p1beta1 API): ${phraseSetRef}`);
       console.log(`[GoogleSpeech]    Using adaptation.phraseSets format for PhraseSet support`);
       console.log(`[GoogleSpeech]    Glossary terms will be recognized with improved accuracy`);
@@ -550,7 +612,7 @@ export class GoogleSpeechStream {
         if (this.initOptions?.disablePunctuation) {
           console.log('[GoogleSpeech-RECOVERY] 🎤 Received data event from Google');
         }
-        this.handleStreamingResponse(data);
+        this.handleRecognizerData(data);
       })
       .on('end', () => {
         console.log('[GoogleSpeech] Stream ended');
@@ -570,7 +632,7 @@ export class GoogleSpeechStream {
 
     this.restartTimer = setTimeout(() => {
       console.log('[GoogleSpeech] Approaching time limit, restarting stream...');
-      this.restartStream();
+      this.handoffStream('streaming_limit');
     }, this.STREAMING_LIMIT);
 
     console.log('[GoogleSpeech] Stream started successfully');
@@ -578,8 +640,10 @@ export class GoogleSpeechStream {
 
   /**
    * Restart the stream (for long sessions)
+   * Cold restart: the current recognizer is closed before the next one opens.
+   * @param {string} reason - Restart reason for metrics ('streaming_limit', 'chunk_timeout', 'recover')
    */
-  async restartStream() {
+  async restartStream(reason = 'recover') {
     // Prevent multiple simultaneous restarts
     if (this.isRestarting) {
       console.log('[GoogleSpeech] Restart already in progress, skipping...');
@@ -590,25 +654,16 @@ export class GoogleSpeechStream {
     this.restartCount++;
     console.log(`[GoogleSpeech] 🔄 Restarting stream (restart #${this.restartCount})...`);
 
+    // A recognizer still draining from a warm handoff goes down with this one
+    this.abortHandoff();
+
     // CRITICAL: If Google never emitted a FINAL for the most recent partial, force-emit it
     // This ensures recovery system is triggered for forced finals
-    if (this.lastPartialTranscript && this.lastPartialTranscript.trim().length > 0) {
-      console.warn(`[GoogleSpeech] ⚠️ Forcing FINAL of latest partial before restart (${this.lastPartialTranscript.length} chars)`);
-      if (this.resultCallback) {
-        try {
-          this.resultCallback(this.lastPartialTranscript, false, {
-            forced: true,
-            detectedLanguage: this.lastDetectedLanguage
-          });
-        } catch (err) {
-          console.error('[GoogleSpeech] ⚠️ Error forcing final transcript before restart:', err.message);
-        }
-      }
-      this.lastPartialTranscript = '';
-    }
+    this.forceFinalOfLatestPartial('restart');
 
     // Mark as inactive during restart
     this.isActive = false;
+    const stoppedAt = Date.now();
 
     // Clean up old stream first to prevent unhandled errors
     if (this.recognizeStream) {
@@ -663,6 +718,8 @@ export class GoogleSpeechStream {
 
     try {
       await this.startStream();
+      recordRecognizerRestart('cold', reason, Date.now() - stoppedAt);
+      this.pendingRestart = { mode: 'cold', startedAt: stoppedAt };
 
       // Process any queued audio after restart
       if (this.audioQueue.length > 0) {
@@ -685,10 +742,216 @@ export class GoogleSpeechStream {
     }
   }
 
+  /**
+   * Warm-standby restart: open the next recognizer, prime it with the last
+   * handoffOverlapMs of buffered audio and keep feeding the current one until it
+   * finalizes the utterance in flight (or handoffDrainMs passes). Audio is never
+   * refused and the merge state downstream sees one continuous result stream.
+   * Falls back to restartStream() when warm handoff is off or the current
+   * recognizer has nothing to hand over.
+   * @param {string} reason - 'streaming_limit' | 'vad_cutoff'
+   */
+  async handoffStream(reason) {
+    if (this.isRestarting || this.handoff?.draining) {
+      return;
+    }
+    if (!this.warmHandoff || !this.isStreamReady() || this.streamOriginMs === null) {
+      return this.restartStream(reason);
+    }
+
+    const startedAt = Date.now();
+    this.restartCount++;
+
+    // The primed audio ends at the current position (every chunk is buffered before it is sent)
+    const primed = this.getRecentAudio(this.handoffOverlapMs);
+    const handoffMs = this.audioPositionMs();
+    const standbyOriginMs = handoffMs - primed.length / this.audioBytesPerMs();
+    this.handoff = new RecognizerHandoff({
+      outgoingOriginMs: this.streamOriginMs,
+      standbyOriginMs,
+      handoffMs,
+      lastFinal: this.lastFinalTimeline
+    });
+    console.log(`[GoogleSpeech] 🔁 Warm handoff #${this.restartCount} (${reason}): priming standby with ${Math.round(handoffMs - standbyOriginMs)}ms of audio`);
+
+    // Detach the current recognizer; it keeps receiving audio until it is retired
+    const outgoing = this.recognizeStream;
+    outgoing.removeAllListeners('data');
+    outgoing.removeAllListeners('end');
+    outgoing.removeAllListeners('error');
+    outgoing
+      .on('error', (err) => {
+        console.warn(`[GoogleSpeech] Outgoing recognizer error during handoff: ${err.message}`);
+        this.retireOutgoingStream('error');
+      })
+      .on('data', (data) => this.handleOutgoingData(data))
+      .on('end', () => this.retireOutgoingStream('ended'));
+    this.outgoingStream = outgoing;
+    this.recognizeStream = null;
+
+    try {
+      await this.startStream();
+    } catch (error) {
+      console.error('[GoogleSpeech] Failed to open standby recognizer, restarting instead:', error);
+      this.retireOutgoingStream('error');
+      return this.restartStream(reason);
+    }
+
+    for (let offset = 0; offset < primed.length; offset += PRIME_WRITE_BYTES) {
+      this.recognizeStream.write(primed.subarray(offset, offset + PRIME_WRITE_BYTES));
+    }
+    this.streamOriginMs = standbyOriginMs;
+
+    this.handoffDrainTimer = setTimeout(() => this.retireOutgoingStream('timeout'), this.handoffDrainMs);
+    recordRecognizerRestart('warm', reason, 0);
+    this.pendingRestart = { mode: 'warm', startedAt };
+  }
+
+  /**
+   * Result from the recognizer being drained after a handoff (delivered as is)
+   */
+  handleOutgoingData(data) {
+    const handoff = this.handoff;
+    if (!handoff) return;
+
+    const finalizedPastHandoff = handoff.fromOutgoing(resultTimeline(data, handoff.outgoingOriginMs));
+    this.deliverResult(data, handoff.outgoingOriginMs);
+    if (finalizedPastHandoff) {
+      this.retireOutgoingStream('final');
+    }
+  }
+
+  /**
+   * Close the recognizer drained after a handoff and release the standby results held meanwhile
+   * @param {string} outcome - 'final' | 'timeout' | 'error' | 'ended' | 'aborted'
+   */
+  retireOutgoingStream(outcome) {
+    const outgoing = this.outgoingStream;
+    if (!outgoing) return;
+    this.outgoingStream = null;
+    clearTimeout(this.handoffDrainTimer);
+    this.handoffDrainTimer = null;
+
+    try {
+      outgoing.removeAllListeners('data');
+      outgoing.removeAllListeners('end');
+      outgoing.removeAllListeners('error');
+      outgoing.on('error', (err) => {
+        if (process.env.DEBUG_GC === 'true') {
+          console.log(`[GoogleSpeech] 💨 Swallowed late error from retired stream: ${err.message}`);
+        }
+      });
+      if (typeof outgoing.destroy === 'function') {
+        outgoing.destroy();
+      } else {
+        outgoing.end();
+      }
+    } catch (err) {
+      console.warn('[GoogleSpeech] Error closing outgoing recognizer:', err.message);
+    }
+
+    const handoff = this.handoff;
+    if (outcome === 'aborted' || !handoff) return;
+
+    // An utterance the outgoing recognizer never finalized is committed as a cold restart would
+    const forcedText = outcome === 'final' ? null : this.forceFinalOfLatestPartial('handoff');
+    const held = handoff.retire(forcedText);
+    recordHandoffRetired(outcome);
+    console.log(`[GoogleSpeech] 🔁 Outgoing recognizer retired (${outcome}), ${held.length} held standby final(s) released`);
+
+    for (const data of held) {
+      this.deliverResult(data);
+    }
+    if (handoff.done && this.handoff === handoff) {
+      this.handoff = null;
+    }
+  }
+
+  /**
+   * Drop a handoff in progress (cold restart or destroy)
+   */
+  abortHandoff() {
+    this.handoff = null;
+    this.retireOutgoingStream('aborted');
+  }
+
+  /**
+   * Force-emit the latest partial as a FINAL when its recognizer goes away before
+   * Google finalized it
+   * @param {string} context - Log context ('restart' | 'handoff')
+   * @returns {string|null} - Text committed, or null when there was no partial
+   */
+  forceFinalOfLatestPartial(context) {
+    const text = this.lastPartialTranscript;
+    if (!text || text.trim().length === 0) return null;
+
+    console.warn(`[GoogleSpeech] ⚠️ Forcing FINAL of latest partial before ${context} (${text.length} chars)`);
+    if (this.resultCallback) {
+      try {
+        this.resultCallback(text, false, {
+          forced: true,
+          detectedLanguage: this.lastDetectedLanguage
+        });
+      } catch (err) {
+        console.error(`[GoogleSpeech] ⚠️ Error forcing final transcript before ${context}:`, err.message);
+      }
+    }
+    this.lastPartialTranscript = '';
+    return text;
+  }
+
+  /**
+   * Result from the current recognizer; while a handoff is open, standby results
+   * are de-overlapped against what the outgoing recognizer delivered
+   */
+  handleRecognizerData(data) {
+    if (this.warmHandoff) {
+      const timeline = resultTimeline(data, this.streamOriginMs);
+      if (timeline?.isFinal) this.lastFinalTimeline = timeline;
+
+      const handoff = this.handoff;
+      if (handoff) {
+        data = handoff.fromStandby(data, timeline);
+        if (handoff.done) this.handoff = null;
+        if (!data) return;
+      }
+    }
+    this.deliverResult(data);
+  }
+
+  /**
+   * Hand a response to handleStreamingResponse, timing the first one after a restart
+   * @param {Object} data - StreamingRecognizeResponse
+   * @param {number|null} originMs - Audio position of the first byte its recognizer was sent
+   */
+  deliverResult(data, originMs = this.streamOriginMs) {
+    if (this.pendingRestart && data.results?.length > 0) {
+      observeRestartResultGap(this.pendingRestart.mode, Date.now() - this.pendingRestart.startedAt);
+      this.pendingRestart = null;
+    }
+    this.handleStreamingResponse(data, this.wordTimeline ? resultTimeline(data, originMs) : null);
+  }
+
+  /**
+   * LINEAR16 mono bytes per millisecond at the configured sample rate
+   */
+  audioBytesPerMs() {
+    return (this.initOptions?.sampleRateHertz || 24000) * 2 / 1000;
+  }
+
+  /**
+   * Position (ms) on the stream's audio timeline: all audio buffered so far
+   */
+  audioPositionMs() {
+    return this.audioBufferManager.totalBytesReceived / this.audioBytesPerMs();
+  }
+
   /**
    * Handle streaming response from Google Speech
+   * @param {Object} data - StreamingRecognizeResponse
+   * @param {Object|null} timeline - resultTimeline() of the response (word timeline mode)
    */
-  handleStreamingResponse(data) {
+  handleStreamingResponse(data, timeline = null) {
     if (!data.results || data.results.length === 0) {
       return;
     }
@@ -747,37 +1010,11 @@ export class GoogleSpeechStream {
     // Log when PhraseSet terms are recognized to confirm it's working
     if (combinedTranscript && process.env.GOOGLE_PHRASE_SET_ID) {
       try {
-        const glossaryPath = path.resolve(__dirname, '../glossary.json');
-        if (fs.existsSync(glossaryPath)) {
-          const glossary = JSON.parse(fs.readFileSync(glossaryPath, 'utf8'));
-          if (glossary.phrases && Array.isArray(glossary.phrases)) {
-            // Strip punctuation and normalize transcript for matching
-            const transcriptClean = combinedTranscript.toLowerCase().replace(/[.,!?;:]/g, '').trim();
-
-            // Check if transcript contains any PhraseSet term
-            const matched = glossary.phrases.find(phrase => {
-              const phraseValue = phrase.value.toLowerCase();
-
-              // Handle entries with "/" separator (e.g., "Ephesia/Ephesus")
-              const phraseVariants = phraseValue.includes('/')
-                ? phraseValue.split('/').map(v => v.trim())
-                : [phraseValue];
-
-              // Check each variant
-              return phraseVariants.some(variant => {
-                const variantClean = variant.replace(/[.,!?;:]/g, '').trim();
-                // Check for exact match or phrase contained in transcript
-                // CRITICAL: Only check if transcript contains phrase (not vice versa)
-                // Checking if phrase contains transcript causes false positives (e.g., "stand your ground" contains "you")
-                return transcriptClean === variantClean ||
-                  transcriptClean.includes(variantClean);
-              });
-            });
-
-            if (matched) {
-              console.log(`[GoogleSpeech] 🎯✅ PHRASESET TERM RECOGNIZED: "${matched.value}" in transcript "${combinedTranscript}"`);
-            }
-          }
+        // Glossary is loaded once and compiled into an automaton (utils/glossaryMatcher.js);
+        // only the transcript is scanned here
+        const matched = getGlossaryMatcher().match(combinedTranscript);
+        if (matched) {
+          console.log(`[GoogleSpeech] 🎯✅ PHRASESET TERM RECOGNIZED: "${matched.value}" in transcript "${combinedTranscript}"`);
         }
       } catch (err) {
         // Silently fail - don't break transcription if glossary check fails
@@ -837,6 +1074,7 @@ export class GoogleSpeechStream {
         } else if (this.lastDetectedLanguage) {
           meta.detectedLanguage = this.lastDetectedLanguage;
         }
+        if (timeline) meta.timeline = timeline;
         this.resultCallback(combinedTranscript, false, meta); // isPartial = false
       }
 
@@ -854,6 +1092,10 @@ export class GoogleSpeechStream {
         const meta = { pipeline: this.pipeline };
         if (speakerTag !== null) meta.speakerTag = speakerTag;
         if (detectedLanguage) meta.detectedLanguage = detectedLanguage;
+        if (timeline) {
+          meta.timeline = timeline;
+          meta.stability = stability;
+        }
         this.resultCallback(combinedTranscript, true, meta); // isPartial = true
       }
 
@@ -935,10 +1177,13 @@ export class GoogleSpeechStream {
 
       // Check if we need to restart due to time limit
       const elapsedTime = Date.now() - this.startTime;
-      if (elapsedTime >= this.STREAMING_LIMIT) {
+      if (elapsedTime >= this.STREAMING_LIMIT && this.warmHandoff) {
+        // No gap: this chunk goes to the standby below
+        await this.handoffStream('streaming_limit');
+      } else if (elapsedTime >= this.STREAMING_LIMIT) {
         console.log('[GoogleSpeech] Time limit reached, queuing chunk for retry after restart...');
         this.queueChunkForRetry(chunkId, audioData, metadata, 0);
-        await this.restartStream();
+        await this.restartStream('streaming_limit');
         return;
       }
 
@@ -957,6 +1202,19 @@ export class GoogleSpeechStream {
       // Double-check stream is still ready
       if (this.isStreamReady()) {
         this.recognizeStream.write(audioBuffer);
+        if (this.streamOriginMs === null) {
+          this.streamOriginMs = this.audioPositionMs() - audioBuffer.length / this.audioBytesPerMs();
+        }
+
+        // Keep the outgoing recognizer fed until it finalizes the utterance in flight
+        if (this.outgoingStream?.writable) {
+          this.outgoingStream.write(audioBuffer);
+        }
+
+        // With warm handoff the proactive VAD-cutoff restart no longer drops audio
+        if (this.warmHandoff && this.audioPositionMs() - this.streamOriginMs >= this.VAD_CUTOFF_LIMIT) {
+          this.handoffStream('vad_cutoff');
+        }
 
         // Log for recovery streams
         if (this.initOptions?.disablePunctuation) {
@@ -1079,7 +1337,7 @@ export class GoogleSpeechStream {
     this.resetAudioPipelinesDueToTimeout();
     this.chunkTimeoutTimestamps = [];
     if (!this.isRestarting) {
-      this.restartStream();
+      this.restartStream('chunk_timeout');
     }
   }
 
@@ -1283,6 +1541,46 @@ export class GoogleSpeechStream {
    */
   onResult(callback) {
     this.resultCallback = callback;
+
+    // OFFLINE REPLAY: Record raw partial/final events for backend/tools/merge_sim
+    if (callback && process.env.STT_REPLAY_RECORD_DIR) {
+      this.resultCallback = this.wrapWithReplayRecorder(callback);
+    }
+  }
+
+  /**
+   * Wrap a result callback so every normal-pipeline result is appended to
+   * `${STT_REPLAY_RECORD_DIR}/${streamId}.jsonl` as {isPartial, transcriptText, t}
+   * @param {Function} callback - (transcript, isPartial, meta) => void
+   * @returns {Function} Recording callback
+   */
+  wrapWithReplayRecorder(callback) {
+    const dir = process.env.STT_REPLAY_RECORD_DIR;
+    try {
+      fs.mkdirSync(dir, { recursive: true });
+    } catch (err) {
+      console.warn(`[GoogleSpeech] Replay recording disabled (${dir}): ${err.message}`);
+      return callback;
+    }
+
+    if (!this.replayRecorder) {
+      this.replayRecorder = fs.createWriteStream(path.join(dir, `${this.streamId}.jsonl`), { flags: 'a' });
+      this.replayRecorder.on('error', (err) => {
+        console.warn(`[GoogleSpeech] Replay recorder error: ${err.message}`);
+      });
+      this.replayStartTime = Date.now();
+    }
+
+    return (transcript, isPartial, meta) => {
+      if (this.pipeline === 'normal' && this.replayRecorder) {
+        this.replayRecorder.write(JSON.stringify({
+          isPartial,
+          transcriptText: transcript,
+          t: Date.now() - this.replayStartTime
+        }) + '\n');
+      }
+      return callback(transcript, isPartial, meta);
+    };
   }
 
   /**
@@ -1345,6 +1643,8 @@ export class GoogleSpeechStream {
       this.restartTimer = null;
     }
 
+    this.abortHandoff();
+
     if (this.recognizeStream) {
       try {
         this.recognizeStream.removeAllListeners();
@@ -1364,13 +1664,18 @@ export class GoogleSpeechStream {
     this.audioQueue = [];
     this.resultCallback = null;
 
+    if (this.replayRecorder) {
+      this.replayRecorder.end();
+      this.replayRecorder = null;
+    }
+
     console.log('[GoogleSpeech] Stream destroyed');
   }
 
   /**
    * Get recent audio from buffer for recovery operations
    * @param {number} durationMs - Duration in milliseconds to retrieve
-   * @returns {Buffer} Concatenated audio buffer
+   * @returns {Buffer} Audio buffer (one copy out of the ring, safe to hold while recovery runs)
    */
   getRecentAudio(durationMs = 600) {
     if (!this.audioBufferManager) {
@@ -1414,6 +1719,9 @@ export class GoogleSpeechStream {
       isActive: this.isActive,
       isRestarting: this.isRestarting,
       restartCount: this.restartCount,
+      warmHandoff: this.warmHandoff,
+      wordTimeline: this.wordTimeline,
+      handoffDraining: this.outgoingStream !== null,
       elapsedTime: Date.now() - this.startTime,
       queuedAudio: this.audioQueue.length,
       languageCode: this.languageCode,
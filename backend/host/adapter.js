@@ -48,6 +48,7 @@ import { partialTranslationWorker, finalTranslationWorker } from '../translation
 import { realtimePartialTranslationWorker, realtimeFinalTranslationWorker } from '../translationWorkersRealtime.js';
 import { grammarWorker } from '../grammarWorker.js';
 import { CoreEngine } from '../../core/engine/coreEngine.js';
+import { SEGMENT_ASSEMBLY_CONSTANTS } from '../../core/shared/types/config.js';
 import { mergeRecoveryText, wordsAreRelated } from '../utils/recoveryMerge.js';
 import { deduplicatePartialText } from '../../core/utils/partialDeduplicator.js';
 import { shouldEmitPartial, shouldEmitFinal, setLastEmittedText, clearLastEmittedText, hasAlphaNumeric } from '../../core/utils/emitGuards.js';
@@ -57,6 +58,8 @@ import { getAllowedTtsTiers } from '../entitlements/index.js';
 import { recordUsageEvent } from '../usage/recordUsage.js';
 import { startSessionSpan, heartbeatSessionSpan, stopSessionSpan } from '../usage/sessionSpans.js';
 import { checkQuotaLimit, createQuotaEvent } from '../usage/quotaEnforcement.js';
+import { createFinalDeduplicator } from '../utils/finalDeduplicator.js';
+import { observePartialFinalGap, recordMergeEvent } from '../utils/metrics.js';
 import { normalizePunctuation } from '../transcriptionCleanup.js';
 import crypto from 'crypto';
 
@@ -878,6 +881,11 @@ export async function handleHostConnection(clientWs, sessionId) {
               // Queue for deferred finals from recovery/dedupe pipeline
               const deferredFinalQueue = [];
 
+              // Rolling window of recent final fingerprints - catches repeats of finals further back
+              // than lastSentFinalText (utils/finalDeduplicator.js)
+              const finalDedup = createFinalDeduplicator({ sessionId: currentSessionId });
+              clientWs.once('close', () => finalDedup.dispose());
+
               // Function to drain deferred final queue (called from recovery completion callbacks)
               async function drainDeferredFinals({ processFinalText }) {
                 const queueLength = deferredFinalQueue.length;
@@ -931,7 +939,7 @@ export async function handleHostConnection(clientWs, sessionId) {
                 if (isProcessingFinal) {
                   // CRITICAL: Before queuing, check if this is an older version of text already committed
                   // This prevents queuing incomplete versions after recovery has committed complete versions
-                  if (lastSentFinalText) {
+                  if (lastSentFinalText && !options.timelineSegment) {
                     const queuedNormalized = textToProcess.trim().replace(/\s+/g, ' ').toLowerCase();
                     const lastSentNormalized = lastSentFinalText.replace(/\s+/g, ' ').toLowerCase();
 
@@ -966,7 +974,8 @@ export async function handleHostConnection(clientWs, sessionId) {
 
                     // Always check for duplicates if we have tracking data (not just within time window)
                     // This catches duplicates even if they arrive outside the continuation window
-                    if (lastSentOriginalText) {
+                    // Timeline segments skip it: the assembler never commits the same audio twice
+                    if (lastSentOriginalText && !options.timelineSegment) {
                       const lastSentOriginalNormalized = lastSentOriginalText.replace(/\s+/g, ' ').toLowerCase();
                       const lastSentFinalNormalized = lastSentFinalText.replace(/\s+/g, ' ').toLowerCase();
                       const timeSinceLastFinal = Date.now() - lastSentFinalTime;
@@ -1149,6 +1158,21 @@ export async function handleHostConnection(clientWs, sessionId) {
                       }
                     }
 
+                    // Exact/near-duplicate of any final still in the window (forced finals have their own checks above)
+                    if (!isForcedFinal && !options.timelineSegment) {
+                      const listeners = sessionStore.getSession(currentSessionId)?.listeners;
+                      const duplicate = finalDedup.checkAndRecord(trimmedText, {
+                        translations: sessionStore.getSessionLanguages(currentSessionId).length,
+                        recipients: (listeners ? listeners.size : 0) + 1 // Listeners plus the host
+                      });
+                      if (duplicate.duplicate) {
+                        recordMergeEvent('HostMode', 'duplicate');
+                        console.log(`[HostMode] ⚠️ ${duplicate.kind === 'near' ? `Near-duplicate (similarity ${duplicate.similarity.toFixed(2)})` : 'Duplicate'} of a recent final, skipping: "${trimmedText.substring(0, 60)}..." (matched: "${duplicate.matched.substring(0, 60)}...")`);
+                        isProcessingFinal = false; // Clear flag before returning
+                        return; // Skip processing duplicate
+                      }
+                    }
+
                     const isTranscriptionOnly = false; // Host mode always translates
 
                     // Different language - KEEP COUPLED FOR FINALS (history needs complete data)
@@ -1522,6 +1546,31 @@ export async function handleHostConnection(clientWs, sessionId) {
               // Alias for backwards compatibility
               const processFinalTranscript = processFinalText;
 
+              // WORD TIMELINE (STT_WORD_TIMELINE): finals are committed by audio time in
+              // coreEngine's segment assembler and sent as they commit, without the
+              // partial-extension wait and forced-final recovery of the string path
+              let segmentFlushTimeout = null;
+              const commitTimelineSegments = (segments) => {
+                for (const segment of segments) {
+                  recordMergeEvent('HostMode', 'timeline_segment');
+                  console.log(`[HostMode] 🧩 Timeline segment committed (${segment.reason}, ${segment.startMs}-${segment.endMs}ms): "${segment.text.substring(0, 80)}"`);
+                  processFinalText(segment.text, { forceFinal: segment.isForced, timelineSegment: true });
+                }
+              };
+              // Open final words wait for the next final to show a boundary; if no result
+              // arrives for IDLE_FLUSH_MS the speaker has paused, so commit them
+              const armSegmentFlush = () => {
+                clearTimeout(segmentFlushTimeout);
+                segmentFlushTimeout = null;
+                if (!coreEngine.hasOpenSegment()) return;
+                segmentFlushTimeout = setTimeout(() => {
+                  segmentFlushTimeout = null;
+                  if (clientWs.readyState !== WebSocket.OPEN) return;
+                  commitTimelineSegments(coreEngine.flushSegments());
+                }, SEGMENT_ASSEMBLY_CONSTANTS.IDLE_FLUSH_MS);
+              };
+              clientWs.once('close', () => clearTimeout(segmentFlushTimeout));
+
               // Set up result callback - handles both partials and finals (solo mode logic, adapted for broadcasting)
               speechStream.onResult(async (transcriptText, isPartial, meta = {}) => {
                 if (!clientWs || clientWs.readyState !== WebSocket.OPEN) return;
@@ -1532,6 +1581,12 @@ export async function handleHostConnection(clientWs, sessionId) {
                   return;
                 }
 
+                // Word-timeline segment assembly (results carry meta.timeline with STT_WORD_TIMELINE).
+                // Forced finals have no timeline but close the assembler's open words
+                const timelineFinal = !isPartial && (Boolean(meta.timeline) || (meta.forced === true && speechStream.wordTimeline));
+                const timelineSegments = coreEngine.assembleResult(transcriptText, isPartial, meta);
+                if (meta.timeline || timelineFinal) armSegmentFlush();
+
                 // Extract pipeline from meta (default to 'normal')
                 const pipeline = meta.pipeline || 'normal';
                 console.log(`[HostMode] 📥 RESULT RECEIVED: ${isPartial ? 'PARTIAL' : 'FINAL'} "${transcriptText.substring(0, 60)}..." (pipeline: ${pipeline})`);
@@ -1560,7 +1615,7 @@ export async function handleHostConnection(clientWs, sessionId) {
                 }
 
                 // DEBUG: Log every result to verify callback is being called
-                console.log(`[HostMode] 📥 RESULT RECEIVED: ${isPartial ? 'PARTIAL' : 'FINAL'} "${transcriptText.substring(0, 60)}..." (meta: ${JSON.stringify(meta)})`);
+                console.log(`[HostMode] 📥 RESULT RECEIVED: ${isPartial ? 'PARTIAL' : 'FINAL'} "${transcriptText.substring(0, 60)}..." (meta: ${JSON.stringify({ ...meta, timeline: undefined })})`);
 
                 if (isPartial) {
                   // PHASE 8: Removed deprecated PRIORITY 0 backpatching logic
@@ -2942,13 +2997,24 @@ export async function handleHostConnection(clientWs, sessionId) {
                   return;
                 }
 
+                // Word-timeline final: send the segments it completed; the partial tail starts over
+                if (timelineFinal) {
+                  if (meta.forced) recordMergeEvent('HostMode', 'forced_final');
+                  partialTracker.reset();
+                  syncPartialVariables();
+                  commitTimelineSegments(timelineSegments);
+                  return;
+                }
+
                 // Final transcript - delay processing to allow partials to extend it (solo mode logic)
                 const isForcedFinal = meta?.forced === true;
                 console.log(`[HostMode] 📝 FINAL signal received (${transcriptText.length} chars): "${transcriptText.substring(0, 80)}..."`);
-                console.log(`[HostMode] 🔍 FINAL meta: ${JSON.stringify(meta)} - isForcedFinal: ${isForcedFinal}`);
+                observePartialFinalGap('HostMode', partialTracker.getSnapshot().latestTime);
+                console.log(`[HostMode] 🔍 FINAL meta: ${JSON.stringify({ ...meta, timeline: undefined })} - isForcedFinal: ${isForcedFinal}`);
 
                 if (isForcedFinal) {
                   console.warn(`[HostMode] ⚠️ Forced FINAL due to stream restart (${transcriptText.length} chars)`);
+                  recordMergeEvent('HostMode', 'forced_final');
                   console.log(`[HostMode] 🎯 FORCED FINAL DETECTED - Setting up dual buffer audio recovery system`);
                   console.log(`[HostMode] 🎯 DUAL BUFFER: Forced final detected - recovery system will activate`);
                   realtimeTranslationCooldownUntil = Date.now() + TRANSLATION_RESTART_COOLDOWN_MS;
@@ -3743,6 +3809,7 @@ export async function handleHostConnection(clientWs, sessionId) {
                     }
                     console.log(`[HostMode] ⚠️ FINAL extended by LONGEST partial (${transcriptText.length} → ${longestPartialText.length} chars)`);
                     console.log(`[HostMode] 📊 Recovered from partial: "${missingWords}"`);
+                    recordMergeEvent('HostMode', 'partial_override', { finalChars: transcriptText.length, partialChars: longestPartialText.length });
                     finalTextToUse = longestPartialText;
                   } else {
                     // Partial doesn't start with final - check for overlap (Google might have missed words)
@@ -3752,6 +3819,7 @@ export async function handleHostConnection(clientWs, sessionId) {
                       // Overlap detected and merged text is longer - likely same segment with missing words
                       console.log(`[HostMode] ⚠️ FINAL merged with LONGEST partial via overlap (${transcriptText.length} → ${merged.length} chars)`);
                       console.log(`[HostMode] 📊 Recovered via overlap: "${merged.substring(finalTrimmed.length)}"`);
+                      recordMergeEvent('HostMode', 'partial_merge', { newPartChars: merged.length - finalTrimmed.length });
                       finalTextToUse = merged;
                     }
                   }
@@ -3776,6 +3844,7 @@ export async function handleHostConnection(clientWs, sessionId) {
                     }
                     console.log(`[HostMode] ⚠️ FINAL extended by LATEST partial (${transcriptText.length} → ${latestPartialText.length} chars)`);
                     console.log(`[HostMode] 📊 Recovered from partial: "${missingWords}"`);
+                    recordMergeEvent('HostMode', 'partial_override', { finalChars: transcriptText.length, partialChars: latestPartialText.length });
                     finalTextToUse = latestPartialText;
                   } else {
                     // Partial doesn't start with final - check for overlap (Google might have missed words)
@@ -3785,6 +3854,7 @@ export async function handleHostConnection(clientWs, sessionId) {
                       // Overlap detected and merged text is longer - likely same segment with missing words
                       console.log(`[HostMode] ⚠️ FINAL merged with LATEST partial via overlap (${transcriptText.length} → ${merged.length} chars)`);
                       console.log(`[HostMode] 📊 Recovered via overlap: "${merged.substring(finalTrimmed.length)}"`);
+                      recordMergeEvent('HostMode', 'partial_merge', { newPartChars: merged.length - finalTrimmed.length });
                       finalTextToUse = merged;
                     }
                   }
@@ -24,6 +24,10 @@ let isRateLimited = false; // Track if we're currently rate limited
 let estimatedTokensUsed = 0; // Track token usage for TPM limits
 let tokenWindowStart = Date.now();
 
+// Base URL override for a local OpenAI-compatible endpoint (benchmarks):
+// OPENAI_API_BASE_URL=http://127.0.0.1:4010 rewrites https://api.openai.com/...
+const OPENAI_API_ORIGIN = 'https://api.openai.com';
+
 // MULTI-SESSION OPTIMIZATION: Per-session tracking for fair-share allocation
 // Tracks token usage per session to ensure fair distribution across multiple sessions
 const sessionTokenUsage = new Map(); // sessionId -> { tokensUsed, windowStart }
@@ -169,9 +173,9 @@ function estimateTokens(fetchOptions) {
  * Check if we're exceeding per-minute rate or token limits
  * MULTI-SESSION: Implements fair-share allocation when multiple sessions are active
  * @param {Object} fetchOptions - Fetch options
- * @param {string} sessionId - Optional session ID for per-session tracking
+ * @param {Array<string>} sessionIds - Sessions the request is made for (several for a batched request)
  */
-function checkPerMinuteLimit(fetchOptions = {}, sessionId = null) {
+function checkPerMinuteLimit(fetchOptions = {}, sessionIds = []) {
   const now = Date.now();
   
   // Reset counters if 1 minute has passed
@@ -202,8 +206,11 @@ function checkPerMinuteLimit(fetchOptions = {}, sessionId = null) {
   const fairShareRPM = Math.floor(MAX_REQUESTS_PER_MINUTE / activeSessions);
   const fairShareTPM = Math.floor(MAX_TOKENS_PER_MINUTE / activeSessions);
   
-  // Track session request if sessionId provided
-  if (sessionId) {
+  // Each session gets an even share of a batched request's tokens
+  const sessionTokens = sessionIds.length > 0 ? Math.ceil(estimatedTokens / sessionIds.length) : 0;
+
+  // Track the request for every session it serves
+  for (const sessionId of sessionIds) {
     trackSessionRequest(sessionId);
     const sessionData = sessionRequestCounts.get(sessionId);
     
@@ -218,7 +225,7 @@ function checkPerMinuteLimit(fetchOptions = {}, sessionId = null) {
     
     // Check per-session TPM limit (fair-share)
     const sessionTokenData = sessionTokenUsage.get(sessionId);
-    if (sessionTokenData && sessionTokenData.tokensUsed + estimatedTokens > fairShareTPM) {
+    if (sessionTokenData && sessionTokenData.tokensUsed + sessionTokens > fairShareTPM) {
       const waitTime = 60000 - (now - sessionTokenData.windowStart);
       if (waitTime > 0) {
         console.warn(`[RateLimiter] ⚠️ Session ${sessionId} TPM fair-share limit (${sessionTokenData.tokensUsed}/${fairShareTPM}), waiting ${Math.round(waitTime)}ms`);
@@ -362,6 +369,19 @@ export async function withRateLimitRetry(apiCall, options = {}) {
   throw lastError || new Error('Unknown error in rate limit retry');
 }
 
+/**
+ * Apply the OPENAI_API_BASE_URL override to an api.openai.com URL
+ * @param {string} url - API endpoint URL
+ * @returns {string} - URL to fetch
+ */
+export function resolveOpenAIUrl(url) {
+  const baseUrl = process.env.OPENAI_API_BASE_URL;
+  if (!baseUrl || !url.startsWith(OPENAI_API_ORIGIN)) {
+    return url;
+  }
+  return baseUrl.replace(/\/+$/, '') + url.substring(OPENAI_API_ORIGIN.length);
+}
+
 /**
  * Wrapper for fetch-based OpenAI API calls with rate limit handling
  * @param {string} url - API endpoint URL
@@ -370,11 +390,11 @@ export async function withRateLimitRetry(apiCall, options = {}) {
  * @returns {Promise<Response>} - Fetch response
  */
 export async function fetchWithRateLimit(url, fetchOptions = {}, retryOptions = {}) {
-  // Extract sessionId from fetchOptions if provided (for multi-session tracking)
-  const sessionId = fetchOptions.sessionId || null;
+  // Extract sessionId (or a batch's sessionIds) from fetchOptions if provided (for multi-session tracking)
+  const sessionIds = [...new Set(fetchOptions.sessionIds || [fetchOptions.sessionId])].filter(Boolean);
   
   // Check per-minute limits BEFORE making request (now we have fetchOptions)
-  const perMinuteWait = checkPerMinuteLimit(fetchOptions, sessionId);
+  const perMinuteWait = checkPerMinuteLimit(fetchOptions, sessionIds);
   if (perMinuteWait > 0) {
     isRateLimited = true;
     // If we have to wait more than 2 seconds, skip the request entirely (return original text)
@@ -408,12 +428,12 @@ export async function fetchWithRateLimit(url, fetchOptions = {}, retryOptions =
     const estimatedTokens = estimateTokens(fetchOptions);
     estimatedTokensUsed += estimatedTokens;
     
-    // Track session token usage if sessionId provided
-    if (sessionId) {
-      trackSessionTokens(sessionId, estimatedTokens);
+    // Track session token usage, split evenly across a batch's sessions
+    for (const sessionId of sessionIds) {
+      trackSessionTokens(sessionId, Math.ceil(estimatedTokens / sessionIds.length));
     }
     
-    const response = await fetch(url, fetchOptions);
+    const response = await fetch(resolveOpenAIUrl(url), fetchOptions);
     
     // If response is not OK, check if it's a rate limit error
     if (!response.ok) {
@@ -19,6 +19,7 @@ import { stripe } from '../services/stripe.js';
 import { supabaseAdmin } from '../supabaseAdmin.js';
 import { requireAuth, requireAdmin } from '../middleware/requireAuthContext.js';
 import { clearEntitlementsCache } from '../entitlements/index.js';
+import { getStripeCustomerId, getPortalSession } from '../services/billingCache.js';
 
 const router = express.Router();
 
@@ -253,15 +254,15 @@ router.post('/billing/subscription-checkout', requireAuth, requireAdmin, async (
             return res.status(400).json({ error: 'planCode is required' });
         }
 
-        // Get or create Stripe customer
-        const customerId = await ensureStripeCustomer(churchId);
-
-        // Look up the target plan's Stripe price
-        const { data: targetPlan, error: planErr } = await supabaseAdmin
-            .from('plans')
-            .select('id, code, name, stripe_price_id')
-            .eq('code', planCode)
-            .single();
+        // Get or create Stripe customer and look up the target plan's Stripe price in parallel
+        const [customerId, { data: targetPlan, error: planErr }] = await Promise.all([
+            ensureStripeCustomer(churchId),
+            supabaseAdmin
+                .from('plans')
+                .select('id, code, name, stripe_price_id')
+                .eq('code', planCode)
+                .single(),
+        ]);
 
         if (planErr || !targetPlan) {
             return res.status(400).json({ error: `Invalid plan: ${planCode}` });
@@ -381,21 +382,27 @@ router.post('/billing/portal', requireAuth, requireAdmin, async (req, res) => {
         }
 
         const churchId = req.auth.profile.church_id;
-        const customerId = await ensureStripeCustomer(churchId);
         const { flow } = req.body;
 
-        const sessionConfig = {
-            customer: customerId,
-            return_url: `${APP_BASE_URL}/billing`,
-        };
-
-        // If 'subscription_update' flow requested, deep link to that specific page
-        if (flow === 'subscription_update') {
-            const { data: sub } = await supabaseAdmin
-                .from('subscriptions')
-                .select('stripe_subscription_id')
-                .eq('church_id', churchId)
-                .single();
+        // Reuse a portal session created moments ago (repeat clicks, several admins)
+        const portalSession = await getPortalSession(churchId, flow, async () => {
+            // If 'subscription_update' flow requested, deep link to that specific page
+            const [customerId, sub] = await Promise.all([
+                ensureStripeCustomer(churchId),
+                flow === 'subscription_update'
+                    ? supabaseAdmin
+                        .from('subscriptions')
+                        .select('stripe_subscription_id')
+                        .eq('church_id', churchId)
+                        .single()
+                        .then(({ data }) => data)
+                    : null,
+            ]);
+
+            const sessionConfig = {
+                customer: customerId,
+                return_url: `${APP_BASE_URL}/billing`,
+            };
 
             if (sub?.stripe_subscription_id) {
                 sessionConfig.flow_data = {
@@ -405,9 +412,9 @@ router.post('/billing/portal', requireAuth, requireAdmin, async (req, res) => {
                     },
                 };
             }
-        }
 
-        const portalSession = await stripe.billingPortal.sessions.create(sessionConfig);
+            return stripe.billingPortal.sessions.create(sessionConfig);
+        });
 
         console.log(`[Billing] ✓ Portal session created: church=${churchId} flow=${flow || 'default'}`);
         res.json({ url: portalSession.url });
@@ -493,10 +500,23 @@ router.get('/billing/status', requireAuth, requireAdmin, async (req, res) => {
 /**
  * Ensure the church has a Stripe customer. Creates one if missing.
  * 
+ * Cached per church; concurrent calls for the same church share one lookup
+ * (see services/billingCache.js).
+ * 
+ * @param {string} churchId - Church UUID
+ * @returns {Promise<string>} Stripe customer ID (cus_xxx)
+ */
+function ensureStripeCustomer(churchId) {
+    return getStripeCustomerId(churchId, lookupOrCreateStripeCustomer);
+}
+
+/**
+ * Read the church's Stripe customer from the DB, creating it in Stripe if missing.
+ * 
  * @param {string} churchId - Church UUID
  * @returns {Promise<string>} Stripe customer ID (cus_xxx)
  */
-async function ensureStripeCustomer(churchId) {
+async function lookupOrCreateStripeCustomer(churchId) {
     // Check if church already has a Stripe customer
     const { data: church } = await supabaseAdmin
         .from('churches')
@@ -509,11 +529,14 @@ async function ensureStripeCustomer(churchId) {
     }
 
     // Create new Stripe customer
+    // Idempotency key: other server instances racing on the same church get the same customer
     const customer = await stripe.customers.create({
         name: church?.name || 'Unknown Church',
         metadata: {
             church_id: churchId,
         },
+    }, {
+        idempotencyKey: `create-customer-${churchId}`,
     });
 
     // Store on churches table
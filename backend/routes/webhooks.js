@@ -21,6 +21,7 @@ import express from 'express';
 import { stripe } from '../services/stripe.js';
 import { supabaseAdmin } from '../supabaseAdmin.js';
 import { clearEntitlementsCache } from '../entitlements/index.js';
+import { clearBillingCache } from '../services/billingCache.js';
 
 const router = express.Router();
 
@@ -194,6 +195,7 @@ async function handleSubscriptionCheckout(session, churchId) {
     await syncRoleFromStatus(churchId, mappedStatus);
 
     clearEntitlementsCache(churchId);
+    clearBillingCache(churchId);
 }
 
 /**
@@ -306,6 +308,7 @@ async function handleSubscriptionDeleted(subscription) {
     await syncRoleFromStatus(sub.church_id, 'canceled');
 
     clearEntitlementsCache(sub.church_id);
+    clearBillingCache(sub.church_id);
 }
 
 /**
@@ -561,6 +564,7 @@ async function updateSubscriptionRow(churchId, subscription, stripePriceId, stri
     // await syncRoleFromStatus(churchId, mappedStatus);
 
     clearEntitlementsCache(churchId);
+    clearBillingCache(churchId);
 }
 
 /**
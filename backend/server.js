@@ -40,6 +40,16 @@ import { loadAllCatalogs } from './tts/voiceCatalog/catalogLoader.js';
 import { supabaseAdmin } from "./supabaseAdmin.js";
 import { getEntitlements } from "./entitlements/index.js";
 import { startPeriodicReaper } from "./usage/abandonedSessionReaper.js";
+import { getTranscriptBufferStats } from "./utils/transcriptBuffer.js";
+import { getFinalDedupStats } from "./utils/finalDeduplicator.js";
+import { getSpeculationStats } from "./utils/speculativeTranslation.js";
+import { getFinalMergeStats } from "./utils/finalMergeQueue.js";
+import { getTranslationBatcherStats } from "./utils/translationBatcher.js";
+import { getListenerFanoutStats } from "./utils/listenerFanout.js";
+import { getTtsAudioCacheStats } from "./tts/ttsAudioCache.js";
+import { getMetricsSnapshot, renderPrometheus, startEventLoopMonitor, startSnapshotWriter } from "./utils/metrics.js";
+import { flushMergeLogs } from "./utils/mergeLogger.js";
+import { partialTranslationWorker } from "./translationWorkers.js";
 
 const app = express();
 const port = process.env.PORT || 3001;
@@ -140,6 +150,13 @@ const server = app.listen(port, '0.0.0.0', async () => {
   console.log(`[Backend] Local: http://localhost:${port}`);
   console.log(`[Backend] WebSocket: ws://localhost:${port}/translate`);
 
+  // Final-path metrics: event-loop lag sampling, optional periodic JSON snapshot
+  startEventLoopMonitor();
+  if (process.env.METRICS_SNAPSHOT_FILE) {
+    startSnapshotWriter(process.env.METRICS_SNAPSHOT_FILE, parseInt(process.env.METRICS_SNAPSHOT_INTERVAL_MS, 10) || undefined);
+    console.log(`[Backend] Metrics snapshot: ${process.env.METRICS_SNAPSHOT_FILE}`);
+  }
+
   // Initialize Voice Catalog on startup
   try {
     const catalogs = await loadAllCatalogs();
@@ -680,7 +697,23 @@ app.get('/sessions', (req, res) => {
     const sessions = sessionStore.getAllSessions();
     res.json({
       success: true,
-      sessions
+      sessions,
+      // Per-session memory held by rolling accumulatedFinals buffers (solo mode)
+      transcriptBuffers: getTranscriptBufferStats(),
+      // Suppressed duplicate finals and the translation calls / broadcast bytes they saved
+      finalDedup: getFinalDedupStats(),
+      // Final translations started from stable partials: hits, wasted calls, latency taken off the final path
+      speculativeTranslation: getSpeculationStats(),
+      // Worker-thread pool for final merge/cleanup: queue depth, fallbacks to the main thread, restarts
+      finalMerge: getFinalMergeStats(),
+      // Finals batched across sessions per model + language pair: requests saved, fallbacks, expired items
+      finalTranslationBatching: getTranslationBatcherStats(),
+      // Listener fan-out: shared serialization, slow listeners, queued / collapsed / dropped messages
+      listenerFanout: getListenerFanoutStats(),
+      // Synthesized audio cache: hits per tier, shared in-flight syntheses, bytes, evictions
+      ttsAudioCache: getTtsAudioCacheStats(),
+      // Stable-prefix partial translation cache (hits, prefix hits, bytes saved)
+      partialTranslationCache: partialTranslationWorker.getCacheStats()
     });
   } catch (error) {
     res.status(500).json({
@@ -690,6 +723,48 @@ app.get('/sessions', (req, res) => {
   }
 });
 
+/**
+ * GET /metrics
+ * Final-path histograms and counters in Prometheus text format
+ * GET /metrics.json
+ * The same metrics as a JSON snapshot (read by tools/metrics_report)
+ * SECURITY: Requires API key authentication
+ */
+app.get(['/metrics', '/metrics.json'], (req, res) => {
+  const apiKey = req.headers['x-api-key'] || req.query.apiKey;
+  if (!apiKey || !apiAuth.isValidKey(apiKey)) {
+    return res.status(401).json({
+      success: false,
+      error: 'Authentication required. Provide valid API key via X-API-Key header or ?apiKey=xxx'
+    });
+  }
+
+  if (req.path === '/metrics.json') {
+    return res.json(getMetricsSnapshot());
+  }
+  res.set('Content-Type', 'text/plain; version=0.0.4; charset=utf-8');
+  res.send(renderPrometheus());
+});
+
+/**
+ * POST /merge-logs/flush
+ * Print the merge-path ring buffers (entries below the log level) to the server log
+ * Optional ?sessionId=xxx flushes a single session
+ * SECURITY: Requires API key authentication
+ */
+app.post('/merge-logs/flush', (req, res) => {
+  const apiKey = req.headers['x-api-key'] || req.query.apiKey;
+  if (!apiKey || !apiAuth.isValidKey(apiKey)) {
+    return res.status(401).json({
+      success: false,
+      error: 'Authentication required. Provide valid API key via X-API-Key header or ?apiKey=xxx'
+    });
+  }
+
+  const flushed = flushMergeLogs(req.query.sessionId || null);
+  res.json({ success: true, flushed });
+});
+
 // Health check endpoint
 app.get('/health', (req, res) => {
   res.json({
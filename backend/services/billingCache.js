@@ -0,0 +1,171 @@
+/**
+ * Billing Cache — Stripe customer IDs and portal sessions
+ * 
+ * Every billing endpoint resolves the church's Stripe customer (a DB read plus
+ * a possible Stripe customer create) before creating a Stripe session. When
+ * churches hit the billing page at month end, each click repeated all of it.
+ * 
+ * - Customer IDs are cached per church, and concurrent lookups for the same
+ *   church share one in-flight promise (single-flight), so a burst of clicks
+ *   does one DB read and creates at most one Stripe customer
+ * - Billing Portal sessions are reused for a short window per church + flow
+ *   (Stripe portal URLs stay valid for several minutes), and concurrent
+ *   creates for the same key are deduplicated the same way
+ * - Failures are never cached
+ * 
+ * Env vars:
+ *   BILLING_CUSTOMER_CACHE_TTL_MS - Customer ID cache TTL (default 10 minutes, 0 disables)
+ *   BILLING_PORTAL_REUSE_MS       - Portal session reuse window (default 60 seconds, 0 disables)
+ * 
+ * @module services/billingCache
+ */
+
+function readMs(name, fallback) {
+    const value = parseInt(process.env[name], 10);
+    return Number.isFinite(value) && value >= 0 ? value : fallback;
+}
+
+const CUSTOMER_CACHE_TTL_MS = readMs('BILLING_CUSTOMER_CACHE_TTL_MS', 10 * 60 * 1000);
+const PORTAL_REUSE_MS = readMs('BILLING_PORTAL_REUSE_MS', 60 * 1000);
+const MAX_ENTRIES = 5000;
+
+const customerCache = new Map(); // churchId -> { customerId, timestamp }
+const portalCache = new Map(); // "churchId:flow" -> { session, timestamp }
+const inflight = new Map(); // "customer:churchId" | "portal:churchId:flow" -> Promise
+
+// Bumped by clearBillingCache so loads that started before a clear don't repopulate it
+let generation = 0;
+
+const stats = {
+    customerHits: 0,
+    customerLoads: 0,
+    portalHits: 0,
+    portalCreates: 0,
+    joined: 0, // Requests that waited on an identical in-flight call instead of making their own
+    errors: 0,
+};
+
+function getFresh(cache, key, ttlMs) {
+    if (ttlMs <= 0) return null;
+    const cached = cache.get(key);
+    if (cached && Date.now() - cached.timestamp < ttlMs) {
+        return cached;
+    }
+    if (cached) cache.delete(key);
+    return null;
+}
+
+function setBounded(cache, key, entry) {
+    cache.delete(key);
+    cache.set(key, entry);
+    if (cache.size > MAX_ENTRIES) {
+        cache.delete(cache.keys().next().value);
+    }
+}
+
+/**
+ * Run `load` once per key at a time; concurrent callers share its promise
+ */
+function singleFlight(key, load) {
+    const pending = inflight.get(key);
+    if (pending) {
+        stats.joined++;
+        return pending;
+    }
+
+    const promise = Promise.resolve()
+        .then(load)
+        .catch((err) => {
+            stats.errors++;
+            throw err;
+        })
+        .finally(() => inflight.delete(key));
+    inflight.set(key, promise);
+    return promise;
+}
+
+/**
+ * Get the church's Stripe customer ID, loading it at most once per burst
+ * 
+ * @param {string} churchId - Church UUID
+ * @param {(churchId: string) => Promise<string>} load - Looks up or creates the customer
+ * @returns {Promise<string>} Stripe customer ID (cus_xxx)
+ */
+export async function getStripeCustomerId(churchId, load) {
+    const cached = getFresh(customerCache, churchId, CUSTOMER_CACHE_TTL_MS);
+    if (cached) {
+        stats.customerHits++;
+        return cached.customerId;
+    }
+
+    const startGeneration = generation;
+    return singleFlight(`customer:${churchId}`, async () => {
+        stats.customerLoads++;
+        const customerId = await load(churchId);
+        if (CUSTOMER_CACHE_TTL_MS > 0 && startGeneration === generation) {
+            setBounded(customerCache, churchId, { customerId, timestamp: Date.now() });
+        }
+        return customerId;
+    });
+}
+
+/**
+ * Get a Billing Portal session for the church, reusing a recent one
+ * 
+ * @param {string} churchId - Church UUID
+ * @param {string} [flow] - Portal flow (e.g. 'subscription_update'), part of the reuse key
+ * @param {() => Promise<Object>} create - Creates a new Stripe portal session
+ * @returns {Promise<Object>} Stripe portal session ({ id, url, ... })
+ */
+export async function getPortalSession(churchId, flow, create) {
+    const key = `${churchId}:${flow || 'default'}`;
+    const cached = getFresh(portalCache, key, PORTAL_REUSE_MS);
+    if (cached) {
+        stats.portalHits++;
+        return cached.session;
+    }
+
+    const startGeneration = generation;
+    return singleFlight(`portal:${key}`, async () => {
+        stats.portalCreates++;
+        const session = await create();
+        if (PORTAL_REUSE_MS > 0 && startGeneration === generation) {
+            setBounded(portalCache, key, { session, timestamp: Date.now() });
+        }
+        return session;
+    });
+}
+
+/**
+ * Clears cached billing data (e.g. when a subscription changes)
+ * @param {string} [churchId] - Optional specific church to clear, or all if omitted
+ */
+export function clearBillingCache(churchId) {
+    generation++;
+    if (!churchId) {
+        customerCache.clear();
+        portalCache.clear();
+        return;
+    }
+    customerCache.delete(churchId);
+    for (const key of portalCache.keys()) {
+        if (key.startsWith(`${churchId}:`)) {
+            portalCache.delete(key);
+        }
+    }
+}
+
+/**
+ * Cache counters for diagnostics
+ * @returns {Object}
+ */
+export function getBillingCacheStats() {
+    return {
+        ...stats,
+        customers: customerCache.size,
+        portalSessions: portalCache.size,
+        inflight: inflight.size,
+        customerCacheTtlMs: CUSTOMER_CACHE_TTL_MS,
+        portalReuseMs: PORTAL_REUSE_MS,
+    };
+}
@@ -6,12 +6,32 @@
  * Required env vars:
  *   STRIPE_SECRET_KEY - Stripe secret API key (sk_test_... or sk_live_...)
  * 
+ * Optional env vars:
+ *   STRIPE_API_BASE_URL - Send API calls to a local Stripe stand-in instead
+ *                         (e.g. http://127.0.0.1:12111 for stripe-mock or the billing benchmark)
+ * 
  * @module services/stripe
  */
 
 import Stripe from 'stripe';
 
 const STRIPE_SECRET_KEY = process.env.STRIPE_SECRET_KEY;
+const STRIPE_API_BASE_URL = process.env.STRIPE_API_BASE_URL;
+
+/**
+ * Host/port/protocol overrides for STRIPE_API_BASE_URL
+ * @returns {Object} Stripe config fields (empty when unset)
+ */
+function apiEndpointConfig() {
+    if (!STRIPE_API_BASE_URL) return {};
+    const url = new URL(STRIPE_API_BASE_URL);
+    console.log(`[Stripe] Using API endpoint ${url.origin}`);
+    return {
+        host: url.hostname,
+        port: url.port || (url.protocol === 'http:' ? 80 : 443),
+        protocol: url.protocol.replace(':', ''),
+    };
+}
 
 if (!STRIPE_SECRET_KEY) {
     console.warn('[Stripe] ⚠️ STRIPE_SECRET_KEY not set — billing features disabled');
@@ -24,6 +44,7 @@ const stripe = STRIPE_SECRET_KEY
             name: 'Exbabel',
             version: '1.0.0',
         },
+        ...apiEndpointConfig(),
     })
     : null;
 
@@ -13,6 +13,7 @@
  */
 
 import { supabaseAdmin } from './supabaseAdmin.js';
+import { createListenerFanout } from './utils/listenerFanout.js';
 
 // DEBUG: Gate high-frequency broadcast logging to prevent I/O overhead
 // Set DEBUG_BROADCAST=1 to enable verbose broadcast logs
@@ -61,7 +62,8 @@ class SessionStore {
       createdAt: Date.now(),
       lastActivity: Date.now(),
       isActive: false,
-      voicePreferences: new Map() // Map<targetLang, voiceId> - Last Write Wins for shared channel
+      voicePreferences: new Map(), // Map<targetLang, voiceId> - Last Write Wins for shared channel
+      fanout: null // ListenerFanout, created on first broadcast
     };
 
     // Persist to DB (if churchId is known)
@@ -195,7 +197,8 @@ class SessionStore {
         createdAt: new Date(data.created_at).getTime(),
         lastActivity: Date.now(),
         isActive: false, // Host needs to reconnect to activate
-        voicePreferences: new Map()
+        voicePreferences: new Map(),
+        fanout: null
       };
 
       this.sessions.set(data.id, sessionData);
@@ -229,8 +232,9 @@ class SessionStore {
 
   /**
    * Add a listener to a session
+   * partialEncoding 'delta' opts the listener in to delta-encoded partials (utils/partialDelta.js)
    */
-  addListener(sessionId, socketId, socket, targetLang, userName = 'Anonymous') {
+  addListener(sessionId, socketId, socket, targetLang, userName = 'Anonymous', partialEncoding = null) {
     const session = this.sessions.get(sessionId);
     if (!session) {
       throw new Error('Session not found');
@@ -241,6 +245,7 @@ class SessionStore {
       socket,
       targetLang,
       userName,
+      partialEncoding: partialEncoding === 'delta' ? 'delta' : null,
       joinedAt: Date.now()
     };
 
@@ -252,6 +257,11 @@ class SessionStore {
     }
     session.languageGroups.get(targetLang).add(socketId);
 
+    // The group's next partial is a keyframe, so the new listener has a base for the deltas after it
+    if (listenerData.partialEncoding) {
+      session.fanout?.resetPartialEncoding(targetLang);
+    }
+
     session.lastActivity = Date.now();
 
     console.log(`[SessionStore] Listener ${userName} joined session ${session.sessionCode} (${targetLang}) - Total: ${session.listeners.size}`);
@@ -289,6 +299,7 @@ class SessionStore {
       // Clean up empty language groups
       if (oldLangGroup.size === 0) {
         session.languageGroups.delete(oldTargetLang);
+        session.fanout?.resetPartialEncoding(oldTargetLang);
       }
     }
 
@@ -301,6 +312,10 @@ class SessionStore {
     }
     session.languageGroups.get(newTargetLang).add(socketId);
 
+    if (listener.partialEncoding) {
+      session.fanout?.resetPartialEncoding(newTargetLang);
+    }
+
     session.lastActivity = Date.now();
 
     console.log(`[SessionStore] Listener ${listener.userName} moved to language group ${newTargetLang}`);
@@ -323,6 +338,7 @@ class SessionStore {
         langGroup.delete(socketId);
         if (langGroup.size === 0) {
           session.languageGroups.delete(listener.targetLang);
+          session.fanout?.resetPartialEncoding(listener.targetLang);
         }
       }
 
@@ -359,18 +375,23 @@ class SessionStore {
   /**
    * Broadcast message to all listeners in a session.
    *
-   * SCALING: Uses batched micro-yielding to prevent the event loop from being
-   * blocked by N synchronous ws.send() calls when listener count is large.
-   * For small groups (≤8) we send immediately to minimise latency.
-   * For larger groups we send 10 at a time, yielding via setImmediate between
-   * batches so incoming audio chunks and partial results aren't starved.
+   * SCALING: The message is serialized once and handed to the session's
+   * ListenerFanout (utils/listenerFanout.js), which sends small groups (≤8)
+   * immediately and larger groups 10 at a time, yielding via setImmediate
+   * between batches so incoming audio chunks and partial results aren't starved.
+   *
+   * Backpressure: listeners whose socket has more than the high-water mark
+   * buffered get a bounded per-listener queue instead of more writes; superseded
+   * partials are collapsed there, so one slow client never holds up the rest.
    *
-   * Backpressure guard: listeners whose kernel send buffer exceeds 1 MB are
-   * skipped to prevent one slow client from stalling the whole loop.
+   * Listeners that opted in to delta-encoded partials get them encoded once per
+   * language group.
+   *
+   * @returns {number} Number of listeners the message was sent or queued to
    */
   broadcastToListeners(sessionId, message, targetLang = null) {
     const session = this.sessions.get(sessionId);
-    if (!session) return;
+    if (!session) return 0;
 
     let listeners;
     if (targetLang) {
@@ -381,62 +402,20 @@ class SessionStore {
       listeners = Array.from(session.listeners.values());
     }
 
-    if (listeners.length === 0) return;
-
-    // Stringify once — never inside the loop
-    const messageStr = JSON.stringify(message);
-    const BACKPRESSURE_LIMIT = 1024 * 1024; // 1 MB
-    const BATCH_SIZE = 10;
-    let sentCount = 0;
-
-    if (listeners.length <= 8) {
-      // Small group: send immediately for minimum latency
-      for (const listener of listeners) {
-        if (listener.socket.readyState !== 1) continue;
-        if (listener.socket.bufferedAmount > BACKPRESSURE_LIMIT) {
-          console.warn(`[SessionStore] ⚠️ Skipping slow listener (bufferedAmount=${listener.socket.bufferedAmount}) for ${targetLang || 'all'}`);
-          continue;
-        }
-        try {
-          listener.socket.send(messageStr);
-          sentCount++;
-
-          // TEMP DEBUG: Log exact payload sent to ES listeners for "Y grito"
-          if (DEBUG_BROADCAST && targetLang === 'es' && message?.hasTranslation && (message?.translatedText || '').includes('Y grito')) {
-            console.log('[ES_PAYLOAD_TO_LISTENER]', JSON.stringify(message));
-          }
-        } catch (error) {
-          console.error(`[SessionStore] Error sending to listener:`, error.message);
-        }
-      }
-      if (DEBUG_BROADCAST) console.log(`[SessionStore] Broadcast to ${sentCount}/${listeners.length} listeners${targetLang ? ` (${targetLang})` : ''}`);
-    } else {
-      // Large group: send in batches, yield between batches
-      let i = 0;
-      const processBatch = () => {
-        const end = Math.min(i + BATCH_SIZE, listeners.length);
-        for (; i < end; i++) {
-          const listener = listeners[i];
-          if (listener.socket.readyState !== 1) continue;
-          if (listener.socket.bufferedAmount > BACKPRESSURE_LIMIT) {
-            console.warn(`[SessionStore] ⚠️ Skipping slow listener (bufferedAmount=${listener.socket.bufferedAmount}) for ${targetLang || 'all'}`);
-            continue;
-          }
-          try {
-            listener.socket.send(messageStr);
-            sentCount++;
-          } catch (error) {
-            console.error(`[SessionStore] Error sending to listener:`, error.message);
-          }
-        }
-        if (i < listeners.length) {
-          setImmediate(processBatch);
-        } else if (DEBUG_BROADCAST) {
-          console.log(`[SessionStore] Broadcast (batched) to ${sentCount}/${listeners.length} listeners${targetLang ? ` (${targetLang})` : ''}`);
-        }
-      };
-      processBatch();
+    if (listeners.length === 0) return 0;
+
+    if (!session.fanout) {
+      session.fanout = createListenerFanout({ label: session.sessionCode });
     }
+    const count = session.fanout.broadcast(listeners, message);
+
+    // TEMP DEBUG: Log exact payload sent to ES listeners for "Y grito"
+    if (DEBUG_BROADCAST && targetLang === 'es' && message?.hasTranslation && (message?.translatedText || '').includes('Y grito')) {
+      console.log('[ES_PAYLOAD_TO_LISTENER]', JSON.stringify(message));
+    }
+    if (DEBUG_BROADCAST) console.log(`[SessionStore] Broadcast to ${count} listeners${targetLang ? ` (${targetLang})` : ''}`);
+
+    return count;
   }
 
   updateSourceLanguage(sessionId, sourceLang) {
@@ -547,12 +526,16 @@ class SessionStore {
           : 'The session has ended'
       });
 
+      // Deliver the notice (and anything still queued for slow listeners) before closing
+      session.fanout?.flush();
+
       // Close all listener connections
       session.listeners.forEach(listener => {
         if (listener.socket.readyState === 1) {
           listener.socket.close();
         }
       });
+      session.fanout?.dispose();
 
       this.sessions.delete(sessionId);
       return true;
@@ -660,7 +643,9 @@ class SessionStore {
       ),
       createdAt: session.createdAt,
       lastActivity: session.lastActivity,
-      duration: Date.now() - session.createdAt
+      duration: Date.now() - session.createdAt,
+      // Listener send queues and backpressure (null until the first broadcast)
+      fanout: session.fanout ? session.fanout.getStats() : null
     };
   }
 
@@ -16,6 +16,7 @@ import { partialTranslationWorker, finalTranslationWorker } from './translationW
 import { realtimePartialTranslationWorker, realtimeFinalTranslationWorker } from './translationWorkersRealtime.js';
 import { normalizePunctuation } from './transcriptionCleanup.js';
 import { CoreEngine } from '../core/engine/coreEngine.js';
+import { SEGMENT_ASSEMBLY_CONSTANTS } from '../core/shared/types/config.js';
 import { mergeRecoveryText, wordsAreRelated } from './utils/recoveryMerge.js';
 import { deduplicatePartialText } from '../core/utils/partialDeduplicator.js';
 import { shouldEmitPartial, shouldEmitFinal, setLastEmittedText, clearLastEmittedText, hasAlphaNumeric } from '../core/utils/emitGuards.js';
@@ -29,6 +30,8 @@ import { checkQuotaLimit, createQuotaEvent } from './usage/quotaEnforcement.js';
 import { supabaseAdmin } from './supabaseAdmin.js';
 import crypto from 'crypto';
 import { getTranscriptionLanguageCode, getGoogleSttAltCode, isTranscriptionSupported } from './languageConfig.js';
+import { createPartialEncoder } from './utils/partialDelta.js';
+import { observePartialFinalGap, recordMergeEvent } from './utils/metrics.js';
 // PHASE 7: Using CoreEngine which coordinates all extracted engines
 // Individual engines are still accessible via coreEngine properties if needed
 
@@ -43,6 +46,7 @@ export async function handleSoloMode(clientWs) {
   let legacySessionId = `session_${Date.now()}`;
   let currentVoiceId = null; // Track selected voice ID
   let currentTtsMode = 'unary'; // Track TTS mode: 'streaming' or 'unary' (default unary to prevent duplicates)
+  let partialEncoder = null; // Delta encoder for partials (opt-in via init { partialEncoding: 'delta' })
 
   // MULTI-SESSION OPTIMIZATION: Track this session for fair-share allocation
   // This allows the rate limiter to distribute capacity fairly across sessions
@@ -337,7 +341,8 @@ export async function handleSoloMode(clientWs) {
     }
 
     if (clientWs && clientWs.readyState === WebSocket.OPEN) {
-      clientWs.send(JSON.stringify(message));
+      // Opt-in delta encoding: partials go out as (prefix length, suffix) against the previous partial
+      clientWs.send(JSON.stringify(partialEncoder ? partialEncoder.encode(message) : message));
     }
 
     return seqId;
@@ -490,6 +495,9 @@ export async function handleSoloMode(clientWs) {
           currentTargetLang = message.targetLang || 'es';
           usePremiumTier = message.tier === 'premium';
 
+          // Partial wire format: 'delta' opts in to delta-encoded partials (re-init starts from a keyframe)
+          partialEncoder = createPartialEncoder(message.partialEncoding);
+
           // Update voice preference if provided
           if (message.voiceId) {
             currentVoiceId = message.voiceId;
@@ -890,7 +898,8 @@ export async function handleSoloMode(clientWs) {
 
                     // Always check for duplicates if we have tracking data (not just within time window)
                     // This catches duplicates even if they arrive outside the continuation window
-                    if (lastSentOriginalText) {
+                    // Timeline segments skip it: the assembler never commits the same audio twice
+                    if (lastSentOriginalText && !options.timelineSegment) {
                       const lastSentOriginalNormalized = lastSentOriginalText.replace(/\s+/g, ' ').toLowerCase();
                       const lastSentFinalNormalized = lastSentFinalText.replace(/\s+/g, ' ').toLowerCase();
                       const timeSinceLastFinal = Date.now() - lastSentFinalTime;
@@ -1501,6 +1510,32 @@ export async function handleSoloMode(clientWs) {
                 })();
               };
 
+              // WORD TIMELINE (STT_WORD_TIMELINE): finals are committed by audio time in
+              // coreEngine's segment assembler and sent as they commit, without the
+              // partial-extension wait and forced-final recovery of the string path
+              let segmentFlushTimeout = null;
+              let segmentLanguages = {};
+              const commitTimelineSegments = (segments) => {
+                for (const segment of segments) {
+                  recordMergeEvent('SoloMode', 'timeline_segment');
+                  console.log(`[SoloMode] 🧩 Timeline segment committed (${segment.reason}, ${segment.startMs}-${segment.endMs}ms): "${segment.text.substring(0, 80)}"`);
+                  processFinalText(segment.text, { forceFinal: segment.isForced, timelineSegment: true, ...segmentLanguages });
+                }
+              };
+              // Open final words wait for the next final to show a boundary; if no result
+              // arrives for IDLE_FLUSH_MS the speaker has paused, so commit them
+              const armSegmentFlush = () => {
+                clearTimeout(segmentFlushTimeout);
+                segmentFlushTimeout = null;
+                if (!coreEngine.hasOpenSegment()) return;
+                segmentFlushTimeout = setTimeout(() => {
+                  segmentFlushTimeout = null;
+                  if (clientWs.readyState !== WebSocket.OPEN) return;
+                  commitTimelineSegments(coreEngine.flushSegments());
+                }, SEGMENT_ASSEMBLY_CONSTANTS.IDLE_FLUSH_MS);
+              };
+              clientWs.once('close', () => clearTimeout(segmentFlushTimeout));
+
               // Set up result callback - handles both partials and finals
               speechStream.onResult(async (transcriptText, isPartial, meta = {}) => {
                 if (!clientWs || clientWs.readyState !== WebSocket.OPEN) return;
@@ -1511,6 +1546,12 @@ export async function handleSoloMode(clientWs) {
                   return;
                 }
 
+                // Word-timeline segment assembly (results carry meta.timeline with STT_WORD_TIMELINE).
+                // Forced finals have no timeline but close the assembler's open words
+                const timelineFinal = !isPartial && (Boolean(meta.timeline) || (meta.forced === true && speechStream.wordTimeline));
+                const timelineSegments = coreEngine.assembleResult(transcriptText, isPartial, meta);
+                if (meta.timeline || timelineFinal) armSegmentFlush();
+
                 // 🧪 AUDIO BUFFER TEST: Log buffer status on every result
                 const audioBufferStatus = speechStream.getAudioBufferStatus();
                 console.log(`[AUDIO_BUFFER_TEST] 🎵 Buffer Status:`, {
@@ -2594,6 +2635,13 @@ export async function handleSoloMode(clientWs) {
                       }, delayMs);
                     }
                   }
+                } else if (timelineFinal) {
+                  // Word-timeline final: send the segments it completed; the partial tail starts over
+                  segmentLanguages = { sourceLang: effectiveSource, targetLang: effectiveTarget };
+                  if (meta.forced) recordMergeEvent('SoloMode', 'forced_final');
+                  partialTracker.reset();
+                  syncPartialVariables();
+                  commitTimelineSegments(timelineSegments);
                 } else {
                   const isForcedFinal = meta?.forced === true;
                   // Final transcript from Google Speech
@@ -2608,9 +2656,11 @@ export async function handleSoloMode(clientWs) {
                   const latestPartialTimeSnapshot = snapshot.latestTime;
 
                   console.log(`[SoloMode] 📸 SNAPSHOT: longest=${longestPartialSnapshot?.length || 0} chars, latest=${latestPartialSnapshot?.length || 0} chars`);
+                  observePartialFinalGap('SoloMode', latestPartialTimeSnapshot);
 
                   if (isForcedFinal) {
                     console.warn(`[SoloMode] ⚠️ Forced FINAL due to stream restart (${transcriptText.length} chars)`);
+                    recordMergeEvent('SoloMode', 'forced_final');
                     realtimeTranslationCooldownUntil = Date.now() + TRANSLATION_RESTART_COOLDOWN_MS;
 
                     // PHASE 6: Use Forced Commit Engine to clear existing buffer
@@ -3965,6 +4015,7 @@ export async function handleSoloMode(clientWs) {
           try {
             // Import TTS modules
             const { getTtsServiceForProvider } = await import('./tts/ttsService.js');
+            const { synthesizeUnaryCached } = await import('./tts/ttsAudioCache.js');
             const { validateTtsRequest } = await import('./tts/ttsPolicy.js');
             const { canSynthesize } = await import('./tts/ttsQuota.js');
             const { recordUsage } = await import('./tts/ttsUsage.js');
@@ -4161,7 +4212,7 @@ export async function handleSoloMode(clientWs) {
 
             // Synthesize audio
             const ttsService = getTtsServiceForProvider(route.provider);
-            const response = await ttsService.synthesizeUnary(ttsRequest, route);
+            const response = await synthesizeUnaryCached(ttsService, ttsRequest, route);
 
             // Send audio response
             if (clientWs.readyState === WebSocket.OPEN) {
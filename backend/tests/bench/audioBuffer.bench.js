@@ -0,0 +1,205 @@
+/**
+ * Audio Buffer Benchmark
+ *
+ * Drives many concurrent streams through the rolling recovery buffer on a
+ * simulated clock: a chunk per stream every --chunk-ms of LINEAR16 audio, the
+ * 750ms/600ms reads the handlers make on every final, and a capture-window read
+ * for a share of finals (forced-commit recovery). Runs AudioBufferManager (PCM
+ * ring) and the previous chunk-array buffer (legacyAudioBuffer.js) on the same
+ * workload and compares the bytes every read returns - any difference fails the run.
+ *
+ * Run with (from backend/): node --expose-gc tests/bench/audioBuffer.bench.js [options]
+ *
+ *   --streams N        Concurrent streams (default: 300)
+ *   --seconds N        Simulated seconds of audio per stream (default: 120)
+ *   --chunk-ms N       Audio per chunk (default: 170, a 4096-sample capture block at 24 kHz)
+ *   --sample-rate N    Sample rate in Hz (default: 24000)
+ *   --final-every-ms N Time between finals per stream (default: 3000)
+ *   --recovery-rate X  Share of finals that also read the 2200ms capture window (default: 0.2)
+ *   --label NAME       Label stored with the results (default: run)
+ *   --out DIR          Results directory (default: tests/bench/results)
+ */
+
+import crypto from 'crypto';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { parseArgs } from 'util';
+import { PerformanceObserver } from 'perf_hooks';
+import { AudioBufferManager } from '../../audioBufferManager.js';
+import { LegacyAudioBuffer } from './legacyAudioBuffer.js';
+import { createRandom } from './fakes/fakeOpenAI.js';
+import { gitInfo, writeResults } from './benchResults.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const BACKEND_DIR = path.resolve(__dirname, '..', '..');
+
+const BUFFER_DURATION_MS = 2500; // As googleSpeechStream.js configures it
+const CAPTURE_WINDOW_MS = 2200;
+const LEGACY_CLEANUP_MS = 500;
+const silentLogger = { info() {}, warn() {}, debug() {}, error() {} };
+
+function heapBytes() {
+    global.gc?.();
+    const usage = process.memoryUsage();
+    return usage.heapUsed + usage.arrayBuffers;
+}
+
+/**
+ * Run the workload against one implementation
+ * @param {string} name - 'legacy' | 'ring'
+ * @param {Object} options - Bench options
+ * @param {Buffer[]} pool - Chunk payloads
+ * @param {Uint32Array} reads - Digest of every read: filled by the legacy run, compared against by the ring run
+ * @returns {Promise<Object>} - Mode report
+ */
+async function runMode(name, options, pool, reads) {
+    const random = createRandom(7);
+    const realNow = Date.now;
+    let clock = 1_700_000_000_000;
+    Date.now = () => clock;
+
+    const gc = { count: 0, ms: 0 };
+    const observer = new PerformanceObserver((list) => {
+        for (const entry of list.getEntries()) {
+            gc.count++;
+            gc.ms += entry.duration;
+        }
+    });
+    observer.observe({ entryTypes: ['gc'] });
+
+    const before = heapBytes();
+    const buffers = Array.from({ length: options.streams }, () => name === 'legacy'
+        ? new LegacyAudioBuffer({ bufferDurationMs: BUFFER_DURATION_MS })
+        : new AudioBufferManager({ bufferDurationMs: BUFFER_DURATION_MS, sampleRate: options.sampleRate, logger: silentLogger }));
+
+    let readIndex = 0;
+    let mismatches = 0;
+    let bytesRead = 0;
+    let busyMs = 0; // Time inside buffer calls only (digests and bookkeeping excluded)
+    const steps = Math.floor(options.seconds * 1000 / options.chunkMs);
+    const finalEverySteps = Math.max(1, Math.round(options.finalEveryMs / options.chunkMs));
+    const cleanupEverySteps = Math.max(1, Math.round(LEGACY_CLEANUP_MS / options.chunkMs));
+
+    for (let step = 0; step < steps; step++) {
+        clock += options.chunkMs;
+        for (let s = 0; s < buffers.length; s++) {
+            const buffer = buffers[s];
+            const chunk = pool[(step + s) % pool.length];
+            let started = performance.now();
+            if (name === 'legacy') buffer.addChunk(chunk, { chunkId: `c${step}`, source: 'client' }, clock);
+            else buffer.addChunk(chunk, { chunkId: `c${step}`, source: 'client' });
+            busyMs += performance.now() - started;
+
+            // Finals are staggered across streams
+            if ((step + s) % finalEverySteps !== 0) continue;
+            const windows = [750, 600];
+            if (random() < options.recoveryRate) windows.push(CAPTURE_WINDOW_MS);
+            for (const windowMs of windows) {
+                started = performance.now();
+                const audio = Buffer.concat(buffer.getRecentAudio(windowMs, clock));
+                busyMs += performance.now() - started;
+                bytesRead += audio.length;
+                const digest = crypto.createHash('sha1').update(audio).digest().readUInt32LE(0);
+                if (name === 'legacy') {
+                    reads[readIndex] = digest;
+                } else if (digest !== reads[readIndex]) {
+                    mismatches++;
+                }
+                readIndex++;
+            }
+        }
+        if (name === 'legacy' && step % cleanupEverySteps === 0) {
+            const started = performance.now();
+            for (const buffer of buffers) buffer.cleanupExpiredChunks(clock);
+            busyMs += performance.now() - started;
+        }
+    }
+
+    // GC entries are delivered asynchronously, after a timer turn
+    await new Promise(resolve => setTimeout(resolve, 20));
+    observer.disconnect();
+
+    // Memory held by the buffers at the end of the run
+    const retained = heapBytes() - before;
+    if (name !== 'legacy') buffers.forEach(buffer => buffer.destroy());
+    Date.now = realNow;
+
+    return {
+        chunks: steps * options.streams,
+        reads: readIndex,
+        bytesRead,
+        mismatches,
+        elapsedMs: Math.round(busyMs),
+        usPerChunk: Number((busyMs * 1000 / (steps * options.streams)).toFixed(2)),
+        gcCount: gc.count,
+        gcMs: Math.round(gc.ms),
+        retainedBytesPerStream: Math.round(retained / options.streams)
+    };
+}
+
+function printMode(name, report) {
+    console.log(`\n${name}: ${report.chunks} chunks, ${report.reads} reads (${Math.round(report.bytesRead / 1e6)} MB)`);
+    console.log(`  ${report.elapsedMs}ms total, ${report.usPerChunk}µs per chunk`);
+    console.log(`  GC: ${report.gcCount} collections, ${report.gcMs}ms`);
+    console.log(`  retained per stream: ${Math.round(report.retainedBytesPerStream / 1024)} KB`);
+}
+
+async function main() {
+    const { values } = parseArgs({
+        options: {
+            streams: { type: 'string', default: '300' },
+            seconds: { type: 'string', default: '120' },
+            'chunk-ms': { type: 'string', default: '170' },
+            'sample-rate': { type: 'string', default: '24000' },
+            'final-every-ms': { type: 'string', default: '3000' },
+            'recovery-rate': { type: 'string', default: '0.2' },
+            label: { type: 'string', default: 'run' },
+            out: { type: 'string', default: path.join(BACKEND_DIR, 'tests', 'bench', 'results') }
+        }
+    });
+
+    const options = {
+        streams: parseInt(values.streams, 10),
+        seconds: parseInt(values.seconds, 10),
+        chunkMs: parseInt(values['chunk-ms'], 10),
+        sampleRate: parseInt(values['sample-rate'], 10),
+        finalEveryMs: parseInt(values['final-every-ms'], 10),
+        recoveryRate: parseFloat(values['recovery-rate'])
+    };
+    if (!global.gc) {
+        console.warn('[Bench] Run with --expose-gc for stable retained-memory numbers');
+    }
+
+    // Distinct payloads so a misplaced byte range cannot compare equal
+    const random = createRandom(1);
+    const chunkBytes = Math.round(options.sampleRate * options.chunkMs / 1000) * 2;
+    const pool = Array.from({ length: 64 }, () => {
+        const chunk = Buffer.alloc(chunkBytes);
+        for (let i = 0; i < chunkBytes; i++) chunk[i] = Math.floor(random() * 256);
+        return chunk;
+    });
+    console.log(`[Bench] ${options.streams} streams × ${options.seconds}s, ${chunkBytes}-byte chunks every ${options.chunkMs}ms`);
+
+    // Upper bound on reads: every stream finals every step, with a recovery read
+    const steps = Math.floor(options.seconds * 1000 / options.chunkMs);
+    const reads = new Uint32Array(options.streams * steps * 3);
+    const modes = { legacy: await runMode('legacy', options, pool, reads) };
+    modes.ring = await runMode('ring', options, pool, reads);
+    printMode('legacy', modes.legacy);
+    printMode('ring', modes.ring);
+    console.log(`\n  mismatches: ${modes.ring.mismatches}`);
+
+    const report = {
+        label: values.label,
+        createdAt: new Date().toISOString(),
+        git: gitInfo(BACKEND_DIR),
+        options,
+        modes
+    };
+    const outPath = writeResults(values.out, 'audio-buffer', report);
+    console.log(`\n[Bench] Results written to ${outPath}`);
+
+    process.exit(modes.ring.mismatches > 0 ? 1 : 0);
+}
+
+main();
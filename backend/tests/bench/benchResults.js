@@ -0,0 +1,77 @@
+/**
+ * Shared helpers for benchmark runners: latency summaries and result files
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { execSync } from 'child_process';
+
+function percentile(sorted, p) {
+    if (sorted.length === 0) return null;
+    const rank = Math.ceil((p / 100) * sorted.length);
+    return sorted[Math.min(sorted.length, Math.max(1, rank)) - 1];
+}
+
+/**
+ * Nearest-rank summary of a list of durations
+ * @param {number[]} values - Durations in ms
+ * @returns {Object} - { count, min, mean, p50, p95, p99, max }
+ */
+function summarize(values) {
+    const sorted = [...values].sort((a, b) => a - b);
+    const sum = sorted.reduce((total, v) => total + v, 0);
+    return {
+        count: sorted.length,
+        min: sorted.length ? sorted[0] : null,
+        mean: sorted.length ? Math.round(sum / sorted.length) : null,
+        p50: percentile(sorted, 50),
+        p95: percentile(sorted, 95),
+        p99: percentile(sorted, 99),
+        max: sorted.length ? sorted[sorted.length - 1] : null
+    };
+}
+
+/**
+ * Current commit and whether the working tree has changes
+ * @param {string} cwd - Directory inside the repo
+ * @returns {Object|null}
+ */
+function gitInfo(cwd) {
+    try {
+        const commit = execSync('git rev-parse --short HEAD', { cwd }).toString().trim();
+        const dirty = execSync('git status --porcelain -- .', { cwd }).toString().trim().length > 0;
+        return { commit, dirty };
+    } catch (err) {
+        return null;
+    }
+}
+
+/**
+ * Write a report as <outDir>/<name>-<label>-<timestamp>.json
+ * @returns {string} - Path written
+ */
+function writeResults(outDir, name, report) {
+    fs.mkdirSync(outDir, { recursive: true });
+    const stamp = report.createdAt.replace(/[:.]/g, '-');
+    const outPath = path.join(outDir, `${name}-${report.label}-${stamp}.json`);
+    fs.writeFileSync(outPath, JSON.stringify(report, null, 2) + '\n');
+    return outPath;
+}
+
+/**
+ * "base → head (+x%)" for comparison output
+ */
+function formatDelta(base, head) {
+    if (base === null || head === null || base === undefined || head === undefined) return 'n/a';
+    const diff = head - base;
+    const pct = base !== 0 ? ` (${diff >= 0 ? '+' : ''}${((diff / base) * 100).toFixed(1)}%)` : '';
+    return `${base} → ${head}${pct}`;
+}
+
+export {
+    formatDelta,
+    gitInfo,
+    percentile,
+    summarize,
+    writeResults
+};
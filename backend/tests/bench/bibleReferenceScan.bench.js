@@ -0,0 +1,165 @@
+/**
+ * Bible Reference Scan Benchmark
+ *
+ * Runs the explicit-reference scan (book names, ordinals, chapter/verse numbers)
+ * over a sermon transcript corpus, the way the live path calls it, with the
+ * pre-ReferenceScanner implementation as the baseline:
+ *
+ * - window:   every final is appended to a sliding word window (BibleReferenceEngine)
+ *             and the whole window is scanned
+ * - partials: every final is replayed as growing partials, one word at a time,
+ *             and each partial is scanned
+ *
+ * Both implementations must return the same references for every call; any
+ * difference is counted and fails the run. No network or backend is needed.
+ *
+ * Run with (from backend/): node tests/bench/bibleReferenceScan.bench.js [options]
+ *
+ *   --corpus PATH      Replay-script JSONL (finals) or text file, one final per line
+ *                      (default: generated corpus)
+ *   --finals N         Finals to generate (default: 5000)
+ *   --seed N           Corpus seed (default: 1)
+ *   --window N         Window size in words (default: 100, as BibleReferenceEngine)
+ *   --label NAME       Label stored with the results (default: run)
+ *   --out DIR          Results directory (default: tests/bench/results)
+ */
+
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { parseArgs } from 'util';
+import { normalizeTranscript } from '../../../core/services/bibleReferenceNormalizer.js';
+import { ReferenceScanner } from '../../../core/services/referenceScanner.js';
+import { legacyDetectExplicitReferences } from './legacyReferenceScan.js';
+import { generateSermonCorpus, readCorpus } from './sermonCorpus.js';
+import { gitInfo, summarize, writeResults } from './benchResults.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const BACKEND_DIR = path.resolve(__dirname, '..', '..');
+
+function micros(start) {
+    return Math.round((performance.now() - start) * 1000);
+}
+
+/**
+ * Scan every input token list with both implementations
+ * @param {Array<string[]>} inputs - Token lists, in call order
+ * @returns {Object} - Mode report
+ */
+function runMode(inputs) {
+    const scanner = new ReferenceScanner();
+    const legacyUs = [];
+    const scannerUs = [];
+    let mismatches = 0;
+    let references = 0;
+    let tokens = 0;
+
+    for (const input of inputs) {
+        tokens += input.length;
+
+        let start = performance.now();
+        const expected = legacyDetectExplicitReferences(input);
+        legacyUs.push(micros(start));
+
+        start = performance.now();
+        const actual = scanner.update(input).references();
+        scannerUs.push(micros(start));
+
+        references += actual.length;
+        if (JSON.stringify(actual) !== JSON.stringify(expected)) {
+            mismatches++;
+            if (mismatches <= 3) {
+                console.error(`[Bench] Mismatch on "${input.join(' ').slice(0, 120)}"`);
+            }
+        }
+    }
+
+    const legacyTotal = legacyUs.reduce((sum, us) => sum + us, 0);
+    const scannerTotal = scannerUs.reduce((sum, us) => sum + us, 0);
+    return {
+        calls: inputs.length,
+        tokens,
+        references,
+        mismatches,
+        legacyUs: { ...summarize(legacyUs), totalMs: Math.round(legacyTotal / 1000) },
+        scannerUs: { ...summarize(scannerUs), totalMs: Math.round(scannerTotal / 1000) },
+        speedup: scannerTotal > 0 ? Number((legacyTotal / scannerTotal).toFixed(1)) : null,
+        scanner: scanner.getStats()
+    };
+}
+
+function windowInputs(corpus, windowSize) {
+    const inputs = [];
+    let window = [];
+    for (const final of corpus) {
+        window.push(...final.split(/\s+/));
+        if (window.length > windowSize) window = window.slice(-windowSize);
+        inputs.push(normalizeTranscript(window.join(' ')).tokens);
+    }
+    return inputs;
+}
+
+function partialInputs(corpus) {
+    const inputs = [];
+    for (const final of corpus) {
+        const words = final.split(/\s+/);
+        for (let i = 1; i <= words.length; i++) {
+            inputs.push(normalizeTranscript(words.slice(0, i).join(' ')).tokens);
+        }
+    }
+    return inputs;
+}
+
+function printMode(name, report) {
+    console.log(`\n${name}: ${report.calls} calls, ${report.tokens} tokens, ${report.references} references`);
+    console.log(`  legacy:  p50 ${report.legacyUs.p50}µs  p99 ${report.legacyUs.p99}µs  total ${report.legacyUs.totalMs}ms`);
+    console.log(`  scanner: p50 ${report.scannerUs.p50}µs  p99 ${report.scannerUs.p99}µs  total ${report.scannerUs.totalMs}ms`);
+    console.log(`  speedup ${report.speedup}x, ${report.scanner.tokensScanned} tokens scanned / ${report.scanner.tokensReused} reused`);
+    console.log(`  mismatches: ${report.mismatches}`);
+}
+
+function main() {
+    const { values } = parseArgs({
+        options: {
+            corpus: { type: 'string' },
+            finals: { type: 'string', default: '5000' },
+            seed: { type: 'string', default: '1' },
+            window: { type: 'string', default: '100' },
+            label: { type: 'string', default: 'run' },
+            out: { type: 'string', default: path.join(BACKEND_DIR, 'tests', 'bench', 'results') }
+        }
+    });
+
+    const options = {
+        corpus: values.corpus || null,
+        finals: parseInt(values.finals, 10),
+        seed: parseInt(values.seed, 10),
+        window: parseInt(values.window, 10)
+    };
+    const corpus = options.corpus
+        ? readCorpus(options.corpus)
+        : generateSermonCorpus({ finals: options.finals, seed: options.seed });
+    const words = corpus.reduce((total, final) => total + final.split(/\s+/).length, 0);
+    console.log(`[Bench] Corpus: ${corpus.length} finals, ${words} words`);
+
+    const modes = {
+        window: runMode(windowInputs(corpus, options.window)),
+        partials: runMode(partialInputs(corpus))
+    };
+    printMode('window', modes.window);
+    printMode('partials', modes.partials);
+
+    const report = {
+        label: values.label,
+        createdAt: new Date().toISOString(),
+        git: gitInfo(BACKEND_DIR),
+        options,
+        corpus: { finals: corpus.length, words },
+        modes
+    };
+    const outPath = writeResults(values.out, 'reference-scan', report);
+    console.log(`\n[Bench] Results written to ${outPath}`);
+
+    process.exit(modes.window.mismatches + modes.partials.mismatches > 0 ? 1 : 0);
+}
+
+main();
@@ -0,0 +1,190 @@
+/**
+ * Billing Endpoint Throughput Benchmark
+ *
+ * Starts the backend against local Stripe and Supabase stand-ins and replays
+ * month-end billing-page bursts: every church fires several concurrent clicks
+ * at the upgrade (subscription-checkout) and portal endpoints, for a number of
+ * rounds. Reports request latency, requests/s and how many Stripe calls the
+ * workload cost.
+ *
+ * Run with (from backend/): node tests/bench/billingThroughput.bench.js [options]
+ *
+ *   --endpoint upgrade|portal|both   Endpoints to hit (default: both)
+ *   --churches N                     Churches (default: 20)
+ *   --with-customers N               Churches that already have a Stripe customer (default: 10)
+ *   --clicks N                       Concurrent requests per church per round (default: 8)
+ *   --rounds N                       Bursts per endpoint (default: 5)
+ *   --round-gap MS                   Pause between bursts (default: 250)
+ *   --stripe-latency MS              Fake Stripe fixed latency (default: 150)
+ *   --stripe-jitter MS               Fake Stripe extra random latency (default: 100)
+ *   --no-cache                       Disable the customer cache and portal reuse window
+ *   --label NAME                     Label stored with the results (default: run)
+ *   --out DIR                        Results directory (default: tests/bench/results)
+ *   --port N                         Backend port (default: 3098)
+ */
+
+import path from 'path';
+import fetch from 'node-fetch';
+import { fileURLToPath } from 'url';
+import { parseArgs } from 'util';
+import { spawnTestServer, stopTestServer } from '../e2e/helpers/spawnServer.js';
+import { sleep } from '../e2e/helpers/wsClient.js';
+import { FakeStripeServer } from './fakes/fakeStripe.js';
+import { FakeSupabaseServer } from './fakes/fakeSupabase.js';
+import { gitInfo, summarize, writeResults } from './benchResults.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const BACKEND_DIR = path.resolve(__dirname, '..', '..');
+
+const ENDPOINTS = {
+    upgrade: { path: '/api/billing/subscription-checkout', body: { planCode: 'pro' } },
+    portal: { path: '/api/billing/portal', body: {} }
+};
+
+async function timedRequest(baseUrl, endpoint, token) {
+    const start = Date.now();
+    try {
+        const res = await fetch(`${baseUrl}${endpoint.path}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${token}` },
+            body: JSON.stringify(endpoint.body)
+        });
+        const body = await res.json().catch(() => ({}));
+        return { ok: res.ok && Boolean(body.url), status: res.status, ms: Date.now() - start, url: body.url };
+    } catch (err) {
+        return { ok: false, status: 0, ms: Date.now() - start, error: err.message };
+    }
+}
+
+async function runEndpoint(name, { baseUrl, stripe, churches, clicks, rounds, roundGapMs }) {
+    const endpoint = ENDPOINTS[name];
+    const before = stripe.getStats();
+    const results = [];
+
+    console.log(`[Bench] ${name}: ${rounds} round(s) × ${churches} churches × ${clicks} clicks...`);
+    const startedAt = Date.now();
+    for (let round = 0; round < rounds; round++) {
+        const burst = [];
+        for (let church = 0; church < churches; church++) {
+            for (let click = 0; click < clicks; click++) {
+                burst.push(timedRequest(baseUrl, endpoint, `bench-${church}-${click}`));
+            }
+        }
+        results.push(...await Promise.all(burst));
+        if (round < rounds - 1) await sleep(roundGapMs);
+    }
+    const durationMs = Date.now() - startedAt;
+
+    const after = stripe.getStats();
+    const stripeCalls = {};
+    for (const key of Object.keys(after)) {
+        stripeCalls[key] = after[key] - before[key];
+    }
+
+    const ok = results.filter(r => r.ok);
+    const statuses = {};
+    for (const r of results) {
+        statuses[r.status] = (statuses[r.status] || 0) + 1;
+    }
+
+    return {
+        requests: results.length,
+        ok: ok.length,
+        statuses,
+        distinctUrls: new Set(ok.map(r => r.url)).size,
+        durationMs,
+        requestsPerSec: +(results.length / (durationMs / 1000)).toFixed(2),
+        latencyMs: summarize(results.map(r => r.ms)),
+        stripeCalls,
+        stripeCallsPerRequest: +((stripeCalls.customers + stripeCalls.portalSessions + stripeCalls.checkoutSessions) / results.length).toFixed(3)
+    };
+}
+
+async function main() {
+    const { values } = parseArgs({
+        options: {
+            endpoint: { type: 'string', default: 'both' },
+            churches: { type: 'string', default: '20' },
+            'with-customers': { type: 'string', default: '10' },
+            clicks: { type: 'string', default: '8' },
+            rounds: { type: 'string', default: '5' },
+            'round-gap': { type: 'string', default: '250' },
+            'stripe-latency': { type: 'string', default: '150' },
+            'stripe-jitter': { type: 'string', default: '100' },
+            'no-cache': { type: 'boolean', default: false },
+            label: { type: 'string', default: 'run' },
+            out: { type: 'string', default: path.join(__dirname, 'results') },
+            port: { type: 'string', default: '3098' }
+        }
+    });
+
+    const endpoints = values.endpoint === 'both' ? ['upgrade', 'portal'] : [values.endpoint];
+    const options = {
+        churches: parseInt(values.churches, 10),
+        withCustomers: parseInt(values['with-customers'], 10),
+        clicks: parseInt(values.clicks, 10),
+        rounds: parseInt(values.rounds, 10),
+        roundGapMs: parseInt(values['round-gap'], 10),
+        noCache: values['no-cache']
+    };
+
+    const stripe = new FakeStripeServer({
+        latencyMs: parseInt(values['stripe-latency'], 10),
+        jitterMs: parseInt(values['stripe-jitter'], 10)
+    });
+    const supabase = new FakeSupabaseServer({ churches: options.churches, withCustomers: options.withCustomers });
+    const stripePort = await stripe.listen();
+    const supabasePort = await supabase.listen();
+    console.log(`[Bench] Fake Stripe on :${stripePort}, fake Supabase on :${supabasePort}`);
+
+    const env = {
+        STRIPE_SECRET_KEY: 'sk_test_bench',
+        STRIPE_API_BASE_URL: `http://127.0.0.1:${stripePort}`,
+        SUPABASE_URL: `http://127.0.0.1:${supabasePort}`,
+        SUPABASE_SERVICE_ROLE_KEY: 'bench-service-role'
+    };
+    if (options.noCache) {
+        env.BILLING_CUSTOMER_CACHE_TTL_MS = '0';
+        env.BILLING_PORTAL_REUSE_MS = '0';
+    }
+
+    // spawnTestServer starts server.js from the working directory
+    process.chdir(BACKEND_DIR);
+    const { server, baseUrl } = await spawnTestServer({ port: parseInt(values.port, 10), env });
+
+    const report = {
+        label: values.label,
+        createdAt: new Date().toISOString(),
+        git: gitInfo(BACKEND_DIR),
+        node: process.version,
+        options: { ...options, stripeLatencyMs: stripe.latencyMs, stripeJitterMs: stripe.jitterMs },
+        endpoints: {}
+    };
+
+    try {
+        for (const name of endpoints) {
+            report.endpoints[name] = await runEndpoint(name, { baseUrl, stripe, ...options });
+        }
+    } finally {
+        await stopTestServer(server);
+        await stripe.close();
+        await supabase.close();
+    }
+    report.supabase = supabase.getStats();
+
+    const outPath = writeResults(values.out, 'billing-throughput', report);
+
+    for (const [name, result] of Object.entries(report.endpoints)) {
+        const { p50, p95, p99 } = result.latencyMs;
+        console.log(`\n=== ${name} ===`);
+        console.log(`Requests: ${result.ok}/${result.requests} ok, ${result.requestsPerSec} req/s`);
+        console.log(`Latency (ms): p50=${p50} p95=${p95} p99=${p99}`);
+        console.log(`Stripe calls: ${JSON.stringify(result.stripeCalls)} (${result.stripeCallsPerRequest} per request)`);
+    }
+    console.log(`\n[Bench] Results written to ${outPath}`);
+}
+
+main().catch(err => {
+    console.error('[Bench] ❌', err);
+    process.exit(1);
+});
@@ -0,0 +1,157 @@
+/**
+ * Fake OpenAI Chat Completions Endpoint
+ *
+ * Local HTTP server answering POST /v1/chat/completions with configurable
+ * latency. The backend talks to it when started with
+ * OPENAI_API_BASE_URL=http://127.0.0.1:<port>.
+ *
+ * - Grammar requests (response_format json_object) echo the text back as
+ *   {"corrected_text": ...}
+ * - Batched final translations (json_object with {"items": [...]}) return
+ *   {"translations": [{"id", "text": "[<target language>] <text>"}]}
+ * - Translation requests return "[<target language>] <text>", streamed as
+ *   server-sent events when the request sets `stream: true`
+ *
+ * Latency per request is latencyMs + uniform(0, jitterMs) from a seeded
+ * generator, so runs with the same options see the same delays.
+ */
+
+import http from 'http';
+
+// Items of a batched translation request, or null for any other JSON request
+function parseItems(text) {
+    try {
+        const parsed = JSON.parse(text);
+        return Array.isArray(parsed?.items) ? parsed.items : null;
+    } catch {
+        return null;
+    }
+}
+
+// mulberry32: small deterministic PRNG for reproducible jitter
+function createRandom(seed) {
+    let state = seed >>> 0;
+    return () => {
+        state = (state + 0x6d2b79f5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+class FakeOpenAIServer {
+    /**
+     * @param {Object} options - Server options
+     * @param {number} options.latencyMs - Fixed delay before responding
+     * @param {number} options.jitterMs - Extra uniform random delay
+     * @param {number} options.streamChunkMs - Delay between streamed chunks
+     * @param {number} options.seed - Jitter seed
+     */
+    constructor(options = {}) {
+        this.latencyMs = options.latencyMs ?? 250;
+        this.jitterMs = options.jitterMs ?? 100;
+        this.streamChunkMs = options.streamChunkMs ?? 15;
+        this.random = createRandom(options.seed ?? 1);
+        this.stats = { requests: 0, translations: 0, batches: 0, grammar: 0, streamed: 0 };
+
+        this.server = http.createServer((req, res) => {
+            this.handle(req, res).catch(err => {
+                res.writeHead(500, { 'Content-Type': 'application/json' });
+                res.end(JSON.stringify({ error: { message: err.message } }));
+            });
+        });
+    }
+
+    /**
+     * Bind to 127.0.0.1
+     * @param {number} port - Port (0 picks a free one)
+     * @returns {Promise<number>} - Bound port
+     */
+    listen(port = 0) {
+        return new Promise(resolve => {
+            this.server.listen(port, '127.0.0.1', () => resolve(this.server.address().port));
+        });
+    }
+
+    /**
+     * @private
+     */
+    async handle(req, res) {
+        if (req.method !== 'POST' || !req.url.startsWith('/v1/chat/completions')) {
+            res.writeHead(404, { 'Content-Type': 'application/json' });
+            res.end(JSON.stringify({ error: { message: `No fake for ${req.method} ${req.url}` } }));
+            return;
+        }
+
+        let raw = '';
+        for await (const chunk of req) raw += chunk;
+        const body = JSON.parse(raw);
+        this.stats.requests++;
+
+        const messages = body.messages || [];
+        const system = messages.find(m => m.role === 'system')?.content || '';
+        const text = [...messages].reverse().find(m => m.role === 'user')?.content || '';
+
+        const target = system.match(/ to ([A-Za-z][\w ()-]*?)[.\n]/)?.[1] || 'translated';
+        const items = body.response_format?.type === 'json_object' ? parseItems(text) : null;
+        let content;
+        if (items) {
+            this.stats.batches++;
+            this.stats.translations += items.length;
+            content = JSON.stringify({
+                translations: items.map(item => ({ id: item.id, text: `[${target}] ${item.text}` }))
+            });
+        } else if (body.response_format?.type === 'json_object') {
+            this.stats.grammar++;
+            content = JSON.stringify({ corrected_text: text });
+        } else {
+            this.stats.translations++;
+            content = `[${target}] ${text}`;
+        }
+
+        await sleep(this.latencyMs + this.random() * this.jitterMs);
+
+        if (body.stream) {
+            this.stats.streamed++;
+            res.writeHead(200, { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache' });
+            const words = content.split(/(?<= )/);
+            for (const word of words) {
+                res.write(`data: ${JSON.stringify({ choices: [{ index: 0, delta: { content: word } }] })}\n\n`);
+                await sleep(this.streamChunkMs);
+            }
+            res.end('data: [DONE]\n\n');
+            return;
+        }
+
+        res.writeHead(200, { 'Content-Type': 'application/json' });
+        res.end(JSON.stringify({
+            id: `chatcmpl-fake-${this.stats.requests}`,
+            object: 'chat.completion',
+            model: body.model,
+            choices: [{ index: 0, message: { role: 'assistant', content }, finish_reason: 'stop' }],
+            usage: { prompt_tokens: Math.ceil(raw.length / 4), completion_tokens: Math.ceil(content.length / 4) }
+        }));
+    }
+
+    /**
+     * Request counters
+     * @returns {Object}
+     */
+    getStats() {
+        return { ...this.stats };
+    }
+
+    close() {
+        return new Promise(resolve => this.server.close(() => resolve()));
+    }
+}
+
+export {
+    FakeOpenAIServer,
+    createRandom
+};
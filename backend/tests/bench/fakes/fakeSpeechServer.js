@@ -0,0 +1,238 @@
+/**
+ * Fake Google Speech StreamingRecognize Server
+ *
+ * Local plaintext gRPC server implementing google.cloud.speech.v1p1beta1
+ * Speech/StreamingRecognize. The backend talks to it when started with
+ * GOOGLE_SPEECH_API_ENDPOINT=127.0.0.1:<port>.
+ *
+ * Each benchmark client prefixes every audio chunk with an 8-byte tag
+ * ("EXBB" + uint32 session index, see audioTag()). The first tagged chunk
+ * starts that session's script clock; scripted results are then written to
+ * whichever primary stream of the session is open (restarts keep the clock).
+ * Recovery streams (automatic punctuation disabled) receive no results.
+ *
+ * Scripts use the replay format recorded via STT_REPLAY_RECORD_DIR:
+ *   {"isPartial": true, "transcriptText": "and the lord", "t": 1520}
+ *
+ * Every final written is recorded with its wall-clock emit time so the
+ * runner can measure emit → client receipt latency.
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { createRequire } from 'module';
+import grpc from '@grpc/grpc-js';
+import protoLoader from '@grpc/proto-loader';
+
+const require = createRequire(import.meta.url);
+
+const TAG_MAGIC = 'EXBB';
+const TAG_BYTES = 8;
+
+/**
+ * 8-byte tag identifying a benchmark session inside its audio
+ * @param {number} index - Session index
+ * @returns {Buffer}
+ */
+function audioTag(index) {
+    const tag = Buffer.alloc(TAG_BYTES);
+    tag.write(TAG_MAGIC, 0, 'latin1');
+    tag.writeUInt32BE(index, 4);
+    return tag;
+}
+
+function readTag(chunk) {
+    if (!chunk || chunk.length < TAG_BYTES || chunk.toString('latin1', 0, 4) !== TAG_MAGIC) {
+        return null;
+    }
+    return chunk.readUInt32BE(4);
+}
+
+/**
+ * Load a replay script, with times relative to its first event
+ * @param {string} file - JSONL path
+ * @returns {Array<{isPartial: boolean, text: string, t: number}>}
+ */
+function loadScript(file) {
+    const events = [];
+    for (const line of fs.readFileSync(file, 'utf8').split('\n')) {
+        if (!line.trim()) continue;
+        const record = JSON.parse(line);
+        if (typeof record.transcriptText !== 'string') continue;
+        events.push({ isPartial: Boolean(record.isPartial), text: record.transcriptText, t: Number(record.t) || 0 });
+    }
+    events.sort((a, b) => a.t - b.t);
+    const start = events.length > 0 ? events[0].t : 0;
+    return events.map(event => ({ ...event, t: event.t - start }));
+}
+
+function loadSpeechService() {
+    const speechProtos = path.join(path.dirname(require.resolve('@google-cloud/speech')), '..', 'protos');
+    const gaxProtos = path.join(path.dirname(require.resolve('google-gax')), '..', 'protos');
+    const definition = protoLoader.loadSync('google/cloud/speech/v1p1beta1/cloud_speech.proto', {
+        includeDirs: [speechProtos, gaxProtos],
+        keepCase: false,
+        longs: String,
+        enums: String,
+        defaults: true,
+        oneofs: true
+    });
+    return grpc.loadPackageDefinition(definition).google.cloud.speech.v1p1beta1.Speech.service;
+}
+
+function toDuration(ms) {
+    return { seconds: String(Math.floor(ms / 1000)), nanos: Math.round(ms % 1000) * 1e6 };
+}
+
+class FakeSpeechServer {
+    /**
+     * @param {Object} options - Server options
+     * @param {Array<Array>} options.scripts - Loaded scripts; session i replays scripts[i % scripts.length]
+     * @param {number} options.speed - Playback speed multiplier (1 = recorded timing)
+     */
+    constructor(options = {}) {
+        this.scripts = options.scripts || [];
+        this.speed = options.speed || 1;
+        this.server = new grpc.Server();
+        this.sessions = new Map(); // tag -> { stream, timers, startedAt, finals: [{ text, emittedAt }], done }
+        this.assignments = new Map(); // tag -> script, overriding scripts[tag % length]
+        this.streamCount = 0;
+
+        this.server.addService(loadSpeechService(), {
+            streamingRecognize: call => this.handleStream(call)
+        });
+    }
+
+    /**
+     * Bind to 127.0.0.1
+     * @param {number} port - Port (0 picks a free one)
+     * @returns {Promise<number>} - Bound port
+     */
+    listen(port = 0) {
+        return new Promise((resolve, reject) => {
+            this.server.bindAsync(`127.0.0.1:${port}`, grpc.ServerCredentials.createInsecure(), (err, boundPort) => {
+                if (err) return reject(err);
+                resolve(boundPort);
+            });
+        });
+    }
+
+    /**
+     * Pin the script a session will replay
+     * @param {number} tag - Session index
+     * @param {Array} script - Loaded script
+     */
+    assign(tag, script) {
+        this.assignments.set(tag, script);
+    }
+
+    /**
+     * @private
+     */
+    handleStream(call) {
+        this.streamCount++;
+        let primary = null;
+        let session = null;
+
+        call.on('data', request => {
+            if (primary === null && request.streamingConfig) {
+                primary = request.streamingConfig.config?.enableAutomaticPunctuation !== false;
+                return;
+            }
+            if (session || !primary) return;
+            const tag = readTag(request.audioContent);
+            if (tag === null) return;
+            session = this.attach(tag, call);
+        });
+
+        const detach = () => {
+            if (session && session.stream === call) session.stream = null;
+        };
+        call.on('end', () => {
+            detach();
+            call.end();
+        });
+        call.on('cancelled', detach);
+        call.on('error', detach);
+    }
+
+    /**
+     * Route a session's results to a stream, starting its script on first sight
+     * @private
+     */
+    attach(tag, call) {
+        let session = this.sessions.get(tag);
+        if (session) {
+            session.stream = call;
+            return session;
+        }
+
+        const script = this.assignments.get(tag) ||
+            (this.scripts.length > 0 ? this.scripts[tag % this.scripts.length] : []);
+        session = { stream: call, timers: [], startedAt: Date.now(), finals: [], done: script.length === 0 };
+        this.sessions.set(tag, session);
+
+        script.forEach((event, i) => {
+            const timer = setTimeout(() => {
+                this.emit(session, event);
+                if (i === script.length - 1) session.done = true;
+            }, event.t / this.speed);
+            session.timers.push(timer);
+        });
+        return session;
+    }
+
+    /**
+     * @private
+     */
+    emit(session, event) {
+        if (!session.stream) return;
+        session.stream.write({
+            results: [{
+                alternatives: [{ transcript: event.text, confidence: event.isPartial ? 0 : 0.92 }],
+                isFinal: !event.isPartial,
+                stability: event.isPartial ? 0.8 : 0,
+                resultEndTime: toDuration(event.t),
+                languageCode: 'en-us'
+            }]
+        });
+        if (!event.isPartial) {
+            session.finals.push({ text: event.text, emittedAt: Date.now() });
+        }
+    }
+
+    /**
+     * Finals emitted for a session
+     * @param {number} tag - Session index
+     * @returns {Array<{text: string, emittedAt: number}>}
+     */
+    finals(tag) {
+        return this.sessions.get(tag)?.finals || [];
+    }
+
+    /**
+     * Whether a session's script has fully played
+     * @param {number} tag - Session index
+     * @returns {boolean}
+     */
+    isDone(tag) {
+        return Boolean(this.sessions.get(tag)?.done);
+    }
+
+    /**
+     * Stop all scripts and shut the server down
+     */
+    async close() {
+        for (const session of this.sessions.values()) {
+            session.timers.forEach(clearTimeout);
+        }
+        await new Promise(resolve => this.server.tryShutdown(() => resolve()));
+    }
+}
+
+export {
+    FakeSpeechServer,
+    TAG_BYTES,
+    audioTag,
+    loadScript
+};
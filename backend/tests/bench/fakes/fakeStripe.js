@@ -0,0 +1,126 @@
+/**
+ * Fake Stripe API
+ *
+ * Local HTTP stand-in for the few Stripe endpoints the billing routes call.
+ * The backend talks to it when started with
+ * STRIPE_API_BASE_URL=http://127.0.0.1:<port> (see services/stripe.js).
+ *
+ *   POST /v1/customers                 - honours Idempotency-Key like Stripe does
+ *   POST /v1/billing_portal/sessions
+ *   POST /v1/checkout/sessions
+ *
+ * Every call waits latencyMs + uniform(0, jitterMs) and is counted, so a
+ * benchmark can report how many Stripe round trips each workload cost.
+ */
+
+import http from 'http';
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+class FakeStripeServer {
+    /**
+     * @param {Object} options - Server options
+     * @param {number} options.latencyMs - Fixed delay per call
+     * @param {number} options.jitterMs - Extra uniform random delay
+     */
+    constructor(options = {}) {
+        this.latencyMs = options.latencyMs ?? 150;
+        this.jitterMs = options.jitterMs ?? 100;
+        this.nextId = 1;
+        this.idempotent = new Map(); // Idempotency-Key -> response body
+        this.calls = { customers: 0, portalSessions: 0, checkoutSessions: 0, idempotentReplays: 0, other: 0 };
+
+        this.server = http.createServer((req, res) => {
+            this.handle(req, res).catch(err => {
+                this.send(res, 500, { error: { type: 'api_error', message: err.message } });
+            });
+        });
+    }
+
+    /**
+     * Bind to 127.0.0.1
+     * @param {number} port - Port (0 picks a free one)
+     * @returns {Promise<number>} - Bound port
+     */
+    listen(port = 0) {
+        return new Promise(resolve => {
+            this.server.listen(port, '127.0.0.1', () => resolve(this.server.address().port));
+        });
+    }
+
+    /**
+     * @private
+     */
+    send(res, status, body) {
+        res.writeHead(status, { 'Content-Type': 'application/json', 'Request-Id': `req_fake_${this.nextId++}` });
+        res.end(JSON.stringify(body));
+    }
+
+    /**
+     * @private
+     */
+    async handle(req, res) {
+        let raw = '';
+        for await (const chunk of req) raw += chunk;
+        const params = new URLSearchParams(raw);
+        const route = `${req.method} ${req.url.split('?')[0]}`;
+
+        await sleep(this.latencyMs + Math.random() * this.jitterMs);
+
+        const key = req.headers['idempotency-key'];
+        if (key && this.idempotent.has(`${route}:${key}`)) {
+            this.calls.idempotentReplays++;
+            return this.send(res, 200, this.idempotent.get(`${route}:${key}`));
+        }
+
+        let body;
+        switch (route) {
+            case 'POST /v1/customers':
+                this.calls.customers++;
+                body = { id: `cus_fake_${this.nextId++}`, object: 'customer', name: params.get('name') };
+                break;
+            case 'POST /v1/billing_portal/sessions':
+                this.calls.portalSessions++;
+                body = {
+                    id: `bps_fake_${this.nextId}`,
+                    object: 'billing_portal.session',
+                    customer: params.get('customer'),
+                    url: `https://billing.stripe.test/p/session/${this.nextId++}`
+                };
+                break;
+            case 'POST /v1/checkout/sessions':
+                this.calls.checkoutSessions++;
+                body = {
+                    id: `cs_fake_${this.nextId}`,
+                    object: 'checkout.session',
+                    customer: params.get('customer'),
+                    url: `https://checkout.stripe.test/c/pay/${this.nextId++}`
+                };
+                break;
+            default:
+                this.calls.other++;
+                return this.send(res, 404, { error: { type: 'invalid_request_error', message: `Unrecognized request URL (${route})` } });
+        }
+
+        if (key) this.idempotent.set(`${route}:${key}`, body);
+        this.send(res, 200, body);
+    }
+
+    /**
+     * Call counters
+     * @returns {Object}
+     */
+    getStats() {
+        return { ...this.calls };
+    }
+
+    close() {
+        return new Promise(resolve => this.server.close(() => resolve()));
+    }
+}
+
+export {
+    FakeStripeServer
+};
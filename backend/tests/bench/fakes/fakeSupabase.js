@@ -0,0 +1,133 @@
+/**
+ * Fake Supabase (Auth + PostgREST) for the billing benchmark
+ *
+ * Answers just enough of the Supabase HTTP API for requireAuth/requireAdmin
+ * and the billing routes. The backend talks to it when started with
+ * SUPABASE_URL=http://127.0.0.1:<port>.
+ *
+ * Bearer tokens are "bench-<church>-<user>"; every such user is an admin of
+ * church "church-<church>". Churches below `withCustomers` start with a Stripe
+ * customer ID, the rest get one created on first use (PATCHes are applied).
+ */
+
+import http from 'http';
+
+class FakeSupabaseServer {
+    /**
+     * @param {Object} options - Server options
+     * @param {number} options.churches - Number of churches
+     * @param {number} options.withCustomers - Churches that already have a Stripe customer
+     * @param {number} options.latencyMs - Delay per request
+     */
+    constructor(options = {}) {
+        this.latencyMs = options.latencyMs ?? 5;
+        this.churches = new Map();
+        for (let i = 0; i < (options.churches ?? 10); i++) {
+            const id = `church-${i}`;
+            const hasCustomer = i < (options.withCustomers ?? 0);
+            this.churches.set(id, { id, name: `Bench Church ${i}`, stripe_customer_id: hasCustomer ? `cus_existing_${i}` : null });
+        }
+        this.calls = { auth: 0, reads: 0, writes: 0 };
+
+        this.server = http.createServer((req, res) => {
+            this.handle(req, res).catch(err => {
+                this.send(res, 500, { message: err.message });
+            });
+        });
+    }
+
+    /**
+     * Bind to 127.0.0.1
+     * @param {number} port - Port (0 picks a free one)
+     * @returns {Promise<number>} - Bound port
+     */
+    listen(port = 0) {
+        return new Promise(resolve => {
+            this.server.listen(port, '127.0.0.1', () => resolve(this.server.address().port));
+        });
+    }
+
+    /**
+     * @private
+     */
+    send(res, status, body) {
+        res.writeHead(status, { 'Content-Type': 'application/json' });
+        res.end(body === undefined ? '' : JSON.stringify(body));
+    }
+
+    /**
+     * @private
+     */
+    async handle(req, res) {
+        let raw = '';
+        for await (const chunk of req) raw += chunk;
+        await new Promise(resolve => setTimeout(resolve, this.latencyMs));
+
+        const url = new URL(req.url, 'http://localhost');
+
+        if (url.pathname === '/auth/v1/user') {
+            this.calls.auth++;
+            const token = (req.headers.authorization || '').replace('Bearer ', '');
+            const match = token.match(/^bench-(\d+)-(\d+)$/);
+            if (!match) return this.send(res, 401, { msg: 'invalid JWT' });
+            return this.send(res, 200, { id: `user-${match[1]}-${match[2]}`, email: `admin${match[2]}@church${match[1]}.test`, aud: 'authenticated' });
+        }
+
+        const table = url.pathname.replace('/rest/v1/', '');
+        const wantsObject = (req.headers.accept || '').includes('vnd.pgrst.object');
+        const eq = name => (url.searchParams.get(name) || '').replace(/^eq\./, '');
+
+        if (req.method === 'PATCH') {
+            this.calls.writes++;
+            const patch = JSON.parse(raw || '{}');
+            const churchId = table === 'churches' ? eq('id') : eq('church_id');
+            const church = this.churches.get(churchId);
+            if (church && patch.stripe_customer_id) church.stripe_customer_id = patch.stripe_customer_id;
+            return this.send(res, 204);
+        }
+
+        this.calls.reads++;
+        let row = null;
+        switch (table) {
+            case 'profiles': {
+                const match = eq('user_id').match(/^user-(\d+)-(\d+)$/);
+                if (match) {
+                    const church = this.churches.get(`church-${match[1]}`);
+                    row = { user_id: eq('user_id'), church_id: church?.id, role: 'admin', churches: { name: church?.name } };
+                }
+                break;
+            }
+            case 'churches':
+                row = this.churches.get(eq('id')) || null;
+                break;
+            case 'subscriptions':
+                row = { stripe_subscription_id: `sub_${eq('church_id')}`, status: 'active' };
+                break;
+            case 'plans':
+                row = { id: `plan-${eq('code')}`, code: eq('code'), name: eq('code'), stripe_price_id: `price_${eq('code')}` };
+                break;
+        }
+
+        if (wantsObject) {
+            if (!row) return this.send(res, 406, { code: 'PGRST116', message: 'JSON object requested, multiple (or no) rows returned' });
+            return this.send(res, 200, row);
+        }
+        return this.send(res, 200, row ? [row] : []);
+    }
+
+    /**
+     * Request counters
+     * @returns {Object}
+     */
+    getStats() {
+        return { ...this.calls };
+    }
+
+    close() {
+        return new Promise(resolve => this.server.close(() => resolve()));
+    }
+}
+
+export {
+    FakeSupabaseServer
+};
@@ -0,0 +1,383 @@
+/**
+ * Final-Path Latency Benchmark
+ *
+ * Starts the backend against a local fake Google streaming recognizer and a
+ * fake OpenAI endpoint, replays scripted partial/final sequences for a number
+ * of concurrent solo and host sessions, and measures how long each final takes
+ * from the recognizer emitting it to the client receiving it.
+ *
+ * Run with (from backend/): node tests/bench/finalLatency.bench.js [options]
+ *
+ *   --mode solo|host|both      Pipelines to measure (default: both)
+ *   --sessions N               Concurrent sessions per mode (default: 4)
+ *   --scripts PATH             Script file or directory of .jsonl scripts (default: tests/bench/scripts)
+ *   --speed X                  Script playback speed (default: 1)
+ *   --openai-latency MS        Fake OpenAI fixed latency (default: 250)
+ *   --openai-jitter MS         Fake OpenAI extra random latency (default: 100)
+ *   --label NAME               Label stored with the results (default: run)
+ *   --out DIR                  Results directory (default: tests/bench/results)
+ *   --port N                   Backend port (default: 3099)
+ *   --compare BASE.json HEAD.json   Print the difference between two result files and exit
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { parseArgs } from 'util';
+import { spawnTestServer, stopTestServer } from '../e2e/helpers/spawnServer.js';
+import { connectWs, createHostSession, sleep, waitForSettle } from '../e2e/helpers/wsClient.js';
+import { FakeSpeechServer, TAG_BYTES, audioTag, loadScript } from './fakes/fakeSpeechServer.js';
+import { FakeOpenAIServer } from './fakes/fakeOpenAI.js';
+import { formatDelta, gitInfo, summarize, writeResults } from './benchResults.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const BACKEND_DIR = path.resolve(__dirname, '..', '..');
+
+const SAMPLE_RATE = 16000;
+const CHUNK_MS = 20;
+const CHUNK_BYTES = (SAMPLE_RATE * 2 * CHUNK_MS) / 1000; // LINEAR16 mono
+const TAIL_AUDIO_MS = 1500; // Keep audio flowing after the script ends so the last final flushes
+const MATCH_WORDS = 4; // Trailing words of an emitted final a client final must contain
+
+function normalize(text) {
+    return (text || '').toLowerCase().replace(/[^\p{L}\p{N}\s']/gu, ' ').replace(/\s+/g, ' ').trim();
+}
+
+// ============================================================================
+// Matching emitted finals to client finals
+// ============================================================================
+
+function sourceText(event) {
+    return event.originalText || event.correctedText || event.transcript || '';
+}
+
+function isTranslated(event) {
+    return Boolean(event.translatedText) && event.translatedText !== sourceText(event);
+}
+
+/**
+ * Match each emitted final to the first client final that contains its last words
+ * @returns {Object} - { finalLatencies, translatedLatencies, matched, lost, duplicates }
+ */
+function analyzeSession(emitted, events) {
+    const finals = events
+        .filter(e => e.type === 'translation' && e.isPartial === false && sourceText(e))
+        .map(e => ({ event: e, text: normalize(sourceText(e)) }));
+
+    const finalLatencies = [];
+    const translatedLatencies = [];
+    let matched = 0;
+
+    for (const final of emitted) {
+        const words = normalize(final.text).split(' ').filter(Boolean);
+        const key = words.slice(-MATCH_WORDS).join(' ');
+        if (!key) continue;
+
+        const candidates = finals.filter(f => f.event._receivedAt >= final.emittedAt && f.text.includes(key));
+        if (candidates.length === 0) continue;
+
+        matched++;
+        finalLatencies.push(candidates[0].event._receivedAt - final.emittedAt);
+        const translated = candidates.find(f => isTranslated(f.event));
+        if (translated) {
+            translatedLatencies.push(translated.event._receivedAt - final.emittedAt);
+        }
+    }
+
+    // Same committed text delivered under more than one seqId
+    const seen = new Map();
+    let duplicates = 0;
+    for (const { event, text } of finals) {
+        const seqId = seen.get(text);
+        if (seqId === undefined) {
+            seen.set(text, event.seqId);
+        } else if (seqId !== event.seqId) {
+            duplicates++;
+        }
+    }
+
+    return { finalLatencies, translatedLatencies, matched, lost: emitted.length - matched, duplicates };
+}
+
+// ============================================================================
+// Sessions
+// ============================================================================
+
+function collect(ws, events, counters) {
+    ws.on('message', data => {
+        counters.messages++;
+        counters.bytes += data.length;
+        try {
+            events.push({ ...JSON.parse(data.toString()), _receivedAt: Date.now() });
+        } catch (err) {
+            // Non-JSON frames are not part of the final path
+        }
+    });
+}
+
+function waitForMessage(events, type, timeoutMs = 10000) {
+    const start = Date.now();
+    return new Promise((resolve, reject) => {
+        const check = () => {
+            if (events.some(e => e.type === type)) return resolve();
+            if (Date.now() - start > timeoutMs) return reject(new Error(`No ${type} within ${timeoutMs}ms`));
+            setTimeout(check, 50);
+        };
+        check();
+    });
+}
+
+/**
+ * Stream tagged silence in real time until the session's script has played
+ */
+async function streamTaggedAudio(ws, tag, speech) {
+    const chunk = Buffer.alloc(CHUNK_BYTES);
+    audioTag(tag).copy(chunk, 0, 0, TAG_BYTES);
+    const audioData = chunk.toString('base64');
+
+    let doneAt = null;
+    let next = Date.now();
+    while (ws.readyState === 1) {
+        ws.send(JSON.stringify({ type: 'audio', audioData }));
+        if (doneAt === null && speech.isDone(tag)) doneAt = Date.now();
+        if (doneAt !== null && Date.now() - doneAt >= TAIL_AUDIO_MS) break;
+        next += CHUNK_MS;
+        await sleep(Math.max(0, next - Date.now()));
+    }
+}
+
+const INIT_MESSAGE = {
+    type: 'init',
+    sourceLang: 'en',
+    targetLang: 'es',
+    tier: 'basic',
+    encoding: 'LINEAR16',
+    sampleRateHertz: SAMPLE_RATE
+};
+
+async function runSoloSession(baseUrl, tag, speech, counters) {
+    const events = [];
+    const ws = await connectWs(`${baseUrl.replace('http', 'ws')}/translate`);
+    collect(ws, events, counters);
+
+    ws.send(JSON.stringify(INIT_MESSAGE));
+    await waitForMessage(events, 'session_ready');
+    await streamTaggedAudio(ws, tag, speech);
+    await waitForSettle(events, { idleMs: 2000, maxWaitMs: 30000 });
+    ws.close();
+    return events;
+}
+
+async function runHostSession(baseUrl, tag, speech, counters) {
+    const wsBase = baseUrl.replace('http', 'ws');
+    const session = await createHostSession(baseUrl);
+
+    const hostEvents = [];
+    const host = await connectWs(`${wsBase}${session.wsUrl}&targetLang=es`);
+    collect(host, hostEvents, { messages: 0, bytes: 0 });
+
+    // Latency is measured where it matters: at the listener
+    const events = [];
+    const listener = await connectWs(`${wsBase}${session.wsUrl.replace('host', 'listen')}&targetLang=es`);
+    collect(listener, events, counters);
+    await sleep(1000); // Let the listener register in the session store
+
+    host.send(JSON.stringify(INIT_MESSAGE));
+    await waitForMessage(hostEvents, 'session_ready');
+    await streamTaggedAudio(host, tag, speech);
+    await waitForSettle(events, { idleMs: 2000, maxWaitMs: 30000 });
+    host.close();
+    listener.close();
+    return events;
+}
+
+async function runMode(mode, { baseUrl, speech, scripts, sessions, tagOffset }) {
+    const counters = { messages: 0, bytes: 0 };
+    const runSession = mode === 'host' ? runHostSession : runSoloSession;
+
+    const tags = Array.from({ length: sessions }, (_, i) => tagOffset + i);
+    tags.forEach((tag, i) => speech.assign(tag, scripts[i % scripts.length].events));
+
+    console.log(`[Bench] ${mode}: ${sessions} concurrent session(s)...`);
+    const startedAt = Date.now();
+    const results = await Promise.allSettled(tags.map(tag => runSession(baseUrl, tag, speech, counters)));
+    const durationMs = Date.now() - startedAt;
+
+    const finalLatencies = [];
+    const translatedLatencies = [];
+    let emitted = 0;
+    let matched = 0;
+    let lost = 0;
+    let duplicates = 0;
+    const errors = [];
+
+    results.forEach((result, i) => {
+        if (result.status === 'rejected') {
+            errors.push(`session ${i}: ${result.reason?.message || result.reason}`);
+            return;
+        }
+        const finals = speech.finals(tags[i]);
+        const analysis = analyzeSession(finals, result.value);
+        emitted += finals.length;
+        matched += analysis.matched;
+        lost += analysis.lost;
+        duplicates += analysis.duplicates;
+        finalLatencies.push(...analysis.finalLatencies);
+        translatedLatencies.push(...analysis.translatedLatencies);
+    });
+
+    const seconds = durationMs / 1000;
+    return {
+        sessions,
+        scripts: scripts.map(s => s.name),
+        durationMs,
+        emittedFinals: emitted,
+        matchedFinals: matched,
+        lostFinals: lost,
+        duplicateFinals: duplicates,
+        finalLatencyMs: summarize(finalLatencies),
+        translatedFinalLatencyMs: summarize(translatedLatencies),
+        throughput: {
+            finalsPerSec: +(matched / seconds).toFixed(2),
+            messagesPerSec: +(counters.messages / seconds).toFixed(2),
+            bytesPerSec: Math.round(counters.bytes / seconds)
+        },
+        errors
+    };
+}
+
+// ============================================================================
+// Results
+// ============================================================================
+
+function loadScripts(target) {
+    const files = fs.statSync(target).isDirectory()
+        ? fs.readdirSync(target).filter(f => f.endsWith('.jsonl')).sort().map(f => path.join(target, f))
+        : [target];
+    return files.map(file => ({ name: path.basename(file, '.jsonl'), events: loadScript(file) }))
+        .filter(script => script.events.length > 0);
+}
+
+function compare(basePath, headPath) {
+    const base = JSON.parse(fs.readFileSync(basePath, 'utf8'));
+    const head = JSON.parse(fs.readFileSync(headPath, 'utf8'));
+    console.log(`\n=== ${base.label} (${base.git?.commit || '?'}) → ${head.label} (${head.git?.commit || '?'}) ===`);
+
+    for (const mode of Object.keys(head.modes)) {
+        const b = base.modes[mode];
+        const h = head.modes[mode];
+        if (!b) {
+            console.log(`\n${mode}: not in base`);
+            continue;
+        }
+        console.log(`\n${mode}:`);
+        for (const metric of ['finalLatencyMs', 'translatedFinalLatencyMs']) {
+            for (const p of ['p50', 'p95', 'p99']) {
+                console.log(`  ${metric}.${p}: ${formatDelta(b[metric][p], h[metric][p])}`);
+            }
+        }
+        console.log(`  lostFinals: ${formatDelta(b.lostFinals, h.lostFinals)}`);
+        console.log(`  duplicateFinals: ${formatDelta(b.duplicateFinals, h.duplicateFinals)}`);
+        console.log(`  finalsPerSec: ${formatDelta(b.throughput.finalsPerSec, h.throughput.finalsPerSec)}`);
+    }
+}
+
+// ============================================================================
+// Main
+// ============================================================================
+
+async function main() {
+    const { values, positionals } = parseArgs({
+        allowPositionals: true,
+        options: {
+            mode: { type: 'string', default: 'both' },
+            sessions: { type: 'string', default: '4' },
+            scripts: { type: 'string', default: path.join(__dirname, 'scripts') },
+            speed: { type: 'string', default: '1' },
+            'openai-latency': { type: 'string', default: '250' },
+            'openai-jitter': { type: 'string', default: '100' },
+            label: { type: 'string', default: 'run' },
+            out: { type: 'string', default: path.join(__dirname, 'results') },
+            port: { type: 'string', default: '3099' },
+            compare: { type: 'boolean', default: false }
+        }
+    });
+
+    if (values.compare) {
+        if (positionals.length !== 2) {
+            throw new Error('--compare needs BASE.json HEAD.json');
+        }
+        compare(positionals[0], positionals[1]);
+        return;
+    }
+
+    const modes = values.mode === 'both' ? ['solo', 'host'] : [values.mode];
+    const sessions = Math.max(1, parseInt(values.sessions, 10));
+    const scripts = loadScripts(path.resolve(values.scripts));
+    if (scripts.length === 0) {
+        throw new Error(`No scripts found in ${values.scripts}`);
+    }
+
+    const speech = new FakeSpeechServer({ speed: parseFloat(values.speed) });
+    const openai = new FakeOpenAIServer({
+        latencyMs: parseInt(values['openai-latency'], 10),
+        jitterMs: parseInt(values['openai-jitter'], 10)
+    });
+    const speechPort = await speech.listen();
+    const openaiPort = await openai.listen();
+    console.log(`[Bench] Fake recognizer on :${speechPort}, fake OpenAI on :${openaiPort}`);
+
+    // spawnTestServer starts server.js from the working directory
+    process.chdir(BACKEND_DIR);
+    const { server, baseUrl } = await spawnTestServer({
+        port: parseInt(values.port, 10),
+        env: {
+            GOOGLE_SPEECH_API_ENDPOINT: `127.0.0.1:${speechPort}`,
+            OPENAI_API_BASE_URL: `http://127.0.0.1:${openaiPort}`,
+            OPENAI_API_KEY: 'bench-fake-key'
+        }
+    });
+
+    const report = {
+        label: values.label,
+        createdAt: new Date().toISOString(),
+        git: gitInfo(BACKEND_DIR),
+        node: process.version,
+        options: {
+            sessions,
+            speed: parseFloat(values.speed),
+            openaiLatencyMs: openai.latencyMs,
+            openaiJitterMs: openai.jitterMs
+        },
+        modes: {}
+    };
+
+    try {
+        for (const [i, mode] of modes.entries()) {
+            report.modes[mode] = await runMode(mode, { baseUrl, speech, scripts, sessions, tagOffset: i * sessions });
+        }
+    } finally {
+        await stopTestServer(server);
+        await speech.close();
+        await openai.close();
+    }
+    report.openai = openai.getStats();
+
+    const outPath = writeResults(values.out, 'final-latency', report);
+
+    for (const [mode, result] of Object.entries(report.modes)) {
+        const { p50, p95, p99 } = result.finalLatencyMs;
+        console.log(`\n=== ${mode} ===`);
+        console.log(`Final latency (ms): p50=${p50} p95=${p95} p99=${p99}`);
+        console.log(`Translated final latency (ms): p50=${result.translatedFinalLatencyMs.p50} p95=${result.translatedFinalLatencyMs.p95} p99=${result.translatedFinalLatencyMs.p99}`);
+        console.log(`Finals: ${result.matchedFinals}/${result.emittedFinals} delivered, ${result.lostFinals} lost, ${result.duplicateFinals} duplicate`);
+        console.log(`Throughput: ${result.throughput.finalsPerSec} finals/s, ${result.throughput.messagesPerSec} msgs/s`);
+        result.errors.forEach(error => console.error(`  ✗ ${error}`));
+    }
+    console.log(`\n[Bench] Results written to ${outPath}`);
+}
+
+main().catch(err => {
+    console.error('[Bench] ❌', err);
+    process.exit(1);
+});
@@ -0,0 +1,58 @@
+/**
+ * Rolling audio buffer as AudioBufferManager kept it before the PCM ring: one
+ * object per chunk (copied Buffer + metadata spread) in an array, filter/sort/map
+ * on every read, a 500ms cleanup pass that rebuilds the array. Logging and events
+ * are left out. Kept as the baseline for the audio buffer benchmark.
+ */
+
+class LegacyAudioBuffer {
+    constructor({ bufferDurationMs = 2500, flushDurationMs = 600, maxChunks = 200 } = {}) {
+        this.bufferDurationMs = bufferDurationMs;
+        this.flushDurationMs = flushDurationMs;
+        this.maxChunks = maxChunks;
+        this.buffer = [];
+        this.bufferIndex = 0;
+        this.totalChunksReceived = 0;
+    }
+
+    addChunk(audioChunk, metadata = {}, timestamp = Date.now()) {
+        const entry = {
+            chunk: Buffer.from(audioChunk),
+            timestamp,
+            metadata: {
+                ...metadata,
+                chunkId: metadata.chunkId || `chunk_${this.totalChunksReceived}`,
+                size: audioChunk.length
+            }
+        };
+        if (this.buffer.length < this.maxChunks) {
+            this.buffer.push(entry);
+        } else {
+            this.buffer[this.bufferIndex] = entry;
+            this.bufferIndex = (this.bufferIndex + 1) % this.maxChunks;
+        }
+        this.totalChunksReceived++;
+    }
+
+    getRecentAudio(durationMs, now = Date.now()) {
+        const startTimestamp = now - durationMs;
+        return this.buffer
+            .filter(entry => entry.timestamp >= startTimestamp && entry.timestamp <= now)
+            .sort((a, b) => a.timestamp - b.timestamp)
+            .map(entry => entry.chunk);
+    }
+
+    flush(now = Date.now()) {
+        const chunks = this.getRecentAudio(this.flushDurationMs, now);
+        return chunks.length === 0 ? Buffer.alloc(0) : Buffer.concat(chunks);
+    }
+
+    cleanupExpiredChunks(now = Date.now()) {
+        const expirationThreshold = now - this.bufferDurationMs;
+        this.buffer = this.buffer.filter(entry => entry.timestamp > expirationThreshold);
+    }
+}
+
+export {
+    LegacyAudioBuffer
+};
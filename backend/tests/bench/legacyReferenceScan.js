@@ -0,0 +1,275 @@
+/**
+ * Bible reference scan as it was before ReferenceScanner: findAllBookNames with a
+ * per-position alias scan, then findAllSpokenNumbers over the rest of the transcript
+ * for every book name. Kept as the baseline for the scan benchmark and the parity test.
+ */
+
+import bookNameDetector from '../../../core/services/bookNameDetector.js';
+import { findAllSpokenNumbers } from '../../../core/services/spokenNumberParser.js';
+
+const { BOOK_ALIASES } = bookNameDetector;
+
+const ORDINAL_MAP = {
+    'first': 1, '1st': 1, '1': 1,
+    'second': 2, '2nd': 2, '2': 2,
+    'third': 3, '3rd': 3, '3': 3,
+    'fourth': 4, '4th': 4, '4': 4,
+    'fifth': 5, '5th': 5, '5': 5
+};
+
+function legacyDetectBookName(tokens, startIndex = 0) {
+    if (!tokens || tokens.length === 0 || startIndex >= tokens.length) return null;
+
+    // Try single token
+    const single = tokens[startIndex]?.toLowerCase();
+    if (single && BOOK_ALIASES[single]) {
+        return {
+            book: BOOK_ALIASES[single],
+            confidence: 0.9,
+            tokenCount: 1
+        };
+    }
+
+    // Try two tokens (for books like "1 Samuel", "Song of")
+    if (startIndex + 1 < tokens.length) {
+        const two = `${tokens[startIndex]} ${tokens[startIndex + 1]}`.toLowerCase();
+        if (BOOK_ALIASES[two]) {
+            return {
+                book: BOOK_ALIASES[two],
+                confidence: 0.95,
+                tokenCount: 2
+            };
+        }
+
+        // Try with ordinal (e.g., "first samuel")
+        const ordinal = ORDINAL_MAP[tokens[startIndex]?.toLowerCase()];
+        if (ordinal) {
+            const second = tokens[startIndex + 1]?.toLowerCase();
+            const ordinalKey = `${ordinal === 1 ? 'first' : ordinal === 2 ? 'second' : ordinal === 3 ? 'third' : ''} ${second}`;
+            if (BOOK_ALIASES[ordinalKey]) {
+                return {
+                    book: BOOK_ALIASES[ordinalKey],
+                    confidence: 0.9,
+                    tokenCount: 2
+                };
+            }
+        }
+    }
+
+    // Try three tokens (e.g., "Song of Solomon")
+    if (startIndex + 2 < tokens.length) {
+        const three = `${tokens[startIndex]} ${tokens[startIndex + 1]} ${tokens[startIndex + 2]}`.toLowerCase();
+        if (BOOK_ALIASES[three]) {
+            return {
+                book: BOOK_ALIASES[three],
+                confidence: 0.95,
+                tokenCount: 3
+            };
+        }
+    }
+
+    // Fuzzy match: check if any token closely matches a book name
+    for (const token of tokens.slice(startIndex, Math.min(startIndex + 3, tokens.length))) {
+        const lower = token.toLowerCase();
+        for (const [alias, canonical] of Object.entries(BOOK_ALIASES)) {
+            if (lower.includes(alias) || alias.includes(lower)) {
+                if (lower.length >= 3) { // Minimum length for confidence
+                    return {
+                        book: canonical,
+                        confidence: 0.4, // Lower confidence for fuzzy match
+                        tokenCount: 1
+                    };
+                }
+            }
+        }
+    }
+
+    return null;
+}
+
+function legacyFindAllBookNames(tokens) {
+    if (!tokens || tokens.length === 0) return [];
+
+    const results = [];
+
+    for (let i = 0; i < tokens.length; i++) {
+        const detection = legacyDetectBookName(tokens, i);
+        if (detection) {
+            results.push({
+                ...detection,
+                startIndex: i
+            });
+            // Skip ahead by token count to avoid overlapping matches
+            i += detection.tokenCount - 1;
+        }
+    }
+
+    return results;
+}
+
+function legacyDetectExplicitReferences(tokens) {
+    const results = [];
+
+    // Find all book names
+    const bookDetections = legacyFindAllBookNames(tokens);
+
+    for (const bookDetection of bookDetections) {
+        const startIndex = bookDetection.startIndex;
+
+        // Look for chapter/verse patterns after book name
+        // Pattern 1: "Acts 2:38" or "Acts 2 38"
+        if (startIndex + 1 < tokens.length) {
+            const nextToken = tokens[startIndex + bookDetection.tokenCount];
+
+            // Try to parse as chapter number
+            let chapter = null;
+            let verse = null;
+
+            // Check if next token is a number
+            const chapterMatch = nextToken?.match(/^(\d+)$/);
+            if (chapterMatch) {
+                chapter = parseInt(chapterMatch[1], 10);
+
+                // Look for verse (next token after colon or space)
+                if (startIndex + bookDetection.tokenCount + 1 < tokens.length) {
+                    const verseToken = tokens[startIndex + bookDetection.tokenCount + 1];
+                    const verseMatch = verseToken?.match(/^(\d+)$/);
+                    if (verseMatch) {
+                        verse = parseInt(verseMatch[1], 10);
+                    }
+                }
+            } else {
+                // Try spoken numbers
+                const spokenNumbers = findAllSpokenNumbers(
+                    tokens.slice(startIndex + bookDetection.tokenCount).join(' ')
+                );
+                if (spokenNumbers.length > 0) {
+                    chapter = spokenNumbers[0].value;
+                    if (spokenNumbers.length > 1) {
+                        verse = spokenNumbers[1].value;
+                    }
+                }
+            }
+
+            if (chapter !== null) {
+                results.push({
+                    book: bookDetection.book,
+                    chapter: chapter,
+                    verse: verse || undefined,
+                    method: 'regex',
+                    confidence: verse !== null ? 0.9 : 0.75,
+                    displayText: verse !== null
+                        ? `${bookDetection.book} ${chapter}:${verse}`
+                        : `${bookDetection.book} ${chapter}`
+                });
+            }
+        }
+
+        // Pattern 2: "Acts chapter two verse thirty eight"
+        const chapterWords = ['chapter', 'ch', 'chap'];
+        const verseWords = ['verse', 'v', 'verses'];
+
+        for (let i = startIndex + bookDetection.tokenCount; i < Math.min(startIndex + bookDetection.tokenCount + 8, tokens.length); i++) {
+            if (chapterWords.includes(tokens[i])) {
+                    // Found "chapter" - next should be number (could be multiple tokens for spoken numbers)
+                    if (i + 1 < tokens.length) {
+                        // Try numeric first
+                        let chapterNum = parseInt(tokens[i + 1], 10);
+                        let chapterTokenCount = 1;
+
+                        // If not a number, try parsing as spoken number (could be multiple tokens)
+                        if (!chapterNum) {
+                            // Try two tokens first (e.g., "thirty eight") - prefer compound numbers
+                            if (i + 2 < tokens.length) {
+                                const twoTokens = `${tokens[i + 1]} ${tokens[i + 2]}`;
+                                const twoNum = findAllSpokenNumbers(twoTokens);
+                                if (twoNum.length > 0) {
+                                    chapterNum = twoNum[0].value;
+                                    chapterTokenCount = 2;
+                                }
+                            }
+
+                            // If two-token didn't work, try single token
+                            if (!chapterNum) {
+                                const singleNum = findAllSpokenNumbers(tokens[i + 1]);
+                                if (singleNum.length > 0) {
+                                    chapterNum = singleNum[0].value;
+                                    chapterTokenCount = 1;
+                                }
+                            }
+                        }
+
+                    if (chapterNum) {
+                        // chapterTokenCount is already set above
+
+                        // Look for verse (start after chapter word + chapter number tokens)
+                        const verseSearchStart = i + 1 + chapterTokenCount;
+
+                        for (let j = verseSearchStart; j < Math.min(verseSearchStart + 6, tokens.length); j++) {
+                            if (verseWords.includes(tokens[j])) {
+                                // Found "verse" - next should be the verse number
+                                if (j + 1 < tokens.length) {
+                                    // Try numeric first
+                                    let verseNum = parseInt(tokens[j + 1], 10);
+                                    let verseTokenCount = 1;
+
+                                    if (!verseNum) {
+                                        // Try two tokens first (e.g., "thirty eight") - prefer compound numbers
+                                        if (j + 2 < tokens.length) {
+                                            const twoVerseTokens = `${tokens[j + 1]} ${tokens[j + 2]}`;
+                                            const twoVerse = findAllSpokenNumbers(twoVerseTokens);
+                                            if (twoVerse.length > 0) {
+                                                verseNum = twoVerse[0].value;
+                                                verseTokenCount = 2;
+                                            }
+                                        }
+
+                                        // If two-token didn't work, try single token
+                                        if (!verseNum) {
+                                            const singleVerse = findAllSpokenNumbers(tokens[j + 1]);
+                                            if (singleVerse.length > 0) {
+                                                verseNum = singleVerse[0].value;
+                                                verseTokenCount = 1;
+                                            }
+                                        }
+                                    }
+
+                                    if (verseNum) {
+                                        results.push({
+                                            book: bookDetection.book,
+                                            chapter: chapterNum,
+                                            verse: verseNum,
+                                            method: 'regex',
+                                            confidence: 0.85,
+                                            displayText: `${bookDetection.book} ${chapterNum}:${verseNum}`
+                                        });
+                                        break; // Found verse, exit loop
+                                    }
+                                }
+                            }
+                        }
+
+                        // Chapter only (no verse found)
+                        if (!results.some(r => r.chapter === chapterNum && r.book === bookDetection.book && r.verse)) {
+                            results.push({
+                                book: bookDetection.book,
+                                chapter: chapterNum,
+                                method: 'regex',
+                                confidence: 0.7,
+                                displayText: `${bookDetection.book} ${chapterNum}`
+                            });
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    return results;
+}
+
+export {
+    legacyDetectBookName,
+    legacyDetectExplicitReferences,
+    legacyFindAllBookNames
+};
@@ -0,0 +1,118 @@
+/**
+ * Segment assembler as core/engine/segmentAssembler.js kept it before the word
+ * timeline: open segments identified by a normalized 12-token prefix, text merged
+ * by startsWith / suffix-overlap string matching, a segment closed when a result
+ * no longer shares its prefix. Logging and the stale-segment interval are left
+ * out. Kept as the baseline for the segment assembler benchmark.
+ */
+
+const PREFIX_TOKEN_COUNT = 12;
+const MIN_PREFIX_LENGTH = 20;
+
+class LegacySegmentAssembler {
+    constructor() {
+        this.openSegments = new Map();
+        this.mostRecentSegmentId = null;
+        this.segmentCounter = 0;
+    }
+
+    normalizePrefix(text) {
+        if (!text) return '';
+        const tokens = text
+            .toLowerCase()
+            .replace(/[.,!?;:…]/g, ' ')
+            .replace(/\s+/g, ' ')
+            .trim()
+            .split(/\s+/)
+            .filter(t => t.length > 0);
+        return tokens.slice(0, PREFIX_TOKEN_COUNT).join(' ');
+    }
+
+    sharesPrefix(text1, text2) {
+        const prefix1 = this.normalizePrefix(text1);
+        const prefix2 = this.normalizePrefix(text2);
+        if (prefix1.length < MIN_PREFIX_LENGTH || prefix2.length < MIN_PREFIX_LENGTH) return false;
+        const minLen = Math.min(prefix1.length, prefix2.length);
+        const overlap = Math.min(minLen, Math.max(prefix1.length, prefix2.length) * 0.7);
+        return prefix1.substring(0, overlap) === prefix2.substring(0, overlap);
+    }
+
+    findMatchingSegment(text) {
+        if (this.normalizePrefix(text).length < MIN_PREFIX_LENGTH) return null;
+        for (const segment of this.openSegments.values()) {
+            if (this.sharesPrefix(text, segment.text)) return segment;
+        }
+        return null;
+    }
+
+    mergeText(existingText, newText) {
+        const existingTrimmed = existingText.trim();
+        const newTrimmed = newText.trim();
+        if (newTrimmed === existingTrimmed || newTrimmed.length <= existingTrimmed.length) return existingTrimmed;
+        if (newTrimmed.toLowerCase().startsWith(existingTrimmed.toLowerCase())) return newTrimmed;
+        const overlap = this.findOverlap(existingTrimmed, newTrimmed);
+        if (overlap > 0) {
+            const newPart = newTrimmed.substring(overlap).trim();
+            return newPart ? existingTrimmed + ' ' + newPart : existingTrimmed;
+        }
+        return newTrimmed.length > existingTrimmed.length ? newTrimmed : existingTrimmed;
+    }
+
+    findOverlap(text1, text2) {
+        const t1 = text1.toLowerCase();
+        const t2 = text2.toLowerCase();
+        const maxCheck = Math.min(t1.length, t2.length, 100);
+        for (let i = Math.min(maxCheck, 50); i >= 10; i--) {
+            const suffix = t1.substring(t1.length - i).trim();
+            if (t2.startsWith(suffix)) return t1.length - i;
+        }
+        return 0;
+    }
+
+    createSegment(text) {
+        const segmentId = `seg_${++this.segmentCounter}`;
+        this.openSegments.set(segmentId, { segmentId, text: text.trim() });
+        this.mostRecentSegmentId = segmentId;
+        return this.openSegments.get(segmentId);
+    }
+
+    processAsrResult(text, isFinal = false) {
+        if (!text || text.trim().length === 0) return [];
+        const trimmedText = text.trim();
+        const segment = this.findMatchingSegment(trimmedText);
+
+        if (!segment) {
+            if (this.mostRecentSegmentId) {
+                const recentSegment = this.openSegments.get(this.mostRecentSegmentId);
+                if (recentSegment && !this.sharesPrefix(trimmedText, recentSegment.text)) {
+                    const completed = this.finalizeSegment(this.mostRecentSegmentId, 'new_segment');
+                    if (completed) {
+                        this.createSegment(trimmedText);
+                        return [completed];
+                    }
+                }
+            }
+            this.createSegment(trimmedText);
+            return [];
+        }
+
+        const mergedText = this.mergeText(segment.text, trimmedText);
+        if (mergedText.length < segment.text.length) return [];
+        segment.text = mergedText;
+        return [];
+    }
+
+    finalizeSegment(segmentId, reason) {
+        const segment = this.openSegments.get(segmentId);
+        if (!segment) return null;
+        this.openSegments.delete(segmentId);
+        if (!segment.text) return null;
+        return { segmentId: segment.segmentId, text: segment.text, isComplete: true, reason };
+    }
+
+    signalHardBoundary() {
+        return this.mostRecentSegmentId ? this.finalizeSegment(this.mostRecentSegmentId, 'hard_boundary') : null;
+    }
+}
+
+export { LegacySegmentAssembler };
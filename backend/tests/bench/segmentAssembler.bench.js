@@ -0,0 +1,369 @@
+/**
+ * Segment Assembler Benchmark
+ *
+ * Replays synthetic recognizer output for many streams through three ways of
+ * turning partials and finals into committed text:
+ *
+ * - legacy:   the previous string SegmentAssembler (legacySegmentAssembler.js)
+ * - string:   the handlers' string path - PartialTracker longest-partial extension,
+ *             and mergeWithOverlap for the final that follows a forced final
+ * - timeline: the word-timeline SegmentAssembler (core/engine/segmentAssembler.js)
+ *
+ * Speech is generated from the sermon corpus with word timings. The recognizer
+ * sends a partial every --partial-ms (the last word sometimes misheard), finals
+ * with word offsets (some utterances finalized in two pieces), and restarts every
+ * --restart-seconds: the pending partial is forced final and the new recognizer
+ * recognizes the last --overlap-ms of audio again.
+ *
+ * Reports the cost per result, the word error rate of the committed transcript
+ * against the spoken words, and how long each segment is committed after the
+ * end of the audio of the final that completed it. No network or backend is needed.
+ *
+ * Run with (from backend/): node tests/bench/segmentAssembler.bench.js [options]
+ *
+ *   --streams N          Streams to replay (default: 20)
+ *   --minutes N          Simulated minutes of speech per stream (default: 10)
+ *   --seed N             Corpus and recognizer seed (default: 1)
+ *   --partial-ms N       Time between partials (default: 150)
+ *   --restart-seconds N  Time between recognizer restarts (default: 25, VAD_CUTOFF_LIMIT)
+ *   --overlap-ms N       Audio recognized again after a restart (default: 1500)
+ *   --rewrite-rate X     Share of partials whose last word is misheard (default: 0.15)
+ *   --split-rate X       Share of utterances finalized in two pieces (default: 0.25)
+ *   --label NAME         Label stored with the results (default: run)
+ *   --out DIR            Results directory (default: tests/bench/results)
+ */
+
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { parseArgs } from 'util';
+import { SegmentAssembler } from '../../../core/engine/segmentAssembler.js';
+import { PartialTracker } from '../../../core/engine/partialTracker.js';
+import { LegacySegmentAssembler } from './legacySegmentAssembler.js';
+import { generateSermonCorpus } from './sermonCorpus.js';
+import { createRandom } from './fakes/fakeOpenAI.js';
+import { gitInfo, summarize, writeResults } from './benchResults.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const BACKEND_DIR = path.resolve(__dirname, '..', '..');
+
+const FINAL_LATENCY_MS = 300;           // Final arrives this long after its last word
+const LONGEST_PARTIAL_WINDOW_MS = 10000; // As the handlers check the longest partial
+const MISHEARD = ['the', 'a', 'and', 'in', 'his', 'this', 'it'];
+
+function normalizeWord(word) {
+    return word.toLowerCase().replace(/[^\p{L}\p{N}']/gu, '');
+}
+
+function toWords(text) {
+    return text.split(/\s+/).map(normalizeWord).filter(Boolean);
+}
+
+/**
+ * Spoken words with timings, grouped into finals
+ * @returns {{ words: Object[], groupEnd: Int32Array }} - groupEnd[i]: index of the last word of word i's final
+ */
+function buildSpeech(sentences, seconds, splitRate, random) {
+    const words = [];
+    const groupEnds = [];
+    let clock = 500;
+    for (let s = 0; clock < seconds * 1000; s++) {
+        let sentence = sentences[s % sentences.length].trim();
+        sentence = sentence.charAt(0).toUpperCase() + sentence.slice(1);
+        if (!/[.!?]$/.test(sentence)) sentence += '.';
+        const spoken = sentence.split(/\s+/);
+
+        const first = words.length;
+        const split = spoken.length >= 6 && random() < splitRate
+            ? first + 2 + Math.floor(random() * (spoken.length - 3))
+            : -1;
+        for (const word of spoken) {
+            const duration = 150 + random() * 300;
+            words.push({ word, startMs: clock, endMs: clock + duration });
+            clock += duration + random() * 60;
+        }
+        for (let i = first; i < words.length; i++) {
+            groupEnds.push(split > 0 && i < split ? split - 1 : words.length - 1);
+        }
+        clock += 400 + random() * 900;
+    }
+    return { words, groupEnd: Int32Array.from(groupEnds) };
+}
+
+/**
+ * Recognizer output for one stream, in arrival order
+ * @returns {Object[]} - { t, text, isPartial, meta, audioEndMs }; audioEndMs: end of the audio the result covers
+ */
+function recognize(speech, options, random) {
+    const { words, groupEnd } = speech;
+    const events = [];
+    const endMs = words[words.length - 1].endMs + 2000;
+    let next = 0;          // First word the current recognizer has not finalized
+    let partial = null;    // Its latest partial
+    let partialEndMs = 0;
+    let nextRestart = options.restartMs;
+
+    for (let t = options.partialMs; t <= endMs; t += options.partialMs) {
+        if (t >= nextRestart) {
+            nextRestart += options.restartMs;
+            if (partial) events.push({ t, text: partial, isPartial: false, meta: { forced: true }, audioEndMs: partialEndMs });
+            partial = null;
+            // The new recognizer starts overlapMs back: words starting after that are recognized again
+            const originMs = t - options.overlapMs;
+            while (next > 0 && words[next - 1].startMs >= originMs) next--;
+            while (next < words.length && words[next].startMs < originMs) next++;
+        }
+        if (next >= words.length) continue;
+
+        const last = groupEnd[next];
+        if (t >= words[last].endMs + FINAL_LATENCY_MS) {
+            const span = words.slice(next, last + 1);
+            events.push({
+                t,
+                text: span.map(word => word.word).join(' '),
+                isPartial: false,
+                meta: { timeline: { endMs: words[last].endMs + 100, words: span } },
+                audioEndMs: words[last].endMs
+            });
+            next = last + 1;
+            partial = null;
+            continue;
+        }
+
+        let heard = next;
+        while (heard <= last && words[heard].startMs < t) heard++;
+        if (heard === next) continue;
+        const shown = words.slice(next, heard).map(word => word.word);
+        if (random() < options.rewriteRate) {
+            shown[shown.length - 1] = MISHEARD[Math.floor(random() * MISHEARD.length)];
+        }
+        const text = shown.join(' ');
+        if (text === partial) continue;
+        partial = text;
+        partialEndMs = words[heard - 1].endMs;
+        events.push({
+            t,
+            text,
+            isPartial: true,
+            meta: { timeline: { endMs: t, words: [] }, stability: 0.1 + random() * 0.8 },
+            audioEndMs: Math.min(t, words[heard - 1].endMs)
+        });
+    }
+    return events;
+}
+
+/*
+ * Each path applies one recognizer result and returns what it committed:
+ * [{ text, endMs }], endMs being the audio end of the result that made the
+ * text's last word final (so commit delay = time the path held final text)
+ */
+
+function legacyPath() {
+    const assembler = new LegacySegmentAssembler();
+    let lastEndMs = 0; // A segment is closed by the result after its last one
+    return {
+        apply(event) {
+            const endMs = lastEndMs;
+            lastEndMs = event.audioEndMs;
+            return assembler.processAsrResult(event.text, !event.isPartial).map(segment => ({ text: segment.text, endMs }));
+        },
+        finish: () => [assembler.signalHardBoundary()].filter(Boolean).map(segment => ({ text: segment.text, endMs: lastEndMs }))
+    };
+}
+
+function stringPath() {
+    const tracker = new PartialTracker();
+    let forced = null; // Forced final held for its continuation, as the handlers buffer it
+    return {
+        apply(event) {
+            if (event.isPartial) {
+                tracker.updatePartial(event.text);
+                return [];
+            }
+            if (event.meta.forced) {
+                forced = { text: event.text, endMs: event.audioEndMs };
+                tracker.reset();
+                return [];
+            }
+            let text = event.text;
+            const extension = tracker.checkLongestExtends(text, LONGEST_PARTIAL_WINDOW_MS);
+            if (extension) text = extension.extendedText;
+            tracker.reset();
+            const final = { text, endMs: event.audioEndMs };
+            if (forced === null) return [final];
+            const merged = tracker.mergeWithOverlap(forced.text, text);
+            const committed = merged ? [{ text: merged, endMs: event.audioEndMs }] : [forced, final];
+            forced = null;
+            return committed;
+        },
+        finish: () => (forced ? [forced] : [])
+    };
+}
+
+function timelinePath() {
+    const assembler = new SegmentAssembler();
+    const finalEnds = []; // audioEndMs of the finals applied, in order
+    const committed = (segment) => {
+        // Earliest final that reaches the segment's last word (the latest for forced segments)
+        let i = finalEnds.length - 1;
+        while (i > 0 && finalEnds[i - 1] >= segment.endMs) i--;
+        return { text: segment.text, endMs: finalEnds[i] };
+    };
+    return {
+        apply(event) {
+            if (!event.isPartial) finalEnds.push(event.audioEndMs);
+            return assembler.addResult(event.text, event.isPartial, event.meta).map(committed);
+        },
+        finish: () => assembler.flush().map(committed)
+    };
+}
+
+const PATHS = { legacy: legacyPath, string: stringPath, timeline: timelinePath };
+
+/**
+ * Word-level edit distance (substitutions, insertions, deletions)
+ */
+function wordErrors(reference, hypothesis) {
+    let previous = new Uint32Array(hypothesis.length + 1).map((_, j) => j);
+    let current = new Uint32Array(hypothesis.length + 1);
+    for (let i = 1; i <= reference.length; i++) {
+        current[0] = i;
+        for (let j = 1; j <= hypothesis.length; j++) {
+            const substitution = previous[j - 1] + (reference[i - 1] === hypothesis[j - 1] ? 0 : 1);
+            current[j] = Math.min(substitution, previous[j] + 1, current[j - 1] + 1);
+        }
+        [previous, current] = [current, previous];
+    }
+    return previous[hypothesis.length];
+}
+
+/**
+ * Replay every stream through one path
+ * @param {string} name - 'legacy' | 'string' | 'timeline'
+ * @param {Object[]} streams - { speech, events }
+ * @returns {Object} - Mode report
+ */
+function runMode(name, streams) {
+    const realNow = Date.now;
+    const realLog = console.log;
+    let clock = 1_700_000_000_000;
+    Date.now = () => clock;
+    console.log = () => {}; // PartialTracker logs every longer partial
+
+    const callUs = [];
+    const delaysMs = [];
+    let busyMs = 0;
+    let errors = 0;
+    let spokenWords = 0;
+    let committedWords = 0;
+    let segments = 0;
+
+    for (const { speech, events } of streams) {
+        const path = PATHS[name]();
+        const reference = speech.words.map(word => normalizeWord(word.word)).filter(Boolean);
+        const hypothesis = [];
+        const commit = (batch, t) => {
+            for (const segment of batch) {
+                hypothesis.push(...toWords(segment.text));
+                segments++;
+                if (t !== null) delaysMs.push(t - segment.endMs);
+            }
+        };
+
+        for (const event of events) {
+            clock = 1_700_000_000_000 + event.t;
+            const started = performance.now();
+            const committed = path.apply(event);
+            const elapsed = performance.now() - started;
+            busyMs += elapsed;
+            callUs.push(elapsed * 1000);
+            commit(committed, event.t);
+        }
+        // End of stream: no delay to measure
+        commit(path.finish(), null);
+
+        spokenWords += reference.length;
+        committedWords += hypothesis.length;
+        errors += wordErrors(reference, hypothesis);
+    }
+
+    console.log = realLog;
+    Date.now = realNow;
+
+    const calls = summarize(callUs);
+    const delays = summarize(delaysMs);
+    return {
+        results: callUs.length,
+        elapsedMs: Math.round(busyMs),
+        usPerResult: Number((busyMs * 1000 / callUs.length).toFixed(2)),
+        p99Us: Number(calls.p99.toFixed(2)),
+        maxUs: Number(calls.max.toFixed(2)),
+        spokenWords,
+        committedWords,
+        segments,
+        wer: Number((errors / spokenWords).toFixed(4)),
+        commitDelayMs: { p50: Math.round(delays.p50), p95: Math.round(delays.p95), max: Math.round(delays.max) }
+    };
+}
+
+function printMode(name, report) {
+    console.log(`\n${name}: ${report.results} results, ${report.segments} segments, ${report.committedWords}/${report.spokenWords} words`);
+    console.log(`  ${report.elapsedMs}ms total, ${report.usPerResult}µs per result, p99 ${report.p99Us}µs, max ${report.maxUs}µs`);
+    console.log(`  WER ${(report.wer * 100).toFixed(2)}%`);
+    console.log(`  commit delay p50 ${report.commitDelayMs.p50}ms, p95 ${report.commitDelayMs.p95}ms`);
+}
+
+function main() {
+    const { values } = parseArgs({
+        options: {
+            streams: { type: 'string', default: '20' },
+            minutes: { type: 'string', default: '10' },
+            seed: { type: 'string', default: '1' },
+            'partial-ms': { type: 'string', default: '150' },
+            'restart-seconds': { type: 'string', default: '25' },
+            'overlap-ms': { type: 'string', default: '1500' },
+            'rewrite-rate': { type: 'string', default: '0.15' },
+            'split-rate': { type: 'string', default: '0.25' },
+            label: { type: 'string', default: 'run' },
+            out: { type: 'string', default: path.join(BACKEND_DIR, 'tests', 'bench', 'results') }
+        }
+    });
+
+    const options = {
+        streams: parseInt(values.streams, 10),
+        minutes: parseFloat(values.minutes),
+        seed: parseInt(values.seed, 10),
+        partialMs: parseInt(values['partial-ms'], 10),
+        restartMs: parseFloat(values['restart-seconds']) * 1000,
+        overlapMs: parseInt(values['overlap-ms'], 10),
+        rewriteRate: parseFloat(values['rewrite-rate']),
+        splitRate: parseFloat(values['split-rate'])
+    };
+
+    const random = createRandom(options.seed);
+    const sentences = generateSermonCorpus({ finals: 2000, seed: options.seed });
+    const streams = Array.from({ length: options.streams }, () => {
+        const offset = Math.floor(random() * sentences.length);
+        const speech = buildSpeech([...sentences.slice(offset), ...sentences.slice(0, offset)], options.minutes * 60, options.splitRate, random);
+        return { speech, events: recognize(speech, options, random) };
+    });
+    const results = streams.reduce((total, stream) => total + stream.events.length, 0);
+    console.log(`[Bench] ${options.streams} streams × ${options.minutes} min, ${results} results, restart every ${options.restartMs / 1000}s`);
+
+    const modes = {};
+    for (const name of Object.keys(PATHS)) {
+        modes[name] = runMode(name, streams);
+        printMode(name, modes[name]);
+    }
+
+    const report = {
+        label: values.label,
+        createdAt: new Date().toISOString(),
+        git: gitInfo(BACKEND_DIR),
+        options,
+        modes
+    };
+    const outPath = writeResults(values.out, 'segment-assembler', report);
+    console.log(`\n[Bench] Results written to ${outPath}`);
+}
+
+main();
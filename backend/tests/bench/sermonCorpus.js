@@ -0,0 +1,123 @@
+/**
+ * Sermon transcript corpus for the Bible reference scan benchmark
+ *
+ * A corpus is a list of finals (recognized segments, in order). It is either read
+ * from a file or generated: the replay scripts' finals and sermon filler, with
+ * explicit references mixed in the way preachers say them ("turn with me to
+ * first corinthians chapter thirteen", "romans 8 28", "john three sixteen").
+ * Generation is seeded, so two runs with the same options scan the same text.
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import bookNameDetector from '../../../core/services/bookNameDetector.js';
+import { createRandom } from './fakes/fakeOpenAI.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const SCRIPTS_DIR = path.join(__dirname, 'scripts');
+
+const FILLER = [
+    'and I want you to notice something here',
+    'the people had been waiting a long time for this',
+    'he did not leave them where he found them',
+    'some of you came in tired this morning and that is alright',
+    'grace is not a reward for the faithful it is a gift for the undeserving',
+    'let that sink in for a moment',
+    'they went out and told everyone what they had seen',
+    'so what does that mean for us today',
+    'the disciples did not understand it at first',
+    'can I get an amen',
+    'we are going to read it together',
+    'look at your neighbor and tell them you are loved',
+    'that was the turning point of the whole story',
+    'there is more to this passage than we usually notice',
+    'stand with me as we read the word of the Lord'
+];
+
+const LEADS = [
+    'turn with me to', 'open your bibles to', 'as it says in', 'we read in',
+    'look at', 'the apostle writes in', 'go back with me to', ''
+];
+
+const ONES = ['', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine',
+    'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen',
+    'eighteen', 'nineteen'];
+const TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety'];
+
+/**
+ * Spoken form of 1..99 ("thirty eight")
+ */
+function spokenNumber(n) {
+    if (n < 20) return ONES[n];
+    return n % 10 === 0 ? TENS[n / 10] : `${TENS[Math.floor(n / 10)]} ${ONES[n % 10]}`;
+}
+
+function scriptFinals() {
+    const finals = [];
+    for (const file of fs.readdirSync(SCRIPTS_DIR).filter(name => name.endsWith('.jsonl')).sort()) {
+        finals.push(...readJsonlFinals(path.join(SCRIPTS_DIR, file)));
+    }
+    return finals;
+}
+
+function readJsonlFinals(file) {
+    return fs.readFileSync(file, 'utf8').split('\n')
+        .filter(line => line.trim())
+        .map(line => JSON.parse(line))
+        .filter(record => record.isPartial === false && record.transcriptText)
+        .map(record => record.transcriptText);
+}
+
+/**
+ * Generate a seeded corpus
+ * @param {Object} options
+ * @param {number} options.finals - Number of finals
+ * @param {number} options.seed - PRNG seed
+ * @param {number} options.referenceRate - Share of finals that contain a reference (0..1)
+ * @returns {string[]}
+ */
+function generateSermonCorpus({ finals = 5000, seed = 1, referenceRate = 0.15 } = {}) {
+    const random = createRandom(seed);
+    const pick = (list) => list[Math.floor(random() * list.length)];
+    const sentences = [...scriptFinals(), ...FILLER];
+    const aliases = Object.keys(bookNameDetector.BOOK_ALIASES).filter(alias => alias.length > 3);
+
+    const reference = () => {
+        const book = pick(aliases);
+        const chapter = 1 + Math.floor(random() * 50);
+        const verse = 1 + Math.floor(random() * 40);
+        const style = random();
+        let spoken;
+        if (style < 0.3) spoken = `${book} ${chapter}:${verse}`;
+        else if (style < 0.6) spoken = `${book} ${spokenNumber(chapter)} ${spokenNumber(verse)}`;
+        else if (style < 0.85) spoken = `${book} chapter ${spokenNumber(chapter)} verse ${spokenNumber(verse)}`;
+        else spoken = `${book} chapter ${spokenNumber(chapter)}`;
+        return `${pick(LEADS)} ${spoken}`.trim();
+    };
+
+    const corpus = [];
+    for (let i = 0; i < finals; i++) {
+        const parts = [pick(sentences)];
+        if (random() < referenceRate) parts.push(reference());
+        if (random() < 0.5) parts.push(pick(FILLER));
+        corpus.push(parts.join(' '));
+    }
+    return corpus;
+}
+
+/**
+ * Read a corpus file: replay-script JSONL (finals only) or plain text, one final per line
+ * @param {string} file
+ * @returns {string[]}
+ */
+function readCorpus(file) {
+    if (file.endsWith('.jsonl')) return readJsonlFinals(file);
+    return fs.readFileSync(file, 'utf8').split('\n').map(line => line.trim()).filter(Boolean);
+}
+
+export {
+    generateSermonCorpus,
+    readCorpus,
+    spokenNumber
+};
@@ -0,0 +1,144 @@
+/**
+ * Stubbed Backend for Load Generation
+ *
+ * Starts the fake recognizer and fake OpenAI (see README.md), spawns the
+ * backend against them, and keeps everything running until interrupted, so an
+ * external load generator (python -m tools.loadgen) can drive it.
+ *
+ * A small control server exposes what the load generator cannot see from the
+ * WebSocket side:
+ *
+ *   GET /status               { backendUrl, backendPid, speechStreams, openai }
+ *   GET /finals?tags=1,2,3    { "<tag>": { done, finals: [{ text, emittedAt }] } }
+ *
+ * Sessions pick their script by audio tag (scripts[tag % scripts.length], files
+ * sorted by name), exactly as in finalLatency.bench.js.
+ *
+ * Run with (from backend/): node tests/bench/stubBackend.js [options]
+ *
+ *   --port N                   Backend port (default: 3099)
+ *   --control-port N           Control server port (default: 3098)
+ *   --scripts PATH             Script file or directory of .jsonl scripts (default: tests/bench/scripts)
+ *   --speed X                  Script playback speed (default: 1)
+ *   --openai-latency MS        Fake OpenAI fixed latency (default: 250)
+ *   --openai-jitter MS         Fake OpenAI extra random latency (default: 100)
+ */
+
+import fs from 'fs';
+import http from 'http';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { parseArgs } from 'util';
+import { spawnTestServer, stopTestServer } from '../e2e/helpers/spawnServer.js';
+import { FakeSpeechServer, loadScript } from './fakes/fakeSpeechServer.js';
+import { FakeOpenAIServer } from './fakes/fakeOpenAI.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const BACKEND_DIR = path.resolve(__dirname, '..', '..');
+
+function loadScripts(target) {
+    const files = fs.statSync(target).isDirectory()
+        ? fs.readdirSync(target).filter(f => f.endsWith('.jsonl')).sort().map(f => path.join(target, f))
+        : [target];
+    return files.map(file => loadScript(file)).filter(events => events.length > 0);
+}
+
+function sendJson(res, status, body) {
+    res.writeHead(status, { 'Content-Type': 'application/json' });
+    res.end(JSON.stringify(body));
+}
+
+/**
+ * Control server for the load generator
+ */
+function startControlServer(port, { speech, openai, backend, baseUrl }) {
+    const server = http.createServer((req, res) => {
+        const url = new URL(req.url, `http://127.0.0.1:${port}`);
+        if (url.pathname === '/status') {
+            return sendJson(res, 200, {
+                backendUrl: baseUrl,
+                backendPid: backend.pid,
+                speechStreams: speech.streamCount,
+                openai: openai.getStats()
+            });
+        }
+        if (url.pathname === '/finals') {
+            const tags = (url.searchParams.get('tags') || '').split(',').filter(Boolean).map(Number);
+            const body = {};
+            for (const tag of tags) {
+                body[tag] = { done: speech.isDone(tag), finals: speech.finals(tag) };
+            }
+            return sendJson(res, 200, body);
+        }
+        sendJson(res, 404, { error: 'Unknown path' });
+    });
+    return new Promise((resolve, reject) => {
+        server.once('error', reject);
+        server.listen(port, '127.0.0.1', () => resolve(server));
+    });
+}
+
+async function main() {
+    const { values } = parseArgs({
+        options: {
+            port: { type: 'string', default: '3099' },
+            'control-port': { type: 'string', default: '3098' },
+            scripts: { type: 'string', default: path.join(__dirname, 'scripts') },
+            speed: { type: 'string', default: '1' },
+            'openai-latency': { type: 'string', default: '250' },
+            'openai-jitter': { type: 'string', default: '100' }
+        }
+    });
+
+    const scripts = loadScripts(path.resolve(values.scripts));
+    if (scripts.length === 0) {
+        throw new Error(`No scripts found in ${values.scripts}`);
+    }
+
+    const speech = new FakeSpeechServer({ scripts, speed: parseFloat(values.speed) });
+    const openai = new FakeOpenAIServer({
+        latencyMs: parseInt(values['openai-latency'], 10),
+        jitterMs: parseInt(values['openai-jitter'], 10)
+    });
+    const speechPort = await speech.listen();
+    const openaiPort = await openai.listen();
+    console.log(`[Stub] Fake recognizer on :${speechPort}, fake OpenAI on :${openaiPort}`);
+
+    // spawnTestServer starts server.js from the working directory
+    process.chdir(BACKEND_DIR);
+    const { server: backend, baseUrl } = await spawnTestServer({
+        port: parseInt(values.port, 10),
+        env: {
+            GOOGLE_SPEECH_API_ENDPOINT: `127.0.0.1:${speechPort}`,
+            OPENAI_API_BASE_URL: `http://127.0.0.1:${openaiPort}`,
+            OPENAI_API_KEY: 'bench-fake-key'
+        }
+    });
+
+    const controlPort = parseInt(values['control-port'], 10);
+    const control = await startControlServer(controlPort, { speech, openai, backend, baseUrl });
+    console.log(`[Stub] Backend at ${baseUrl} (pid ${backend.pid}), control at http://127.0.0.1:${controlPort}`);
+
+    let stopping = false;
+    const stop = async () => {
+        if (stopping) return;
+        stopping = true;
+        control.close();
+        await stopTestServer(backend);
+        await speech.close();
+        await openai.close();
+        process.exit(0);
+    };
+    process.on('SIGINT', stop);
+    process.on('SIGTERM', stop);
+    backend.on('exit', code => {
+        if (stopping) return;
+        console.error(`[Stub] ❌ Backend exited with code ${code}`);
+        stop();
+    });
+}
+
+main().catch(err => {
+    console.error('[Stub] ❌', err);
+    process.exit(1);
+});
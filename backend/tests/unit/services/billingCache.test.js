@@ -0,0 +1,132 @@
+/**
+ * Unit Tests for Billing Cache (Stripe customer IDs + portal sessions)
+ *
+ * Run with: node backend/tests/unit/services/billingCache.test.js
+ */
+
+process.env.BILLING_PORTAL_REUSE_MS = '50';
+
+const {
+    getStripeCustomerId,
+    getPortalSession,
+    clearBillingCache,
+    getBillingCacheStats
+} = await import('../../../services/billingCache.js');
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+async function run() {
+    console.log('\n=== Billing Cache Unit Tests ===\n');
+
+    // Test 1: Single-flight customer lookup
+    console.log('=== Test 1: Concurrent customer lookups ===');
+    let loads = 0;
+    const slowLoad = async (churchId) => {
+        loads++;
+        await sleep(20);
+        return `cus_${churchId}`;
+    };
+    const ids = await Promise.all(Array.from({ length: 10 }, () => getStripeCustomerId('church-1', slowLoad)));
+    assertEquals(loads, 1, 'Burst of 10 lookups loads once');
+    assert(ids.every(id => id === 'cus_church-1'), 'Every caller gets the customer ID');
+    assertEquals(getBillingCacheStats().joined, 9, 'Nine callers joined the in-flight lookup');
+    console.log('');
+
+    // Test 2: Cached afterwards
+    console.log('=== Test 2: Customer cache ===');
+    assertEquals(await getStripeCustomerId('church-1', slowLoad), 'cus_church-1', 'Cached ID returned');
+    assertEquals(loads, 1, 'Cache hit does not load');
+    await getStripeCustomerId('church-2', slowLoad);
+    assertEquals(loads, 2, 'Other church loads separately');
+    console.log('');
+
+    // Test 3: Failures are not cached
+    console.log('=== Test 3: Failures ===');
+    let attempts = 0;
+    const flaky = async () => {
+        attempts++;
+        if (attempts === 1) throw new Error('Stripe down');
+        return 'cus_flaky';
+    };
+    const results = await Promise.allSettled([getStripeCustomerId('church-3', flaky), getStripeCustomerId('church-3', flaky)]);
+    assert(results.every(r => r.status === 'rejected'), 'Joined callers see the failure');
+    assertEquals(await getStripeCustomerId('church-3', flaky), 'cus_flaky', 'Next call retries');
+    assertEquals(getBillingCacheStats().inflight, 0, 'Nothing left in flight');
+    console.log('');
+
+    // Test 4: Portal session reuse window
+    console.log('=== Test 4: Portal sessions ===');
+    let creates = 0;
+    const create = async () => {
+        creates++;
+        await sleep(10);
+        return { id: `bps_${creates}`, url: `https://billing.example/p/${creates}` };
+    };
+    const sessions = await Promise.all(Array.from({ length: 5 }, () => getPortalSession('church-1', undefined, create)));
+    assertEquals(creates, 1, 'Concurrent clicks create one portal session');
+    assert(sessions.every(s => s.id === 'bps_1'), 'Every click gets the same session');
+    assertEquals((await getPortalSession('church-1', undefined, create)).id, 'bps_1', 'Session reused inside the window');
+    assertEquals((await getPortalSession('church-1', 'subscription_update', create)).id, 'bps_2', 'Different flow gets its own session');
+    await sleep(60);
+    assertEquals((await getPortalSession('church-1', undefined, create)).id, 'bps_3', 'New session after the window');
+    console.log('');
+
+    // Test 5: Invalidation
+    console.log('=== Test 5: clearBillingCache ===');
+    clearBillingCache('church-1');
+    await getStripeCustomerId('church-1', slowLoad);
+    assertEquals(loads, 3, 'Cleared church reloads its customer');
+    assertEquals((await getPortalSession('church-1', undefined, create)).id, 'bps_4', 'Cleared church gets a new portal session');
+    await getStripeCustomerId('church-2', slowLoad);
+    assertEquals(loads, 3, 'Other churches stay cached');
+
+    const pending = getStripeCustomerId('church-4', slowLoad);
+    clearBillingCache();
+    await pending;
+    await getStripeCustomerId('church-4', slowLoad);
+    assertEquals(loads, 5, 'Load finishing after a clear is not cached');
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
@@ -0,0 +1,219 @@
+/**
+ * Unit Tests for the Bible Reference Scanner (book trie + incremental reference scan)
+ *
+ * Run with: node backend/tests/unit/services/referenceScanner.test.js
+ */
+
+import bookNameDetector, { detectBookName, findAllBookNames } from '../../../../core/services/bookNameDetector.js';
+import { normalizeTranscript } from '../../../../core/services/bibleReferenceNormalizer.js';
+import { BibleReferenceDetector } from '../../../../core/services/bibleReferenceDetector.js';
+import { ReferenceScanner, scanReferences } from '../../../../core/services/referenceScanner.js';
+import {
+    legacyDetectBookName,
+    legacyDetectExplicitReferences,
+    legacyFindAllBookNames
+} from '../../bench/legacyReferenceScan.js';
+import { createRandom } from '../../bench/fakes/fakeOpenAI.js';
+import { generateSermonCorpus } from '../../bench/sermonCorpus.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const tokensOf = (text) => normalizeTranscript(text).tokens;
+
+console.log('\n=== Test 1: Exact, ordinal and multi-token book names ===');
+assertEquals(detectBookName(['romans'], 0), { book: 'Romans', confidence: 0.9, tokenCount: 1 },
+    'Single-token alias');
+assertEquals(detectBookName(['first', 'corinthians'], 0), { book: '1 Corinthians', confidence: 0.95, tokenCount: 2 },
+    'Two-token alias');
+assertEquals(detectBookName(['1', 'corinthians'], 0), { book: '1 Corinthians', confidence: 0.9, tokenCount: 2 },
+    'Ordinal spelling of a "first X" alias');
+assertEquals(detectBookName(['3', 'john'], 0), { book: '3 John', confidence: 0.95, tokenCount: 2 },
+    'Exact two-token alias wins over its ordinal form');
+assertEquals(detectBookName(['1st', 'kings', '3'], 0), { book: '1 Kings', confidence: 0.95, tokenCount: 2 },
+    'Lookups stop at the first (shortest) match');
+assertEquals(detectBookName(['song', 'of', 'solomon'], 0), { book: 'Song of Solomon', confidence: 0.9, tokenCount: 1 },
+    'Single-token "song" wins over the three-token alias, as before');
+assertEquals(detectBookName(['fourth', 'john'], 0)?.confidence, 0.4,
+    'Ordinals without a word form only reach the fuzzy match');
+
+console.log('\n=== Test 2: Fuzzy fallback keeps alias-table order ===');
+assertEquals(detectBookName(['next'], 0), { book: 'Exodus', confidence: 0.4, tokenCount: 1 },
+    'Token containing an alias ("next" contains "ex")');
+assertEquals(detectBookName(['corin'], 0)?.book, '1 Corinthians',
+    'Token contained in an alias reports the first such alias');
+assertEquals(detectBookName(['we', 'read', 'from'], 0)?.book, 'Romans',
+    'Fuzzy match may come from a later token in the three-token window');
+assertEquals(detectBookName(['at', 'we'], 0), null, 'Tokens shorter than three characters never fuzzy match');
+
+console.log('\n=== Test 3: detectBookName parity with the alias scan ===');
+{
+    const { BOOK_ALIASES } = bookNameDetector;
+    const words = new Set(['first', 'second', 'third', 'fourth', '1st', '2nd', '3rd', '1', '2', '3', '4', 'of',
+        'the', 'chapter', 'verse', 'next', 'from', 'action', 'genesisx', 'marked', 'psalter', 'romance']);
+    for (const alias of Object.keys(BOOK_ALIASES)) alias.split(' ').forEach(word => words.add(word));
+    const vocabulary = [...words];
+
+    let mismatches = 0;
+    let checked = 0;
+    for (const a of vocabulary) {
+        for (const b of vocabulary) {
+            for (const tokens of [[a], [a, b], [a, b, 'solomon'], [a, 'of', b]]) {
+                checked++;
+                if (JSON.stringify(detectBookName(tokens, 0)) !== JSON.stringify(legacyDetectBookName(tokens, 0))) {
+                    mismatches++;
+                }
+            }
+        }
+    }
+    assertEquals(mismatches, 0, `Same detection for ${checked} token combinations`);
+}
+
+console.log('\n=== Test 4: References match the previous scan ===');
+{
+    const samples = [
+        'turn with me to first corinthians chapter thirteen verse four',
+        'romans 8:28 and we know that all things work together',
+        'john three sixteen for God so loved the world',
+        'acts chapter two verse thirty eight',
+        'psalm 23',
+        'genesis chapter one hundred twenty',
+        '2nd peter three nine and then 1 john 1 9',
+        'numbers and more numbers one two three',
+        'in the book of ruth chapter zero verse zero'
+    ];
+    for (const sample of samples) {
+        const tokens = tokensOf(sample);
+        assertEquals(scanReferences(tokens), legacyDetectExplicitReferences(tokens), `"${sample}"`);
+    }
+    assertEquals(findAllBookNames(tokensOf(samples[0])), legacyFindAllBookNames(tokensOf(samples[0])),
+        'findAllBookNames unchanged');
+    assertEquals(new ReferenceScanner().update(tokensOf(samples[0])).bookNames(), findAllBookNames(tokensOf(samples[0])),
+        'Scanner bookNames() matches findAllBookNames');
+    assertEquals(scanReferences([]), [], 'Empty token list');
+}
+
+console.log('\n=== Test 5: Growing partials only scan new tokens ===');
+{
+    const words = 'and now turn with me to romans chapter eight verse twenty eight please'.split(' ');
+    const scanner = new ReferenceScanner();
+    let mismatches = 0;
+    for (let i = 1; i <= words.length; i++) {
+        const tokens = tokensOf(words.slice(0, i).join(' '));
+        if (JSON.stringify(scanner.update(tokens).references()) !== JSON.stringify(legacyDetectExplicitReferences(tokens))) {
+            mismatches++;
+        }
+    }
+    assertEquals(mismatches, 0, 'Every partial matches a full scan');
+    const stats = scanner.getStats();
+    assert(stats.tokensScanned <= 3 * words.length,
+        `Each position looked up at most three times (${stats.tokensScanned} lookups for ${words.length} tokens)`);
+    assert(stats.tokensReused > 0, 'Common prefix reused');
+}
+
+console.log('\n=== Test 6: Revised tail and sliding window ===');
+{
+    const scanner = new ReferenceScanner();
+    scanner.update(tokensOf('please turn to john chapter three'));
+    const revised = tokensOf('please turn to john chapter two verse one');
+    assertEquals(scanner.update(revised).references(), legacyDetectExplicitReferences(revised),
+        'Revised partial tail rescans from the change');
+
+    const window = tokensOf('we read in romans 8 28 and then we go on to hebrews eleven one');
+    scanner.reset();
+    scanner.update(window).references();
+    const before = scanner.getStats().tokensScanned;
+    const slid = [...window.slice(4), ...tokensOf('faith is the substance')];
+    assertEquals(scanner.update(slid).references(), legacyDetectExplicitReferences(slid),
+        'Window that dropped tokens from the front');
+    assert(scanner.getStats().tokensScanned - before <= 4 + 2, 'Slide only scans the appended tokens and the old tail');
+
+    const unrelated = tokensOf('james one five');
+    assertEquals(scanner.update(unrelated).references(), legacyDetectExplicitReferences(unrelated),
+        'Unrelated token list falls back to a full scan');
+}
+
+console.log('\n=== Test 7: Randomized updates match the previous scan ===');
+{
+    const random = createRandom(7);
+    const vocabulary = ['romans', 'john', 'first', '1', 'third', 'song', 'of', 'solomon', 'chapter', 'verse',
+        'one', 'two', 'thirty', 'eight', 'hundred', 'twenty', '3', '16', '28', 'the', 'lord', 'said', 'from',
+        'next', 'acts', 'psalm', 'kings', 'peter', 'and', 'zero'];
+    const scanner = new ReferenceScanner();
+    let tokens = [];
+    let mismatches = 0;
+    for (let step = 0; step < 2000; step++) {
+        const op = random();
+        if (op < 0.6) {
+            tokens = [...tokens, ...Array.from({ length: 1 + Math.floor(random() * 3) },
+                () => vocabulary[Math.floor(random() * vocabulary.length)])];
+        } else if (op < 0.8) {
+            tokens = tokens.slice(0, Math.floor(random() * tokens.length));
+        } else {
+            tokens = tokens.slice(Math.floor(random() * 5));
+        }
+        if (tokens.length > 60) tokens = tokens.slice(-60);
+        if (JSON.stringify(scanner.update(tokens).references()) !== JSON.stringify(legacyDetectExplicitReferences(tokens))) {
+            mismatches++;
+        }
+    }
+    assertEquals(mismatches, 0, '2000 random appends, truncations and slides');
+}
+
+console.log('\n=== Test 8: Generated sermon corpus through BibleReferenceDetector ===');
+{
+    const detector = new BibleReferenceDetector({ enableAIMatching: false });
+    let window = [];
+    let mismatches = 0;
+    let references = 0;
+    for (const final of generateSermonCorpus({ finals: 300, seed: 3 })) {
+        window.push(...final.split(/\s+/));
+        if (window.length > 100) window = window.slice(-100);
+        const normalized = normalizeTranscript(window.join(' '));
+        const actual = detector.detectExplicitReferences(normalized, window.join(' '));
+        references += actual.length;
+        if (JSON.stringify(actual) !== JSON.stringify(legacyDetectExplicitReferences(normalized.tokens))) {
+            mismatches++;
+        }
+    }
+    assert(references > 0, `Corpus produces references (${references})`);
+    assertEquals(mismatches, 0, 'Sliding-window detection matches the previous scan');
+    assert(detector.referenceScanner.getStats().tokensReused > 0, 'Detector reuses work across windows');
+}
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
@@ -0,0 +1,294 @@
+/**
+ * Unit Tests for the TTS Audio Cache
+ *
+ * Tests request keying, memory/disk tiers, LRU eviction, single-flight
+ * coalescing and chunked replay.
+ * Run with: node backend/tests/unit/tts/ttsAudioCache.test.js
+ */
+
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import {
+    TtsAudioCache,
+    normalizeTtsText,
+    streamingCacheKey,
+    synthesizeUnaryCached,
+    unaryCacheKey
+} from '../../../tts/ttsAudioCache.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Provider stream handle yielding `chunks` (arrays of byte values) `delayMs` apart
+ */
+function fakeProvider(chunks, { delayMs = 5, failAfter = null } = {}) {
+    const provider = { calls: 0, cancelled: 0 };
+    provider.produce = () => {
+        provider.calls++;
+        let cancelled = false;
+        async function* generate() {
+            for (let i = 0; i < chunks.length; i++) {
+                await sleep(delayMs);
+                if (cancelled) return; // Like the providers: an aborted request just ends
+                if (failAfter !== null && i === failAfter) throw new Error('provider failed');
+                yield Uint8Array.from(chunks[i]);
+            }
+        }
+        return {
+            chunks: generate(),
+            cancel: () => {
+                cancelled = true;
+                provider.cancelled++;
+            },
+            getTimeToFirstByteMs: () => null
+        };
+    };
+    return provider;
+}
+
+async function collect(handle) {
+    const bytes = [];
+    const sizes = [];
+    for await (const chunk of handle.chunks) {
+        bytes.push(...chunk);
+        sizes.push(chunk.length);
+    }
+    return { bytes, sizes };
+}
+
+const key = (text, extra = {}) => streamingCacheKey({ text, provider: 'google', voice: 'en-US-Chirp3-HD-Kore', audioEncoding: 'MP3', ...extra });
+
+async function run() {
+    console.log('\n=== TTS Audio Cache Unit Tests ===\n');
+    const tempDir = fs.mkdtempSync(path.join(os.tmpdir(), 'tts-cache-test-'));
+
+    // Test 1: Keys
+    console.log('=== Test 1: Request keys ===');
+    assertEquals(normalizeTtsText('  In the\tbeginning \n was '), 'In the beginning was', 'Whitespace collapsed');
+    assertEquals(normalizeTtsText('José'), 'José', 'Unicode composed (NFC)');
+    assertEquals(key('In the  beginning'), key(' In the beginning '), 'Spacing does not change the key');
+    assert(key('In the beginning') !== key('in the beginning'), 'Case changes the key');
+    assert(key('Amen') !== key('Amen', { voice: 'en-US-Chirp3-HD-Puck' }), 'Voice changes the key');
+    assert(key('Amen') !== key('Amen', { audioEncoding: 'OGG_OPUS' }), 'Format changes the key');
+    const route = { provider: 'google', tier: 'gemini', engine: 'gemini', voiceName: 'Kore', languageCode: 'es-ES', model: 'gemini-2.5-flash-tts', audioEncoding: 'MP3' };
+    const request = {
+        sessionId: 's1', userId: 'u1', orgId: 'o1', segmentId: 'seg-1', text: 'Amén',
+        profile: { engine: 'gemini', requestedTier: 'gemini', languageCode: 'es-ES', voiceName: 'Kore', streaming: true, prompt: null },
+        ssmlOptions: { rate: '1.1' }, promptPresetId: 'preacher', ttsPrompt: null, intensity: 3
+    };
+    const sameAudio = {
+        ...request, sessionId: 's2', userId: 'u2', segmentId: 'seg-9',
+        profile: { ...request.profile, streaming: false }, ssmlOptions: { rate: '1.1' }
+    };
+    assertEquals(unaryCacheKey(sameAudio, route), unaryCacheKey(request, route), 'Session, user and segment do not change the unary key');
+    assert(unaryCacheKey({ ...request, promptPresetId: 'narrator' }, route) !== unaryCacheKey(request, route), 'Prompt preset changes the unary key');
+    assert(unaryCacheKey({ ...request, ssmlOptions: { rate: '0.9' } }, route) !== unaryCacheKey(request, route), 'SSML options change the unary key');
+    assert(unaryCacheKey(request, { ...route, model: 'gemini-2.5-pro-tts' }) !== unaryCacheKey(request, route), 'Routed model changes the unary key');
+    assert(unaryCacheKey({ ...request, text: 'Amen' }, route) !== streamingCacheKey({ text: 'Amen', provider: 'google', voice: 'Kore', audioEncoding: 'MP3' }),
+        'Unary and streaming keys never collide');
+    console.log('');
+
+    // Test 2: Miss, then replay from memory in fixed-size chunks
+    console.log('=== Test 2: Miss then memory replay ===');
+    let cache = new TtsAudioCache({ memoryMaxBytes: 1000, replayChunkBytes: 4 });
+    let provider = fakeProvider([[1, 2, 3], [4, 5, 6, 7, 8], [9, 10]]);
+    let handle = cache.stream(key('Amen'), provider.produce, { codec: 'mp3' });
+    let result = await collect(handle);
+    assertEquals([result.bytes, result.sizes], [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [3, 5, 2]], 'Miss streams provider chunks as they come');
+    assertEquals(handle.getSource(), 'provider', 'Source is the provider');
+    handle = cache.stream(key('Amen'), provider.produce);
+    result = await collect(handle);
+    assertEquals([result.bytes, result.sizes], [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [4, 4, 2]], 'Hit replays the clip in replayChunkBytes slices');
+    assertEquals([handle.getSource(), provider.calls], ['memory', 1], 'Hit served from memory without a provider call');
+    assert(handle.getTimeToFirstByteMs() <= 2, `Hit time to first byte ${handle.getTimeToFirstByteMs()}ms`);
+    assertEquals((await cache.lookup(key('Amen'))).meta, { codec: 'mp3' }, 'Meta stored with the clip');
+    console.log('');
+
+    // Test 3: Concurrent identical requests share one synthesis
+    console.log('=== Test 3: Single flight ===');
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000 });
+    provider = fakeProvider([[1], [2], [3], [4]], { delayMs: 10 });
+    const first = cache.stream(key('Grace'), provider.produce);
+    const firstDone = collect(first);
+    await sleep(25); // Two chunks produced
+    const second = cache.stream(key('Grace'), provider.produce);
+    const [firstResult, secondResult] = await Promise.all([firstDone, collect(second)]);
+    assertEquals(provider.calls, 1, 'One provider call for two identical requests');
+    assertEquals(secondResult.bytes, [1, 2, 3, 4], 'Late caller gets the chunks already produced, then the rest');
+    assertEquals(firstResult.bytes, secondResult.bytes, 'Both callers get the same audio');
+    assertEquals([first.getSource(), second.getSource()], ['provider', 'inflight'], 'Sources');
+    assertEquals([cache.getStats().misses, cache.getStats().coalesced, cache.getStats().inflight], [1, 1, 0], 'Stats');
+    console.log('');
+
+    // Test 4: Cancels and failures store nothing
+    console.log('=== Test 4: Cancel and failure ===');
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000 });
+    provider = fakeProvider([[1], [2], [3], [4]], { delayMs: 10 });
+    const a = cache.stream(key('Peace'), provider.produce);
+    const b = cache.stream(key('Peace'), provider.produce);
+    const aDone = collect(a);
+    const bDone = collect(b);
+    await sleep(15);
+    a.cancel();
+    assertEquals((await bDone).bytes, [1, 2, 3, 4], 'Other consumer keeps receiving after one cancels');
+    await aDone;
+    assertEquals(provider.cancelled, 0, 'Synthesis not cancelled while someone listens');
+    assert(cache.memory.has(key('Peace')), 'Completed clip stored');
+
+    provider = fakeProvider([[1], [2], [3], [4]], { delayMs: 10 });
+    handle = cache.stream(key('Joy'), provider.produce);
+    const received = [];
+    for await (const chunk of handle.chunks) {
+        received.push(...chunk);
+        handle.cancel();
+    }
+    await sleep(30);
+    assertEquals([received, provider.cancelled], [[1], 1], 'Last consumer cancelling cancels the synthesis');
+    assert(!cache.memory.has(key('Joy')), 'Truncated clip not stored');
+
+    provider = fakeProvider([[1], [2], [3]], { delayMs: 5, failAfter: 2 });
+    const errors = await Promise.all([0, 1].map(async () => {
+        try {
+            await collect(cache.stream(key('Hope'), provider.produce));
+            return null;
+        } catch (error) {
+            return error.message;
+        }
+    }));
+    assertEquals([errors, provider.calls], [['provider failed', 'provider failed'], 1], 'Provider error reaches every consumer');
+    assert(!cache.memory.has(key('Hope')) && cache.flights.size === 0, 'Failed clip not stored, flight cleared');
+    provider = fakeProvider([[7]], { delayMs: 1 });
+    assertEquals((await collect(cache.stream(key('Hope'), provider.produce))).bytes, [7], 'Next request synthesizes again');
+    console.log('');
+
+    // Test 5: Memory LRU
+    console.log('=== Test 5: Memory LRU ===');
+    cache = new TtsAudioCache({ memoryMaxBytes: 10, maxClipBytes: 6 });
+    cache.remember('a', Buffer.alloc(4), {});
+    cache.remember('b', Buffer.alloc(4), {});
+    await cache.lookup('a');
+    cache.remember('c', Buffer.alloc(4), {});
+    assertEquals([...cache.memory.keys()], ['a', 'c'], 'Least recently used clip evicted');
+    assertEquals([cache.memoryBytes, cache.getStats().memoryEvictions], [8, 1], 'Bytes and evictions');
+    cache.remember('d', Buffer.alloc(7), {});
+    assert(!cache.memory.has('d'), 'Clip over maxClipBytes kept out of memory');
+    console.log('');
+
+    // Test 6: Disk tier
+    console.log('=== Test 6: Disk tier ===');
+    const diskDir = path.join(tempDir, 'clips');
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000, diskDir, diskMaxBytes: 100 });
+    provider = fakeProvider([[1, 2, 3], [4, 5]], { delayMs: 1 });
+    await collect(cache.stream(key('Psalm 23'), provider.produce, { codec: 'opus' }));
+    await cache.flush();
+    assertEquals(fs.readdirSync(diskDir), [`${key('Psalm 23')}.tts`], 'Clip written to disk, no temp files left');
+
+    // A fresh process: memory empty, index rebuilt from the directory
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000, diskDir, diskMaxBytes: 100 });
+    handle = cache.stream(key('Psalm 23'), provider.produce);
+    result = await collect(handle);
+    assertEquals([result.bytes, handle.getSource(), provider.calls], [[1, 2, 3, 4, 5], 'disk', 1], 'Clip survives a restart');
+    assertEquals((await cache.lookup(key('Psalm 23'))).source, 'memory', 'Disk hit promoted to memory');
+
+    fs.writeFileSync(path.join(diskDir, `${key('corrupt')}.tts`), 'garbage');
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000, diskDir, diskMaxBytes: 100 });
+    assertEquals(await cache.lookup(key('corrupt')), null, 'Unreadable clip is a miss');
+    await sleep(10);
+    assert(!fs.existsSync(path.join(diskDir, `${key('corrupt')}.tts`)), 'Unreadable clip removed');
+
+    // Each stored file: 8-byte prefix + 2-byte "{}" meta + 30 bytes of audio = 40 bytes
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000, diskDir: path.join(tempDir, 'lru'), diskMaxBytes: 100 });
+    for (const name of ['one', 'two', 'three']) {
+        await cache.getOrSynthesize(name, async () => ({ audio: Buffer.alloc(30, 1), meta: {} }));
+        await cache.flush();
+    }
+    assertEquals([cache.disk.size, cache.diskBytes, cache.getStats().diskEvictions], [2, 80, 1], 'Disk tier bounded by diskMaxBytes');
+    assert(!fs.existsSync(path.join(tempDir, 'lru', 'one.tts')), 'Oldest clip file deleted');
+
+    const blocked = path.join(tempDir, 'not-a-dir');
+    fs.writeFileSync(blocked, '');
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000, diskDir: blocked });
+    const originalWarn = console.warn;
+    console.warn = () => {};
+    await cache.getOrSynthesize('x', async () => ({ audio: Buffer.alloc(3), meta: {} }));
+    await cache.flush();
+    console.warn = originalWarn;
+    assertEquals([cache.diskDir, (await cache.lookup('x')).source], [null, 'memory'], 'Unusable directory disables the disk tier only');
+    console.log('');
+
+    // Test 7: Unary synthesis through the cache
+    console.log('=== Test 7: Unary synthesis ===');
+    cache = new TtsAudioCache({ memoryMaxBytes: 1000 });
+    const service = {
+        calls: 0,
+        async synthesizeUnary(ttsRequest, ttsRoute) {
+            this.calls++;
+            await sleep(10);
+            return {
+                segmentId: ttsRequest.segmentId,
+                audio: { bytesBase64: Buffer.from('mp3-bytes').toString('base64'), mimeType: 'audio/mpeg', durationMs: undefined, sampleRateHz: 24000 },
+                mode: 'unary',
+                route: ttsRoute,
+                promptMetadata: null
+            };
+        }
+    };
+    const responses = await Promise.all([
+        synthesizeUnaryCached(service, request, route, cache),
+        synthesizeUnaryCached(service, sameAudio, route, cache)
+    ]);
+    assertEquals(service.calls, 1, 'Concurrent identical unary requests synthesized once');
+    assertEquals(responses.map(response => response.segmentId), ['seg-1', 'seg-9'], 'Each caller gets its own segmentId');
+    assertEquals(responses.map(response => response.cache), ['provider', 'inflight'], 'Cache source reported');
+    const hit = await synthesizeUnaryCached(service, { ...request, segmentId: 'seg-10' }, route, cache);
+    assertEquals([hit.cache, hit.audio.mimeType, Buffer.from(hit.audio.bytesBase64, 'base64').toString(), hit.route.tier],
+        ['memory', 'audio/mpeg', 'mp3-bytes', 'gemini'], 'Hit rebuilds the full response');
+    assertEquals(service.calls, 1, 'Hit made no provider call');
+    const uncached = await synthesizeUnaryCached(service, request, route, null);
+    assertEquals([uncached.cache, service.calls], [undefined, 2], 'No cache: plain synthesizeUnary');
+
+    fs.rmSync(tempDir, { recursive: true, force: true });
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
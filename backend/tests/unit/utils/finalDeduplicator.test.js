@@ -0,0 +1,141 @@
+/**
+ * Unit Tests for Rolling-Window Final Deduplicator
+ *
+ * Run with: node backend/tests/unit/utils/finalDeduplicator.test.js
+ */
+
+import { FinalDeduplicator, getFinalDedupStats, normalizeFinal } from '../../../utils/finalDeduplicator.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+console.log('\n=== Final Deduplicator Unit Tests ===\n');
+
+// Test 1: Normalization
+console.log('=== Test 1: Normalization ===');
+assertEquals(normalizeFinal('  And the LORD said,  "Let there be light!" '), 'and the lord said let there be light', 'Case, punctuation and spacing normalized');
+assertEquals(normalizeFinal('¿Dónde está?'), 'dónde está', 'Accented letters kept');
+assertEquals(normalizeFinal(''), '', 'Empty text');
+console.log('');
+
+// Test 2: Exact duplicates anywhere in the window
+console.log('=== Test 2: Exact duplicates ===');
+let dedup = new FinalDeduplicator({ sessionId: 'test-exact' });
+assertEquals(dedup.checkAndRecord('In the beginning God created the heavens.').duplicate, false, 'First final passes');
+assertEquals(dedup.checkAndRecord('And the earth was without form and void.').duplicate, false, 'Different final passes');
+let result = dedup.checkAndRecord('in the beginning, God created the heavens');
+assertEquals(result.duplicate, true, 'Repeat from two finals back caught');
+assertEquals(result.kind, 'exact', 'Punctuation/case-only difference is an exact match');
+assertEquals(dedup.getStats().windowEntries, 2, 'Duplicate not recorded');
+dedup.dispose();
+console.log('');
+
+// Test 3: Near duplicates
+console.log('=== Test 3: Near duplicates ===');
+dedup = new FinalDeduplicator({ sessionId: 'test-near' });
+dedup.checkAndRecord('For God so loved the world that he gave his only begotten son');
+result = dedup.checkAndRecord('God so loved the world that he gave his only begotten son');
+assertEquals(result.kind, 'near', 'Final missing a leading word is a near duplicate');
+assert(result.similarity >= 0.8, `Similarity reported (${result.similarity?.toFixed(2)})`);
+assertEquals(dedup.checkAndRecord('For God so loved the world that he gave his only begotten son Jesus').duplicate, false,
+    'Final adding a word is never suppressed');
+assertEquals(dedup.checkAndRecord('Whosoever believeth in him should not perish but have everlasting life').duplicate, false,
+    'Unrelated final passes');
+assertEquals(dedup.check('For God so loved the world that he gave').duplicate, false, 'Too dissimilar prefix passes');
+dedup.dispose();
+
+dedup = new FinalDeduplicator({ sessionId: 'test-novel', maxNovelWords: 1 });
+dedup.checkAndRecord('The Lord is my shepherd I shall not want anything');
+assertEquals(dedup.check('The Lord is my shepherd I shall not want anything more').duplicate, true,
+    'maxNovelWords allows trailing-word variants');
+dedup.dispose();
+console.log('');
+
+// Test 4: Short finals only compare with the previous final
+console.log('=== Test 4: Short finals ===');
+dedup = new FinalDeduplicator({ sessionId: 'test-short' });
+dedup.checkAndRecord('Amen.');
+assertEquals(dedup.checkAndRecord('Amen!').duplicate, true, 'Immediate short repeat caught');
+dedup.checkAndRecord('Let us turn to the book of Romans.');
+assertEquals(dedup.checkAndRecord('Amen.').duplicate, false, 'Short final repeated later is kept');
+dedup.dispose();
+console.log('');
+
+// Test 5: Window bounds
+console.log('=== Test 5: Window bounds ===');
+dedup = new FinalDeduplicator({ sessionId: 'test-window', windowSize: 2 });
+dedup.checkAndRecord('first sentence of the sermon today');
+dedup.checkAndRecord('second sentence of the sermon today friends');
+dedup.checkAndRecord('a third and completely different thought');
+assertEquals(dedup.check('first sentence of the sermon today').duplicate, false, 'Final pushed out of the window is forgotten');
+assertEquals(dedup.getStats().windowEntries, 2, 'Window capped at windowSize');
+assertEquals(dedup.buckets.size <= 2 * 8, true, 'Evicted entries leave no LSH buckets behind');
+dedup.dispose();
+
+dedup = new FinalDeduplicator({ sessionId: 'test-age', windowMs: 1 });
+dedup.checkAndRecord('grace and peace to you from God our Father');
+const start = Date.now();
+while (Date.now() - start < 5) { /* wait past the window */ }
+assertEquals(dedup.check('grace and peace to you from God our Father').duplicate, false, 'Expired final is forgotten');
+assertEquals(dedup.getStats().windowEntries, 0, 'Expired entries removed');
+dedup.dispose();
+console.log('');
+
+// Test 6: Savings counters
+console.log('=== Test 6: Savings counters ===');
+const before = getFinalDedupStats().totals;
+dedup = new FinalDeduplicator({ sessionId: 'test-savings' });
+dedup.checkAndRecord('Blessed are the poor in spirit', { translations: 3, recipients: 10 });
+dedup.checkAndRecord('Blessed are the poor in spirit.', { translations: 3, recipients: 10 });
+dedup.checkAndRecord('Blessed are the poor in spirit', { translations: 0, recipients: 1 });
+let stats = dedup.getStats();
+assertEquals(stats.checked, 3, 'Checks counted');
+assertEquals(stats.exactDuplicates, 2, 'Exact duplicates counted');
+assertEquals(stats.translationsSaved, 3, 'Translation calls saved counted');
+const textBytes = Buffer.byteLength('Blessed are the poor in spirit.');
+assert(stats.broadcastBytesSaved > textBytes * 2 * 10, `Broadcast bytes saved counted (${stats.broadcastBytesSaved})`);
+
+let live = getFinalDedupStats();
+assert(live.sessions.some(s => s.sessionId === 'test-savings'), 'Live deduplicator listed');
+dedup.dispose();
+dedup.dispose();
+live = getFinalDedupStats();
+assert(!live.sessions.some(s => s.sessionId === 'test-savings'), 'Disposed deduplicator removed');
+assertEquals(live.totals.translationsSaved - before.translationsSaved, 3, 'Disposed counters kept in totals once');
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
@@ -0,0 +1,202 @@
+/**
+ * Unit Tests for Final Merge and the Final Merge Queue
+ *
+ * Run with: node backend/tests/unit/utils/finalMergeQueue.test.js
+ */
+
+import { mergeFinal, runFinalMergeJob } from '../../../utils/finalMerge.js';
+import { FinalMergeQueue, getFinalMergeStats } from '../../../utils/finalMergeQueue.js';
+import { TranscriptBuffer } from '../../../utils/transcriptBuffer.js';
+import { WorkerPool } from '../../../utils/workerPool.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+function branches(events) {
+    return events.map(e => e.event);
+}
+
+// Pool stand-in that runs jobs on the main thread after a delay
+function delayedPool(delayMs) {
+    return {
+        async run(job) {
+            await sleep(delayMs);
+            return runFinalMergeJob(job);
+        }
+    };
+}
+
+async function run() {
+    console.log('\n=== Final Merge Unit Tests ===\n');
+
+    // Test 1: Merge branches
+    console.log('=== Test 1: Merge branches ===');
+    const buffer = new TranscriptBuffer();
+    let result = mergeFinal(buffer, 'And God said let there be light');
+    assertEquals([result.text, result.events], ['And God said let there be light', []], 'First final starts accumulation');
+
+    result = mergeFinal(buffer, 'God said let there be light and there was light');
+    assertEquals(branches(result.events), ['accumulate'], 'Overlapping final accumulates');
+    assertEquals(result.text, 'And God said let there be light and there was light', 'Overlap merged once');
+
+    result = mergeFinal(buffer, 'let there be light and there was light');
+    assertEquals([branches(result.events), result.text], [['contained'], buffer.toString()], 'Contained final keeps accumulated text');
+
+    result = mergeFinal(buffer, 'Saw');
+    assertEquals(branches(result.events), ['append'], 'Unrelated short final appended');
+
+    buffer.set('And God saw the light');
+    const longer = 'In the beginning God created the heavens and the earth and the earth was without form and void, and darkness was upon the deep';
+    result = mergeFinal(buffer, longer);
+    assertEquals([branches(result.events), buffer.toString()], [['replace'], longer], 'Much longer final replaces');
+    buffer.dispose();
+    console.log('');
+
+    // Test 2: Partial recovery
+    console.log('=== Test 2: Partial recovery ===');
+    let partialBuffer = new TranscriptBuffer();
+    result = mergeFinal(partialBuffer, 'Blessed are the poor', 'Blessed are the poor in spirit for theirs');
+    assertEquals([branches(result.events), result.text], [['partial_override'], 'Blessed are the poor in spirit for theirs'],
+        'Partial extending the final overrides it');
+    assertEquals(partialBuffer.toString(), result.text, 'Buffer holds the recovered text');
+    partialBuffer.dispose();
+
+    partialBuffer = new TranscriptBuffer();
+    result = mergeFinal(partialBuffer, 'blessed are the meek for they shall', 'the meek for they shall inherit the earth');
+    assertEquals([branches(result.events), result.text], [['partial_merge'], 'blessed are the meek for they shall inherit the earth'],
+        'Overlapping partial merged onto the final');
+    partialBuffer.dispose();
+
+    partialBuffer = new TranscriptBuffer();
+    result = mergeFinal(partialBuffer, 'Amen', 'Amen');
+    assertEquals(result.events, [], 'Partial no longer than the final ignored');
+    partialBuffer.dispose();
+    console.log('');
+
+    // Test 3: Job round trip matches merging in place
+    console.log('=== Test 3: Job round trip ===');
+    const inPlace = new TranscriptBuffer({ tailWindowChars: 64 });
+    const copied = new TranscriptBuffer({ tailWindowChars: 64 });
+    const finals = [
+        'Now faith is the substance of things hoped for',
+        'the substance of things hoped for, the evidence of things not seen',
+        'For by it',
+        'For by it the elders obtained a good report. Through faith we understand that the worlds were framed by the word of God, so that things which are seen were not made of things which do appear'
+    ];
+    for (const finalText of finals) {
+        const expected = mergeFinal(inPlace, finalText);
+        const job = await runFinalMergeJob({
+            segments: copied.getSegments(),
+            tailWindowChars: copied.tailWindowChars,
+            maxChars: copied.maxChars,
+            finalText
+        });
+        copied.load(job.segments);
+        assertEquals([job.text, job.cleanedText, job.events], [expected.text, expected.text, expected.events],
+            `Job result matches in-place merge for "${finalText}"`);
+    }
+    assertEquals([copied.toString(), copied.length, copied.getTail()], [inPlace.toString(), inPlace.length, inPlace.getTail()],
+        'Loaded segments rebuild the same buffer');
+    inPlace.dispose();
+    copied.dispose();
+    console.log('');
+
+    // Test 4: Results in submission order
+    console.log('=== Test 4: Queue ordering ===');
+    let sessionBuffer = new TranscriptBuffer();
+    let queue = new FinalMergeQueue({ sessionId: 'order', buffer: sessionBuffer, pool: delayedPool(5) });
+    const seen = [];
+    queue.submit('the Lord is my shepherd', '', ({ text }) => seen.push(text));
+    queue.submit('the Lord is my shepherd I shall not want', '', ({ text }) => seen.push(text));
+    assertEquals(queue.getStats().queued, 1, 'Second final waits for the first');
+    assert(getFinalMergeStats().sessions.some(s => s.sessionId === 'order'), 'Queue listed in stats');
+    await sleep(50);
+    assertEquals(seen, ['the Lord is my shepherd', 'the Lord is my shepherd I shall not want'],
+        'Each final merged onto the previous result, in order');
+    assertEquals(sessionBuffer.toString(), seen[1], 'Session buffer updated');
+    queue.dispose();
+    assert(!getFinalMergeStats().sessions.some(s => s.sessionId === 'order'), 'Disposed queue removed from stats');
+    sessionBuffer.dispose();
+    console.log('');
+
+    // Test 5: A clear during the job re-runs it against the cleared buffer
+    console.log('=== Test 5: Clear while running ===');
+    sessionBuffer = new TranscriptBuffer();
+    queue = new FinalMergeQueue({ sessionId: 'clear', buffer: sessionBuffer, pool: delayedPool(20) });
+    const delivered = [];
+    queue.submit('he restoreth my soul', '', ({ text }) => delivered.push(text));
+    await sleep(40);
+    // Final B is merging onto [A] when A is sent and the buffer cleared
+    queue.submit('he leadeth me', '', ({ text }) => delivered.push(text));
+    await sleep(5);
+    sessionBuffer.clear();
+    await sleep(80);
+    assertEquals(delivered, ['he restoreth my soul', 'he leadeth me'], 'Already-sent final not repeated in the next result');
+    assertEquals(sessionBuffer.toString(), 'he leadeth me', 'Buffer rebuilt from the cleared state');
+    assertEquals(queue.getStats().clearedWhileRunning, 1, 'Clear counted');
+
+    let late = false;
+    queue.submit('in paths of righteousness', '', () => { late = true; });
+    queue.dispose();
+    await sleep(40);
+    assert(!late, 'Result of a disposed queue dropped');
+    sessionBuffer.dispose();
+    console.log('');
+
+    // Test 6: Pool of size 0 runs on the main thread
+    console.log('=== Test 6: Main-thread pool ===');
+    const pool = new WorkerPool({ name: 'final-merge-test', script: 'unused', size: 0, fallback: (job) => runFinalMergeJob(job) });
+    sessionBuffer = new TranscriptBuffer();
+    queue = new FinalMergeQueue({ sessionId: 'main', buffer: sessionBuffer, pool });
+    const mainResults = [];
+    queue.submit('surely goodness and mercy', '', ({ text }) => mainResults.push(text));
+    queue.submit('and mercy shall follow me', '', ({ text }) => { mainResults.push(text); throw new Error('handler bug'); });
+    queue.submit('all the days of my life', '', ({ text }) => mainResults.push(text));
+    await sleep(20);
+    assertEquals(mainResults.length, 3, 'All finals delivered, even after a throwing handler');
+    assertEquals(pool.getStats().fallbacks.unavailable, 3, 'Jobs ran through the fallback');
+    queue.dispose();
+    pool.dispose();
+    sessionBuffer.dispose();
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
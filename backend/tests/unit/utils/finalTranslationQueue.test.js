@@ -0,0 +1,186 @@
+/**
+ * Unit Tests for Final Translation Queue
+ *
+ * Run with: node backend/tests/unit/utils/finalTranslationQueue.test.js
+ */
+
+import { FinalTranslationQueue, isSupersededBy } from '../../../utils/finalTranslationQueue.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Fake translator: resolves after `delays[text]` ms (default 20), honours abort
+ */
+function createTranslator(delays = {}) {
+    const translator = { calls: [], aborted: [] };
+    translator.translate = (text, signal) => new Promise((resolve, reject) => {
+        translator.calls.push(text);
+        const timer = setTimeout(() => resolve(`ES(${text})`), delays[text] ?? 20);
+        signal.addEventListener('abort', () => {
+            clearTimeout(timer);
+            translator.aborted.push(text);
+            const error = new Error('This operation was aborted');
+            error.name = 'AbortError';
+            reject(error);
+        });
+    });
+    return translator;
+}
+
+async function run() {
+    console.log('\n=== Final Translation Queue Unit Tests ===\n');
+
+    // Test 1: Supersede rule
+    console.log('=== Test 1: Supersede rule ===');
+    assert(isSupersededBy('And God said', 'And God said let there be light'), 'Extended final supersedes');
+    assert(isSupersededBy('  God said ', 'And God said let there be light'), 'Contained final supersedes (trimmed)');
+    assert(!isSupersededBy('let there be light', 'And God said'), 'Shorter unrelated final does not supersede');
+    assert(!isSupersededBy('And God said', 'Next sentence entirely'), 'Independent final does not supersede');
+    console.log('');
+
+    // Test 2: Burst within the coalescing window makes one API call
+    console.log('=== Test 2: Coalescing ===');
+    let translator = createTranslator();
+    let delivered = [];
+    let queue = new FinalTranslationQueue({
+        coalesceMs: 30,
+        translate: translator.translate,
+        deliver: (result) => delivered.push(result)
+    });
+    queue.enqueue('In the beginning');
+    queue.enqueue('In the beginning God created');
+    queue.enqueue('In the beginning God created the heavens');
+    await sleep(100);
+    assertEquals(translator.calls, ['In the beginning God created the heavens'], 'Only the last final is translated');
+    assertEquals(delivered.map(r => r.translatedText), ['ES(In the beginning God created the heavens)'], 'Only the last final is delivered');
+    assertEquals(queue.getStats().coalesced, 2, 'Two finals coalesced');
+    queue.dispose();
+    console.log('');
+
+    // Test 3: In-flight superseded final is aborted
+    console.log('=== Test 3: Abort in flight ===');
+    translator = createTranslator({ 'For God so loved': 80 });
+    delivered = [];
+    queue = new FinalTranslationQueue({
+        coalesceMs: 0,
+        translate: translator.translate,
+        deliver: (result) => delivered.push(result)
+    });
+    queue.enqueue('For God so loved');
+    await sleep(10);
+    queue.enqueue('For God so loved the world');
+    await sleep(120);
+    assertEquals(translator.aborted, ['For God so loved'], 'First request aborted');
+    assertEquals(delivered.map(r => r.text), ['For God so loved the world'], 'Aborted result never delivered');
+    assertEquals(queue.getStats().aborted, 1, 'Abort counted');
+    queue.dispose();
+    console.log('');
+
+    // Test 4: Independent finals are delivered in enqueue order
+    console.log('=== Test 4: In-order delivery ===');
+    translator = createTranslator({ 'First sentence.': 60, 'Second sentence.': 5 });
+    delivered = [];
+    queue = new FinalTranslationQueue({
+        coalesceMs: 0,
+        translate: translator.translate,
+        deliver: (result) => delivered.push(result.text)
+    });
+    queue.enqueue('First sentence.');
+    queue.enqueue('Second sentence.');
+    await sleep(30);
+    assertEquals(delivered, [], 'Fast second final waits for the slow first one');
+    await sleep(60);
+    assertEquals(delivered, ['First sentence.', 'Second sentence.'], 'Both delivered in order');
+    queue.dispose();
+    console.log('');
+
+    // Test 5: Aborting a blocking entry releases finished entries behind it
+    console.log('=== Test 5: Drain after abort ===');
+    translator = createTranslator({ 'Blessed are': 100, 'Amen.': 5, 'Blessed are the meek': 5 });
+    delivered = [];
+    queue = new FinalTranslationQueue({
+        coalesceMs: 0,
+        translate: translator.translate,
+        deliver: (result) => delivered.push(result.text)
+    });
+    queue.enqueue('Blessed are');
+    queue.enqueue('Amen.');
+    await sleep(20);
+    assertEquals(delivered, [], 'Finished final held behind slow head');
+    queue.enqueue('Blessed are the meek');
+    assertEquals(delivered, ['Amen.'], 'Finished final released as soon as the head is aborted');
+    await sleep(30);
+    assertEquals(delivered, ['Amen.', 'Blessed are the meek'], 'Superseding final delivered after');
+    queue.dispose();
+    console.log('');
+
+    // Test 6: Errors are delivered (for fallback), dispose cancels everything
+    console.log('=== Test 6: Errors and dispose ===');
+    delivered = [];
+    queue = new FinalTranslationQueue({
+        coalesceMs: 0,
+        translate: async () => { throw new Error('OpenAI API error: boom'); },
+        deliver: (result) => delivered.push(result)
+    });
+    queue.enqueue('Grace and peace');
+    await sleep(5);
+    assertEquals(delivered.length, 1, 'Failed translation still delivered');
+    assertEquals(delivered[0].error?.message, 'OpenAI API error: boom', 'Error passed to deliver');
+    assertEquals(queue.getStats().failed, 1, 'Failure counted');
+
+    translator = createTranslator();
+    delivered = [];
+    queue = new FinalTranslationQueue({
+        coalesceMs: 10,
+        translate: translator.translate,
+        deliver: (result) => delivered.push(result)
+    });
+    queue.enqueue('Pending final');
+    queue.dispose();
+    assertEquals(queue.enqueue('After dispose'), -1, 'Enqueue after dispose is ignored');
+    await sleep(50);
+    assertEquals(translator.calls.length, 0, 'Pending final never translated after dispose');
+    assertEquals(delivered.length, 0, 'Nothing delivered after dispose');
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
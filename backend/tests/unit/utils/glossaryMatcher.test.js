@@ -0,0 +1,169 @@
+/**
+ * Unit Tests for the PhraseSet Glossary Matcher
+ *
+ * Run with: node backend/tests/unit/utils/glossaryMatcher.test.js
+ */
+
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { GlossaryMatcher, PhraseAutomaton, compileIndex } from '../../../utils/glossaryMatcher.js';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const REPO_ROOT = path.resolve(__dirname, '../../../..');
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// The per-result scan googleSpeechStream used to run, as the reference
+function legacyMatch(glossary, transcript) {
+    const transcriptClean = transcript.toLowerCase().replace(/[.,!?;:]/g, '').trim();
+    const matched = glossary.phrases.find(phrase => {
+        const phraseValue = phrase.value.toLowerCase();
+        const variants = phraseValue.includes('/') ? phraseValue.split('/').map(v => v.trim()) : [phraseValue];
+        return variants.some(variant => {
+            const variantClean = variant.replace(/[.,!?;:]/g, '').trim();
+            return transcriptClean === variantClean || transcriptClean.includes(variantClean);
+        });
+    });
+    return matched ? matched.value : null;
+}
+
+function writeJson(file, value) {
+    fs.writeFileSync(file, JSON.stringify(value));
+}
+
+async function run() {
+    console.log('\n=== Glossary Matcher Unit Tests ===\n');
+
+    // Test 1: Automaton
+    console.log('=== Test 1: Automaton ===');
+    const automaton = new PhraseAutomaton([['he', 2], ['she', 1], ['his', 3], ['hers', 0]]);
+    assertEquals(automaton.firstMatch('ushers'), 0, 'Lowest id among overlapping matches');
+    assertEquals(automaton.firstMatch('ahis'), 3, 'Match after a failure transition');
+    assertEquals(automaton.firstMatch('she'), 1, 'Suffix output inherited (she > he)');
+    assertEquals(automaton.firstMatch('xyz'), -1, 'No match');
+    assertEquals(automaton.firstMatch(''), -1, 'Empty text');
+    console.log('');
+
+    // Test 2: Same results as the inline scan on the real glossary
+    console.log('=== Test 2: Parity with the inline scan ===');
+    const glossary = JSON.parse(fs.readFileSync(path.join(REPO_ROOT, 'glossary.json'), 'utf8'));
+    const matcher = new GlossaryMatcher();
+    await matcher.load();
+    const transcripts = [
+        'In the beginning God created the heaven and the earth.',
+        'Turn with me to the book of Ephesians, chapter two.',
+        'And the truth shall make you free',
+        'We went to Aramea last summer',
+        'the grace of God is sufficient',
+        'Søren Kierkegaard wrote about faith',
+        'christos (χριστός) means anointed',
+        'ok',
+        '...',
+        ''
+    ];
+    // Plus every 97th glossary phrase inside a sentence, and some shifted/truncated ones
+    glossary.phrases.forEach((phrase, i) => {
+        if (i % 97 === 0) transcripts.push(`and then ${phrase.value}, he said`);
+        if (i % 211 === 0) transcripts.push(phrase.value.slice(1, -1).toUpperCase());
+    });
+    const mismatches = transcripts.filter(t => (matcher.match(t)?.value ?? null) !== legacyMatch(glossary, t));
+    assertEquals(mismatches, [], `Same phrase as the inline scan for ${transcripts.length} transcripts`);
+    assert(matcher.match('Acts chapter 2').categories.includes('Bible Book Names'), 'Categories from the segmented glossary');
+    assertEquals(matcher.match(''), null, 'Empty transcript');
+    console.log('');
+
+    // Test 3: Index written by tools/glossary
+    console.log('=== Test 3: Precompiled index ===');
+    const indexPath = path.join(REPO_ROOT, 'glossary.index.json');
+    const index = JSON.parse(fs.readFileSync(indexPath, 'utf8'));
+    const segmented = JSON.parse(fs.readFileSync(path.join(REPO_ROOT, 'glossary-segmented.json'), 'utf8'));
+    const compiled = compileIndex(glossary, segmented);
+    assertEquals(matcher.getStats().fromIndex, 1, 'Current index used instead of compiling');
+    assertEquals([index.phrases, index.phraseCategories, index.categories],
+        [compiled.phrases, compiled.phraseCategories, compiled.categories],
+        'Python index matches the JS compiler (normalization parity)');
+    console.log('');
+
+    // Test 4: Stale index, reload on change
+    console.log('=== Test 4: Fallback and reload ===');
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'glossary-'));
+    const paths = {
+        glossaryPath: path.join(dir, 'glossary.json'),
+        segmentedPath: path.join(dir, 'glossary-segmented.json'),
+        indexPath: path.join(dir, 'glossary.index.json')
+    };
+    writeJson(paths.glossaryPath, { phrases: [{ value: 'Ephesia/Ephesus' }, { value: 'Ephesus' }, { value: 'Bethel' }] });
+    writeJson(paths.indexPath, { ...index, sources: { glossary: 'stale', segmented: null } });
+
+    const originalWarn = console.warn;
+    console.warn = () => {};
+    const local = new GlossaryMatcher({ ...paths });
+    assertEquals(local.match('ephesus'), null, 'No match before the first load');
+    await local.load();
+    assertEquals(local.getStats().compiled, 1, 'Stale index ignored - glossary compiled');
+    assertEquals(local.match('Paul sailed to Ephesus.'), { value: 'Ephesia/Ephesus', categories: [] },
+        'Slash variant reported under the first phrase');
+    assertEquals(local.phrases, ['Ephesia/Ephesus', 'Bethel'], 'Phrases that can never be reported dropped');
+
+    local.watch();
+    await sleep(50);
+    writeJson(paths.glossaryPath, { phrases: [{ value: 'Shiloh' }] });
+    await sleep(800);
+    assertEquals(local.match('they came to Shiloh')?.value, 'Shiloh', 'Reloaded after the file changed');
+    assertEquals(local.match('Bethel'), null, 'Old phrases gone after reload');
+
+    const originalError = console.error;
+    console.error = () => {};
+    fs.writeFileSync(paths.glossaryPath, '{ not json');
+    await local.load();
+    console.error = originalError;
+    assertEquals(local.match('Shiloh')?.value, 'Shiloh', 'Failed reload keeps the previous glossary');
+    assertEquals(local.getStats().loadErrors, 1, 'Load error counted');
+    local.dispose();
+    console.warn = originalWarn;
+    fs.rmSync(dir, { recursive: true, force: true });
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
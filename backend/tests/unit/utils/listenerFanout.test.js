@@ -0,0 +1,231 @@
+/**
+ * Unit Tests for Listener Fan-out (shared serialization + per-listener bounded queues)
+ *
+ * Run with: node backend/tests/unit/utils/listenerFanout.test.js
+ */
+
+import { ListenerFanout, getListenerFanoutStats } from '../../../utils/listenerFanout.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Fake ws socket: records what it was sent; bufferedAmount is set by the test
+ */
+class FakeSocket {
+    constructor() {
+        this.readyState = 1;
+        this.bufferedAmount = 0;
+        this.frames = [];
+        this.options = [];
+    }
+    send(data, options) {
+        this.frames.push(data);
+        this.options.push(options);
+    }
+    get messages() {
+        return this.frames.map(frame => JSON.parse(frame.toString()));
+    }
+}
+
+const listenersOf = (count) => Array.from({ length: count }, () => ({ socket: new FakeSocket() }));
+const partial = (text, targetLang = 'es') => ({ type: 'translation', isPartial: true, targetLang, translatedText: text });
+const final = (text, targetLang = 'es') => ({ type: 'translation', isPartial: false, targetLang, translatedText: text });
+
+async function run() {
+    console.log('\n=== Listener Fan-out Unit Tests ===\n');
+
+    // Test 1: One serialization shared by every listener, sent as text
+    console.log('=== Test 1: Serialize once ===');
+    let fanout = new ListenerFanout({ label: 'T1' });
+    let listeners = listenersOf(5);
+    assertEquals(fanout.broadcast(listeners, final('hola')), 5, 'Returns the number of listeners');
+    assert(listeners.every(l => l.socket.frames[0] === listeners[0].socket.frames[0]), 'Same Buffer for every listener');
+    assert(Buffer.isBuffer(listeners[0].socket.frames[0]), 'Frame is a Buffer');
+    assertEquals(listeners[0].socket.options[0], { binary: false }, 'Sent as a text frame');
+    assertEquals(listeners[4].socket.messages, [final('hola')], 'Listener receives the JSON message');
+    let stats = fanout.getStats();
+    assertEquals([stats.messages, stats.sends, stats.sentBytes], [1, 5, 5 * stats.serializedBytes], 'One serialization, five sends');
+    fanout.dispose();
+    console.log('');
+
+    // Test 2: Large groups yield to the event loop and keep broadcast order
+    console.log('=== Test 2: Large groups in chunks, in order ===');
+    fanout = new ListenerFanout({ label: 'T2', chunkSize: 10 });
+    listeners = listenersOf(35);
+    fanout.broadcast(listeners, final('one'));
+    fanout.broadcast(listeners.slice(0, 3), final('two')); // Small, but queued behind the large broadcast
+    assertEquals(listeners.filter(l => l.socket.frames.length > 0).length, 10, 'First chunk sent synchronously');
+    let immediateRan = false;
+    setImmediate(() => { immediateRan = true; });
+    await sleep(10);
+    assert(immediateRan, 'Other callbacks ran between chunks');
+    assert(listeners.every(l => l.socket.messages[0].translatedText === 'one'), 'Every listener got the first broadcast');
+    assertEquals(listeners[0].socket.messages.map(m => m.translatedText), ['one', 'two'], 'Later broadcast arrives after it');
+    assert(fanout.getStats().yields >= 3, `Yielded between chunks (${fanout.getStats().yields})`);
+    fanout.dispose();
+    console.log('');
+
+    // Test 3: Slow listener gets a queue; others are unaffected
+    console.log('=== Test 3: Backpressure queue ===');
+    fanout = new ListenerFanout({ label: 'T3', highWaterBytes: 1000 });
+    listeners = listenersOf(3);
+    const slow = listeners[1].socket;
+    slow.bufferedAmount = 5000;
+    fanout.broadcast(listeners, final('first'));
+    fanout.broadcast(listeners, partial('sec'));
+    fanout.broadcast(listeners, partial('second'));
+    fanout.broadcast(listeners, final('second.'));
+    assertEquals(listeners[0].socket.messages.length, 4, 'Fast listener gets everything straight away');
+    assertEquals(slow.frames.length, 0, 'Slow listener gets nothing while over the high-water mark');
+    stats = fanout.getStats();
+    assertEquals([stats.slowListeners, stats.queuedMessages, stats.collapsed, stats.maxBufferedAmount], [1, 3, 1, 5000],
+        'Backpressure reported: one slow listener, superseded partial collapsed');
+    slow.bufferedAmount = 0;
+    await sleep(40);
+    assertEquals(slow.messages.map(m => m.translatedText), ['first', 'second', 'second.'], 'Queue drains in order once bufferedAmount falls');
+    assertEquals(fanout.getStats().slowListeners, 0, 'Listener no longer reported slow');
+    fanout.broadcast(listeners, final('third'));
+    assertEquals(slow.messages.length, 4, 'Drained listener is sent to directly again');
+    fanout.dispose();
+    console.log('');
+
+    // Test 4: Partials collapse per language; finals never do
+    console.log('=== Test 4: Collapse rules ===');
+    fanout = new ListenerFanout({ label: 'T4', highWaterBytes: 0 });
+    listeners = listenersOf(1);
+    listeners[0].socket.bufferedAmount = 1;
+    fanout.broadcast(listeners, partial('a', 'es'));
+    fanout.broadcast(listeners, partial('a', 'en'));
+    fanout.broadcast(listeners, final('f1'));
+    fanout.broadcast(listeners, partial('ab', 'es'));
+    fanout.broadcast(listeners, final('f2'));
+    fanout.broadcast(listeners, { type: 'warning', message: 'restarting' });
+    fanout.flush();
+    assertEquals(listeners[0].socket.messages.map(m => m.translatedText ?? m.type),
+        ['a', 'f1', 'ab', 'f2', 'warning'], 'Newer es partial replaced the queued one and moved behind f1; en partial kept');
+    fanout.dispose();
+    console.log('');
+
+    // Test 5: Bounded queue drops partials first, then the oldest messages
+    console.log('=== Test 5: Queue limits ===');
+    fanout = new ListenerFanout({ label: 'T5', highWaterBytes: 0, maxQueueMessages: 3 });
+    listeners = listenersOf(1);
+    listeners[0].socket.bufferedAmount = 1;
+    fanout.broadcast(listeners, final('f1'));
+    fanout.broadcast(listeners, partial('p'));
+    fanout.broadcast(listeners, final('f2'));
+    fanout.broadcast(listeners, final('f3'));
+    assertEquals(fanout.getStats().queuedMessages, 3, 'Queue stays within maxQueueMessages');
+    fanout.broadcast(listeners, final('f4'));
+    fanout.flush();
+    assertEquals(listeners[0].socket.messages.map(m => m.translatedText), ['f2', 'f3', 'f4'],
+        'Partial dropped first, then the oldest final');
+    assertEquals(fanout.getStats().dropped, 2, 'Drops counted');
+
+    fanout = new ListenerFanout({ label: 'T5b', highWaterBytes: 0, maxQueueBytes: 200 });
+    listeners[0].socket.frames = [];
+    for (let i = 0; i < 10; i++) fanout.broadcast(listeners, final(`${i}`.repeat(50)));
+    assert(fanout.getStats().queuedBytes <= 200, `Queue stays within maxQueueBytes (${fanout.getStats().queuedBytes})`);
+    fanout.dispose();
+    console.log('');
+
+    // Test 6: Closed sockets, flush and stats
+    console.log('=== Test 6: Closed sockets, flush, stats ===');
+    fanout = new ListenerFanout({ label: 'T6', highWaterBytes: 0 });
+    listeners = listenersOf(2);
+    listeners[0].socket.bufferedAmount = 1;
+    fanout.broadcast(listeners, final('x'));
+    listeners[0].socket.readyState = 3;
+    fanout.broadcast(listeners, final('y'));
+    assertEquals(listeners[0].socket.frames.length, 0, 'Closed socket is not sent to');
+    assertEquals(fanout.getStats().slowListeners, 0, 'Closed socket queue discarded');
+
+    listeners = listenersOf(30);
+    fanout.broadcast(listeners, { type: 'session_ended' });
+    fanout.flush();
+    assert(listeners.every(l => l.socket.messages.length === 1), 'flush() finishes a large broadcast synchronously');
+    assert(getListenerFanoutStats().sessions.some(s => s.label === 'T6'), 'Live fan-out listed in stats');
+    const totalsBefore = getListenerFanoutStats().totals.messages;
+    fanout.dispose();
+    assertEquals(fanout.broadcast(listeners, final('late')), 0, 'Disposed fan-out sends nothing');
+    assert(!getListenerFanoutStats().sessions.some(s => s.label === 'T6'), 'Disposed fan-out removed from stats');
+    assertEquals(getListenerFanoutStats().totals.messages, totalsBefore, 'Retired counters kept in totals');
+    console.log('');
+
+    // Test 7: Delta-encoded partials for listeners that opted in
+    console.log('=== Test 7: Delta partials per language group ===');
+    fanout = new ListenerFanout({ label: 'T7', highWaterBytes: 0 });
+    const deltaListener = (targetLang) => ({ socket: new FakeSocket(), targetLang, partialEncoding: 'delta' });
+    const plainEs = { socket: new FakeSocket(), targetLang: 'es' };
+    const [es1, es2, fr] = [deltaListener('es'), deltaListener('es'), deltaListener('fr')];
+    const everyone = [plainEs, es1, es2, fr];
+    const seqPartial = (seqId, text, targetLang, originalText = text) => ({ ...partial(text, targetLang), seqId, originalText });
+
+    fanout.broadcast(everyone, seqPartial(1, 'In the beginning', 'en'));
+    fanout.broadcast([plainEs, es1, es2], seqPartial(2, 'En el principio', 'es', 'In the beginning'));
+    fanout.broadcast(everyone, seqPartial(3, 'In the beginning God', 'en'));
+    assertEquals(plainEs.socket.messages.map(m => m.delta), [undefined, undefined, undefined], 'Plain listener gets full partials');
+    assertEquals(es1.socket.messages.map(m => [m.keyframe, m.delta?.baseSeqId]), [[true, undefined], [undefined, 1], [undefined, 1]],
+        'Delta listener: a keyframe, then deltas against the closest recent partial');
+    assertEquals(es1.socket.messages[2].delta.fields.translatedText, [16, ' God'], 'Delta carries only the new suffix');
+    assert(es1.socket.frames[2] === es2.socket.frames[2], 'One encoding shared by the language group');
+    assertEquals(fr.socket.messages.map(m => [m.keyframe, m.delta?.baseSeqId]), [[true, undefined], [undefined, 1]],
+        'Each group has its own encoder state');
+    fanout.broadcast(everyone, final('In the beginning God created.'));
+    assertEquals(es1.socket.messages[3], final('In the beginning God created.'), 'Finals are sent in full');
+
+    es2.socket.bufferedAmount = 1;
+    fanout.broadcast([es1, es2], seqPartial(4, 'In the beginning God created', 'en'));
+    assertEquals(es1.socket.messages[4].delta.baseSeqId, 3, 'Fast listener gets the delta');
+    es2.socket.bufferedAmount = 0;
+    fanout.flush();
+    assertEquals([es2.socket.messages[4].keyframe, es2.socket.messages[4].translatedText], [true, 'In the beginning God created'],
+        'Slow listener gets the queued partial as a keyframe');
+
+    fanout.resetPartialEncoding('es');
+    fanout.broadcast([es1, es2], seqPartial(5, 'In the beginning God created the', 'en'));
+    assertEquals([es1.socket.messages[5].keyframe, es2.socket.messages[5].keyframe], [true, true], 'Reset group starts with a keyframe');
+    fanout.dispose();
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
@@ -0,0 +1,173 @@
+/**
+ * Unit Tests for Merge-Path Logger
+ *
+ * Run with: node backend/tests/unit/utils/mergeLogger.test.js
+ */
+
+import { MergeLogger, createMergeLogger, flushMergeLogs, parseSampleRates, preview } from '../../../utils/mergeLogger.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+// Captures output instead of writing to the console
+function createSink() {
+    const sink = { logs: [], errors: [] };
+    sink.log = (line) => sink.logs.push(line);
+    sink.error = (line) => sink.errors.push(line);
+    return sink;
+}
+
+console.log('\n=== Merge Logger Unit Tests ===\n');
+
+// Test 1: Level gating
+console.log('=== Test 1: Level gating ===');
+let sink = createSink();
+let logger = createMergeLogger({ sessionId: 'session_test_1', level: 'info', sink, bufferSize: 0 });
+logger.debug('final_raw', { text: 'hello' });
+logger.info('append');
+assertEquals(sink.logs.length, 1, 'Debug event below info level is not printed');
+assertEquals(sink.logs[0], '[SoloMode] ➕ Appending final to accumulated', 'Info event printed with mode prefix');
+logger.dispose();
+
+sink = createSink();
+logger = createMergeLogger({ level: 'silent', sink, bufferSize: 0 });
+logger.info('append');
+logger.warn('append');
+assertEquals(sink.logs.length, 0, 'Silent level prints nothing');
+logger.dispose();
+console.log('');
+
+// Test 2: Lazy data construction
+console.log('=== Test 2: Lazy data construction ===');
+sink = createSink();
+logger = createMergeLogger({ level: 'info', sink, bufferSize: 0 });
+let built = 0;
+logger.debug('final_processed', () => { built++; return { text: 'x' }; });
+assertEquals(built, 0, 'Data function not called for a filtered, unbuffered event');
+logger.info('final_processed', () => { built++; return { text: 'x' }; });
+assertEquals(built, 1, 'Data function called once for a printed event');
+assertEquals(logger.counters.final_processed, 2, 'Filtered events are still counted');
+logger.dispose();
+
+sink = createSink();
+logger = createMergeLogger({ level: 'info', sink, bufferSize: 10 });
+built = 0;
+logger.debug('final_processed', () => { built++; return { text: 'buffered' }; });
+assertEquals(built, 0, 'Data function not called for a buffered event until it is flushed');
+logger.flush();
+assertEquals(built, 1, 'Data function called once by the flush');
+assert(sink.logs[0].includes('buffered'), 'Flushed entry built from the data function');
+logger.dispose();
+console.log('');
+
+// Test 3: Sampling
+console.log('=== Test 3: Sampling ===');
+assertEquals(parseSampleRates('final_raw=0.1, accumulate = 0.5,bogus,x=2'), { final_raw: 0.1, accumulate: 0.5, x: 1 }, 'Sample spec parsed and clamped');
+sink = createSink();
+logger = createMergeLogger({ level: 'debug', sink, bufferSize: 0, sampleRates: { append: 0, final_error: 0 } });
+for (let i = 0; i < 20; i++) logger.info('append');
+assertEquals(sink.logs.length, 0, 'Event with rate 0 is never printed');
+logger.error('final_error', { error: new Error('boom') });
+assertEquals(sink.errors.length, 1, 'Errors are never sampled away');
+assert(sink.errors[0].includes('Error processing final: boom'), 'Error message formatted');
+logger.dispose();
+console.log('');
+
+// Test 4: Ring buffer wraps and keeps the newest entries
+console.log('=== Test 4: Ring buffer ===');
+sink = createSink();
+logger = createMergeLogger({ level: 'silent', sink, bufferSize: 3 });
+for (let i = 0; i < 5; i++) logger.debug('duplicate', { text: `final ${i}` });
+assertEquals(logger.snapshot().map(e => e.data.text), ['final 2', 'final 3', 'final 4'], 'Buffer holds the last 3 entries, oldest first');
+assertEquals(logger.flush(), 3, 'Flush reports entry count');
+assertEquals(sink.logs.length, 1, 'Flush is a single write');
+assert(sink.logs[0].includes('final 4') && !sink.logs[0].includes('final 1'), 'Flush output contains buffered entries only');
+assertEquals(logger.snapshot().length, 0, 'Buffer empty after flush');
+assertEquals(logger.flush(), 0, 'Flushing an empty buffer writes nothing');
+assertEquals(sink.logs.length, 1, 'No extra write for an empty flush');
+logger.dispose();
+console.log('');
+
+// Test 5: Error flushes the buffer
+console.log('=== Test 5: Flush on error ===');
+sink = createSink();
+logger = createMergeLogger({ sessionId: 'session_test_5', level: 'error', sink, bufferSize: 10 });
+logger.debug('final_raw', { text: 'raw text' });
+logger.info('partial_override', { finalChars: 10, partialChars: 30, final: 'short', partial: 'longer partial' });
+assertEquals(sink.logs.length, 0, 'Nothing printed before the error');
+logger.error('translation_error', { error: new Error('timeout') });
+assertEquals(sink.errors.length, 1, 'Error printed immediately');
+assertEquals(sink.logs.length, 1, 'Buffer flushed once on error');
+assert(sink.logs[0].includes('session_test_5') && sink.logs[0].includes('error: translation_error'), 'Flush header names session and reason');
+assert(sink.logs[0].includes('(10 → 30 chars)') && sink.logs[0].includes('[SoloMode]   Partial: "longer partial"'), 'Multi-line messages keep the prefix on each line');
+logger.dispose();
+
+sink = createSink();
+logger = createMergeLogger({ level: 'info', sink, bufferSize: 10 });
+logger.debug('final_raw', { text: 'debug only' });
+logger.info('final_processed', { text: 'printed already' });
+logger.error('final_error', { error: new Error('boom') });
+assertEquals(sink.logs.length, 2, 'Info line printed, then one flush');
+assert(sink.logs[1].includes('debug only') && !sink.logs[1].includes('printed already'), 'Flush repeats no printed entry');
+assert(sink.logs[1].includes('1 unprinted entries'), 'Flush header counts unprinted entries');
+logger.dispose();
+console.log('');
+
+// Test 6: flushMergeLogs and dispose
+console.log('=== Test 6: flushMergeLogs ===');
+const sinkA = createSink();
+const sinkB = createSink();
+const loggerA = new MergeLogger({ sessionId: 'session_a', level: 'silent', sink: sinkA });
+const loggerB = new MergeLogger({ sessionId: 'session_b', level: 'silent', sink: sinkB });
+loggerA.info('append');
+loggerB.info('append');
+loggerB.info('replace');
+assertEquals(flushMergeLogs('session_b'), 2, 'Session filter flushes only that logger');
+assertEquals(sinkA.logs.length, 0, 'Other session not flushed');
+loggerA.dispose();
+assertEquals(flushMergeLogs('session_a'), 0, 'Disposed logger is no longer flushed');
+loggerB.dispose();
+console.log('');
+
+// Test 7: preview
+console.log('=== Test 7: preview ===');
+assertEquals(preview('short'), 'short', 'Short text unchanged');
+assertEquals(preview('abcdef', 3), 'abc...', 'Long text truncated with ellipsis');
+assertEquals(preview(undefined), '', 'Missing text is empty');
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
@@ -0,0 +1,138 @@
+/**
+ * Unit Tests for Final-Path Metrics
+ *
+ * Run with: node backend/tests/unit/utils/metrics.test.js
+ */
+
+import {
+    Histogram,
+    getMetricsSnapshot,
+    observePartialFinalGap,
+    observeTranslateFinal,
+    recordMergeEvent,
+    renderPrometheus,
+    resetMetrics
+} from '../../../utils/metrics.js';
+import { MergeLogger } from '../../../utils/mergeLogger.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+function series(name, labels = {}) {
+    const metric = getMetricsSnapshot().metrics[name];
+    return metric.series.find(s => Object.entries(labels).every(([k, v]) => s.labels[k] === v));
+}
+
+console.log('\n=== Metrics Unit Tests ===\n');
+
+// Test 1: Histogram buckets
+console.log('=== Test 1: Histogram buckets ===');
+const histogram = new Histogram('test_hist', 'Test', ['mode'], [1, 5, 10]);
+[0.5, 1, 3, 7, 50].forEach(v => histogram.observe({ mode: 'a' }, v));
+histogram.observe({ mode: 'a' }, NaN);
+const raw = histogram.series.values().next().value;
+assertEquals(raw.counts, [2, 1, 1], 'Per-bucket counts (upper bound inclusive)');
+assertEquals(raw.count, 5, 'Overflow and count tracked, NaN ignored');
+assertEquals(raw.sum, 61.5, 'Sum tracked');
+console.log('');
+
+// Test 2: Merge events
+console.log('=== Test 2: Merge events ===');
+resetMetrics();
+recordMergeEvent('SoloMode', 'accumulate', { overlapChars: 24 });
+recordMergeEvent('SoloMode', 'append', { lengthRatio: 0.8 });
+recordMergeEvent('SoloMode', 'partial_override', { finalChars: 40, partialChars: 55 });
+recordMergeEvent('SoloMode', 'partial_merge', { newPartChars: 12 });
+recordMergeEvent('SoloMode', 'final_raw', { gapMs: 300 });
+recordMergeEvent('SoloMode', 'final_sent', {});
+assertEquals(series('exbabel_final_merge_events_total', { branch: 'accumulate' }).value, 1, 'Branch counted');
+assertEquals(series('exbabel_final_merge_events_total', { branch: 'final_sent' }), undefined, 'Non-branch events not counted');
+assertEquals(series('exbabel_final_recovered_chars', { branch: 'partial_override' }).sum, 15, 'Override recovery = partial - final chars');
+assertEquals(series('exbabel_final_recovered_chars', { branch: 'partial_merge' }).sum, 12, 'Merge recovery = new part chars');
+assertEquals(series('exbabel_final_overlap_chars').sum, 24, 'Overlap recorded');
+assertEquals(series('exbabel_final_length_ratio').sum, 0.8, 'Length ratio recorded');
+assertEquals(series('exbabel_partial_final_gap_seconds', { mode: 'SoloMode' }).sum, 0.3, 'Gap from final_raw recorded in seconds');
+console.log('');
+
+// Test 3: Direct observers and MergeLogger hook
+console.log('=== Test 3: Observers ===');
+resetMetrics();
+observePartialFinalGap('HostMode', 0);
+assertEquals(series('exbabel_partial_final_gap_seconds', { mode: 'HostMode' }), undefined, 'No gap without a partial');
+observePartialFinalGap('HostMode', 1000, 1750);
+assertEquals(series('exbabel_partial_final_gap_seconds', { mode: 'HostMode' }).sum, 0.75, 'Gap observed');
+observeTranslateFinal('chat', performance.now() - 200, 'ok');
+const translate = series('exbabel_translate_final_seconds', { worker: 'chat', status: 'ok' });
+assert(translate.count === 1 && translate.sum >= 0.2, 'translateFinal latency observed');
+
+const silentSink = { log() {}, error() {} };
+const logger = new MergeLogger({ level: 'silent', bufferSize: 0, sink: silentSink });
+logger.info('replace', { lengthRatio: 2.5 });
+logger.info('append', () => ({ lengthRatio: 0.5 }));
+assertEquals(series('exbabel_final_merge_events_total', { mode: 'SoloMode', branch: 'replace' }).value, 1,
+    'MergeLogger events counted even when silent');
+assertEquals(series('exbabel_final_merge_events_total', { branch: 'append' }).value, 1, 'Lazy-data events counted');
+assertEquals(series('exbabel_final_length_ratio').count, 1, 'Lazy data not evaluated for metrics');
+logger.dispose();
+console.log('');
+
+// Test 4: Prometheus exposition
+console.log('=== Test 4: Prometheus format ===');
+resetMetrics();
+recordMergeEvent('SoloMode', 'accumulate', { overlapChars: 30 });
+recordMergeEvent('Host "A"', 'replace', {});
+const text = renderPrometheus();
+assert(text.includes('# TYPE exbabel_final_overlap_chars histogram'), 'TYPE line');
+assert(text.includes('exbabel_final_overlap_chars_bucket{mode="SoloMode",le="25"} 0'), 'Bucket below observation');
+assert(text.includes('exbabel_final_overlap_chars_bucket{mode="SoloMode",le="30"} 1'), 'Cumulative bucket');
+assert(text.includes('exbabel_final_overlap_chars_bucket{mode="SoloMode",le="+Inf"} 1'), '+Inf bucket');
+assert(text.includes('exbabel_final_overlap_chars_count{mode="SoloMode"} 1'), 'Count line');
+assert(text.includes('exbabel_final_merge_events_total{mode="Host \\"A\\"",branch="replace"} 1'), 'Label values escaped');
+assert(text.endsWith('\n'), 'Trailing newline');
+console.log('');
+
+// Test 5: JSON snapshot
+console.log('=== Test 5: JSON snapshot ===');
+const snapshot = JSON.parse(JSON.stringify(getMetricsSnapshot()));
+const overlap = snapshot.metrics.exbabel_final_overlap_chars;
+assertEquals(overlap.type, 'histogram', 'Type included');
+assertEquals(overlap.buckets.length, overlap.series[0].buckets.length, 'Bucket bounds align with counts');
+assertEquals(overlap.series[0].buckets.slice(-1)[0], 1, 'Snapshot buckets are cumulative');
+assert(typeof snapshot.generatedAt === 'string' && snapshot.uptimeSeconds >= 0, 'Timestamp and uptime included');
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
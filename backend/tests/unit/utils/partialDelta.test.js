@@ -0,0 +1,120 @@
+/**
+ * Unit Tests for Delta-Encoded Partial Wire Format
+ *
+ * Run with: node backend/tests/unit/utils/partialDelta.test.js
+ */
+
+import { PartialDeltaEncoder, commonPrefixLength, createPartialEncoder } from '../../../utils/partialDelta.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+function partial(seqId, originalText, extra = {}) {
+    return { type: 'translation', seqId, isPartial: true, originalText, translatedText: originalText, ...extra };
+}
+
+console.log('\n=== Partial Delta Encoder Unit Tests ===\n');
+
+// Test 1: Opt-in
+console.log('=== Test 1: Opt-in ===');
+assertEquals(createPartialEncoder(undefined), null, 'No encoder without partialEncoding');
+assertEquals(createPartialEncoder('full'), null, 'No encoder for unknown encodings');
+assert(createPartialEncoder('delta') instanceof PartialDeltaEncoder, 'Encoder for partialEncoding=delta');
+console.log('');
+
+// Test 2: Common prefix
+console.log('=== Test 2: Common prefix ===');
+assertEquals(commonPrefixLength('In the beginning', 'In the begin'), 12, 'Prefix of a shorter string');
+assertEquals(commonPrefixLength('abc', 'xyz'), 0, 'No common prefix');
+assertEquals(commonPrefixLength('ok 😀', 'ok 😃'), 3, 'Prefix never splits a surrogate pair');
+console.log('');
+
+// Test 3: Keyframe then deltas
+console.log('=== Test 3: Keyframe then deltas ===');
+let encoder = new PartialDeltaEncoder();
+const first = encoder.encode(partial(1, 'In the beginning', { targetLang: 'es' }));
+assertEquals(first.keyframe, true, 'First partial is a keyframe');
+assertEquals(first.originalText, 'In the beginning', 'Keyframe carries full text');
+
+const second = encoder.encode(partial(2, 'In the beginning God', { targetLang: 'es' }));
+assertEquals(second.keyframe, undefined, 'Second partial is a delta');
+assertEquals(second.originalText, undefined, 'Delta has no full text fields');
+assertEquals(second.targetLang, 'es', 'Non-text fields pass through');
+assertEquals(second.delta, {
+    baseSeqId: 1,
+    fields: { originalText: [16, ' God'], translatedText: [16, ' God'] }
+}, 'Delta encodes prefix length and suffix per field');
+
+const unchanged = encoder.encode({ ...partial(3, 'In the beginning God'), translatedText: 'En el principio Dios' });
+assertEquals(Object.keys(unchanged.delta.fields), ['translatedText'], 'Unchanged fields are omitted');
+console.log('');
+
+// Test 4: Finals pass through and do not move the base
+console.log('=== Test 4: Finals ===');
+const final = { type: 'translation', seqId: 4, isPartial: false, originalText: 'In the beginning God created.' };
+assert(encoder.encode(final) === final, 'Final returned unchanged');
+const afterFinal = encoder.encode(partial(5, 'In the beginning God created'));
+assertEquals(afterFinal.delta.baseSeqId, 2, 'Delta picks the closest recent base');
+console.log('');
+
+// Test 5: Keyframe rules
+console.log('=== Test 5: Keyframe rules ===');
+encoder = new PartialDeltaEncoder({ keyframeInterval: 3 });
+encoder.encode(partial(1, 'one'));
+encoder.encode(partial(2, 'one two'));
+encoder.encode(partial(3, 'one two three'));
+assertEquals(encoder.encode(partial(4, 'one two three four')).keyframe, true, 'Keyframe every keyframeInterval partials');
+assertEquals(encoder.encode(partial(5, 'something else entirely')).keyframe, true, 'Keyframe when a delta would not be smaller');
+encoder.reset();
+assertEquals(encoder.encode(partial(6, 'something else entirely!')).keyframe, true, 'Keyframe after reset');
+console.log('');
+
+// Test 6: Constant per-partial payload as the sentence grows
+console.log('=== Test 6: Bandwidth ===');
+encoder = new PartialDeltaEncoder({ keyframeInterval: 1000 });
+let text = '';
+const sizes = [];
+for (let i = 1; i <= 200; i++) {
+    text += (text ? ' ' : '') + `word${i % 10}`;
+    sizes.push(JSON.stringify(encoder.encode(partial(i, text))).length);
+}
+assert(sizes[199] < 200, `Delta size stays small for a ${text.length}-char partial (${sizes[199]} bytes)`);
+assert(Math.abs(sizes[199] - sizes[20]) < 20, 'Delta size does not grow with sentence length');
+assert(encoder.getStats().savedRatio > 0.9, `Most text bytes saved (${(encoder.getStats().savedRatio * 100).toFixed(1)}%)`);
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
@@ -0,0 +1,190 @@
+/**
+ * Unit Tests for the PCM Ring Buffer and AudioBufferManager on top of it
+ *
+ * Run with: node backend/tests/unit/utils/pcmRingBuffer.test.js
+ */
+
+import { PcmRingBuffer } from '../../../utils/pcmRingBuffer.js';
+import { AudioBufferManager } from '../../../audioBufferManager.js';
+import { createRandom } from '../../bench/fakes/fakeOpenAI.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+const chunkOf = (size, value) => Buffer.alloc(size, value);
+const bytesOf = (views) => [...Buffer.concat(views)];
+const silentLogger = { info() {}, warn() {}, debug() {}, error() {} };
+
+async function run() {
+    console.log('\n=== PCM Ring Buffer Unit Tests ===\n');
+
+    // Test 1: Time range lookups
+    console.log('=== Test 1: Timestamp ranges ===');
+    let ring = new PcmRingBuffer({ capacityBytes: 100, maxChunks: 10, windowMs: 1000 });
+    ring.write(chunkOf(4, 1), 1000);
+    ring.write(chunkOf(4, 2), 1020);
+    ring.write(chunkOf(4, 3), 1020);
+    ring.write(chunkOf(4, 4), 1100);
+    assertEquals(bytesOf(ring.views(1000, 1100).views), [1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4], 'Whole window');
+    assertEquals(ring.views(1001, 1020).chunks, 2, 'Start and end are inclusive');
+    assertEquals(ring.views(1021, 1099).chunks, 0, 'Gap between chunks is empty');
+    assertEquals(ring.views(0, 999).views, [], 'Range before the window');
+    assertEquals(bytesOf(ring.views(1050, 5000).views), [4, 4, 4, 4], 'Range past the newest chunk');
+    assertEquals([ring.chunkCount, ring.byteCount, ring.oldestTimestamp, ring.newestTimestamp], [4, 16, 1000, 1100],
+        'Counts and timestamps');
+    ring.write(chunkOf(1, 5), 900);
+    assertEquals(ring.newestTimestamp, 1100, 'Timestamps never go backwards');
+    console.log('');
+
+    // Test 2: Views are zero-copy; a wrapped range is two views; copy() is one Buffer
+    console.log('=== Test 2: Zero-copy views and wraparound ===');
+    ring = new PcmRingBuffer({ capacityBytes: 10, maxChunks: 10, windowMs: 1000 });
+    ring.write(chunkOf(6, 1), 0);
+    let { views } = ring.views(0, 0);
+    assertEquals(views.length, 1, 'Contiguous range is one view');
+    assert(views[0].buffer === ring.ring.buffer, 'View shares the ring memory');
+    ring.write(chunkOf(6, 2), 10);
+    assertEquals(ring.chunkCount, 1, 'Overwritten chunk leaves the window');
+    assertEquals(ring.overwritten, 1, 'Overwrite counted');
+    ring.write(chunkOf(3, 3), 20);
+    views = ring.views(0, 20).views;
+    assertEquals(views.length, 2, 'Wrapped range is two views');
+    assertEquals(bytesOf(views), [2, 2, 2, 2, 2, 2, 3, 3, 3], 'Wrapped bytes in order');
+    const copied = ring.copy(0, 20);
+    assert(copied.buffer !== ring.ring.buffer, 'copy() does not share the ring');
+    ring.write(chunkOf(5, 9), 30);
+    assertEquals([...copied], [2, 2, 2, 2, 2, 2, 3, 3, 3], 'Copy survives later writes');
+    ring.write(chunkOf(25, 7), 40);
+    assertEquals([ring.chunkCount, bytesOf(ring.views(0, 40).views).length], [1, 10], 'Chunk larger than the ring keeps its tail');
+    console.log('');
+
+    // Test 3: Expiry, maxChunks and clear
+    console.log('=== Test 3: Expiry, maxChunks, clear ===');
+    ring = new PcmRingBuffer({ capacityBytes: 1000, maxChunks: 3, windowMs: 100 });
+    for (let t = 0; t < 5; t++) ring.write(chunkOf(2, t), t * 10);
+    assertEquals([ring.chunkCount, ring.oldestTimestamp], [3, 20], 'Only maxChunks chunks kept');
+    assertEquals(ring.expire(125), 1, 'Chunks older than windowMs expire');
+    assertEquals(ring.oldestTimestamp, 30, 'Oldest chunk moves forward');
+    assertEquals(ring.clear(), 2, 'clear() reports dropped chunks');
+    assertEquals([ring.chunkCount, ring.byteCount, ring.views(0, 1000).chunks], [0, 0, 0], 'Empty after clear');
+    ring.write(chunkOf(2, 8), 200);
+    assertEquals(bytesOf(ring.views(0, 1000).views), [8, 8], 'Writable after clear');
+    console.log('');
+
+    // Test 4: Randomized comparison with a plain chunk list
+    console.log('=== Test 4: Randomized comparison with a chunk list ===');
+    {
+        const random = createRandom(21);
+        const capacity = 4800;
+        ring = new PcmRingBuffer({ capacityBytes: capacity, maxChunks: 40, windowMs: 500 });
+        let model = []; // { timestamp, bytes, start }
+        let written = 0;
+        let now = 0;
+        let mismatches = 0;
+        let lookups = 0;
+        for (let step = 0; step < 5000; step++) {
+            now += Math.floor(random() * 40);
+            const size = 1 + Math.floor(random() * 600);
+            const chunk = Buffer.alloc(size);
+            for (let i = 0; i < size; i++) chunk[i] = Math.floor(random() * 256);
+            ring.write(chunk, now);
+            model.push({ timestamp: now, bytes: chunk, start: written });
+            written += size;
+            // Same window rules: maxChunks, overwritten bytes, age
+            model = model.slice(-40).filter(entry => entry.start >= written - capacity);
+            if (random() < 0.3) {
+                ring.expire(now);
+                model = model.filter(entry => entry.timestamp > now - 500);
+            }
+
+            const from = now - Math.floor(random() * 700);
+            const to = from + Math.floor(random() * 700);
+            const expected = Buffer.concat(model.filter(e => e.timestamp >= from && e.timestamp <= to).map(e => e.bytes));
+            const actual = ring.copy(from, to);
+            lookups++;
+            if (!actual.equals(expected) || ring.chunkCount !== model.length) mismatches++;
+        }
+        assertEquals(mismatches, 0, `${lookups} random writes and range reads match the chunk list`);
+    }
+    console.log('');
+
+    // Test 5: AudioBufferManager keeps its API on the ring
+    console.log('=== Test 5: AudioBufferManager ===');
+    const manager = new AudioBufferManager({
+        bufferDurationMs: 200, flushDurationMs: 60, maxChunks: 50, sampleRate: 16000, logger: silentLogger
+    });
+    assertEquals(manager.capacityBytes, Math.ceil(16000 * 2 * 0.2 * 1.1), 'Ring sized from duration and sample rate');
+    const source = chunkOf(320, 5);
+    manager.addChunk(source, { chunkId: 'a' });
+    source.fill(0);
+    await sleep(100);
+    manager.addChunk(chunkOf(320, 6));
+    let recent = manager.getRecentAudio(50);
+    assert(Array.isArray(recent) && recent.every(Buffer.isBuffer), 'getRecentAudio returns Buffer[]');
+    assertEquals(bytesOf(recent), Array(320).fill(6), 'Recent window holds only the newest chunk');
+    assertEquals(bytesOf(manager.getRecentAudio(1000)).slice(0, 2), [5, 5], 'Ring copied the chunk (caller may reuse its buffer)');
+    let flushEvent = null;
+    manager.on('flush', (data) => { flushEvent = data; });
+    const flushed = manager.flush();
+    assertEquals([flushed.length, flushEvent?.chunks], [320, 1], 'flush() returns last flushDurationMs as one Buffer');
+    let status = manager.getStatus();
+    assertEquals([status.chunks, status.totalBytesStored], [2, 640], 'Status counts');
+    assert(status.durationMs >= 90, `Status duration (${status.durationMs}ms)`);
+    await sleep(150);
+    status = manager.getStatus();
+    assertEquals([status.chunks, manager.getMetrics().chunksExpired], [1, 1], 'Old chunk expired on read, no timer needed');
+    assertEquals(manager.flush().length, 0, 'Nothing to flush once the newest chunk is older than flushDurationMs');
+    manager.destroy();
+    assertEquals(manager.getStatus().chunks, 0, 'Destroyed manager is empty');
+
+    const resized = new AudioBufferManager({ bufferDurationMs: 200, logger: silentLogger });
+    resized.addChunk(chunkOf(320, 7));
+    resized.setSampleRate(48000);
+    assertEquals([resized.capacityBytes, resized.ring.capacity], [Math.ceil(48000 * 2 * 0.2 * 1.1), Math.ceil(48000 * 2 * 0.2 * 1.1)],
+        'Ring resized for the stream sample rate');
+    assertEquals(resized.getStatus().chunks, 0, 'Audio at the old rate dropped');
+    resized.addChunk(chunkOf(320, 8));
+    resized.setSampleRate(48000);
+    assertEquals(resized.getStatus().chunks, 1, 'Same rate keeps the ring');
+    resized.destroy();
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
@@ -0,0 +1,157 @@
+/**
+ * Unit Tests for Stable-Prefix Translation Cache
+ *
+ * Run with: node backend/tests/unit/utils/prefixTranslationCache.test.js
+ */
+
+import { PrefixTranslationCache, joinTranslation, sentenceSeparator, splitSentences } from '../../../utils/prefixTranslationCache.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+console.log('\n=== Prefix Translation Cache Unit Tests ===\n');
+
+// Test 1: Sentence splitting
+console.log('=== Test 1: Sentence splitting ===');
+assertEquals(splitSentences('In the beginning. God created').sentences, ['In the beginning.'], 'Complete sentence split off');
+assertEquals(splitSentences('In the beginning. God created').tail, 'God created', 'Unfinished tail kept');
+assertEquals(splitSentences('Verse 3.16 says. Next').sentences, ['Verse 3.16 says.'], 'Decimal point is not a boundary');
+assertEquals(splitSentences('He said "Go." Then').sentences, ['He said "Go."'], 'Closing quote stays with its sentence');
+assertEquals(splitSentences('No punctuation yet').sentences, [], 'No sentences without a terminator');
+console.log('');
+
+// Test 2: Exact hits
+console.log('=== Test 2: Exact hits ===');
+let cache = new PrefixTranslationCache();
+cache.set('en', 'es', 'In the beginning God', 'En el principio Dios');
+assertEquals(cache.lookup('en', 'es', 'In the beginning God'), { translation: 'En el principio Dios' }, 'Exact tail-only hit');
+assertEquals(cache.lookup('en', 'fr', 'In the beginning God'), {}, 'Other language pair misses');
+assertEquals(cache.lookup('en', 'es', 'In the beginning God created'), {}, 'Growing partial without a complete sentence misses');
+console.log('');
+
+// Test 3: Growing partial reuses the stable prefix
+console.log('=== Test 3: Stable prefix reuse ===');
+cache = new PrefixTranslationCache();
+cache.set('en', 'es', 'In the beginning God created the heavens. And the earth',
+    'En el principio Dios creó los cielos. Y la tierra');
+
+const grown = cache.lookup('en', 'es', 'In the beginning God created the heavens. And the earth was without form');
+assertEquals(grown.translatedPrefix, 'En el principio Dios creó los cielos.', 'Prefix translation reused');
+assertEquals(grown.remainder, 'And the earth was without form', 'Only the tail needs translating');
+
+cache.set('en', 'es', 'For God so loved the world. That he gave',
+    'Porque de tal manera amó Dios al mundo. Que dio. Extra sentence');
+assertEquals(cache.lookup('en', 'es', 'For God so loved the world. That he gave his only Son').translatedPrefix, undefined,
+    'Misaligned translation never stored as a sentence prefix');
+
+cache.set('en', 'es', 'Grace to you. And peace', 'Gracia a vosotros. Y paz.');
+assertEquals(cache.lookup('en', 'es', 'Grace to you. And peace from God').translatedPrefix, 'Gracia a vosotros.',
+    'Translator punctuating the tail still aligns');
+
+const stats = cache.getStats();
+assertEquals(stats.prefixHits, 2, 'Prefix hits counted');
+assert(stats.bytesSaved >= 'In the beginning God created the heavens. '.length, 'Bytes saved counted');
+console.log('');
+
+// Test 4: Deepest prefix wins
+console.log('=== Test 4: Deepest prefix ===');
+cache = new PrefixTranslationCache();
+cache.set('en', 'es', 'One. Two. Three', 'Uno. Dos. Tres');
+const deep = cache.lookup('en', 'es', 'One. Two. Three four');
+assertEquals(deep.translatedPrefix, 'Uno. Dos.', 'Two-sentence prefix used');
+assertEquals(deep.prefixText, 'One. Two.', 'Prefix text reported');
+assertEquals(cache.lookup('en', 'es', 'One. Two.'), { translation: 'Uno. Dos.' }, 'Complete-sentence text is an exact hit');
+console.log('');
+
+// Test 5: LRU eviction
+console.log('=== Test 5: LRU eviction ===');
+cache = new PrefixTranslationCache({ maxEntries: 2 });
+cache.set('en', 'es', 'alpha', 'alfa');
+cache.set('en', 'es', 'beta', 'beta-es');
+cache.lookup('en', 'es', 'alpha'); // alpha becomes most recently used
+cache.set('en', 'es', 'gamma', 'gama');
+assertEquals(cache.size, 2, 'Size capped at maxEntries');
+assertEquals(cache.lookup('en', 'es', 'beta'), {}, 'Least recently used entry evicted');
+assertEquals(cache.lookup('en', 'es', 'alpha'), { translation: 'alfa' }, 'Recently used entry kept');
+assertEquals(cache.getStats().evictions, 1, 'Eviction counted');
+console.log('');
+
+// Test 6: TTL expiry and pruning
+console.log('=== Test 6: TTL ===');
+cache = new PrefixTranslationCache({ ttlMs: 1 });
+cache.set('en', 'es', 'Amen. So be it', 'Amén. Así sea');
+const start = Date.now();
+while (Date.now() - start < 5) { /* wait past the TTL */ }
+assertEquals(cache.lookup('en', 'es', 'Amen. So be it'), {}, 'Expired entries miss');
+assertEquals(cache.lookup('en', 'es', 'Amen. So be it'), {}, 'Expired entries stay gone');
+assert(cache.getStats().expirations >= 1, 'Expiration counted');
+assertEquals(cache.getStats().languagePairs, 0, 'Empty trie pruned');
+console.log('');
+
+// Test 7: Unspaced target languages (zh/ja/th)
+console.log('=== Test 7: CJK targets ===');
+assertEquals([sentenceSeparator('zh'), sentenceSeparator('zh-TW'), sentenceSeparator('ja'), sentenceSeparator('th'), sentenceSeparator('es')],
+    ['', '', '', '', ' '], 'Separator by target language');
+cache = new PrefixTranslationCache();
+cache.set('en', 'zh', 'God is love. He who abides in love. And God', '神就是爱。住在爱里面的。神也');
+let hit = cache.lookup('en', 'zh', 'God is love. He who abides in love. And God in him');
+assertEquals(hit.translatedPrefix, '神就是爱。住在爱里面的。', 'Sentence prefix stored without spaces');
+assertEquals(hit.remainder, 'And God in him', 'Only the tail needs translating');
+assertEquals(joinTranslation(hit.translatedPrefix, '神也住在他里面', 'zh'), '神就是爱。住在爱里面的。神也住在他里面',
+    'Tail re-attached without a space');
+cache.set('en', 'es', 'God is love. He who abides', 'Dios es amor. El que permanece');
+assertEquals(joinTranslation(cache.lookup('en', 'es', 'God is love. He who abides in love').translatedPrefix, 'El que permanece en amor', 'es'),
+    'Dios es amor. El que permanece en amor', 'Spaced languages keep the space');
+assertEquals(joinTranslation('', '神', 'zh'), '神', 'No prefix');
+console.log('');
+
+// Test 8: Runs of terminators split in linear time
+console.log('=== Test 8: Terminator runs ===');
+let started = Date.now();
+let split = splitSentences('Wait' + '.'.repeat(5000) + 'x');
+assert(Date.now() - started < 100, 'Long dot run inside a word splits in under 100ms');
+assertEquals(split.sentences, [], 'Dots not followed by whitespace end no sentence');
+started = Date.now();
+split = splitSentences('Wait' + '.'.repeat(5000) + 'x and then?! Yes');
+assert(Date.now() - started < 100, 'Long dot run before a sentence end splits in under 100ms');
+assertEquals(split.sentences, ['Wait' + '.'.repeat(5000) + 'x and then?!'], 'Run stays inside the sentence');
+assertEquals(split.tail, 'Yes', 'Tail after the sentence');
+assertEquals(splitSentences('Wait... Go!! Now').sentences, ['Wait...', 'Go!!'], 'Runs followed by a space still end a sentence');
+assertEquals(splitSentences('He said "Stop!?" Then').sentences, ['He said "Stop!?"'], 'Run before a closing quote ends a sentence');
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
@@ -0,0 +1,173 @@
+/**
+ * Unit Tests for the warm-standby recognizer handoff de-overlap
+ *
+ * Run with: node backend/tests/unit/utils/recognizerHandoff.test.js
+ */
+
+import {
+    RecognizerHandoff,
+    durationToMs,
+    resultTimeline,
+    stripOverlapWords
+} from '../../../utils/recognizerHandoff.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const duration = (ms) => ({ seconds: String(Math.floor(ms / 1000)), nanos: (ms % 1000) * 1e6 });
+
+/**
+ * Build a StreamingRecognizeResponse with one result
+ * @param {string} text - Transcript
+ * @param {Object} options - { isFinal, endMs, words: [[word, startMs, endMs]] } (times relative to the recognizer)
+ */
+function response(text, { isFinal = false, endMs = 0, words = [] } = {}) {
+    return {
+        results: [{
+            alternatives: [{
+                transcript: text,
+                words: words.map(([word, start, end]) => ({ word, startTime: duration(start), endTime: duration(end) }))
+            }],
+            isFinal,
+            resultEndTime: duration(endMs)
+        }]
+    };
+}
+
+const transcriptOf = (data) => data?.results.map(result => result.alternatives[0].transcript).join(' ') ?? null;
+
+async function run() {
+    console.log('\n=== Recognizer Handoff Unit Tests ===\n');
+
+    // Test 1: Durations and timelines
+    console.log('=== Test 1: Durations and timelines ===');
+    assertEquals(durationToMs({ seconds: '2', nanos: 500000000 }), 2500, 'String seconds + nanos');
+    assertEquals(durationToMs({ seconds: { toNumber: () => 3 } }), 3000, 'Long seconds');
+    assertEquals(durationToMs(null), 0, 'Missing duration is 0');
+    const timeline = resultTimeline(response('and the lord', {
+        isFinal: true, endMs: 1200, words: [['and', 0, 300], ['the', 300, 600], ['lord', 600, 1100]]
+    }), 10000);
+    assertEquals([timeline.isFinal, timeline.endMs, timeline.text], [true, 11200, 'and the lord'], 'Timeline end is origin + resultEndTime');
+    assertEquals(timeline.words.map(word => [word.startMs, word.endMs]), [[10000, 10300], [10300, 10600], [10600, 11100]],
+        'Word offsets shifted by the origin');
+    assertEquals(resultTimeline(response('x'), null), null, 'No timeline before the recognizer was sent audio');
+    assertEquals(resultTimeline({ results: [] }, 0), null, 'No timeline without results');
+    console.log('');
+
+    // Test 2: Text overlap stripping
+    console.log('=== Test 2: Stripping repeated words ===');
+    const overlap = ['and', 'the', 'lord', 'said'];
+    assertEquals(stripOverlapWords('the Lord said unto Moses', overlap), 'unto Moses', 'Repeated run removed, case and punctuation ignored');
+    assertEquals(stripOverlapWords('The lord,', overlap), '', 'Partial inside the overlap is all repeat');
+    assertEquals(stripOverlapWords('unto Moses', overlap), 'unto Moses', 'No repeat kept as is');
+    assertEquals(stripOverlapWords('said go', overlap, 2), 'said go', 'Single-word repeat ignored when two are required');
+    assertEquals(stripOverlapWords('lord said go', overlap, 2), 'go', 'Two-word repeat removed');
+    console.log('');
+
+    // Test 3: Outgoing finalizes the utterance in flight; held standby final trimmed by word time
+    console.log('=== Test 3: Handoff completed by an outgoing final ===');
+    // Outgoing recognizer started at 0; standby primed with 23500..25000; handoff at 25000
+    let handoff = new RecognizerHandoff({ outgoingOriginMs: 0, standbyOriginMs: 23500, handoffMs: 25000 });
+    assertEquals(handoff.fromStandby(response('we are', { endMs: 800 }), resultTimeline(response('we are', { endMs: 800 }), 23500)), null,
+        'Standby partial dropped while the outgoing recognizer drains');
+    const standbyFinal = response('we are gathered here today', {
+        isFinal: true, endMs: 3000,
+        words: [['we', 200, 500], ['are', 500, 800], ['gathered', 1600, 2100], ['here', 2100, 2400], ['today', 2400, 2900]]
+    });
+    assertEquals(handoff.fromStandby(standbyFinal, resultTimeline(standbyFinal, 23500)), null, 'Standby final held while draining');
+    assertEquals(handoff.fromOutgoing(resultTimeline(response('we are gath'), 0)), false, 'Outgoing partial does not retire it');
+    const outgoingFinal = response('we are', { isFinal: true, endMs: 24600, words: [['we', 23700, 24000], ['are', 24000, 24400]] });
+    assertEquals(handoff.fromOutgoing(resultTimeline(outgoingFinal, 0)), false, 'Final before the handoff point keeps it draining');
+    assertEquals(handoff.boundaryMs, 24600, 'Boundary at the end of the outgoing final');
+    assertEquals(handoff.overlapWords, ['we', 'are'], 'Overlap words are the final words inside the primed audio');
+    const released = handoff.retire();
+    assertEquals(released.map(transcriptOf), ['gathered here today'], 'Held final lost the words before the boundary');
+    assertEquals(released[0].results[0].alternatives[0].words.length, 3, 'Trimmed words match the transcript');
+    assert(handoff.done, 'First standby final ends the handoff');
+    assertEquals(transcriptOf(handoff.fromStandby(response('and then', { endMs: 4000 }), resultTimeline(response('and then', { endMs: 4000 }), 23500))),
+        'and then', 'Results after the handoff pass through');
+    console.log('');
+
+    // Test 4: Retire on a final past the handoff point; later standby results de-overlapped
+    console.log('=== Test 4: Standby results after retirement ===');
+    handoff = new RecognizerHandoff({ outgoingOriginMs: 1000, standbyOriginMs: 24500, handoffMs: 25000 });
+    const spanning = response('the lord said', {
+        isFinal: true, endMs: 24400, words: [['the', 23000, 23500], ['lord', 23500, 24000], ['said', 24000, 24300]]
+    });
+    assert(handoff.fromOutgoing(resultTimeline(spanning, 1000)), 'Final past the handoff point retires the outgoing recognizer');
+    assertEquals(handoff.retire(), [], 'Nothing held');
+    assertEquals(handoff.overlapWords, ['lord', 'said'], 'Words ending after the standby origin are the overlap');
+    let data = response('lord said', { endMs: 800 });
+    assertEquals(handoff.fromStandby(data, resultTimeline(data, 24500)), null, 'Standby partial ending before the boundary dropped');
+    data = response('lord said unto', { endMs: 2200 });
+    assertEquals(transcriptOf(handoff.fromStandby(data, resultTimeline(data, 24500))), 'unto', 'Standby partial stripped of repeated words');
+    data = response('Lord said unto Moses.', {
+        isFinal: true, endMs: 3200, words: [['Lord', 0, 500], ['said', 500, 800], ['unto', 1600, 2000], ['Moses.', 2000, 2600]]
+    });
+    const delivered = handoff.fromStandby(data, resultTimeline(data, 24500));
+    assertEquals(transcriptOf(delivered), 'unto Moses.', 'Standby final trimmed at the boundary by word midpoint');
+    assert(data.results[0].alternatives[0].transcript === 'Lord said unto Moses.', 'Original response left untouched');
+    assertEquals([handoff.done, handoff.droppedResults, handoff.trimmedWords], [true, 1, 4], 'Handoff stats');
+    console.log('');
+
+    // Test 5: Outgoing never finalizes; the forced partial becomes the boundary
+    console.log('=== Test 5: Drain timeout with a forced final ===');
+    handoff = new RecognizerHandoff({ outgoingOriginMs: 0, standbyOriginMs: 238500, handoffMs: 240000 });
+    handoff.fromOutgoing(resultTimeline(response('for God so loved the world', { endMs: 241500 }), 0));
+    data = response('loved the world that he gave', { isFinal: true, endMs: 5000 });
+    handoff.fromStandby(data, resultTimeline(data, 238500));
+    const forced = handoff.retire('for God so loved the world');
+    assertEquals(handoff.boundaryMs, 241500, 'Boundary at the end of the forced partial');
+    assertEquals(forced.map(transcriptOf), ['that he gave'], 'Held final without word offsets stripped by text');
+    console.log('');
+
+    // Test 6: A final shortly before the handoff seeds the boundary
+    console.log('=== Test 6: Last final before the handoff ===');
+    const lastFinal = resultTimeline(response('Amen.', { isFinal: true, endMs: 24800, words: [['Amen.', 24300, 24700]] }), 0);
+    handoff = new RecognizerHandoff({ outgoingOriginMs: 0, standbyOriginMs: 23500, handoffMs: 25000, lastFinal });
+    assertEquals([handoff.boundaryMs, handoff.overlapWords], [24800, ['amen']], 'Boundary and overlap from the last final');
+    handoff.retire();
+    data = response('Amen. Let us pray', {
+        isFinal: true, endMs: 3000, words: [['Amen.', 800, 1200], ['Let', 1900, 2100], ['us', 2100, 2300], ['pray', 2300, 2800]]
+    });
+    assertEquals(transcriptOf(handoff.fromStandby(data, resultTimeline(data, 23500))), 'Let us pray', 'Re-recognized word dropped');
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
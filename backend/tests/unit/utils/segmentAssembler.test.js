@@ -0,0 +1,168 @@
+/**
+ * Unit Tests for the word-timeline Segment Assembler
+ *
+ * Tests partial tail rewrites, final replacement by audio span, segment
+ * boundaries, restart overlap and forced finals.
+ * Run with: node backend/tests/unit/utils/segmentAssembler.test.js
+ */
+
+import { SegmentAssembler } from '../../../../core/engine/segmentAssembler.js';
+import { CoreEngine } from '../../../../core/engine/coreEngine.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+/**
+ * Meta of a final: words as [word, startMs, endMs] on the audio timeline
+ */
+function finalMeta(words, endMs = words[words.length - 1][2] + 100) {
+    return { timeline: { endMs, words: words.map(([word, startMs, endMs]) => ({ word, startMs, endMs })) } };
+}
+
+const partialMeta = (endMs, stability = 0.5) => ({ timeline: { endMs, words: [] }, stability });
+const texts = (segments) => segments.map(segment => segment.text);
+
+async function run() {
+    console.log('\n=== Segment Assembler Unit Tests ===\n');
+
+    // Test 1: Partials rewrite only the changed tail
+    console.log('=== Test 1: Partial tail ===');
+    let assembler = new SegmentAssembler();
+    assertEquals(assembler.addResult('for God', true, partialMeta(800)), [], 'Partials commit nothing');
+    assertEquals(assembler.stats.recordsWritten, 2, 'Two records written');
+    assembler.addResult('for God so', true, partialMeta(1200));
+    assertEquals(assembler.stats.recordsWritten, 3, 'Extension writes only the new word');
+    assembler.addResult('for God so loved', true, partialMeta(1600, 0.9));
+    assembler.addResult('for God sold', true, partialMeta(1500));
+    assertEquals(assembler.stats.recordsWritten, 5, 'Rewrite starts at the first changed word');
+    let open = assembler.getOpenSegment();
+    assertEquals([open.partialText, open.finalWords, open.partialWords], ['for God sold', 0, 3], 'Open transcript');
+    assertEquals([assembler.starts[2], assembler.ends[2]], [assembler.ends[1], 1500], 'Rewritten word spread up to resultEndTime');
+    assertEquals(assembler.stabilities[0], 0.5, 'Partial stability stored');
+    console.log('');
+
+    // Test 2: Finals replace the tail; segments commit at sentence ends
+    console.log('=== Test 2: Finals and sentence boundaries ===');
+    let segments = assembler.addResult('For God so loved the world.', false, finalMeta([
+        ['For', 0, 300], ['God', 300, 700], ['so', 700, 900], ['loved', 900, 1300], ['the', 1300, 1450], ['world.', 1450, 1900]
+    ]));
+    assertEquals(texts(segments), ['For God so loved the world.'], 'Sentence committed as soon as it is final');
+    assertEquals([segments[0].startMs, segments[0].endMs, segments[0].wordCount, segments[0].reason, segments[0].isForced],
+        [0, 1900, 6, 'sentence_end', false], 'Segment span from word offsets');
+    assertEquals(assembler.getOpenSegment(), null, 'Nothing left open');
+
+    assembler.addResult('that he', true, partialMeta(2600));
+    segments = assembler.addResult('That he gave his only Son, that whoever believes', false, finalMeta([
+        ['That', 2100, 2300], ['he', 2300, 2450], ['gave', 2450, 2800], ['his', 2800, 2950], ['only', 2950, 3300], ['Son,', 3300, 3700],
+        ['that', 4600, 4800], ['whoever', 4800, 5200], ['believes', 5200, 5700]
+    ]));
+    assertEquals(texts(segments), ['That he gave his only Son,'], 'Pause between final words ends a segment');
+    assertEquals(segments[0].reason, 'pause', 'Reason');
+    open = assembler.getOpenSegment();
+    assertEquals([open.finalText, open.partialWords], ['that whoever believes', 0], 'Final words without a boundary stay open');
+    segments = assembler.addResult('in him shall not perish.', false, finalMeta([
+        ['in', 5800, 5900], ['him', 5900, 6100], ['shall', 6100, 6400], ['not', 6400, 6600], ['perish.', 6600, 7100]
+    ]));
+    assertEquals(texts(segments), ['that whoever believes in him shall not perish.'], 'Open final words join the next final');
+    console.log('');
+
+    // Test 3: A final re-covering audio replaces records by span, not by text
+    console.log('=== Test 3: Replacement by audio span ===');
+    assembler = new SegmentAssembler();
+    assembler.addResult('and the lord said', false, finalMeta([['and', 0, 200], ['the', 200, 400], ['lord', 400, 800], ['said', 800, 1100]]));
+    assembler.addResult('unto moses', true, partialMeta(1800));
+    assembler.addResult('the Lord said unto', false, finalMeta([['the', 200, 400], ['Lord', 400, 800], ['said', 800, 1100], ['unto', 1100, 1400]]));
+    open = assembler.getOpenSegment();
+    assertEquals([open.text, open.partialWords], ['and the Lord said unto', 0], 'Covered records replaced, earlier ones kept, tail dropped');
+    assembler.addResult('the great', false, finalMeta([['the', 200, 300], ['great', 300, 400]]));
+    assertEquals(assembler.getOpenSegment().text, 'and the great Lord said unto', 'Later records shift right after a longer replacement');
+    assembler.addResult('Lord said', false, finalMeta([['Lordsaid', 400, 1100]]));
+    assertEquals(assembler.getOpenSegment().text, 'and the great Lordsaid unto', 'Later records shift left after a shorter replacement');
+    console.log('');
+
+    // Test 4: Restart overlap and forced finals
+    console.log('=== Test 4: Forced finals and restart overlap ===');
+    assembler = new SegmentAssembler();
+    assembler.addResult('we are gathered', false, finalMeta([['we', 0, 200], ['are', 200, 400], ['gathered', 400, 900]]));
+    assembler.addResult('here to', true, partialMeta(1500));
+    segments = assembler.addResult('here today', false, { forced: true });
+    assertEquals(texts(segments), ['we are gathered here today'], 'Forced final commits finals and the pending partial');
+    assertEquals([segments[0].isForced, segments[0].reason, segments[0].endMs], [true, 'forced', 1500], 'Forced segment ends at the partial end');
+    // The new recognizer was primed with audio from before the restart
+    segments = assembler.addResult('today we remember.', false, finalMeta([['today', 1100, 1450], ['we', 1700, 1900], ['remember.', 1900, 2400]]));
+    assertEquals(texts(segments), ['we remember.'], 'Re-recognized committed word dropped');
+    assertEquals(assembler.stats.overlapWordsDropped, 1, 'Overlap counted');
+    assertEquals(assembler.addResult('Amen', false, { forced: true }).length, 1, 'Forced final without open words still commits its text');
+    console.log('');
+
+    // Test 5: Boundaries, growth and compaction
+    console.log('=== Test 5: Boundaries and capacity ===');
+    assembler = new SegmentAssembler({ maxSegmentWords: 4, initialCapacity: 4 });
+    const words = Array.from({ length: 10 }, (_, i) => [`w${i}`, i * 100, i * 100 + 90]);
+    segments = assembler.addResult('', false, finalMeta(words));
+    assertEquals(texts(segments), ['w0 w1 w2 w3', 'w4 w5 w6 w7'], 'maxSegmentWords splits run-ons');
+    assert(assembler.capacity >= 10, `Arrays grew to ${assembler.capacity}`);
+    assertEquals([assembler.head, assembler.getOpenSegment().text], [0, 'w8 w9'], 'Committed records compacted away');
+    assertEquals(texts([assembler.signalHardBoundary()]), ['w8 w9'], 'Hard boundary commits open final words');
+    assertEquals(assembler.signalExplicitBoundary(), null, 'Nothing to commit');
+    assembler.addResult('more', true, partialMeta(2000));
+    assertEquals(assembler.flush(), [], 'Flush leaves the partial tail open');
+    assembler.reset();
+    assertEquals([assembler.getOpenSegment(), assembler.committedEndMs], [null, -1], 'Reset');
+    console.log('');
+
+    // Test 6: CoreEngine assembles only timeline results
+    console.log('=== Test 6: CoreEngine assembly ===');
+    const engine = new CoreEngine();
+    assertEquals(engine.assembleResult('no timeline.', false, {}), [], 'Results without a timeline ignored');
+    assertEquals(engine.assembleResult('stray', false, { forced: true }), [], 'Forced final ignored when nothing is open');
+    segments = engine.assembleResult('Amen.', false, finalMeta([['Amen.', 0, 400]]));
+    assertEquals(texts(segments), ['Amen.'], 'Committed segments returned');
+    assertEquals(engine.getState().segments.segmentsCommitted, 1, 'State includes the assembler');
+    assertEquals(engine.assembleResult('and then', false, finalMeta([['and', 600, 800], ['then', 850, 1000]])), [], 'Open final words wait for a boundary');
+    engine.assembleResult('and then we', true, partialMeta(1300));
+    assert(engine.hasOpenSegment(), 'Open segment reported');
+    assertEquals(texts(engine.flushSegments()), ['and then'], 'Flush commits the open final words (speaker paused)');
+    assert(!engine.hasOpenSegment(), 'Only the partial tail is left open');
+    segments = engine.assembleResult('we', false, { forced: true });
+    assertEquals([texts(segments), segments[0].isForced], [['we'], true], 'Forced final commits the partial tail');
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
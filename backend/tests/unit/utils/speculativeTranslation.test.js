@@ -0,0 +1,196 @@
+/**
+ * Unit Tests for Speculative Final Translation
+ *
+ * Run with: node backend/tests/unit/utils/speculativeTranslation.test.js
+ */
+
+import { SpeculativeTranslator, getSpeculationStats } from '../../../utils/speculativeTranslation.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Fake translator: resolves after `delay` ms, honours abort, fails texts listed in `failing`
+ */
+function createTranslator(delay = 20, failing = []) {
+    const translator = { calls: [], aborted: [] };
+    translator.translate = (text, signal) => new Promise((resolve, reject) => {
+        translator.calls.push(text);
+        const timer = setTimeout(() => {
+            if (failing.includes(text)) reject(new Error('upstream error'));
+            else resolve(`ES(${text})`);
+        }, delay);
+        signal?.addEventListener('abort', () => {
+            clearTimeout(timer);
+            translator.aborted.push(text);
+            const error = new Error('This operation was aborted');
+            error.name = 'AbortError';
+            reject(error);
+        });
+    });
+    return translator;
+}
+
+async function run() {
+    console.log('\n=== Speculative Translation Unit Tests ===\n');
+
+    // Test 1: Stable partial is translated and reused by the matching final
+    console.log('=== Test 1: Hit on a stable partial ===');
+    let translator = createTranslator(20);
+    let spec = new SpeculativeTranslator({ sessionId: 'test-hit', stableMs: 20, translate: translator.translate });
+    spec.onPartial('and god said let there');
+    spec.onPartial('and god said let there be light');
+    await sleep(10);
+    spec.onPartial('And God said let there be light'); // Same text up to case - timer keeps running
+    await sleep(60);
+    assertEquals(translator.calls, ['And God said let there be light'], 'Only the stable partial is translated');
+    let result = await spec.translateFinal('And God said, "Let there be light."');
+    assertEquals(result, 'ES(And God said let there be light)', 'Final with punctuation reuses the speculation');
+    assertEquals(translator.calls.length, 1, 'No second API call');
+    let stats = spec.getStats();
+    assertEquals([stats.hits, stats.inFlightHits, stats.wasted], [1, 0, 0], 'Finished hit counted');
+    assert(stats.savedMs >= 15, `Saved latency recorded (${stats.savedMs}ms)`);
+    spec.dispose();
+    console.log('');
+
+    // Test 2: Final arriving while the speculation is still in flight
+    console.log('=== Test 2: In-flight hit ===');
+    translator = createTranslator(50);
+    spec = new SpeculativeTranslator({ sessionId: 'test-inflight', stableMs: 10, translate: translator.translate });
+    spec.onPartial('blessed are the poor in spirit');
+    await sleep(25);
+    const started = Date.now();
+    result = await spec.translateFinal('Blessed are the poor in spirit.');
+    assertEquals(result, 'ES(blessed are the poor in spirit)', 'In-flight speculation awaited');
+    assert(Date.now() - started < 50, 'Final waits only for the remainder of the call');
+    assertEquals(spec.getStats().inFlightHits, 1, 'In-flight hit counted');
+    spec.dispose();
+    console.log('');
+
+    // Test 3: Mismatch discards the speculation and translates normally
+    console.log('=== Test 3: Mismatch ===');
+    translator = createTranslator(50);
+    spec = new SpeculativeTranslator({ sessionId: 'test-miss', stableMs: 10, translate: translator.translate });
+    spec.onPartial('for god so loved the world');
+    await sleep(20);
+    result = await spec.translateFinal('For God so loved the world that he gave');
+    assertEquals(result, 'ES(For God so loved the world that he gave)', 'Final translated normally');
+    assertEquals(translator.aborted, ['for god so loved the world'], 'Unmatched in-flight speculation aborted');
+    assertEquals(spec.getStats().wasted, 1, 'Wasted call counted');
+    spec.dispose();
+    console.log('');
+
+    // Test 4: Wasted-call budget
+    console.log('=== Test 4: Wasted-call budget ===');
+    translator = createTranslator(5);
+    spec = new SpeculativeTranslator({
+        sessionId: 'test-budget', stableMs: 5, maxWastedPerMinute: 2, translate: translator.translate
+    });
+    for (const phrase of ['one two three four', 'five six seven eight', 'nine ten eleven twelve']) {
+        spec.onPartial(phrase);
+        await sleep(20);
+        await spec.translateFinal(`${phrase} and more`);
+    }
+    stats = spec.getStats();
+    assertEquals([stats.started, stats.wasted, stats.budgetSkipped], [2, 2, 1], 'Speculation stops once the budget is spent');
+    assertEquals(stats.wastedLastMinute, 2, 'Budget window tracked');
+    spec.dispose();
+    console.log('');
+
+    // Test 5: Context, short partials, failures, disabled
+    console.log('=== Test 5: Guards ===');
+    translator = createTranslator(5, ['the lord is my shepherd']);
+    let pair = 'en:es';
+    spec = new SpeculativeTranslator({
+        sessionId: 'test-guards', stableMs: 5, contextKey: () => pair, translate: translator.translate
+    });
+    spec.onPartial('amen');
+    await sleep(20);
+    assertEquals(translator.calls.length, 0, 'Partials under minWords are not speculated on');
+
+    spec.onPartial('grace and peace to you');
+    await sleep(20);
+    pair = 'en:fr';
+    await spec.translateFinal('grace and peace to you');
+    assertEquals(translator.calls.length, 2, 'Speculation from another language pair is not reused');
+
+    spec.onPartial('the lord is my shepherd');
+    await sleep(20);
+    result = await spec.translateFinal('The Lord is my shepherd.');
+    assertEquals(result, 'ES(The Lord is my shepherd.)', 'Failed speculation falls back to a normal translation');
+    assertEquals(spec.getStats().failed, 1, 'Failure counted');
+    spec.dispose();
+
+    translator = createTranslator(5);
+    spec = new SpeculativeTranslator({ sessionId: 'test-off', enabled: false, stableMs: 5, translate: translator.translate });
+    spec.onPartial('in the beginning was the word');
+    await sleep(20);
+    await spec.translateFinal('In the beginning was the word');
+    assertEquals(translator.calls, ['In the beginning was the word'], 'Disabled translator only translates finals');
+    spec.dispose();
+    console.log('');
+
+    // Test 6: Abort and dispose
+    console.log('=== Test 6: Abort and dispose ===');
+    translator = createTranslator(50);
+    spec = new SpeculativeTranslator({ sessionId: 'test-abort', stableMs: 5, translate: translator.translate });
+    spec.onPartial('let us pray together now');
+    await sleep(15);
+    const controller = new AbortController();
+    const pending = spec.translateFinal('Let us pray together now.', controller.signal);
+    controller.abort();
+    try {
+        await pending;
+        assert(false, 'Aborted final rejects');
+    } catch (error) {
+        assertEquals(error.name, 'AbortError', 'Aborting the final aborts the matched speculation');
+    }
+
+    spec.onPartial('peace be with you all');
+    await sleep(15);
+    spec.dispose();
+    assertEquals(translator.aborted.length, 2, 'Dispose aborts live speculations');
+    assert(!getSpeculationStats().sessions.some(s => s.sessionId === 'test-abort'), 'Disposed translator removed from stats');
+    assert(getSpeculationStats().totals.hits >= 3, 'Retired counters kept in totals');
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
@@ -0,0 +1,116 @@
+/**
+ * Unit Tests for Transcript Text Merge
+ *
+ * Run with: node backend/tests/unit/utils/textMerge.test.js
+ */
+
+import { findOverlap, mergeWithOverlap, prefixFunction, ACCUMULATED_MAX_OVERLAP } from '../../../utils/textMerge.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+// Quadratic scan the patchers used to inject, used as the oracle
+function naiveOverlap(oldText, newText, minOverlap, maxOverlap = Infinity) {
+    if (!oldText || !newText) return 0;
+    const limit = Math.min(oldText.length, newText.length, maxOverlap);
+    for (let i = limit; i >= minOverlap && i > 0; i--) {
+        if (newText.startsWith(oldText.slice(-i))) return i;
+    }
+    return 0;
+}
+
+console.log('\n=== Text Merge Unit Tests ===\n');
+
+// Test 1: Prefix function
+console.log('=== Test 1: Prefix function ===');
+assertEquals(Array.from(prefixFunction('abacaba')), [0, 0, 1, 0, 1, 2, 3], 'prefixFunction("abacaba")');
+assertEquals(Array.from(prefixFunction('')), [], 'prefixFunction("") is empty');
+
+// Test 2: Basic overlap
+console.log('\n=== Test 2: Basic overlap ===');
+const accumulated = 'And the Lord said unto Moses, go down and speak unto the people';
+const nextFinal = 'go down and speak unto the people that they may hear';
+assertEquals(findOverlap(accumulated, nextFinal), 'go down and speak unto the people'.length, 'Finds full sentence overlap');
+assertEquals(findOverlap('short text here', 'here we go'), 0, 'Overlap below minimum is ignored');
+assertEquals(findOverlap('short text here', 'here we go', { minOverlap: 1 }), 4, 'minOverlap is configurable');
+assertEquals(findOverlap('', 'anything'), 0, 'Empty old text has no overlap');
+assertEquals(findOverlap('anything', null), 0, 'Missing new text has no overlap');
+
+// Test 3: maxOverlap caps the match length
+console.log('\n=== Test 3: maxOverlap ===');
+const longSentence = 'a'.repeat(150);
+assertEquals(findOverlap(longSentence, longSentence, { maxOverlap: ACCUMULATED_MAX_OVERLAP }), 100, 'Overlap capped at maxOverlap');
+assertEquals(findOverlap('xyz' + 'ab'.repeat(60), 'ab'.repeat(60) + 'q', { maxOverlap: 101 }), 100, 'Cap falls back to the longest border that fits');
+
+// Test 4: Agrees with the quadratic scan on random input
+console.log('\n=== Test 4: Randomized agreement with naive scan ===');
+let seed = 12345;
+function rand(n) {
+    seed = (seed * 1103515245 + 12345) & 0x7fffffff;
+    return seed % n;
+}
+function randomText(len, alphabet) {
+    let s = '';
+    for (let i = 0; i < len; i++) s += alphabet[rand(alphabet.length)];
+    return s;
+}
+let mismatches = 0;
+for (let trial = 0; trial < 2000; trial++) {
+    const alphabet = trial % 2 ? 'ab' : 'ab c';
+    const shared = randomText(rand(40), alphabet);
+    const oldText = randomText(rand(60), alphabet) + shared;
+    const newText = shared + randomText(rand(60), alphabet);
+    const minOverlap = 1 + rand(25);
+    const maxOverlap = trial % 3 === 0 ? 10 + rand(40) : Infinity;
+    if (findOverlap(oldText, newText, { minOverlap, maxOverlap }) !== naiveOverlap(oldText, newText, minOverlap, maxOverlap)) {
+        mismatches++;
+    }
+}
+assertEquals(mismatches, 0, 'KMP overlap matches naive scan on 2000 random cases');
+
+// Test 5: mergeWithOverlap
+console.log('\n=== Test 5: mergeWithOverlap ===');
+const merged = mergeWithOverlap(accumulated + ' ', '  ' + nextFinal);
+assertEquals(merged.mergedText, 'And the Lord said unto Moses, go down and speak unto the people that they may hear', 'Merges overlapping texts');
+assertEquals(merged.newPart, 'that they may hear', 'Reports new part');
+const contained = mergeWithOverlap(accumulated, 'go down and speak unto the people');
+assertEquals(contained.mergedText, accumulated, 'Fully overlapped text leaves old text unchanged');
+const unrelated = mergeWithOverlap(accumulated, 'completely different sentence here');
+assertEquals(unrelated.mergedText, null, 'No overlap returns null mergedText');
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
@@ -0,0 +1,99 @@
+/**
+ * Unit Tests for Rolling Transcript Buffer
+ *
+ * Run with: node backend/tests/unit/utils/transcriptBuffer.test.js
+ */
+
+import { TranscriptBuffer, getTranscriptBufferStats } from '../../../utils/transcriptBuffer.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+console.log('\n=== Transcript Buffer Unit Tests ===\n');
+
+// Test 1: Behaves like the old string for set/append/clear
+console.log('=== Test 1: String-equivalent accumulation ===');
+const buffer = new TranscriptBuffer({ sessionId: 'session_test_1' });
+assert(buffer.isEmpty(), 'New buffer is empty');
+buffer.set('In the beginning');
+buffer.append('was the Word');
+buffer.append('and the Word was with God');
+assertEquals(buffer.toString(), 'In the beginning was the Word and the Word was with God', 'Segments join with single spaces');
+assertEquals(buffer.length, buffer.toString().length, 'length matches joined string');
+buffer.set('Replaced');
+assertEquals(buffer.toString(), 'Replaced', 'set() replaces contents');
+buffer.clear();
+assert(buffer.isEmpty() && buffer.toString() === '', 'clear() empties the buffer');
+
+// Test 2: Tail window tracks the end of the text
+console.log('\n=== Test 2: Tail window ===');
+const tailBuffer = new TranscriptBuffer({ tailWindowChars: 120 });
+let reference = '';
+for (let i = 0; i < 50; i++) {
+    const segment = `segment number ${i} of the sermon`;
+    tailBuffer.append(segment);
+    reference = reference ? `${reference} ${segment}` : segment;
+}
+assertEquals(tailBuffer.getTail(), reference.slice(-120), 'Tail equals last tailWindowChars of the full text');
+assertEquals(tailBuffer.getTail(30), reference.slice(-30), 'getTail(n) returns last n chars');
+assert(tailBuffer.getTail().length <= 120, 'Tail never exceeds the window');
+
+// Test 3: Size bound evicts oldest segments
+console.log('\n=== Test 3: Eviction ===');
+const bounded = new TranscriptBuffer({ tailWindowChars: 100, maxChars: 200 });
+for (let i = 0; i < 100; i++) {
+    bounded.append(`final ${i} goes here`);
+}
+assert(bounded.length <= 200, 'Buffer stays within maxChars');
+assert(bounded.toString().endsWith('final 99 goes here'), 'Newest text is retained');
+const boundedStats = bounded.getStats();
+assert(boundedStats.evictedSegments > 0, 'Evicted segments are counted');
+assertEquals(boundedStats.chars, bounded.toString().length, 'Stats chars matches contents');
+bounded.set('x'.repeat(500));
+assertEquals(bounded.length, 200, 'Oversized single segment is truncated to maxChars');
+
+// Test 4: Registry
+console.log('\n=== Test 4: Per-session stats registry ===');
+const before = getTranscriptBufferStats();
+assert(before.sessions.some(s => s.sessionId === 'session_test_1'), 'Live buffer is listed by session');
+buffer.dispose();
+const after = getTranscriptBufferStats();
+assert(!after.sessions.some(s => s.sessionId === 'session_test_1'), 'Disposed buffer is removed from stats');
+assertEquals(after.buffers, before.buffers - 1, 'Buffer count decreases on dispose');
+
+// Summary
+console.log('\n=== Test Summary ===');
+console.log(`Passed: ${passed}`);
+console.log(`Failed: ${failed}`);
+console.log(`Total: ${passed + failed}`);
+
+if (failed === 0) {
+    console.log('\n✓ All tests passed!');
+    process.exit(0);
+} else {
+    console.log('\n✗ Some tests failed');
+    process.exit(1);
+}
@@ -0,0 +1,248 @@
+/**
+ * Unit Tests for the Cross-Session Final Translation Batcher
+ *
+ * Run with: node backend/tests/unit/utils/translationBatcher.test.js
+ */
+
+import { TranslationBatcher, createTranslationBatcher, getTranslationBatcherStats } from '../../../utils/translationBatcher.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+function abortable(signal, timer, reject) {
+    signal?.addEventListener('abort', () => {
+        clearTimeout(timer);
+        const error = new Error('This operation was aborted');
+        error.name = 'AbortError';
+        reject(error);
+    });
+}
+
+/**
+ * Fake upstream: single and batched requests resolve after `delay` ms (or per-text
+ * delays), batches leave out texts listed in `missing`, `failBatch` fails every batch
+ */
+function createUpstream({ delay = 20, delays = {}, missing = [], failBatch = null } = {}) {
+    const upstream = { single: [], batches: [], aborted: 0 };
+    upstream.translateOne = (item, signal) => new Promise((resolve, reject) => {
+        upstream.single.push(item.text);
+        const timer = setTimeout(() => resolve(`${item.targetLang}(${item.text})`), delays[item.text] ?? delay);
+        abortable(signal, timer, (error) => { upstream.aborted++; reject(error); });
+    });
+    upstream.translateBatch = (items, signal) => new Promise((resolve, reject) => {
+        upstream.batches.push(items.map(item => item.text));
+        const timer = setTimeout(() => {
+            if (failBatch) reject(failBatch);
+            else resolve(items.map(item => missing.includes(item.text) ? null : `${item.targetLang}(${item.text})`));
+        }, delay);
+        abortable(signal, timer, (error) => { upstream.aborted++; reject(error); });
+    });
+    return upstream;
+}
+
+const request = (text, sessionId, targetLang = 'es', extra = {}) => ({
+    text, sessionId, targetLang, sourceLang: 'en', model: 'gpt-4o-mini', apiKey: 'key', ...extra
+});
+
+async function run() {
+    console.log('\n=== Translation Batcher Unit Tests ===\n');
+
+    // Test 1: Finals from different sessions for the same pair share one request
+    console.log('=== Test 1: Cross-session batching ===');
+    let upstream = createUpstream();
+    let batcher = new TranslationBatcher({ ...upstream, windowMs: 15 });
+    let results = await Promise.all([
+        batcher.translate(request('hello', 's1')),
+        batcher.translate(request('good morning', 's2')),
+        batcher.translate(request('welcome', 's3'))
+    ]);
+    assertEquals(results, ['es(hello)', 'es(good morning)', 'es(welcome)'], 'Each caller gets its own translation');
+    assertEquals(upstream.batches, [['hello', 'good morning', 'welcome']], 'One batched request');
+    assertEquals(upstream.single.length, 0, 'No single requests');
+    let stats = batcher.getStats();
+    assertEquals([stats.requests, stats.batchRequests, stats.requestsSaved], [1, 1, 2], 'Two requests saved');
+    batcher.dispose();
+    console.log('');
+
+    // Test 2: Different language pairs / models / keys never share a request
+    console.log('=== Test 2: Grouping by model and language pair ===');
+    upstream = createUpstream();
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 15 });
+    results = await Promise.all([
+        batcher.translate(request('a', 's1', 'es')),
+        batcher.translate(request('b', 's2', 'fr')),
+        batcher.translate(request('c', 's3', 'es')),
+        batcher.translate(request('d', 's4', 'es', { model: 'gpt-4o' })),
+        batcher.translate(request('e', 's5', 'es', { apiKey: 'other' }))
+    ]);
+    assertEquals(results, ['es(a)', 'fr(b)', 'es(c)', 'es(d)', 'es(e)'], 'Results matched to their pair');
+    assertEquals(upstream.batches, [['a', 'c']], 'Only the same model + pair + key is batched');
+    assertEquals(upstream.single.sort(), ['b', 'd', 'e'], 'Lone items sent as single translations');
+    batcher.dispose();
+    console.log('');
+
+    // Test 3: A session's results resolve in request order across batches
+    console.log('=== Test 3: Per-session ordering ===');
+    upstream = createUpstream({ delays: { first: 60, second: 5 } });
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 0 });
+    const order = [];
+    await Promise.all([
+        batcher.translate(request('first', 's1')).then(text => order.push(text)),
+        batcher.translate(request('second', 's1')).then(text => order.push(text)),
+        batcher.translate(request('other', 's2')).then(text => order.push(text))
+    ]);
+    assertEquals(order.filter(text => text !== 'es(other)'), ['es(first)', 'es(second)'],
+        'Faster second request waits for the first');
+    assert(order.indexOf('es(other)') < order.indexOf('es(first)'), 'Other sessions are not held back');
+    batcher.dispose();
+    console.log('');
+
+    // Test 4: Items missing from the batch response, or a failed batch, fall back to single requests
+    console.log('=== Test 4: Fallback to single translations ===');
+    upstream = createUpstream({ missing: ['lost'] });
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 10 });
+    results = await Promise.all([
+        batcher.translate(request('kept', 's1')),
+        batcher.translate(request('lost', 's2'))
+    ]);
+    assertEquals(results, ['es(kept)', 'es(lost)'], 'Missing item translated on its own');
+    assertEquals(upstream.single, ['lost'], 'Only the missing item retried');
+    batcher.dispose();
+
+    upstream = createUpstream({ failBatch: new Error('Unexpected token in JSON') });
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 10 });
+    results = await Promise.all([
+        batcher.translate(request('x', 's1')),
+        batcher.translate(request('y', 's2'))
+    ]);
+    assertEquals(results, ['es(x)', 'es(y)'], 'Failed batch retried item by item');
+    assertEquals(batcher.getStats().fallbacks, 2, 'Fallbacks counted');
+    batcher.dispose();
+
+    const rateLimited = new Error('Rate limited');
+    rateLimited.skipRequest = true;
+    upstream = createUpstream({ failBatch: rateLimited });
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 10 });
+    const settled = await Promise.allSettled([
+        batcher.translate(request('x', 's1')),
+        batcher.translate(request('y', 's2'))
+    ]);
+    assert(settled.every(outcome => outcome.status === 'rejected' && outcome.reason.skipRequest),
+        'Rate-limit skip applies to every item without retries');
+    assertEquals(upstream.single.length, 0, 'No single retries while rate limited');
+    batcher.dispose();
+    console.log('');
+
+    // Test 5: Aborting one item leaves the rest of its batch alone
+    console.log('=== Test 5: Per-item abort ===');
+    upstream = createUpstream({ delay: 30 });
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 10 });
+    let controller = new AbortController();
+    let aborted = batcher.translate(request('superseded', 's1', 'es', { signal: controller.signal }));
+    let kept = batcher.translate(request('kept', 's2'));
+    controller.abort();
+    try {
+        await aborted;
+        assert(false, 'Aborted item rejects');
+    } catch (error) {
+        assertEquals(error.name, 'AbortError', 'Aborted item rejects with AbortError');
+    }
+    assertEquals(await kept, 'es(kept)', 'Other item still translated');
+    assertEquals(upstream.single, ['kept'], 'Aborted while collecting: never sent');
+
+    controller = new AbortController();
+    aborted = batcher.translate(request('late', 's1', 'es', { signal: controller.signal }));
+    await sleep(20); // Sent, request in flight
+    controller.abort();
+    await aborted.catch(() => {});
+    await sleep(5);
+    assertEquals(upstream.aborted, 1, 'In-flight request aborted once nothing in it is waiting');
+    batcher.dispose();
+    console.log('');
+
+    // Test 6: Deadlines flush early and expire items that cannot make it
+    console.log('=== Test 6: Deadlines ===');
+    upstream = createUpstream({ delay: 10 });
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 200 });
+    let startedAt = Date.now();
+    assertEquals(await batcher.translate(request('urgent', 's1', 'es', { deadline: Date.now() + 40 })), 'es(urgent)',
+        'Item with a deadline translated');
+    assert(Date.now() - startedAt < 150, `Deadline flushed the batch before the window (${Date.now() - startedAt}ms)`);
+
+    upstream = createUpstream({ delay: 80 });
+    batcher.dispose();
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 5 });
+    try {
+        await batcher.translate(request('slow', 's1', 'es', { deadline: Date.now() + 20 }));
+        assert(false, 'Expired item rejects');
+    } catch (error) {
+        assert(error.message.includes('timeout'), `Expired item rejects with a timeout error (${error.message})`);
+    }
+    assertEquals(batcher.getStats().expired, 1, 'Expiry counted');
+    batcher.dispose();
+    console.log('');
+
+    // Test 7: Batch limits
+    console.log('=== Test 7: maxItems, maxChars and windowMs 0 ===');
+    upstream = createUpstream();
+    batcher = new TranslationBatcher({ ...upstream, windowMs: 50, maxItems: 2, maxChars: 100 });
+    startedAt = Date.now();
+    await Promise.all(['one', 'two', 'three'].map((text, i) => batcher.translate(request(text, `s${i}`))));
+    assertEquals(upstream.batches, [['one', 'two']], 'Full batch sent straight away');
+    assertEquals(upstream.single, ['three'], 'Next item starts a new batch');
+    await Promise.all([
+        batcher.translate(request('x'.repeat(80), 'a')),
+        batcher.translate(request('y'.repeat(80), 'b'))
+    ]);
+    assertEquals(upstream.single.length, 3, 'Items past maxChars go into separate requests');
+    batcher.dispose();
+
+    upstream = createUpstream();
+    batcher = createTranslationBatcher({ ...upstream, windowMs: 0 });
+    await Promise.all([batcher.translate(request('p', 's1')), batcher.translate(request('q', 's2'))]);
+    assertEquals([upstream.batches.length, upstream.single.length], [0, 2], 'windowMs 0 disables batching');
+    assert(getTranslationBatcherStats().some(entry => entry.windowMs === 0), 'Live batcher listed in stats');
+    batcher.dispose();
+    assert(!getTranslationBatcherStats().some(entry => entry.windowMs === 0), 'Disposed batcher removed from stats');
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
@@ -0,0 +1,141 @@
+/**
+ * Unit Tests for Worker Thread Pool
+ *
+ * Run with: node backend/tests/unit/utils/workerPool.test.js
+ */
+
+import { WorkerPool, getWorkerPoolStats } from '../../../utils/workerPool.js';
+
+// Test counter
+let passed = 0;
+let failed = 0;
+
+function assert(condition, message) {
+    if (condition) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        failed++;
+    }
+}
+
+function assertEquals(actual, expected, message) {
+    if (JSON.stringify(actual) === JSON.stringify(expected)) {
+        console.log(`✓ ${message}`);
+        passed++;
+    } else {
+        console.error(`✗ ${message}`);
+        console.error(`  Expected: ${JSON.stringify(expected)}`);
+        console.error(`  Actual:   ${JSON.stringify(actual)}`);
+        failed++;
+    }
+}
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Test worker: doubles job.n after job.delayMs; job.fail replies with an error, job.crash kills the thread
+const TEST_WORKER = `
+const { parentPort } = require('worker_threads');
+parentPort.on('message', ({ id, job }) => {
+    if (job.crash) process.exit(3);
+    setTimeout(() => {
+        if (job.fail) parentPort.postMessage({ id, error: 'job failed' });
+        else parentPort.postMessage({ id, result: { n: job.n * 2, thread: require('worker_threads').threadId } });
+    }, job.delayMs || 0);
+});
+parentPort.postMessage({ ready: true });
+`;
+
+const fallbackCalls = [];
+const fallback = async (job, reason) => {
+    fallbackCalls.push(reason);
+    return { n: job.n * 2, thread: 0, reason };
+};
+
+function createPool(options = {}) {
+    return new WorkerPool({ name: 'test', script: TEST_WORKER, workerOptions: { eval: true }, fallback, ...options });
+}
+
+async function run() {
+    console.log('\n=== Worker Pool Unit Tests ===\n');
+
+    // Test 1: Jobs run on workers, results matched by id
+    console.log('=== Test 1: Parallel jobs ===');
+    let pool = createPool({ size: 2 });
+    const results = await Promise.all([30, 10, 20, 0].map((delayMs, n) => pool.run({ n, delayMs })));
+    assertEquals(results.map(r => r.n), [0, 2, 4, 6], 'Each caller gets its own result, whatever finishes first');
+    assert(results.every(r => r.thread > 0), 'Jobs ran on worker threads');
+    assertEquals(new Set(results.map(r => r.thread)).size, 2, 'Both workers used');
+    let stats = pool.getStats();
+    assertEquals([stats.completed, stats.workers, stats.busy, stats.queued], [4, 2, 0, 0], 'Stats after the batch');
+    assert(getWorkerPoolStats().some(s => s.name === 'test'), 'Pool listed in live stats');
+    pool.dispose();
+    console.log('');
+
+    // Test 2: Backpressure
+    console.log('=== Test 2: Backpressure ===');
+    fallbackCalls.length = 0;
+    pool = createPool({ size: 1, maxQueue: 2 });
+    pool.warm();
+    const burst = await Promise.all([1, 2, 3, 4, 5].map(n => pool.run({ n, delayMs: 20 })));
+    assertEquals(burst.map(r => r.n), [2, 4, 6, 8, 10], 'Every job answered');
+    assert(fallbackCalls.length >= 2 && fallbackCalls.every(r => r === 'backpressure'),
+        `Jobs beyond the queue limit ran on the fallback (${fallbackCalls.length})`);
+    assertEquals(pool.getStats().maxQueued, 2, 'Queue never grew past maxQueue');
+    pool.dispose();
+    console.log('');
+
+    // Test 3: Time budget
+    console.log('=== Test 3: Time budget ===');
+    fallbackCalls.length = 0;
+    pool = createPool({ size: 1, timeoutMs: 30 });
+    const slow = await pool.run({ n: 7, delayMs: 200 });
+    assertEquals([slow.n, slow.reason], [14, 'timeout'], 'Over-budget job answered by the fallback');
+    stats = pool.getStats();
+    assertEquals([stats.restarts, stats.workers], [1, 1], 'Stuck worker replaced');
+    const after = await pool.run({ n: 8 });
+    assert(after.thread > 0 && after.n === 16, 'Replacement worker serves the next job');
+    pool.dispose();
+    console.log('');
+
+    // Test 4: Errors, crashes and size 0
+    console.log('=== Test 4: Failures ===');
+    fallbackCalls.length = 0;
+    pool = createPool({ size: 1 });
+    const failedJob = await pool.run({ n: 1, fail: true });
+    assertEquals(failedJob.reason, 'error', 'Job error answered by the fallback');
+    const crashed = await pool.run({ n: 2, crash: true });
+    assertEquals(crashed.reason, 'error', 'Worker crash answered by the fallback');
+    const recovered = await pool.run({ n: 3 });
+    assert(recovered.thread > 0, 'Crashed worker replaced');
+    pool.dispose();
+    const disposed = await pool.run({ n: 4 });
+    assertEquals(disposed.reason, 'unavailable', 'Disposed pool falls back');
+
+    pool = createPool({ size: 0 });
+    assertEquals((await pool.run({ n: 5 })).reason, 'unavailable', 'Size 0 runs on the fallback');
+    pool.dispose();
+
+    pool = new WorkerPool({ name: 'broken', script: 'throw new Error("boom")', workerOptions: { eval: true }, fallback, size: 1 });
+    const broken = await pool.run({ n: 6 });
+    assertEquals(broken.n, 12, 'Worker that cannot start still gets an answer');
+    await sleep(50);
+    pool.dispose();
+
+    // Summary
+    console.log('\n=== Test Summary ===');
+    console.log(`Passed: ${passed}`);
+    console.log(`Failed: ${failed}`);
+    console.log(`Total: ${passed + failed}`);
+
+    if (failed === 0) {
+        console.log('\n✓ All tests passed!');
+        process.exit(0);
+    } else {
+        console.log('\n✗ Some tests failed');
+        process.exit(1);
+    }
+}
+
+run();
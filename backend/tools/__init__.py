@@ -0,0 +1 @@
+"""Python tooling for the Exbabel backend (reference implementations, benchmarks, simulators)"""
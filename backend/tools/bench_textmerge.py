@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark per-final overlap cost as accumulated text grows
+
+Two shapes from the soloModeHandler.js final path are measured at each
+accumulated size:
+
+  final    a new ~200-char final whose start repeats the tail of the
+           accumulated finals (the "Accumulated final" merge)
+  partial  the uncapped final-vs-partial check where the latest partial spans
+           the whole processed final but diverges from it near the start
+           (the worst case of the "FINAL merged with partial" merge)
+
+Usage (from backend/):
+    python -m tools.bench_textmerge [--max-chars 60000] [--step 10000]
+"""
+
+import argparse
+import random
+import time
+
+from tools.textmerge import ACCUMULATED_MAX_OVERLAP, find_overlap, naive_find_overlap
+
+WORDS = (
+    'the lord is my shepherd i shall not want he maketh me to lie down in green '
+    'pastures he leadeth me beside the still waters he restoreth my soul grace '
+    'and peace be unto you from god our father and the lord jesus christ'
+).split()
+
+
+def make_text(rng, n_chars):
+    words = []
+    size = 0
+    while size < n_chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)[:n_chars]
+
+
+def time_per_call(fn, old_text, new_text, repeats, **kwargs):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(old_text, new_text, **kwargs)
+    return (time.perf_counter() - start) / repeats
+
+
+def run(max_chars, step, repeats, seed):
+    rng = random.Random(seed)
+    corpus = make_text(rng, max_chars + step)
+    rows = []
+    for size in range(step, max_chars + 1, step):
+        accumulated = corpus[:size]
+
+        final = accumulated[-60:] + ' ' + make_text(rng, 140)
+        final_linear = time_per_call(find_overlap, accumulated, final, repeats,
+                                     max_overlap=ACCUMULATED_MAX_OVERLAP)
+        final_naive = time_per_call(naive_find_overlap, accumulated, final, repeats,
+                                    max_overlap=ACCUMULATED_MAX_OVERLAP)
+
+        partial = 'and ' + accumulated + ' ' + make_text(rng, 40)
+        partial_linear = time_per_call(find_overlap, accumulated, partial, max(1, repeats // 10))
+        partial_naive = time_per_call(naive_find_overlap, accumulated, partial, 1)
+
+        rows.append((size, final_linear, final_naive, partial_linear, partial_naive))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-chars', type=int, default=60000)
+    parser.add_argument('--step', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print('Per-call cost in milliseconds (linear = KMP, naive = injected closure)')
+    print(f'{"accumulated":>12} {"final lin":>10} {"final naive":>12} {"partial lin":>12} {"partial naive":>14}')
+    for size, f_lin, f_naive, p_lin, p_naive in run(args.max_chars, args.step, args.repeats, args.seed):
+        print(f'{size:>12} {f_lin * 1e3:>10.3f} {f_naive * 1e3:>12.3f} {p_lin * 1e3:>12.3f} {p_naive * 1e3:>14.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""Compile the PhraseSet glossary into the compact index used by utils/glossaryMatcher.js
+
+The matcher compiles glossary.json itself when the index is missing or stale.
+Building the index ahead of time keeps that work (and the 800 KB of JSON)
+off the backend's event loop.
+
+Usage (from backend/):
+    python -m tools.glossary            # writes ../glossary.index.json
+    python -m tools.glossary --check    # exit 1 if the index is out of date
+"""
+
+from tools.glossary.compile import (
+    INDEX_VERSION,
+    build_index,
+    compile_index,
+    is_current,
+    normalize_variant,
+    phrase_variants,
+    write_index,
+)
+
+__all__ = [
+    'INDEX_VERSION',
+    'build_index',
+    'compile_index',
+    'is_current',
+    'normalize_variant',
+    'phrase_variants',
+    'write_index',
+]
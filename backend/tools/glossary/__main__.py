@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Command-line entry point: python -m tools.glossary [--check]"""
+
+import argparse
+import os
+import sys
+
+from tools.glossary.compile import build_index, is_current, write_index
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tools.glossary',
+        description='Compile the PhraseSet glossary into the index loaded by utils/glossaryMatcher.js')
+    parser.add_argument('--glossary', default=os.path.join(REPO_ROOT, 'glossary.json'))
+    parser.add_argument('--segmented', default=os.path.join(REPO_ROOT, 'glossary-segmented.json'),
+                        help='Segmented glossary for phrase categories (skipped if missing)')
+    parser.add_argument('--out', default=os.path.join(REPO_ROOT, 'glossary.index.json'))
+    parser.add_argument('--check', action='store_true',
+                        help='Exit 1 if the index is missing or out of date instead of writing it')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.check:
+            if is_current(args.out, args.glossary, args.segmented):
+                print(f'{args.out} is up to date')
+                return 0
+            print(f'{args.out} is missing or out of date - run python -m tools.glossary', file=sys.stderr)
+            return 1
+        index = build_index(args.glossary, args.segmented)
+    except (OSError, ValueError) as err:
+        print(f'Could not compile glossary: {err}', file=sys.stderr)
+        return 1
+
+    write_index(index, args.out)
+    print(f"Wrote {args.out}: {len(index['phrases'])} phrases, {len(index['categories'])} categories "
+          f"({os.path.getsize(args.out)} bytes)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Compile glossary.json / glossary-segmented.json into the matcher index
+
+The index holds exactly what utils/glossaryMatcher.js needs to build its
+automaton, and nothing else:
+
+    {
+      "version": 1,
+      "sources": {"glossary": <sha256>, "segmented": <sha256 or null>},
+      "categories": [category names from glossary-segmented.json],
+      "phrases": [phrase values that can be reported, in glossary.json order],
+      "phraseCategories": [bitmask of categories per phrase]
+    }
+
+A match reports the first glossary phrase that has the matched variant, so a phrase
+whose variants all belong to earlier phrases can never be reported and is left out.
+The matcher derives the variants from the phrases with the same normalization as
+the inline check it replaced: lowercase, split "/" alternatives ("Aram/Aramea"),
+drop . , ! ? ; : and trim. Empty variants are dropped, because they would match
+every transcript.
+"""
+
+import hashlib
+import json
+import re
+
+INDEX_VERSION = 1
+PUNCTUATION = re.compile(r'[.,!?;:]')
+
+
+def normalize_variant(text):
+    return PUNCTUATION.sub('', text.strip()).strip()
+
+
+def phrase_variants(value):
+    """Normalized variants of a glossary phrase value"""
+    return [variant for variant in (normalize_variant(part) for part in value.lower().split('/')) if variant]
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def compile_index(glossary, segmented=None, glossary_sha=None, segmented_sha=None):
+    """Build the index dict from parsed glossary (and optional segmented glossary) JSON"""
+    phrases = [phrase['value'] for phrase in glossary.get('phrases', []) if isinstance(phrase.get('value'), str)]
+
+    categories = list((segmented or {}).get('categories', {}).keys())
+    if len(categories) > 31:
+        raise ValueError(f'{len(categories)} categories do not fit the 31-bit category mask')
+    masks_by_value = {}
+    for bit, name in enumerate(categories):
+        for phrase in segmented['categories'][name].get('phrases', []):
+            value = phrase.get('value')
+            if isinstance(value, str):
+                masks_by_value[value] = masks_by_value.get(value, 0) | (1 << bit)
+
+    seen = set()
+    reportable = []
+    for value in phrases:
+        variants = set(phrase_variants(value)) - seen
+        if variants:
+            seen |= variants
+            reportable.append(value)
+
+    return {
+        'version': INDEX_VERSION,
+        'sources': {'glossary': glossary_sha, 'segmented': segmented_sha},
+        'categories': categories,
+        'phrases': reportable,
+        'phraseCategories': [masks_by_value.get(value, 0) for value in reportable],
+    }
+
+
+def build_index(glossary_path, segmented_path=None):
+    """Read the glossary files and compile the index (source hashes included)"""
+    with open(glossary_path, 'rb') as f:
+        glossary_bytes = f.read()
+    segmented = segmented_sha = None
+    if segmented_path:
+        try:
+            with open(segmented_path, 'rb') as f:
+                segmented_bytes = f.read()
+        except FileNotFoundError:
+            segmented_bytes = None
+        if segmented_bytes is not None:
+            segmented = json.loads(segmented_bytes)
+            segmented_sha = sha256_bytes(segmented_bytes)
+    return compile_index(json.loads(glossary_bytes), segmented, sha256_bytes(glossary_bytes), segmented_sha)
+
+
+def write_index(index, out_path):
+    """Write the index compactly (one line, no spaces, UTF-8)"""
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+        f.write('\n')
+
+
+def is_current(index_path, glossary_path, segmented_path=None):
+    """Whether the index on disk was compiled from the current glossary files"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    return index == build_index(glossary_path, segmented_path)
@@ -0,0 +1,37 @@
+"""Asyncio multi-session load generator and capacity report
+
+Drives concurrent host sessions, each with its listeners, against a backend
+running on the fake recognizer and fake OpenAI (tests/bench/stubBackend.js).
+Each step runs N sessions at once and records:
+
+- caption latency at every listener (recognizer final -> listener final)
+- lost and duplicated finals
+- server CPU/RSS over time, and the load generator's own CPU and send lag
+  (if the generator falls behind, the step measures it, not the server)
+
+The result is a sessions vs p99 caption latency curve (JSON + CSV) that can
+be compared across releases.
+
+Usage (from backend/):
+    npm run bench:stub                                  # in another terminal, or pass --spawn
+    python -m tools.loadgen --steps 1,10,50,100 --listeners 20 --label v2.1
+    python -m tools.loadgen --spawn --steps 1,5,10 --label quick
+    python -m tools.loadgen --compare tests/bench/results/capacity-v2.0-*.json tests/bench/results/capacity-v2.1-*.json
+"""
+
+from tools.loadgen.capacity import analyze_listener, capacity, compare, summarize, summarize_step
+from tools.loadgen.runner import run_capacity, run_step
+from tools.loadgen.wsclient import ConnectionClosed, WebSocket, connect
+
+__all__ = [
+    'ConnectionClosed',
+    'WebSocket',
+    'analyze_listener',
+    'capacity',
+    'compare',
+    'connect',
+    'run_capacity',
+    'run_step',
+    'summarize',
+    'summarize_step',
+]
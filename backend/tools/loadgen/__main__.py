@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Command-line entry point: python -m tools.loadgen [--spawn] [--steps 1,10,50] ..."""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from tools.loadgen.capacity import capacity, compare, git_info, write_report
+from tools.loadgen.control import BACKEND_DIR, fetch_status, spawn_stub, stop_stub
+from tools.loadgen.runner import run_capacity
+
+DEFAULT_OUT = os.path.join(BACKEND_DIR, 'tests', 'bench', 'results')
+
+
+def _steps(value):
+    steps = [int(part) for part in value.split(',') if part.strip()]
+    if not steps or min(steps) < 1:
+        raise argparse.ArgumentTypeError('steps must be positive session counts, e.g. 1,10,50')
+    return steps
+
+
+def _raise_fd_limit():
+    """Thousands of sockets need more than the usual 1024 descriptors"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+
+
+async def _run(args):
+    if args.server_pid is None:
+        try:
+            status = await fetch_status(args.control_url)
+            args.server_pid = status.get('backendPid')
+        except OSError as err:
+            print(f'[LoadGen] Stub control server not reachable ({err}); server CPU/RSS will not be sampled',
+                  file=sys.stderr)
+    return await run_capacity(args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tools.loadgen',
+        description='Drive concurrent host/listener sessions against the stubbed backend '
+                    '(tests/bench/stubBackend.js) and record a sessions vs p99 caption latency curve')
+    parser.add_argument('--url', default='http://127.0.0.1:3099', help='Backend base URL')
+    parser.add_argument('--control-url', default='http://127.0.0.1:3098', help='Stub backend control server')
+    parser.add_argument('--spawn', action='store_true', help='Start tests/bench/stubBackend.js for the run')
+    parser.add_argument('--scripts', help='Replay scripts for --spawn (default: tests/bench/scripts)')
+    parser.add_argument('--speed', type=float, help='Script playback speed for --spawn')
+    parser.add_argument('--steps', type=_steps, default=[1, 5, 10, 25, 50], help='Concurrent sessions per step')
+    parser.add_argument('--listeners', type=int, default=5, help='Listeners per session (default: 5)')
+    parser.add_argument('--chunk-ms', type=int, default=100, help='Audio chunk duration (default: 100)')
+    parser.add_argument('--ramp-s', type=float, default=5.0, help='Spread session starts over this many seconds')
+    parser.add_argument('--settle-s', type=float, default=2.0, help='Listener idle time that ends a session')
+    parser.add_argument('--settle-timeout-s', type=float, default=30.0, help='Longest wait for listeners to go idle')
+    parser.add_argument('--max-session-s', type=float, default=600.0, help='Longest a host streams audio')
+    parser.add_argument('--target-lang', default='es')
+    parser.add_argument('--slo-p99-ms', type=int, default=2000, help='p99 caption latency that defines capacity')
+    parser.add_argument('--stop-on-breach', action='store_true', help='Stop after the first step that misses the SLO')
+    parser.add_argument('--server-pid', type=int, help='Backend pid to sample (default: from the control server)')
+    parser.add_argument('--sample-interval', type=float, default=1.0, help='CPU/RSS sampling interval in seconds')
+    parser.add_argument('--first-tag', type=int, default=1000,
+                        help='First audio tag; use a new range when reusing a running stub')
+    parser.add_argument('--label', default='run', help='Label stored with the results')
+    parser.add_argument('--out', default=DEFAULT_OUT, help='Results directory')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'),
+                        help='Print the difference between two result files and exit')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        reports = []
+        for path in args.compare:
+            with open(path, 'r', encoding='utf-8') as f:
+                reports.append(json.load(f))
+        print('\n'.join(compare(*reports)))
+        return 0
+    if args.listeners < 1:
+        parser.error('--listeners must be at least 1 (caption latency is measured at listeners)')
+
+    _raise_fd_limit()
+    stub = None
+    if args.spawn:
+        try:
+            stub = spawn_stub(urlsplit(args.url).port or 80, urlsplit(args.control_url).port or 80,
+                              scripts=args.scripts, speed=args.speed)
+        except (OSError, RuntimeError) as err:
+            print(f'[LoadGen] Could not start the stub backend: {err}', file=sys.stderr)
+            return 1
+
+    created_at = datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+    try:
+        steps = asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        stop_stub(stub)
+
+    report = {
+        'label': args.label,
+        'createdAt': created_at,
+        'git': git_info(BACKEND_DIR),
+        'python': platform.python_version(),
+        'options': {
+            'listenersPerSession': args.listeners,
+            'chunkMs': args.chunk_ms,
+            'rampS': args.ramp_s,
+            'targetLang': args.target_lang,
+            'speed': args.speed,
+        },
+        'capacity': capacity(steps, args.slo_p99_ms),
+        'curve': [[step['sessions'], step['captionLatencyMs']['p99']] for step in steps],
+        'steps': steps,
+    }
+    out_path = write_report(args.out, report)
+
+    print('\nsessions  connections  p99 caption latency (ms)')
+    for step in steps:
+        print(f"{step['sessions']:>8}  {step['connections']:>11}  {step['captionLatencyMs']['p99']}")
+    print(f"Capacity @ p99 <= {args.slo_p99_ms}ms with no lost finals: {report['capacity']['sessions']} session(s)")
+    print(f'[LoadGen] Results written to {out_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""Per-step analysis, the capacity curve, and result files
+
+Matching follows tests/bench/finalLatency.bench.js, applied per listener:
+
+- Caption latency = recognizer emitting a final -> first listener final at or
+  after it that contains the emitted final's last 4 words. Translated caption
+  latency runs up to the first such final that carries a translation.
+- An emitted final that never arrives at a listener is lost (counted per
+  listener). The same committed text under more than one seqId is a duplicate.
+
+Percentiles are nearest-rank, as in tests/bench/benchResults.js.
+"""
+
+import csv
+import json
+import math
+import os
+import re
+import subprocess
+
+MATCH_WORDS = 4
+NON_WORD = re.compile(r"[^\w\s']|_")
+SPACES = re.compile(r'\s+')
+
+CSV_COLUMNS = (
+    'sessions', 'connections', 'p50_ms', 'p95_ms', 'p99_ms', 'translated_p99_ms', 'lost', 'duplicates',
+    'server_cpu_mean', 'server_cpu_max', 'rss_max_mb', 'client_cpu_max', 'max_send_lag_ms', 'errors',
+)
+
+
+def normalize(text):
+    return SPACES.sub(' ', NON_WORD.sub(' ', (text or '').lower())).strip()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    rank = math.ceil(p / 100 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+
+def summarize(values):
+    """count/min/mean/p50/p95/p99/max of durations in ms"""
+    ordered = sorted(round(v) for v in values)
+    return {
+        'count': len(ordered),
+        'min': ordered[0] if ordered else None,
+        'mean': round(sum(ordered) / len(ordered)) if ordered else None,
+        'p50': percentile(ordered, 50),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+        'max': ordered[-1] if ordered else None,
+    }
+
+
+def analyze_listener(emitted, finals):
+    """Match emitted finals against one listener's finals
+
+    emitted: [{ text, emittedAt }] from the recognizer
+    finals: [(received_at_ms, source_text, seq_id, translated)] from the listener
+    Returns (latencies, translated_latencies, lost, duplicates)
+    """
+    received = [(at, normalize(text), seq_id, translated) for at, text, seq_id, translated in finals]
+
+    latencies = []
+    translated_latencies = []
+    for final in emitted:
+        key = ' '.join(normalize(final['text']).split(' ')[-MATCH_WORDS:])
+        if not key:
+            continue
+        candidates = [r for r in received if r[0] >= final['emittedAt'] and key in r[1]]
+        if not candidates:
+            continue
+        latencies.append(candidates[0][0] - final['emittedAt'])
+        translated = next((r for r in candidates if r[3]), None)
+        if translated:
+            translated_latencies.append(translated[0] - final['emittedAt'])
+
+    seen = {}
+    duplicates = 0
+    for _, text, seq_id, _ in received:
+        if text not in seen:
+            seen[text] = seq_id
+        elif seen[text] != seq_id:
+            duplicates += 1
+
+    return latencies, translated_latencies, len(emitted) - len(latencies), duplicates
+
+
+def summarize_step(sessions, listeners, results, emitted_by_tag, duration_s, resources):
+    """One point of the capacity curve from the sessions' results"""
+    latencies = []
+    translated_latencies = []
+    session_p99 = []
+    details = []
+    errors = []
+    emitted_total = lost = duplicates = messages = chunks = late_chunks = unsettled = 0
+    max_send_lag = 0.0
+
+    for tag, result in results:
+        if isinstance(result, BaseException):
+            errors.append(f'session {tag}: {type(result).__name__}: {result}')
+            continue
+        emitted = emitted_by_tag.get(tag, {}).get('finals', [])
+        emitted_total += len(emitted)
+        session_latencies = []
+        session_lost = session_duplicates = 0
+        for finals in result.listener_finals:
+            found, translated, missing, repeated = analyze_listener(emitted, finals)
+            session_latencies += found
+            translated_latencies += translated
+            session_lost += missing
+            session_duplicates += repeated
+        latencies += session_latencies
+        lost += session_lost
+        duplicates += session_duplicates
+        messages += result.messages
+        chunks += result.chunks
+        late_chunks += result.late_chunks
+        max_send_lag = max(max_send_lag, result.max_send_lag_ms)
+        unsettled += not result.settled
+
+        summary = summarize(session_latencies)
+        if summary['p99'] is not None:
+            session_p99.append(summary['p99'])
+        details.append({
+            'tag': tag,
+            'sessionId': result.session_id,
+            'emittedFinals': len(emitted),
+            'lostFinals': session_lost,
+            'duplicateFinals': session_duplicates,
+            'latencyMs': {'p50': summary['p50'], 'p99': summary['p99'], 'max': summary['max']},
+        })
+
+    return {
+        'sessions': sessions,
+        'listenersPerSession': listeners,
+        'connections': sessions * (listeners + 1),
+        'durationS': round(duration_s, 1),
+        'emittedFinals': emitted_total,
+        'expectedDeliveries': emitted_total * listeners,
+        'deliveredFinals': len(latencies),
+        'lostFinals': lost,
+        'duplicateFinals': duplicates,
+        'captionLatencyMs': summarize(latencies),
+        'translatedCaptionLatencyMs': summarize(translated_latencies),
+        'sessionP99LatencyMs': summarize(session_p99),
+        'throughput': {
+            'deliveriesPerSec': round(len(latencies) / duration_s, 2) if duration_s else None,
+            'listenerMessagesPerSec': round(messages / duration_s, 2) if duration_s else None,
+        },
+        'client': {
+            'maxSendLagMs': round(max_send_lag),
+            'lateChunkShare': round(late_chunks / chunks, 4) if chunks else None,
+            'unsettledSessions': unsettled,
+        },
+        'resources': resources,
+        'errors': errors,
+        'sessionDetails': details,
+    }
+
+
+def meets_slo(step, slo_p99_ms):
+    p99 = step['captionLatencyMs']['p99']
+    return not step['errors'] and step['lostFinals'] == 0 and p99 is not None and p99 <= slo_p99_ms
+
+
+def capacity(steps, slo_p99_ms):
+    """Largest session count before the first step that misses the SLO (p99, no loss, no errors)"""
+    best = None
+    for step in steps:
+        if not meets_slo(step, slo_p99_ms):
+            break
+        best = step['sessions']
+    return {'sloP99Ms': slo_p99_ms, 'sessions': best}
+
+
+def git_info(cwd):
+    """Current commit and whether the working tree has changes"""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--', '.'], cwd=cwd, text=True).strip())
+        return {'commit': commit, 'dirty': dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _csv_row(step):
+    latency = step['captionLatencyMs']
+    resources = step['resources'] or {}
+    return {
+        'sessions': step['sessions'],
+        'connections': step['connections'],
+        'p50_ms': latency['p50'],
+        'p95_ms': latency['p95'],
+        'p99_ms': latency['p99'],
+        'translated_p99_ms': step['translatedCaptionLatencyMs']['p99'],
+        'lost': step['lostFinals'],
+        'duplicates': step['duplicateFinals'],
+        'server_cpu_mean': resources.get('cpuPercent', {}).get('mean'),
+        'server_cpu_max': resources.get('cpuPercent', {}).get('max'),
+        'rss_max_mb': resources.get('rssMb', {}).get('max'),
+        'client_cpu_max': resources.get('clientCpuPercent', {}).get('max'),
+        'max_send_lag_ms': step['client']['maxSendLagMs'],
+        'errors': len(step['errors']),
+    }
+
+
+def write_report(out_dir, report):
+    """Write capacity-<label>-<timestamp>.json and the curve as .csv; returns the JSON path"""
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = re.sub(r'[:.]', '-', report['createdAt'])
+    base = os.path.join(out_dir, f"capacity-{report['label']}-{stamp}")
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    with open(base + '.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(_csv_row(step) for step in report['steps'])
+    return base + '.json'
+
+
+def format_delta(base, head):
+    """"base -> head (+x%)" for comparison output"""
+    if base is None or head is None:
+        return 'n/a'
+    diff = head - base
+    pct = f" ({'+' if diff >= 0 else ''}{diff / base * 100:.1f}%)" if base != 0 else ''
+    return f'{base} -> {head}{pct}'
+
+
+def compare(base, head):
+    """Comparison lines for two reports, step by step (steps matched by session count)"""
+    lines = [f"=== {base['label']} ({(base.get('git') or {}).get('commit', '?')}) -> "
+             f"{head['label']} ({(head.get('git') or {}).get('commit', '?')}) ==="]
+    base_steps = {step['sessions']: step for step in base['steps']}
+    for step in head['steps']:
+        before = base_steps.get(step['sessions'])
+        if before is None:
+            lines.append(f"{step['sessions']} sessions: not in base")
+            continue
+        lines.append(f"{step['sessions']} sessions ({step['connections']} connections):")
+        for p in ('p50', 'p95', 'p99'):
+            lines.append(f"  captionLatencyMs.{p}: "
+                         f"{format_delta(before['captionLatencyMs'][p], step['captionLatencyMs'][p])}")
+        lines.append(f"  lostFinals: {format_delta(before['lostFinals'], step['lostFinals'])}")
+        lines.append(f"  duplicateFinals: {format_delta(before['duplicateFinals'], step['duplicateFinals'])}")
+        if before['resources'] and step['resources']:
+            lines.append(f"  serverCpuMean: {format_delta(before['resources']['cpuPercent']['mean'], step['resources']['cpuPercent']['mean'])}")
+            lines.append(f"  rssMaxMb: {format_delta(before['resources']['rssMb']['max'], step['resources']['rssMb']['max'])}")
+    lines.append(f"capacity @ p99 <= {head['capacity']['sloP99Ms']}ms: "
+                 f"{format_delta(base['capacity']['sessions'], head['capacity']['sessions'])} sessions")
+    return lines
@@ -0,0 +1,97 @@
+"""HTTP side of a load run: session creation and the stub backend's control server
+
+Blocking urllib calls run in worker threads, so they never stall the sockets.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STUB_SCRIPT = os.path.join('tests', 'bench', 'stubBackend.js')
+
+SESSION_START_ATTEMPTS = 5
+FINALS_TAGS_PER_REQUEST = 200
+
+
+def _request_json(method, url, body=None, timeout=10.0):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)
+
+
+async def request_json(method, url, body=None, timeout=10.0):
+    return await asyncio.to_thread(_request_json, method, url, body, timeout)
+
+
+async def start_session(base_url):
+    """POST /session/start, backing off on 429; returns { sessionId, sessionCode, wsUrl }"""
+    for attempt in range(SESSION_START_ATTEMPTS):
+        try:
+            data = await request_json('POST', f'{base_url}/session/start', {})
+        except urllib.error.HTTPError as err:
+            if err.code != 429 or attempt == SESSION_START_ATTEMPTS - 1:
+                raise
+            try:
+                retry_after = float(json.load(err).get('retryAfter') or 1)
+            except ValueError:
+                retry_after = 1.0
+            await asyncio.sleep(retry_after)
+            continue
+        if not data.get('success'):
+            raise RuntimeError(f"Session creation failed: {data.get('error')}")
+        return data
+    raise RuntimeError('Session creation failed')
+
+
+async def fetch_status(control_url):
+    """GET /status from the stub backend"""
+    return await request_json('GET', f'{control_url}/status')
+
+
+async def fetch_finals(control_url, tags):
+    """Emitted finals and script state per tag: { tag: { done, finals: [{ text, emittedAt }] } }"""
+    tags = list(tags)
+    result = {}
+    for i in range(0, len(tags), FINALS_TAGS_PER_REQUEST):
+        batch = ','.join(str(tag) for tag in tags[i:i + FINALS_TAGS_PER_REQUEST])
+        data = await request_json('GET', f'{control_url}/finals?tags={batch}')
+        result.update({int(tag): value for tag, value in data.items()})
+    return result
+
+
+def spawn_stub(port, control_port, scripts=None, speed=None, timeout=60.0):
+    """Start tests/bench/stubBackend.js and wait until its control server answers"""
+    command = ['node', STUB_SCRIPT, '--port', str(port), '--control-port', str(control_port)]
+    if scripts:
+        command += ['--scripts', os.path.abspath(scripts)]
+    if speed:
+        command += ['--speed', str(speed)]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Stub backend exited with code {process.returncode}')
+        try:
+            _request_json('GET', f'http://127.0.0.1:{control_port}/status', timeout=2)
+            return process
+        except (OSError, ValueError):
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f'Stub backend did not start within {timeout:.0f}s')
+
+
+def stop_stub(process, timeout=10.0):
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
@@ -0,0 +1,82 @@
+"""Capacity steps: N concurrent sessions at a time, each step a point on the curve
+
+Every session gets a fresh audio tag, so the fake recognizer starts a new
+script clock for it. Tags are never reused across steps, and the stub backend
+is never restarted between steps, so later steps also measure anything that
+leaks across sessions.
+"""
+
+import asyncio
+import time
+
+from tools.loadgen.capacity import meets_slo, summarize_step
+from tools.loadgen.control import fetch_finals
+from tools.loadgen.sampler import ProcessSampler
+from tools.loadgen.session import run_session
+
+DONE_POLL_S = 1.0
+STEP_COOLDOWN_S = 3.0  # Let the server close the previous step's sessions
+
+
+async def _poll_done(control_url, done):
+    """Set each tag's event once the recognizer has played its whole script"""
+    while True:
+        waiting = [tag for tag, event in done.items() if not event.is_set()]
+        if not waiting:
+            return
+        try:
+            state = await fetch_finals(control_url, waiting)
+        except OSError:
+            state = {}
+        for tag, value in state.items():
+            if value.get('done'):
+                done[tag].set()
+        await asyncio.sleep(DONE_POLL_S)
+
+
+async def run_step(options, sessions, first_tag):
+    tags = list(range(first_tag, first_tag + sessions))
+    done = {tag: asyncio.Event() for tag in tags}
+
+    sampler = ProcessSampler(options.server_pid, options.sample_interval)
+    sampler.start()
+    poller = asyncio.create_task(_poll_done(options.control_url, done))
+
+    async def launch(i, tag):
+        await asyncio.sleep(i * options.ramp_s / sessions)
+        return await run_session(options, tag, done[tag])
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(launch(i, tag) for i, tag in enumerate(tags)), return_exceptions=True)
+    duration = time.monotonic() - started
+
+    poller.cancel()
+    await sampler.stop()
+    emitted = await fetch_finals(options.control_url, tags)
+    return summarize_step(sessions, options.listeners, list(zip(tags, results)), emitted, duration, sampler.summary())
+
+
+async def run_capacity(options, log=print):
+    """Run every step in options.steps; returns the step summaries"""
+    steps = []
+    next_tag = options.first_tag
+    for i, sessions in enumerate(options.steps):
+        if i > 0:
+            await asyncio.sleep(STEP_COOLDOWN_S)
+        log(f'[LoadGen] {sessions} session(s) x {options.listeners} listener(s)...')
+        step = await run_step(options, sessions, next_tag)
+        next_tag += sessions
+        steps.append(step)
+
+        latency = step['captionLatencyMs']
+        resources = step['resources']
+        log(f"[LoadGen]   p50={latency['p50']} p95={latency['p95']} p99={latency['p99']}ms, "
+            f"{step['deliveredFinals']}/{step['expectedDeliveries']} delivered, {step['lostFinals']} lost, "
+            f"{step['duplicateFinals']} duplicate, {len(step['errors'])} error(s)"
+            + (f", server cpu {resources['cpuPercent']['mean']}% rss {resources['rssMb']['max']}MB" if resources else ''))
+        for error in step['errors'][:5]:
+            log(f'[LoadGen]   x {error}')
+        if options.stop_on_breach and not meets_slo(step, options.slo_p99_ms):
+            log(f'[LoadGen] SLO missed at {sessions} sessions - stopping')
+            break
+    return steps
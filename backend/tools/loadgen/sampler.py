@@ -0,0 +1,86 @@
+"""Server CPU/RSS sampling from /proc (Linux only, no psutil)
+
+Worker threads (grammar, final merge) live in the backend process, so its
+/proc/<pid>/stat counters cover them.
+"""
+
+import asyncio
+import os
+import time
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def read_process(pid):
+    """(cpu_seconds, rss_bytes) for a process, or None if it cannot be read"""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        with open(f'/proc/{pid}/statm', 'rb') as f:
+            statm = f.read().split()
+    except OSError:
+        return None
+    # The command name may contain spaces; fields after it are fixed
+    fields = stat[stat.rindex(b')') + 2:].split()
+    utime, stime = int(fields[11]), int(fields[12])
+    return (utime + stime) / CLOCK_TICKS, int(statm[1]) * PAGE_SIZE
+
+
+class ProcessSampler:
+    """Samples a process (and the load generator itself) every `interval` seconds"""
+
+    def __init__(self, pid, interval=1.0):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []  # (elapsed_s, server_cpu_percent, server_rss_bytes, client_cpu_percent)
+        self.available = pid is not None and read_process(pid) is not None
+        self._task = None
+
+    def start(self):
+        if self.available:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        started = time.monotonic()
+        last_wall = started
+        last_cpu, _ = read_process(self.pid)
+        last_client = time.process_time()
+        while True:
+            await asyncio.sleep(self.interval)
+            reading = read_process(self.pid)
+            if reading is None:
+                return  # Server exited
+            now = time.monotonic()
+            client = time.process_time()
+            wall = now - last_wall
+            cpu, rss = reading
+            self.samples.append((
+                round(now - started, 3),
+                round(100 * (cpu - last_cpu) / wall, 1),
+                rss,
+                round(100 * (client - last_client) / wall, 1),
+            ))
+            last_wall, last_cpu, last_client = now, cpu, client
+
+    def summary(self):
+        """Mean/max CPU and RSS over the samples, or None when sampling was unavailable"""
+        if not self.samples:
+            return None
+        server_cpu = [s[1] for s in self.samples]
+        rss_mb = [s[2] / (1024 * 1024) for s in self.samples]
+        client_cpu = [s[3] for s in self.samples]
+        return {
+            'cpuPercent': {'mean': round(sum(server_cpu) / len(server_cpu), 1), 'max': max(server_cpu)},
+            'rssMb': {'start': round(rss_mb[0], 1), 'max': round(max(rss_mb), 1), 'end': round(rss_mb[-1], 1)},
+            'clientCpuPercent': {'mean': round(sum(client_cpu) / len(client_cpu), 1), 'max': max(client_cpu)},
+            'samples': [[t, c, round(r / (1024 * 1024), 1), cc] for t, c, r, cc in self.samples],
+        }
@@ -0,0 +1,186 @@
+"""One host session: the host socket streaming tagged audio, and its listeners
+
+Audio is LINEAR16 silence whose chunks start with the 8-byte tag the fake
+recognizer routes scripts by ("EXBB" + uint32 tag, see
+tests/bench/fakes/fakeSpeechServer.js). Listeners keep only committed finals;
+partials are counted but never parsed.
+"""
+
+import asyncio
+import base64
+import json
+import struct
+import time
+
+from tools.loadgen.control import start_session
+from tools.loadgen.wsclient import ConnectionClosed, connect
+
+SAMPLE_RATE = 16000
+TAG_MAGIC = b'EXBB'
+TAIL_AUDIO_S = 1.5           # Keep audio flowing after the script ends so the last final flushes
+LISTENER_REGISTER_S = 1.0    # Let listeners register in the session store before audio starts
+READY_TIMEOUT_S = 15.0
+SETTLE_POLL_S = 0.2
+
+# Cheap pre-filter: only these frames are worth decoding
+FINAL_MARKER = '"isPartial":false'
+READY_MARKER = '"session_ready"'
+
+
+def audio_message(tag, chunk_ms):
+    """The audio message a host sends every chunk_ms (identical every time)"""
+    chunk = bytearray(SAMPLE_RATE * 2 * chunk_ms // 1000)
+    chunk[:8] = TAG_MAGIC + struct.pack('>I', tag)
+    return json.dumps({'type': 'audio', 'audioData': base64.b64encode(bytes(chunk)).decode('ascii')})
+
+
+def init_message(target_lang):
+    return json.dumps({
+        'type': 'init',
+        'sourceLang': 'en',
+        'targetLang': target_lang,
+        'tier': 'basic',
+        'encoding': 'LINEAR16',
+        'sampleRateHertz': SAMPLE_RATE,
+    })
+
+
+def _source_text(event):
+    return event.get('originalText') or event.get('correctedText') or event.get('transcript') or ''
+
+
+class Collector:
+    """Reads a socket until it closes"""
+
+    __slots__ = ('ws', 'finals', 'messages', 'bytes', 'ready', 'task')
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.finals = []  # (received_at_ms, source_text, seq_id, translated)
+        self.messages = 0
+        self.bytes = 0
+        self.ready = asyncio.Event()
+        self.task = asyncio.create_task(self._read())
+
+    async def _read(self):
+        try:
+            while True:
+                data = await self.ws.recv()
+                received_at = time.time() * 1000
+                self.messages += 1
+                self.bytes += len(data)
+                if not isinstance(data, str):
+                    continue
+                if READY_MARKER in data:
+                    self.ready.set()
+                if FINAL_MARKER not in data:
+                    continue
+                try:
+                    event = json.loads(data)
+                except ValueError:
+                    continue
+                source = _source_text(event)
+                if event.get('type') != 'translation' or not source:
+                    continue
+                translated = event.get('translatedText')
+                self.finals.append((received_at, source, event.get('seqId'), bool(translated) and translated != source))
+        except ConnectionClosed:
+            pass
+
+    async def close(self):
+        await self.ws.close()
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+
+class SessionResult:
+    """What one session saw; the runner pairs it with the recognizer's emitted finals"""
+
+    __slots__ = ('tag', 'session_id', 'listener_finals', 'messages', 'bytes', 'chunks', 'late_chunks',
+                 'max_send_lag_ms', 'settled')
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.session_id = None
+        self.listener_finals = []
+        self.messages = 0
+        self.bytes = 0
+        self.chunks = 0
+        self.late_chunks = 0
+        self.max_send_lag_ms = 0.0
+        self.settled = True
+
+
+async def _stream_audio(ws, tag, chunk_ms, script_done, max_seconds, result):
+    """Send tagged audio in real time until the script has played (plus a tail)"""
+    message = audio_message(tag, chunk_ms)
+    interval = chunk_ms / 1000
+    loop = asyncio.get_running_loop()
+    next_at = loop.time()
+    deadline = next_at + max_seconds
+    done_at = None
+    while True:
+        now = loop.time()
+        lag_ms = (now - next_at) * 1000
+        result.max_send_lag_ms = max(result.max_send_lag_ms, lag_ms)
+        if lag_ms > chunk_ms:
+            result.late_chunks += 1
+        await ws.send(message)
+        result.chunks += 1
+        if done_at is None and script_done.is_set():
+            done_at = now
+        if (done_at is not None and now - done_at >= TAIL_AUDIO_S) or now >= deadline:
+            return
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+
+async def _wait_for_settle(collectors, idle_seconds, max_seconds):
+    """Wait until no listener has received anything for idle_seconds; False on timeout"""
+    loop = asyncio.get_running_loop()
+    start = last_change = loop.time()
+    last_count = -1
+    while loop.time() - start < max_seconds:
+        count = sum(c.messages for c in collectors)
+        if count != last_count:
+            last_count = count
+            last_change = loop.time()
+        elif loop.time() - last_change >= idle_seconds:
+            return True
+        await asyncio.sleep(SETTLE_POLL_S)
+    return False
+
+
+async def run_session(options, tag, script_done):
+    """Run one host session with options.listeners listeners; returns a SessionResult"""
+    result = SessionResult(tag)
+    session = await start_session(options.url)
+    result.session_id = session['sessionId']
+    ws_base = 'ws' + options.url[len('http'):]
+
+    collectors = []
+    try:
+        host = Collector(await connect(f"{ws_base}{session['wsUrl']}&targetLang={options.target_lang}"))
+        collectors.append(host)
+        listeners = []
+        for i in range(options.listeners):
+            ws = await connect(f'{ws_base}/translate?role=listener&sessionId={result.session_id}'
+                               f'&targetLang={options.target_lang}&userName=loadgen-{tag}-{i}')
+            listeners.append(Collector(ws))
+        collectors.extend(listeners)
+        await asyncio.sleep(LISTENER_REGISTER_S)
+
+        await host.ws.send(init_message(options.target_lang))
+        await asyncio.wait_for(host.ready.wait(), READY_TIMEOUT_S)
+        await _stream_audio(host.ws, tag, options.chunk_ms, script_done, options.max_session_s, result)
+        result.settled = await _wait_for_settle(listeners, options.settle_s, options.settle_timeout_s)
+
+        result.listener_finals = [listener.finals for listener in listeners]
+        result.messages = sum(listener.messages for listener in listeners)
+        result.bytes = sum(listener.bytes for listener in listeners)
+    finally:
+        await asyncio.gather(*(collector.close() for collector in collectors), return_exceptions=True)
+    return result
@@ -0,0 +1,176 @@
+"""Minimal asyncio WebSocket client (RFC 6455)
+
+Only what the load generator needs: the ws:// client handshake, masked text
+frames out, text/binary frames in, ping/pong and close. It is standard library
+only, and each connection is one StreamReader/StreamWriter pair, so thousands
+of sockets stay cheap.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+from urllib.parse import urlsplit
+
+ACCEPT_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+class ConnectionClosed(Exception):
+    """The connection is closed; `code` is the close code (1006 if the socket dropped)"""
+
+    def __init__(self, code=1006):
+        super().__init__(f'WebSocket closed ({code})')
+        self.code = code
+
+
+def _mask(payload, key):
+    if not payload:
+        return b''
+    n = len(payload)
+    stream = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(stream, 'big')).to_bytes(n, 'big')
+
+
+class WebSocket:
+    """An open client connection"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    def _write_frame(self, opcode, payload):
+        n = len(payload)
+        header = bytearray([0x80 | opcode])
+        if n < 126:
+            header.append(0x80 | n)
+        elif n < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack('!H', n)
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack('!Q', n)
+        key = os.urandom(4)
+        self.writer.write(bytes(header) + key + _mask(payload, key))
+
+    async def send(self, text):
+        """Send a text message"""
+        if self.closed:
+            raise ConnectionClosed()
+        self._write_frame(OP_TEXT, text.encode('utf-8'))
+        try:
+            await self.writer.drain()
+        except ConnectionError as err:
+            self.closed = True
+            raise ConnectionClosed() from err
+
+    async def _read_frame(self):
+        try:
+            first, second = await self.reader.readexactly(2)
+            n = second & 0x7F
+            if n == 126:
+                (n,) = struct.unpack('!H', await self.reader.readexactly(2))
+            elif n == 127:
+                (n,) = struct.unpack('!Q', await self.reader.readexactly(8))
+            if n > MAX_MESSAGE_BYTES:
+                raise ConnectionClosed(1009)
+            key = await self.reader.readexactly(4) if second & 0x80 else None
+            payload = await self.reader.readexactly(n)
+        except (asyncio.IncompleteReadError, ConnectionError) as err:
+            self.closed = True
+            raise ConnectionClosed() from err
+        if key:
+            payload = _mask(payload, key)
+        return bool(first & 0x80), first & 0x0F, payload
+
+    async def recv(self):
+        """Next message: str for text frames, bytes for binary ones. Raises ConnectionClosed."""
+        opcode = None
+        fragments = []
+        while True:
+            fin, frame_opcode, payload = await self._read_frame()
+            if frame_opcode == OP_PING:
+                self._write_frame(OP_PONG, payload)
+                continue
+            if frame_opcode == OP_PONG:
+                continue
+            if frame_opcode == OP_CLOSE:
+                code = struct.unpack('!H', payload[:2])[0] if len(payload) >= 2 else 1005
+                if not self.closed:
+                    self.closed = True
+                    self._write_frame(OP_CLOSE, payload[:2])
+                    self.writer.close()
+                raise ConnectionClosed(code)
+            if frame_opcode != OP_CONTINUATION:
+                opcode = frame_opcode
+                fragments = []
+            fragments.append(payload)
+            if fin:
+                data = b''.join(fragments)
+                return data.decode('utf-8', errors='replace') if opcode == OP_TEXT else data
+
+    async def close(self, code=1000):
+        """Send a close frame and drop the connection (without waiting for the server's close)"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._write_frame(OP_CLOSE, struct.pack('!H', code))
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def connect(url, timeout=10.0):
+    """Open a ws:// connection; raises ConnectionError if the upgrade is refused"""
+    parts = urlsplit(url)
+    if parts.scheme != 'ws':
+        raise ValueError(f'Only ws:// URLs are supported: {url}')
+    host = parts.hostname
+    port = parts.port or 80
+    target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    key = base64.b64encode(os.urandom(16)).decode('ascii')
+    writer.write((
+        f'GET {target} HTTP/1.1\r\n'
+        f'Host: {host}:{port}\r\n'
+        'Upgrade: websocket\r\n'
+        'Connection: Upgrade\r\n'
+        f'Sec-WebSocket-Key: {key}\r\n'
+        'Sec-WebSocket-Version: 13\r\n'
+        '\r\n'
+    ).encode('latin-1'))
+
+    try:
+        response = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError) as err:
+        writer.close()
+        raise ConnectionError(f'No upgrade response from {url}') from err
+
+    status_line, *header_lines = response.decode('latin-1').split('\r\n')
+    status = status_line.split(' ', 2)
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    expected = base64.b64encode(hashlib.sha1(key.encode('ascii') + ACCEPT_GUID).digest()).decode('ascii')
+    if len(status) < 2 or status[1] != '101' or headers.get('sec-websocket-accept') != expected:
+        writer.close()
+        raise ConnectionError(f'WebSocket upgrade refused by {url}: {status_line}')
+    return WebSocket(reader, writer)
@@ -0,0 +1,27 @@
+"""Summarize [SoloMode]/[HostMode] production logs
+
+Counts final-path merge branches (accumulate, replace, append, partial
+override/merge, duplicate), final lengths, characters recovered from partials,
+gaps between finals and final -> send latency, per session. Large files are
+memory-mapped and split into byte-range chunks scanned by a process pool;
+.gz files are streamed. Timing columns need log lines with a leading ISO
+timestamp (as added by most log shippers); without one they stay empty.
+
+Usage (from backend/):
+    python -m tools.log_analyzer server.log [more.log ...] [--jobs 8] [--out-dir out] [--format parquet]
+"""
+
+from tools.log_analyzer.aggregate import SessionStats, combine, merge_totals, scan_chunk, scan_stream
+from tools.log_analyzer.parse import classify, measure
+from tools.log_analyzer.report import write_reports
+
+__all__ = [
+    'SessionStats',
+    'classify',
+    'combine',
+    'measure',
+    'merge_totals',
+    'scan_chunk',
+    'scan_stream',
+    'write_reports',
+]
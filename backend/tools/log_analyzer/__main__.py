@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Command-line entry point: python -m tools.log_analyzer <log files>"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.log_analyzer.aggregate import combine, merge_totals, plan_chunks, scan_chunk, scan_stream
+from tools.log_analyzer.parse import BRANCHES, DEFAULT_SESSION_PATTERN
+from tools.log_analyzer.report import distribution_summary, write_reports
+
+
+def _scan(task):
+    path, start, end, session_pattern = task
+    if start is None:
+        return scan_stream(path, session_pattern)
+    return scan_chunk(path, start, end, session_pattern)
+
+
+def analyze(paths, jobs=None, chunk_bytes=64 << 20, session_pattern=DEFAULT_SESSION_PATTERN):
+    """Scan log files in parallel chunks; returns ({session: SessionStats}, marker lines scanned)"""
+    tasks = [(path, start, end, session_pattern)
+             for path in paths for path, start, end in plan_chunks(path, chunk_bytes)]
+    if jobs == 1 or len(tasks) == 1:
+        results = [_scan(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # map() keeps task order, which combine() relies on
+            results = list(pool.map(_scan, tasks))
+    return combine(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tools.log_analyzer',
+        description='Per-session merge-branch frequencies, final lengths and timing gaps from SoloMode/HostMode logs')
+    parser.add_argument('paths', nargs='+', help='Log files in chronological order (.gz is streamed)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(), help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-mb', type=int, default=64, help='Chunk size per task in MiB (default: 64)')
+    parser.add_argument('--out-dir', default='log_analysis', help='Output directory (default: log_analysis)')
+    parser.add_argument('--format', choices=('csv', 'parquet'), default='csv', help='Output format (default: csv)')
+    parser.add_argument('--session-pattern', default=DEFAULT_SESSION_PATTERN.decode(),
+                        help='Regex whose first group is the session id (default: session_<ms> or UUID)')
+    args = parser.parse_args(argv)
+
+    missing = [p for p in args.paths if not os.path.isfile(p)]
+    if missing:
+        print(f"Not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    sessions, lines = analyze(args.paths, jobs=max(1, args.jobs), chunk_bytes=max(1, args.chunk_mb) << 20,
+                              session_pattern=args.session_pattern.encode())
+    elapsed = time.perf_counter() - started
+
+    totals = merge_totals(sessions)
+
+    try:
+        written = write_reports(sessions, totals, args.out_dir, args.format)
+    except RuntimeError as err:
+        print(err, file=sys.stderr)
+        return 1
+
+    size = sum(os.path.getsize(p) for p in args.paths)
+    print(f'Scanned {size / (1 << 20):.1f} MiB, {lines} SoloMode/HostMode lines, '
+          f'{len(sessions)} sessions in {elapsed:.2f}s')
+    finals = totals.events['final_signal']
+    print(f'Finals: {finals}, forced: {totals.events["forced_final"]}, sent: {totals.events["final_sent"]}')
+    print('Branches: ' + ', '.join(f'{b}={totals.events[b]}' for b in BRANCHES))
+    for name in ('final_length', 'recovered', 'final_gap_ms', 'send_latency_ms'):
+        summary = distribution_summary(getattr(totals, name))
+        print(f'{name}: ' + ' '.join(f'{k}={"-" if v is None else v}' for k, v in summary.items()))
+    for path in written:
+        print(f'Wrote {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""Mergeable per-session aggregates and the chunked mmap scan
+
+Files are split into byte ranges scanned by separate processes. A line belongs
+to the chunk its first byte falls in. Each chunk is searched in place with one
+regex for mode tags and session ids, so lines from other components are never
+split, copied or decoded.
+
+Tagged lines rarely carry a session id, so attribution is sticky: a line belongs
+to the last session id seen before it, on any line. Interleaved sessions in one
+process log are therefore attributed approximately. Lines before the first id in a chunk
+are kept aside and re-attributed once the previous chunk's last session is
+known; timing state (last final, finals awaiting a send) is merged the same way,
+so results do not depend on where the chunk boundaries fall.
+"""
+
+import gzip
+import mmap
+import os
+import re
+from collections import Counter, deque
+
+from tools.log_analyzer.parse import DEFAULT_SESSION_PATTERN, MARKER, classify, line_mode, measure, parse_timestamp
+
+UNKNOWN_SESSION = 'unknown'
+MAX_PENDING = 64  # Finals awaiting their send, per session
+
+LENGTH_BUCKETS = (10, 20, 40, 80, 160, 320, 640, 1280, 2560)
+RECOVERED_BUCKETS = (1, 5, 10, 20, 40, 80, 160, 320)
+GAP_MS_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+class Histogram:
+    """Fixed-bucket histogram; the last count is the overflow bucket"""
+
+    __slots__ = ('bounds', 'counts', 'n', 'total', 'min', 'max')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.n = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.n += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.n += other.n
+        self.total += other.total
+        if other.n:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else None
+
+    def quantile(self, q):
+        """Interpolated within the containing bucket; clamped to the observed min/max"""
+        if not self.n:
+            return None
+        rank = q * self.n
+        seen = 0
+        lower = self.min
+        for i, count in enumerate(self.counts):
+            upper = self.bounds[i] if i < len(self.bounds) else self.max
+            if count and seen + count >= rank:
+                value = lower + (min(upper, self.max) - lower) * (rank - seen) / count
+                return max(self.min, min(self.max, value))
+            seen += count
+            if i < len(self.bounds):
+                lower = max(lower, self.bounds[i])
+        return self.max
+
+
+def _pick(choose, a, b):
+    """choose(a, b), ignoring missing values"""
+    if a is None or b is None:
+        return b if a is None else a
+    return choose(a, b)
+
+
+class SessionStats:
+    """Everything aggregated for one session, mergeable in log order"""
+
+    def __init__(self):
+        self.modes = Counter()
+        self.events = Counter()
+        self.final_length = Histogram(LENGTH_BUCKETS)
+        self.recovered = Histogram(RECOVERED_BUCKETS)
+        self.final_gap_ms = Histogram(GAP_MS_BUCKETS)
+        self.send_latency_ms = Histogram(GAP_MS_BUCKETS)
+        self.first_ts = None
+        self.last_ts = None
+        self.first_final_ts = None
+        self.last_final_ts = None
+        self.pending = deque(maxlen=MAX_PENDING)  # final_signal times not yet matched to a send
+        self.leading_sends = []  # Send times seen while nothing was pending (may match an earlier chunk)
+
+    def observe(self, mode, event, ts, length, recovered):
+        self.modes[mode] += 1
+        self.events[event] += 1
+        if ts is not None:
+            self.first_ts = ts if self.first_ts is None else self.first_ts
+            self.last_ts = ts
+        if length is not None and event in ('final_signal', 'forced_final'):
+            self.final_length.add(length)
+        if recovered is not None and recovered > 0:
+            self.recovered.add(recovered)
+        if ts is None:
+            return
+        if event == 'final_signal':
+            if self.last_final_ts is not None:
+                self.final_gap_ms.add(max(0.0, ts - self.last_final_ts))
+            self.first_final_ts = ts if self.first_final_ts is None else self.first_final_ts
+            self.last_final_ts = ts
+            self.pending.append(ts)
+        elif event == 'final_sent':
+            if self.pending:
+                self.send_latency_ms.add(max(0.0, ts - self.pending.popleft()))
+            elif self.first_final_ts is None and len(self.leading_sends) < MAX_PENDING:
+                self.leading_sends.append(ts)
+
+    def merge(self, later, link=True):
+        """Fold in stats that come after these in the log
+
+        With link (same session), the gap from our last final to their first and
+        their sends that answer our pending finals are counted too.
+        """
+        self.modes.update(later.modes)
+        self.events.update(later.events)
+        self.final_length.merge(later.final_length)
+        self.recovered.merge(later.recovered)
+        self.final_gap_ms.merge(later.final_gap_ms)
+        self.send_latency_ms.merge(later.send_latency_ms)
+        self.first_ts = _pick(min, self.first_ts, later.first_ts)
+        self.last_ts = _pick(max, self.last_ts, later.last_ts)
+
+        if not link:
+            return self
+        if self.last_final_ts is not None and later.first_final_ts is not None:
+            self.final_gap_ms.add(max(0.0, later.first_final_ts - self.last_final_ts))
+        for send_ts in later.leading_sends:
+            if self.pending:
+                self.send_latency_ms.add(max(0.0, send_ts - self.pending.popleft()))
+            elif self.first_final_ts is None and len(self.leading_sends) < MAX_PENDING:
+                self.leading_sends.append(send_ts)
+        self.pending.extend(later.pending)
+        self.first_final_ts = self.first_final_ts if self.first_final_ts is not None else later.first_final_ts
+        self.last_final_ts = later.last_final_ts if later.last_final_ts is not None else self.last_final_ts
+        return self
+
+
+class ChunkResult:
+    """Stats for one byte range: lines before the first session id, then per session"""
+
+    def __init__(self):
+        self.leading = SessionStats()
+        self.sessions = {}
+        self.last_session = None
+        self.lines = 0
+
+    def feed(self, line, session_re):
+        """Aggregate one line that carries a mode tag"""
+        mode = line_mode(line)
+        if mode is None:
+            return
+        self.lines += 1
+        match = session_re.search(line)
+        if match:
+            self.last_session = match.group(1).decode('ascii', 'replace')
+        event = classify(line)
+        if event is None:
+            return
+        stats = self.leading if self.last_session is None else self.sessions.setdefault(self.last_session, SessionStats())
+        length, recovered = measure(event, line)
+        stats.observe(mode, event, parse_timestamp(line), length, recovered)
+
+
+def _scanner(session_pattern):
+    """One regex for both jobs: group 1 is a mode tag, group 2 a session id"""
+    session_re = re.compile(session_pattern)
+    combined = re.compile(rb'(\[(?:Solo|Host)Mode\] )|(?:' + session_pattern + rb')')
+    return session_re, combined
+
+
+def scan_chunk(path, start, end, session_pattern=DEFAULT_SESSION_PATTERN):
+    """Aggregate the lines of `path` whose first byte is in [start, end)
+
+    Only tagged lines are sliced out of the map; every other line is skipped
+    inside the regex engine unless it carries a session id.
+    """
+    session_re, combined = _scanner(session_pattern)
+    result = ChunkResult()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return result
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if start > 0:
+                newline = mm.find(b'\n', start - 1)
+                start = len(mm) if newline == -1 else newline + 1
+            pos = start
+            while True:
+                match = combined.search(mm, pos)
+                if match is None:
+                    break
+                idx = match.start()
+                if idx >= end and mm.rfind(b'\n', 0, idx) + 1 >= end:
+                    break
+                if match.group(1) is None:
+                    result.last_session = match.group(2).decode('ascii', 'replace')
+                    pos = match.end()
+                    continue
+                line_start = mm.rfind(b'\n', 0, idx) + 1
+                line_end = mm.find(b'\n', idx)
+                if line_end == -1:
+                    line_end = len(mm)
+                result.feed(mm[line_start:line_end], session_re)
+                pos = line_end + 1
+    return result
+
+
+def scan_stream(path, session_pattern=DEFAULT_SESSION_PATTERN):
+    """Sequential scan for compressed logs (.gz cannot be memory-mapped)"""
+    session_re, _ = _scanner(session_pattern)
+    result = ChunkResult()
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            if MARKER in line and line_mode(line):
+                result.feed(line.rstrip(b'\n'), session_re)
+                continue
+            match = session_re.search(line)
+            if match:
+                result.last_session = match.group(1).decode('ascii', 'replace')
+    return result
+
+
+def plan_chunks(path, chunk_bytes):
+    """Byte ranges covering the file; compressed files are a single streamed task"""
+    if path.endswith('.gz'):
+        return [(path, None, None)]
+    size = os.path.getsize(path)
+    return [(path, start, min(start + chunk_bytes, size)) for start in range(0, max(size, 1), chunk_bytes)]
+
+
+def combine(chunk_results):
+    """Merge chunk results in log order into {session: SessionStats}"""
+    sessions = {}
+    previous_session = None
+    lines = 0
+    for result in chunk_results:
+        lines += result.lines
+        if result.leading.events or result.leading.modes:
+            target = previous_session or UNKNOWN_SESSION
+            sessions.setdefault(target, SessionStats()).merge(result.leading)
+        for session, stats in result.sessions.items():
+            sessions.setdefault(session, SessionStats()).merge(stats)
+        previous_session = result.last_session or previous_session
+    return sessions, lines
+
+
+def merge_totals(sessions):
+    """All sessions folded together, without linking timing across session boundaries"""
+    totals = SessionStats()
+    for stats in sessions.values():
+        totals.merge(stats, link=False)
+    return totals
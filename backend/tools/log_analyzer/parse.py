@@ -0,0 +1,102 @@
+"""Line classification for [SoloMode]/[HostMode] log lines
+
+Each rule maps a fixed message fragment (as written by the merge patches,
+utils/mergeLogger.js MESSAGES and host/adapter.js) to an event name. Branch
+names match tools.merge_sim.rules.Branch where the two overlap. Fragments are
+matched on raw bytes, so only lines that hit a rule are ever decoded.
+"""
+
+import re
+from datetime import datetime
+
+MODES = {b'[SoloMode]': 'SoloMode', b'[HostMode]': 'HostMode'}
+MARKER = b'Mode] '  # Shared tail of both tags, a cheap pre-filter for streamed lines
+
+# (fragment, event); first match wins, so more specific fragments come first
+RULES = (
+    (b'FINAL signal received', 'final_signal'),
+    (b'Forced FINAL due to stream restart', 'forced_final'),
+    (b'FINAL Transcript (raw)', 'final_raw'),
+    (b'Accumulated final', 'accumulate'),
+    (b'Final already in accumulated text', 'contained'),
+    (b'Replacing accumulated with longer final', 'replace'),
+    (b'Appending final to accumulated', 'append'),
+    (b'FINAL truncated - using partial instead', 'partial_override'),
+    (b'FINAL merged with', 'partial_merge'),                # merge patch, host LONGEST/LATEST via overlap
+    (b'partial with overlap', 'partial_merge'),             # "Using LONGEST/LATEST partial with overlap"
+    (b'via overlap merge after wait', 'partial_merge'),
+    (b'Merged via overlap after continuation wait', 'partial_merge'),
+    (b'Forced FINAL using LONGEST partial', 'partial_override'),
+    (b'Using LONGEST partial', 'partial_override'),
+    (b'Using LATEST partial', 'partial_override'),
+    (b'Skipping duplicate final', 'duplicate'),
+    (b'Skipping near-duplicate final', 'duplicate'),
+    (b'Duplicate final detected', 'duplicate'),
+    (b'Duplicate FORCED final detected', 'duplicate'),
+    (b'Subset final detected', 'duplicate'),
+    (b'of a recent final, skipping', 'duplicate'),
+    (b'Sending final', 'final_sent'),                       # solo merge patch: transcript or translation
+    (b'Sending FINAL', 'final_sent'),                       # solo: coupled send
+    (b'FORCED FINAL: Sending immediately', 'final_sent'),
+    (b'SENT_TO_HOST (FINAL', 'final_sent'),                 # host
+)
+
+BRANCHES = ('accumulate', 'contained', 'replace', 'append', 'partial_override', 'partial_merge', 'duplicate')
+EVENTS = ('final_signal', 'forced_final', 'final_raw') + BRANCHES + ('final_sent',)
+
+DEFAULT_SESSION_PATTERN = rb'\b(session_\d{10,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\b'
+
+# Leading timestamp as written by most log shippers (optionally bracketed or indented)
+TIMESTAMP = re.compile(rb'^\s*\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)')
+
+ARROW_CHARS = re.compile(rb'\((\d+) \xe2\x86\x92 (\d+) chars\)')     # "(40 → 55 chars)"
+SUM_CHARS = re.compile(rb'\((\d+) \+ (\d+) = (\d+) chars\)')          # "(40 + 12 = 52 chars)"
+PLAIN_CHARS = re.compile(rb'\((\d+) chars\)')                         # "(57 chars)"
+
+
+def line_mode(line):
+    """'SoloMode', 'HostMode' or None"""
+    for tag, mode in MODES.items():
+        if tag in line:
+            return mode
+    return None
+
+
+def classify(line):
+    """Event name for a log line, or None"""
+    for fragment, event in RULES:
+        if fragment in line:
+            return event
+    return None
+
+
+def parse_timestamp(line):
+    """Epoch milliseconds from a leading ISO timestamp, or None"""
+    match = TIMESTAMP.match(line)
+    if not match:
+        return None
+    text = match.group(1).decode('ascii').replace(' ', 'T', 1)
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(text).timestamp() * 1000.0
+    except ValueError:
+        return None
+
+
+def measure(event, line):
+    """(text_length, recovered_chars) carried by the line; either may be None"""
+    if event == 'partial_merge':
+        match = SUM_CHARS.search(line)
+        if match:
+            return int(match.group(3)), int(match.group(2))
+    match = ARROW_CHARS.search(line)
+    if match:
+        before, after = int(match.group(1)), int(match.group(2))
+        recovered = after - before if event in ('partial_override', 'partial_merge') else None
+        return after, recovered
+    if event in ('final_signal', 'forced_final'):
+        match = PLAIN_CHARS.search(line)
+        if match:
+            return int(match.group(1)), None
+    return None, None
@@ -0,0 +1,107 @@
+"""Flatten per-session stats into tables and write them as CSV or Parquet"""
+
+import csv
+import os
+
+from tools.log_analyzer.parse import BRANCHES, EVENTS
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+DISTRIBUTIONS = ('final_length', 'recovered', 'final_gap_ms', 'send_latency_ms')
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+def session_rows(sessions):
+    """One row per session: event counts, branch shares and distribution summaries"""
+    rows = []
+    for session, stats in sorted(sessions.items()):
+        finals = stats.events['final_signal']
+        row = {
+            'session': session,
+            'mode': '/'.join(sorted(stats.modes)),
+            'first_ts_ms': _round(stats.first_ts),
+            'last_ts_ms': _round(stats.last_ts),
+            'duration_s': _round((stats.last_ts - stats.first_ts) / 1000.0) if stats.first_ts is not None else None,
+        }
+        for event in EVENTS:
+            row[event] = stats.events[event]
+        branched = sum(stats.events[b] for b in BRANCHES)
+        row['recovery_rate'] = _round((stats.events['partial_override'] + stats.events['partial_merge']) / finals) if finals else None
+        row['duplicate_rate'] = _round(stats.events['duplicate'] / finals) if finals else None
+        row['branch_events'] = branched
+        for name in DISTRIBUTIONS:
+            histogram = getattr(stats, name)
+            row[f'{name}_mean'] = _round(histogram.mean)
+            row[f'{name}_p50'] = _round(histogram.quantile(0.5))
+            row[f'{name}_p95'] = _round(histogram.quantile(0.95))
+        rows.append(row)
+    return rows
+
+
+def branch_rows(sessions):
+    """Long format: one row per (session, mode, event) that occurred"""
+    rows = []
+    for session, stats in sorted(sessions.items()):
+        for event in EVENTS:
+            count = stats.events[event]
+            if count:
+                rows.append({'session': session, 'event': event, 'count': count,
+                             'is_branch': event in BRANCHES})
+    return rows
+
+
+def distribution_rows(sessions, totals):
+    """Histogram buckets per session plus an 'ALL' pseudo-session for the merged totals"""
+    rows = []
+    for session, stats in sorted(sessions.items()) + [('ALL', totals)]:
+        for name in DISTRIBUTIONS:
+            histogram = getattr(stats, name)
+            for i, count in enumerate(histogram.counts):
+                if not count:
+                    continue
+                upper = histogram.bounds[i] if i < len(histogram.bounds) else None
+                lower = histogram.bounds[i - 1] if i > 0 else 0
+                rows.append({'session': session, 'distribution': name, 'lower': lower, 'upper': upper,
+                             'count': count})
+    return rows
+
+
+def distribution_summary(histogram):
+    return {
+        'n': histogram.n,
+        'mean': _round(histogram.mean),
+        **{f'p{int(q * 100)}': _round(histogram.quantile(q)) for q in QUANTILES},
+        'max': _round(histogram.max),
+    }
+
+
+def write_table(rows, path, fmt):
+    """Write rows (list of dicts with identical keys) as CSV or Parquet; returns the path written"""
+    path = f'{path}.{fmt}'
+    if fmt == 'parquet':
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise RuntimeError('Parquet output needs pyarrow (pip install pyarrow), or use --format csv') from err
+        pq.write_table(pa.Table.from_pylist(rows), path)
+        return path
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        if rows:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    return path
+
+
+def write_reports(sessions, totals, out_dir, fmt='csv'):
+    """sessions / events / distributions tables; returns the paths written"""
+    os.makedirs(out_dir, exist_ok=True)
+    return [
+        write_table(session_rows(sessions), os.path.join(out_dir, 'sessions'), fmt),
+        write_table(branch_rows(sessions), os.path.join(out_dir, 'events'), fmt),
+        write_table(distribution_rows(sessions, totals), os.path.join(out_dir, 'distributions'), fmt),
+    ]
@@ -0,0 +1,20 @@
+"""Offline replay of recorded Google Speech partial/final streams through the
+soloModeHandler.js final-merge rules (see backend/fix_missing_sentences.py)
+
+Usage (from backend/):
+    python -m tools.merge_sim recordings/ [--latency-ms 300] [--jobs 8] [--json report.json]
+"""
+
+from tools.merge_sim.corpus import load_reference, load_stream, discover_streams
+from tools.merge_sim.rules import MergeState, Branch
+from tools.merge_sim.simulate import simulate_stream, run_corpus
+
+__all__ = [
+    'Branch',
+    'MergeState',
+    'discover_streams',
+    'load_reference',
+    'load_stream',
+    'run_corpus',
+    'simulate_stream',
+]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Command-line entry point: python -m tools.merge_sim <streams or dirs>"""
+
+import argparse
+import json
+import os
+import sys
+
+from tools.merge_sim.corpus import discover_streams
+from tools.merge_sim.rules import Branch
+from tools.merge_sim.simulate import run_corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tools.merge_sim',
+        description='Replay recorded partial/final streams through the SoloMode merge rules')
+    parser.add_argument('paths', nargs='+', help='.jsonl stream files or directories of them')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Simulated translate+send latency before accumulatedFinals is cleared (default 0)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--min-overlap', type=int, help='Override the 21-char minimum overlap')
+    parser.add_argument('--replace-ratio', type=float, help='Override the 1.5x replacement ratio')
+    parser.add_argument('--dedup-window', type=int, help='Override the 8-final duplicate window')
+    parser.add_argument('--json', dest='json_path', help='Write the full report as JSON')
+    parser.add_argument('--per-stream', action='store_true', help='Print one line per stream')
+    args = parser.parse_args(argv)
+
+    streams = discover_streams(args.paths)
+    if not streams:
+        print('No .jsonl streams found', file=sys.stderr)
+        return 1
+
+    state_kwargs = {}
+    if args.min_overlap is not None:
+        state_kwargs['min_overlap'] = args.min_overlap
+    if args.replace_ratio is not None:
+        state_kwargs['replace_ratio'] = args.replace_ratio
+    if args.dedup_window is not None:
+        state_kwargs['dedup_window_size'] = args.dedup_window
+
+    results, summary = run_corpus(streams, args.latency_ms, args.jobs, state_kwargs)
+
+    if args.per_stream:
+        for r in results:
+            c = r['comparison']
+            accuracy = f"{c['accuracy']:.3f}" if c else '-'
+            dropped = c['droppedWords'] if c else '-'
+            print(f"{r['stream']}: events={r['events']} finals={r['finals']} "
+                  f"emitted={r['emittedFinals']} accuracy={accuracy} dropped={dropped}")
+
+    print(f"Streams: {summary['streams']}  Events: {summary['events']}  "
+          f"Finals: {summary['finals']} (emitted {summary['emittedFinals']})")
+    print(f"Throughput: {summary['eventsPerSecond']:,.0f} events/s ({summary['wallSeconds']:.2f}s wall)")
+    print('Branches: ' + ', '.join(f'{name}={summary["branches"][name]}' for name in Branch.ALL))
+    if summary['accuracy'] is not None:
+        print(f"Accuracy: {summary['accuracy']:.4f} over {summary['referenceWords']} reference words "
+              f"({summary['streamsWithReference']} streams)")
+        print(f"Dropped words: {summary['droppedWords']}  Inserted words: {summary['insertedWords']}")
+    else:
+        print('Accuracy: n/a (no .ref.txt references found)')
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'streams': results}, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
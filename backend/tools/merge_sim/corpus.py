@@ -0,0 +1,63 @@
+"""Loading recorded partial/final streams
+
+A stream is a JSONL file with one recognition event per line:
+
+    {"isPartial": true, "transcriptText": "and the lord", "t": 1520}
+
+`t` is milliseconds (absolute or relative to stream start). Lines without a
+`transcriptText` are ignored. An optional sidecar `<stream>.ref.txt` holds the
+human reference transcript used for accuracy and dropped-word counts.
+
+Recordings are written by googleSpeechStream.js when STT_REPLAY_RECORD_DIR is set.
+"""
+
+import json
+import os
+
+STREAM_SUFFIX = '.jsonl'
+REFERENCE_SUFFIX = '.ref.txt'
+
+
+def discover_streams(paths):
+    """Expand files and directories into a sorted list of .jsonl stream paths"""
+    streams = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, files in os.walk(path):
+                for name in files:
+                    if name.endswith(STREAM_SUFFIX):
+                        streams.append(os.path.join(root, name))
+        else:
+            streams.append(path)
+    return sorted(streams)
+
+
+def load_stream(path):
+    """Read a stream into a list of (is_partial, text, t_ms) tuples ordered by time"""
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f'{path}:{line_no}: invalid JSON ({e})') from e
+            text = record.get('transcriptText')
+            if text is None:
+                continue
+            events.append((bool(record.get('isPartial')), text, float(record.get('t', 0))))
+    # Stable sort keeps recording order for events with the same timestamp
+    events.sort(key=lambda e: e[2])
+    return events
+
+
+def load_reference(stream_path):
+    """Return the sidecar reference transcript for a stream, or None"""
+    base = stream_path[:-len(STREAM_SUFFIX)] if stream_path.endswith(STREAM_SUFFIX) else stream_path
+    ref_path = base + REFERENCE_SUFFIX
+    if not os.path.exists(ref_path):
+        return None
+    with open(ref_path, 'r', encoding='utf-8') as f:
+        return f.read()
@@ -0,0 +1,77 @@
+"""Port of utils/finalDeduplicator.js (the rolling-window duplicate check the
+"missing-sentences" patch set uses in place of `=== lastFinalText`)
+
+Same normalization, window bounds, short-final rule, bigram-shingle Jaccard
+threshold and novel-word guard. The JS side only verifies candidates that
+share a MinHash LSH band; here every final in the window is verified, which
+differs only for the rare similar pair the bands miss.
+"""
+
+import unicodedata
+
+DEFAULT_WINDOW_SIZE = 8
+DEFAULT_WINDOW_MS = 30000
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_MIN_WORDS = 4
+
+
+def normalize_final(text):
+    """Lowercase, drop everything but letters/marks/numbers, collapse whitespace"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    kept = ''.join(ch for ch in text if ch.isspace() or unicodedata.category(ch)[0] in 'LMN')
+    return ' '.join(kept.split())
+
+
+def _shingles(words):
+    if len(words) < 2:
+        return set(words)
+    return {f'{a} {b}' for a, b in zip(words, words[1:])}
+
+
+def _jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class FinalDeduplicator:
+    """Recent-final window for one session"""
+
+    def __init__(self, window_size=DEFAULT_WINDOW_SIZE, window_ms=DEFAULT_WINDOW_MS,
+                 threshold=DEFAULT_THRESHOLD, min_words=DEFAULT_MIN_WORDS, max_novel_words=0):
+        self.window_size = window_size
+        self.window_ms = window_ms
+        self.threshold = threshold
+        self.min_words = min_words
+        self.max_novel_words = max_novel_words
+        self.window = []  # (normalized, words, word_set, shingles, recorded_at), oldest first
+
+    def check_and_record(self, text, now=None):
+        """Return None if the final is new (and record it), else 'exact' or 'near'"""
+        normalized = normalize_final(text)
+        words = normalized.split(' ') if normalized else []
+        if now is not None:
+            self.window = [e for e in self.window if now - e[4] <= self.window_ms]
+
+        kind = self._match(normalized, words) if normalized and self.window else None
+        if kind is None and normalized:
+            shingles = _shingles(words)
+            self.window.append((normalized, words, set(words), shingles, now or 0))
+            del self.window[:-self.window_size]
+        return kind
+
+    def _match(self, normalized, words):
+        if len(words) < self.min_words:
+            return 'exact' if self.window[-1][0] == normalized else None
+        if any(entry[0] == normalized for entry in self.window):
+            return 'exact'
+
+        shingles = _shingles(words)
+        for _, _, word_set, entry_shingles, _ in self.window:
+            if _jaccard(shingles, entry_shingles) < self.threshold:
+                continue
+            novel = sum(1 for word in words if word not in word_set)
+            if novel <= self.max_novel_words:
+                return 'near'
+        return None
@@ -0,0 +1,51 @@
+"""Word-level comparison of merged output against a reference transcript"""
+
+import difflib
+import re
+
+_WORD_RE = re.compile(r"[\w']+", re.UNICODE)
+
+
+def words(text):
+    """Lowercased word tokens with punctuation stripped"""
+    return _WORD_RE.findall(text.lower())
+
+
+def compare_words(hypothesis, reference):
+    """Align hypothesis against reference words
+
+    Returns a dict with reference/hypothesis word counts, matched words,
+    dropped (deleted) words, inserted words (duplicates or hallucinations),
+    substituted words and accuracy (1 - WER, floored at 0).
+    """
+    hyp = words(hypothesis)
+    ref = words(reference)
+    matcher = difflib.SequenceMatcher(None, ref, hyp, autojunk=False)
+
+    matched = dropped = inserted = substituted = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        ref_len = i2 - i1
+        hyp_len = j2 - j1
+        if tag == 'equal':
+            matched += ref_len
+        elif tag == 'delete':
+            dropped += ref_len
+        elif tag == 'insert':
+            inserted += hyp_len
+        else:
+            common = min(ref_len, hyp_len)
+            substituted += common
+            dropped += ref_len - common
+            inserted += hyp_len - common
+
+    errors = dropped + inserted + substituted
+    accuracy = max(0.0, 1.0 - errors / len(ref)) if ref else (1.0 if not hyp else 0.0)
+    return {
+        'referenceWords': len(ref),
+        'outputWords': len(hyp),
+        'matchedWords': matched,
+        'droppedWords': dropped,
+        'insertedWords': inserted,
+        'substitutedWords': substituted,
+        'accuracy': accuracy,
+    }
@@ -0,0 +1,109 @@
+"""Port of the final-merge rules injected by backend/fix_missing_sentences.py
+(patch set "missing-sentences" in tools/patching/solo_mode.py)
+
+Mirrors the `latestPartialText` / `accumulatedFinals` / `finalDedup`
+bookkeeping and every branch of the final block line for line, so a change to
+the patcher can be replayed against recorded streams before it ships. Keep
+this file in sync with the JS the patcher writes.
+"""
+
+from tools.merge_sim.dedup import DEFAULT_WINDOW_SIZE, FinalDeduplicator
+from tools.textmerge import ACCUMULATED_MAX_OVERLAP, DEFAULT_MIN_OVERLAP, find_overlap
+
+
+class Branch:
+    """Names of the merge branches taken for a final (match the handler log lines)"""
+
+    FIRST = 'first'                        # No accumulated finals - start accumulation
+    ACCUMULATE = 'accumulate'              # "Accumulated final"
+    CONTAINED = 'contained'                # "Final already in accumulated text"
+    REPLACE = 'replace'                    # "Replacing accumulated with longer final"
+    APPEND = 'append'                      # "Appending final to accumulated"
+    PARTIAL_OVERRIDE = 'partial_override'  # "FINAL truncated - using partial instead"
+    PARTIAL_MERGE = 'partial_merge'        # "FINAL merged with partial"
+    DUPLICATE = 'duplicate'                # "Skipping (near-)duplicate final"
+
+    ALL = (FIRST, ACCUMULATE, CONTAINED, REPLACE, APPEND, PARTIAL_OVERRIDE, PARTIAL_MERGE, DUPLICATE)
+
+
+class MergeState:
+    """Per-session merge state plus the tunable thresholds of the patched handler"""
+
+    def __init__(self, min_overlap=DEFAULT_MIN_OVERLAP, accumulated_max_overlap=ACCUMULATED_MAX_OVERLAP,
+                 replace_ratio=1.5, partial_prefix_chars=50, dedup_window_size=DEFAULT_WINDOW_SIZE):
+        self.min_overlap = min_overlap
+        self.accumulated_max_overlap = accumulated_max_overlap
+        self.replace_ratio = replace_ratio
+        self.partial_prefix_chars = partial_prefix_chars
+
+        self.latest_partial_text = ''
+        self.accumulated_finals = ''
+        self.final_dedup = FinalDeduplicator(window_size=dedup_window_size)
+
+    def on_partial(self, text):
+        """Track the latest partial so a truncated final can be recovered"""
+        latest = self.latest_partial_text
+        if (len(text) > len(latest) or not latest or
+                not text.startswith(latest[:min(len(latest), self.partial_prefix_chars)])):
+            self.latest_partial_text = text
+
+    def on_final(self, text, t=None):
+        """Apply the final-merge rules
+
+        Returns (final_text_or_None, branches). final_text is None when the
+        final was skipped as a duplicate. t (ms) ages out the duplicate window.
+        """
+        branches = []
+        final = text
+
+        if self.accumulated_finals:
+            accumulated_trimmed = self.accumulated_finals.strip()
+            incoming_trimmed = text.strip()
+            overlap = find_overlap(accumulated_trimmed, incoming_trimmed,
+                                   self.min_overlap, self.accumulated_max_overlap)
+            if overlap > 0:
+                new_part = incoming_trimmed[overlap:].strip()
+                if new_part:
+                    self.accumulated_finals = self.accumulated_finals + ' ' + new_part
+                    branches.append(Branch.ACCUMULATE)
+                else:
+                    branches.append(Branch.CONTAINED)
+                final = self.accumulated_finals
+            elif len(text) > len(self.accumulated_finals) * self.replace_ratio:
+                self.accumulated_finals = text
+                final = text
+                branches.append(Branch.REPLACE)
+            else:
+                self.accumulated_finals = self.accumulated_finals + ' ' + text.strip()
+                final = self.accumulated_finals
+                branches.append(Branch.APPEND)
+        else:
+            self.accumulated_finals = text
+            final = text
+            branches.append(Branch.FIRST)
+
+        latest = self.latest_partial_text
+        if latest and len(latest) > len(final):
+            if latest.startswith(final.strip()):
+                final = latest
+                self.accumulated_finals = latest
+                branches.append(Branch.PARTIAL_OVERRIDE)
+            else:
+                overlap = find_overlap(final, latest, self.min_overlap)
+                if overlap > 0 and len(latest) > len(final):
+                    new_part = latest[overlap:]
+                    final = final.strip() + ' ' + new_part.strip()
+                    self.accumulated_finals = final
+                    branches.append(Branch.PARTIAL_MERGE)
+
+        if self.final_dedup.check_and_record(final, t):
+            self.latest_partial_text = ''
+            branches.append(Branch.DUPLICATE)
+            return None, branches
+
+        self.latest_partial_text = ''
+        return final, branches
+
+    def on_final_sent(self):
+        """The async send/translate block clears the accumulation once it completes"""
+        self.accumulated_finals = ''
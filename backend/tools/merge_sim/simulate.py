@@ -0,0 +1,112 @@
+"""Replay streams through the merge rules and aggregate corpus statistics"""
+
+import heapq
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.merge_sim.corpus import load_reference, load_stream
+from tools.merge_sim.metrics import compare_words
+from tools.merge_sim.rules import Branch, MergeState
+
+
+def simulate_stream(events, latency_ms=0.0, state=None):
+    """Run one stream of (is_partial, text, t_ms) events through the merge rules
+
+    latency_ms models the translate-then-send block: accumulatedFinals is only
+    cleared once it completes, so finals arriving inside that window take the
+    accumulate/replace/append branches. 0 matches transcription-only sessions.
+    """
+    state = state or MergeState()
+    pending_clears = []
+    emitted = []
+    branch_counts = dict.fromkeys(Branch.ALL, 0)
+    partials = finals = 0
+
+    for is_partial, text, t in events:
+        while pending_clears and pending_clears[0] <= t:
+            heapq.heappop(pending_clears)
+            state.on_final_sent()
+
+        if is_partial:
+            partials += 1
+            state.on_partial(text)
+            continue
+
+        finals += 1
+        final, branches = state.on_final(text, t)
+        for branch in branches:
+            branch_counts[branch] += 1
+        if final is None:
+            continue
+
+        emitted.append(final)
+        if latency_ms <= 0:
+            state.on_final_sent()
+        else:
+            heapq.heappush(pending_clears, t + latency_ms)
+
+    return {
+        'events': partials + finals,
+        'partials': partials,
+        'finals': finals,
+        'emitted': emitted,
+        'branches': branch_counts,
+    }
+
+
+def _run_one(args):
+    path, latency_ms, state_kwargs = args
+    started = time.perf_counter()
+    events = load_stream(path)
+    result = simulate_stream(events, latency_ms, MergeState(**state_kwargs))
+    result['elapsedSeconds'] = time.perf_counter() - started
+    result['stream'] = path
+
+    reference = load_reference(path)
+    result['comparison'] = compare_words(' '.join(result['emitted']), reference) if reference is not None else None
+    result['emittedFinals'] = len(result.pop('emitted'))
+    return result
+
+
+def run_corpus(paths, latency_ms=0.0, jobs=1, state_kwargs=None):
+    """Simulate every stream and return (per_stream_results, summary)"""
+    state_kwargs = state_kwargs or {}
+    tasks = [(path, latency_ms, state_kwargs) for path in paths]
+
+    started = time.perf_counter()
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(_run_one, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    else:
+        results = [_run_one(task) for task in tasks]
+    wall = time.perf_counter() - started
+
+    return results, summarize(results, wall)
+
+
+def summarize(results, wall_seconds):
+    """Aggregate per-stream results into corpus totals"""
+    total_events = sum(r['events'] for r in results)
+    branches = dict.fromkeys(Branch.ALL, 0)
+    for r in results:
+        for name, count in r['branches'].items():
+            branches[name] += count
+
+    compared = [r['comparison'] for r in results if r['comparison']]
+    ref_words = sum(c['referenceWords'] for c in compared)
+    errors = sum(c['droppedWords'] + c['insertedWords'] + c['substitutedWords'] for c in compared)
+
+    return {
+        'streams': len(results),
+        'events': total_events,
+        'finals': sum(r['finals'] for r in results),
+        'emittedFinals': sum(r['emittedFinals'] for r in results),
+        'wallSeconds': wall_seconds,
+        'eventsPerSecond': total_events / wall_seconds if wall_seconds > 0 else 0.0,
+        'branches': branches,
+        'streamsWithReference': len(compared),
+        'referenceWords': ref_words,
+        'droppedWords': sum(c['droppedWords'] for c in compared),
+        'insertedWords': sum(c['insertedWords'] for c in compared),
+        'accuracy': max(0.0, 1.0 - errors / ref_words) if ref_words else None,
+    }
@@ -0,0 +1,17 @@
+"""Read final-path metrics snapshots written by utils/metrics.js
+
+Snapshots come from GET /metrics.json or the file set by METRICS_SNAPSHOT_FILE.
+
+Usage (from backend/):
+    python -m tools.metrics_report metrics.json
+    python -m tools.metrics_report "http://localhost:3001/metrics.json?apiKey=..." [--json out.json]
+"""
+
+from tools.metrics_report.snapshot import histogram_quantile, load_snapshot, merge_series, summarize
+
+__all__ = [
+    'histogram_quantile',
+    'load_snapshot',
+    'merge_series',
+    'summarize',
+]
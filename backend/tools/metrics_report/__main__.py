@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Command-line entry point: python -m tools.metrics_report <snapshot file or URL>"""
+
+import argparse
+import json
+import sys
+
+from tools.metrics_report.snapshot import load_snapshot, summarize
+
+
+def _fmt(value, unit=''):
+    if value is None:
+        return '-'
+    return f'{value:.3f}{unit}' if isinstance(value, float) else f'{value}{unit}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tools.metrics_report',
+        description='Summarize a final-path metrics snapshot (GET /metrics.json or METRICS_SNAPSHOT_FILE)')
+    parser.add_argument('source', help='Snapshot JSON file or http(s) URL')
+    parser.add_argument('--json', dest='json_path', help='Write the full summary as JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        snapshot = load_snapshot(args.source)
+    except (OSError, ValueError) as err:
+        print(f'Could not load snapshot: {err}', file=sys.stderr)
+        return 1
+
+    report = summarize(snapshot)
+    print(f"Snapshot: {report['generatedAt']}")
+
+    for name, groups in report['histograms'].items():
+        for group, summary in groups.items():
+            q = summary['quantiles']
+            print(f"{name} [{group}]: n={summary['count']} mean={_fmt(summary['mean'])} "
+                  f"p50={_fmt(q['0.5'])} p90={_fmt(q['0.9'])} p95={_fmt(q['0.95'])} p99={_fmt(q['0.99'])}")
+
+    for mode, branches in report['mergeEvents'].items():
+        print(f'Merge branches [{mode}]: ' + ', '.join(f'{b}={n}' for b, n in sorted(branches.items())))
+
+    tuning = report['tuning']
+    if 'partialWindow' in tuning:
+        t = tuning['partialWindow']
+        print(f"Partial window {t['current']}s: {_fmt(t['finalsWithinWindow'])} of finals arrive within it, "
+              f"p95 gap {_fmt(t['p95Seconds'], 's')}")
+    if 'minOverlap' in tuning:
+        t = tuning['minOverlap']
+        print(f"Min overlap {t['current']} chars: {_fmt(t['overlapsAtOrBelowMinimum'])} of matched overlaps are "
+              f"at or below it, p10 {_fmt(t['p10Chars'])} chars")
+    if 'replaceRatio' in tuning:
+        t = tuning['replaceRatio']
+        print(f"Replace ratio {t['current']}x: append {_fmt(t['appendShare'])}, replace {_fmt(t['replaceShare'])}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Snapshot loading and histogram quantiles
+
+Histogram series hold cumulative bucket counts (Prometheus semantics) next to
+the metric's bucket bounds; quantiles are interpolated linearly within the
+bucket that contains them, like PromQL histogram_quantile().
+"""
+
+import json
+import urllib.request
+
+from tools.textmerge import DEFAULT_MIN_OVERLAP
+
+GAP = 'exbabel_partial_final_gap_seconds'
+MERGE_EVENTS = 'exbabel_final_merge_events_total'
+RECOVERED = 'exbabel_final_recovered_chars'
+OVERLAP = 'exbabel_final_overlap_chars'
+RATIO = 'exbabel_final_length_ratio'
+TRANSLATE = 'exbabel_translate_final_seconds'
+LOOP_LAG = 'exbabel_event_loop_lag_seconds'
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+# Constants the histograms exist to tune (see utils/metrics.js)
+PARTIAL_WINDOW_SECONDS = 0.5   # add_partial_check.py
+MIN_OVERLAP_CHARS = DEFAULT_MIN_OVERLAP
+REPLACE_RATIO = 1.5            # fix_missing_sentences.py
+
+
+def load_snapshot(source):
+    """Load a snapshot from a file path or an http(s) URL"""
+    if source.startswith(('http://', 'https://')):
+        with urllib.request.urlopen(source, timeout=10) as response:
+            return json.load(response)
+    with open(source, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def merge_series(metric, **labels):
+    """Sum the histogram series whose labels match, as (count, sum, cumulative_buckets)"""
+    buckets = [0] * len(metric['buckets'])
+    count = 0
+    total = 0.0
+    for series in metric['series']:
+        if any(series['labels'].get(name) != value for name, value in labels.items()):
+            continue
+        count += series['count']
+        total += series['sum']
+        buckets = [a + b for a, b in zip(buckets, series['buckets'])]
+    return count, total, buckets
+
+
+def histogram_quantile(q, bounds, cumulative, count):
+    """Estimate the q-quantile; None if empty. Values past the last bound report that bound."""
+    if count == 0:
+        return None
+    rank = q * count
+    lower_bound = 0.0
+    lower_count = 0
+    for bound, cumulative_count in zip(bounds, cumulative):
+        if cumulative_count >= rank:
+            in_bucket = cumulative_count - lower_count
+            if in_bucket == 0:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / in_bucket
+        lower_bound = bound
+        lower_count = cumulative_count
+    return bounds[-1] if bounds else None
+
+
+def fraction_at_most(value, bounds, cumulative, count):
+    """Fraction of observations <= value (value must be a bucket bound)"""
+    if count == 0 or value not in bounds:
+        return None
+    return cumulative[bounds.index(value)] / count
+
+
+def _histogram_summary(metric, **labels):
+    count, total, cumulative = merge_series(metric, **labels)
+    return {
+        'count': count,
+        'mean': total / count if count else None,
+        'quantiles': {str(q): histogram_quantile(q, metric['buckets'], cumulative, count) for q in QUANTILES},
+        'bounds': metric['buckets'],
+        'cumulative': cumulative,
+    }
+
+
+def summarize(snapshot):
+    """Per-mode distributions plus the tuning signals for each hard-coded constant"""
+    metrics = snapshot.get('metrics', {})
+    report = {'generatedAt': snapshot.get('generatedAt'), 'histograms': {}, 'mergeEvents': {}, 'tuning': {}}
+
+    for name, metric in metrics.items():
+        if metric['type'] != 'histogram':
+            continue
+        label_name = metric['labelNames'][0] if metric['labelNames'] else None
+        groups = sorted({s['labels'].get(label_name) for s in metric['series']}) if label_name else [None]
+        report['histograms'][name] = {
+            (group or 'all'): _histogram_summary(metric, **({label_name: group} if label_name else {}))
+            for group in groups
+        }
+
+    for series in metrics.get(MERGE_EVENTS, {}).get('series', []):
+        mode = series['labels'].get('mode', '')
+        report['mergeEvents'].setdefault(mode, {})[series['labels'].get('branch', '')] = series['value']
+
+    tuning = report['tuning']
+    if GAP in metrics:
+        count, _, cumulative = merge_series(metrics[GAP])
+        tuning['partialWindow'] = {
+            'current': PARTIAL_WINDOW_SECONDS,
+            'finalsWithinWindow': fraction_at_most(PARTIAL_WINDOW_SECONDS, metrics[GAP]['buckets'], cumulative, count),
+            'p95Seconds': histogram_quantile(0.95, metrics[GAP]['buckets'], cumulative, count),
+        }
+    if OVERLAP in metrics:
+        count, _, cumulative = merge_series(metrics[OVERLAP])
+        tuning['minOverlap'] = {
+            'current': MIN_OVERLAP_CHARS,
+            'overlapsAtOrBelowMinimum': fraction_at_most(MIN_OVERLAP_CHARS, metrics[OVERLAP]['buckets'], cumulative, count),
+            'p10Chars': histogram_quantile(0.1, metrics[OVERLAP]['buckets'], cumulative, count),
+        }
+    if RATIO in metrics:
+        count, _, cumulative = merge_series(metrics[RATIO])
+        below = fraction_at_most(REPLACE_RATIO, metrics[RATIO]['buckets'], cumulative, count)
+        tuning['replaceRatio'] = {
+            'current': REPLACE_RATIO,
+            'appendShare': below,
+            'replaceShare': None if below is None else 1 - below,
+        }
+    return report
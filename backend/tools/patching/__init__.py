@@ -0,0 +1,35 @@
+"""Single-pass patch runner for soloModeHandler.js and its variants
+
+Usage (from backend/):
+    python -m tools.patching --set missing-sentences soloModeHandler.js [more targets...]
+    python -m tools.patching --set missing-sentences --dry-run --timing soloModeHandler.js*
+"""
+
+from tools.patching.engine import (
+    AnchorIndex,
+    InsertAfter,
+    Patch,
+    PatchError,
+    PatchResult,
+    Replace,
+    ReplaceBetween,
+    apply_patch_set,
+    patch_file,
+)
+from tools.patching.runner import main, run_targets
+from tools.patching.solo_mode import PATCH_SETS
+
+__all__ = [
+    'AnchorIndex',
+    'InsertAfter',
+    'PATCH_SETS',
+    'Patch',
+    'PatchError',
+    'PatchResult',
+    'Replace',
+    'ReplaceBetween',
+    'apply_patch_set',
+    'main',
+    'patch_file',
+    'run_targets',
+]
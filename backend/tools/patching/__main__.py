@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""Command-line entry point: python -m tools.patching --set <name> <targets>"""
+
+import sys
+
+from tools.patching.runner import main
+
+if __name__ == '__main__':
+    sys.exit(main())
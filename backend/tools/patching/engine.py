@@ -0,0 +1,250 @@
+"""Single-pass, indexed patch engine
+
+A patch set is an ordered list of declarative patches. Applying it to a target:
+
+1. reads the target once,
+2. builds an offset index for every anchor used by the set in one regex scan,
+3. lets each patch plan its edits against that index (skipping patches whose
+   `applied` marker is already present, which makes re-runs no-ops),
+4. assembles all edits in a single pass and writes the file at most once.
+
+Edits are planned against the original text, so two patches may not touch
+overlapping ranges; that is reported as a conflict instead of being applied.
+"""
+
+import difflib
+import re
+import time
+from abc import ABC, abstractmethod
+
+
+class PatchError(Exception):
+    """A patch could not be planned against the target"""
+
+
+class Edit:
+    """Replace text[start:end] with `text`"""
+
+    __slots__ = ('start', 'end', 'text', 'patch')
+
+    def __init__(self, start, end, text, patch):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.patch = patch
+
+
+class AnchorIndex:
+    """Offsets of every anchor in a text, found with one left-to-right scan
+
+    Anchors are matched through a lookahead alternation (longest first), so
+    overlapping occurrences are all found. When an anchor matches, every
+    other anchor that is a prefix of it necessarily matches at the same
+    offset and is recorded too.
+    """
+
+    def __init__(self, text, anchors):
+        self.text = text
+        unique = sorted(set(a for a in anchors if a), key=len, reverse=True)
+        self.offsets = {anchor: [] for anchor in unique}
+        if not unique:
+            return
+
+        prefixes = {a: [b for b in unique if b != a and a.startswith(b)] for a in unique}
+        pattern = re.compile('(?=(' + '|'.join(re.escape(a) for a in unique) + '))')
+        for match in pattern.finditer(text):
+            anchor = match.group(1)
+            pos = match.start()
+            self.offsets[anchor].append(pos)
+            for prefix in prefixes[anchor]:
+                self.offsets[prefix].append(pos)
+
+    def find(self, anchor, start=0):
+        """First offset of anchor at or after start, or -1"""
+        for pos in self.offsets.get(anchor, ()):
+            if pos >= start:
+                return pos
+        return -1
+
+    def find_all(self, anchor, start=0, end=None):
+        return [p for p in self.offsets.get(anchor, ()) if p >= start and (end is None or p < end)]
+
+    def __contains__(self, anchor):
+        return bool(self.offsets.get(anchor))
+
+
+class Patch(ABC):
+    """Base class: subclasses implement anchors() and plan()
+
+    `applied` is a marker string whose presence means the patch has already
+    been applied to the target.
+    """
+
+    def __init__(self, name, applied=None):
+        self.name = name
+        self.applied = applied
+
+    def anchors(self):
+        return [self.applied] if self.applied else []
+
+    def is_applied(self, index):
+        return bool(self.applied) and self.applied in index
+
+    @abstractmethod
+    def plan(self, index):
+        """Return the list of Edits this patch makes against the index"""
+
+    def _require(self, index, anchor, start=0):
+        pos = index.find(anchor, start)
+        if pos < 0:
+            raise PatchError(f'{self.name}: anchor not found: {anchor[:70]!r}')
+        return pos
+
+
+class InsertAfter(Patch):
+    """Insert text immediately after the first occurrence of an anchor"""
+
+    def __init__(self, name, anchor, text, applied=None):
+        super().__init__(name, applied)
+        self.anchor = anchor
+        self.text = text
+
+    def anchors(self):
+        return super().anchors() + [self.anchor]
+
+    def plan(self, index):
+        pos = self._require(index, self.anchor) + len(self.anchor)
+        return [Edit(pos, pos, self.text, self.name)]
+
+
+class Replace(Patch):
+    """Replace the first occurrence of an anchor (or all, with count=None)"""
+
+    def __init__(self, name, anchor, replacement, applied=None, count=1):
+        super().__init__(name, applied)
+        self.anchor = anchor
+        self.replacement = replacement
+        self.count = count
+
+    def anchors(self):
+        return super().anchors() + [self.anchor]
+
+    def plan(self, index):
+        self._require(index, self.anchor)
+        edits = []
+        last_end = -1
+        for pos in index.find_all(self.anchor):
+            if pos < last_end:
+                continue
+            edits.append(Edit(pos, pos + len(self.anchor), self.replacement, self.name))
+            last_end = pos + len(self.anchor)
+            if self.count is not None and len(edits) >= self.count:
+                break
+        return edits
+
+
+class ReplaceBetween(Patch):
+    """Replace from a start anchor through the first end anchor after it
+
+    With keep_end=True the end anchor itself is preserved.
+    """
+
+    def __init__(self, name, start, end, replacement, applied=None, keep_end=False):
+        super().__init__(name, applied)
+        self.start = start
+        self.end = end
+        self.replacement = replacement
+        self.keep_end = keep_end
+
+    def anchors(self):
+        return super().anchors() + [self.start, self.end]
+
+    def plan(self, index):
+        begin = self._require(index, self.start)
+        finish = self._require(index, self.end, begin + len(self.start))
+        if not self.keep_end:
+            finish += len(self.end)
+        return [Edit(begin, finish, self.replacement, self.name)]
+
+
+class PatchResult:
+    """Outcome of applying a patch set to one target"""
+
+    def __init__(self, target):
+        self.target = target
+        self.original = ''
+        self.patched = ''
+        self.applied = []
+        self.skipped = []
+        self.error = None
+        self.timings = []  # (step, seconds)
+
+    @property
+    def changed(self):
+        return self.error is None and self.patched != self.original
+
+    def diff(self):
+        return ''.join(difflib.unified_diff(
+            self.original.splitlines(True), self.patched.splitlines(True),
+            fromfile=f'a/{self.target}', tofile=f'b/{self.target}'))
+
+
+def apply_patch_set(text, patches, result):
+    """Plan every patch against one anchor index and assemble the output once"""
+    started = time.perf_counter()
+    anchors = [a for patch in patches for a in patch.anchors()]
+    index = AnchorIndex(text, anchors)
+    result.timings.append(('index', time.perf_counter() - started))
+
+    edits = []
+    for order, patch in enumerate(patches):
+        started = time.perf_counter()
+        if patch.is_applied(index):
+            result.skipped.append(patch.name)
+        else:
+            for edit in patch.plan(index):
+                edits.append((edit.start, order, edit))
+            result.applied.append(patch.name)
+        result.timings.append((patch.name, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    edits.sort(key=lambda e: (e[0], e[1]))
+    pieces = []
+    cursor = 0
+    previous = None
+    for _start, _order, edit in edits:
+        if edit.start < cursor:
+            raise PatchError(f'{edit.patch}: overlaps edit from {previous.patch}')
+        pieces.append(text[cursor:edit.start])
+        pieces.append(edit.text)
+        cursor = edit.end
+        previous = edit
+    pieces.append(text[cursor:])
+    output = ''.join(pieces)
+    result.timings.append(('assemble', time.perf_counter() - started))
+    return output
+
+
+def patch_file(target, patches, dry_run=False):
+    """Read target once, apply patches, and write it back once if it changed"""
+    result = PatchResult(target)
+    try:
+        started = time.perf_counter()
+        with open(target, 'r', encoding='utf-8', newline='') as f:
+            raw = f.read()
+        crlf = '\r\n' in raw
+        result.original = raw.replace('\r\n', '\n') if crlf else raw
+        result.timings.append(('read', time.perf_counter() - started))
+
+        result.patched = apply_patch_set(result.original, patches, result)
+
+        if result.changed and not dry_run:
+            started = time.perf_counter()
+            output = result.patched.replace('\n', '\r\n') if crlf else result.patched
+            with open(target, 'w', encoding='utf-8', newline='') as f:
+                f.write(output)
+            result.timings.append(('write', time.perf_counter() - started))
+    except (OSError, PatchError) as e:
+        result.error = str(e)
+        result.patched = result.original
+    return result
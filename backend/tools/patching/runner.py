@@ -0,0 +1,64 @@
+"""Apply a named patch set to one or more targets, in parallel"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.patching.engine import patch_file
+from tools.patching.solo_mode import PATCH_SETS
+
+
+def _patch_one(args):
+    target, set_name, dry_run = args
+    return patch_file(target, PATCH_SETS[set_name], dry_run=dry_run)
+
+
+def run_targets(targets, set_name, dry_run=False, jobs=None):
+    """Patch every target with the named set; returns PatchResults in target order"""
+    if set_name not in PATCH_SETS:
+        raise KeyError(f'Unknown patch set: {set_name}')
+    tasks = [(target, set_name, dry_run) for target in targets]
+    jobs = jobs or min(len(tasks), os.cpu_count() or 1)
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_patch_one, tasks))
+    return [_patch_one(task) for task in tasks]
+
+
+def _report(result, show_timing):
+    if result.error:
+        print(f'❌ {result.target}: {result.error}')
+    elif result.changed:
+        print(f'✅ {result.target}: applied {", ".join(result.applied)}'
+              + (f' (already applied: {", ".join(result.skipped)})' if result.skipped else ''))
+    else:
+        print(f'⏭️  {result.target}: already patched, no changes')
+
+    if show_timing:
+        for step, seconds in result.timings:
+            print(f'     {step:<28} {seconds * 1000:8.3f} ms')
+
+
+def main(argv=None, default_set=None, default_targets=None):
+    parser = argparse.ArgumentParser(prog='python -m tools.patching',
+                                     description='Apply a SoloMode patch set in a single pass')
+    parser.add_argument('targets', nargs='*', default=default_targets or [],
+                        help='Handler files to patch (e.g. soloModeHandler.js soloModeHandler.js.backup2)')
+    parser.add_argument('--set', dest='set_name', default=default_set, choices=sorted(PATCH_SETS),
+                        required=default_set is None, help='Patch set to apply')
+    parser.add_argument('--dry-run', action='store_true', help='Print a unified diff instead of writing')
+    parser.add_argument('--timing', action='store_true', help='Print per-patch timing')
+    parser.add_argument('--jobs', type=int, help='Parallel worker processes (default: one per target)')
+    args = parser.parse_args(argv)
+
+    if not args.targets:
+        parser.error('no targets given')
+
+    results = run_targets(args.targets, args.set_name, dry_run=args.dry_run, jobs=args.jobs)
+    for result in results:
+        if args.dry_run and result.changed:
+            sys.stdout.write(result.diff())
+        _report(result, args.timing)
+
+    return 1 if any(r.error for r in results) else 0
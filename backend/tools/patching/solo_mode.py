@@ -0,0 +1,394 @@
+"""SoloMode handler patch sets
+
+Declarative versions of the backend/*.py patch scripts. Each set is an ordered
+list of patches applied by tools.patching.engine in a single pass:
+
+  missing-sentences  fix_missing_sentences.py - track partials, accumulate finals
+                     in a bounded buffer, merge truncated finals with partials
+  partial-tracking   fix_partial.py / fix_partial_tracking.py - track partials and
+                     recover truncated finals (no accumulation)
+  partial-check      apply_fixes.py / add_partial_check.py - prefer a partial seen
+                     within 500 ms over a shorter final
+
+The sets are alternatives; apply only one of them to a given handler.
+"""
+
+from tools.patching.engine import InsertAfter, Replace, ReplaceBetween
+
+SPEECH_STREAM_IMPORT = "import { GoogleSpeechStream } from './googleSpeechStream.js';\n"
+
+CURRENT_PARTIAL_DECLARATION = (
+    "let currentPartialText = ''; // Track current partial text for delayed translations\n"
+    "              \n"
+)
+
+PARTIAL_BRANCH = (
+    '                if (isPartial) {\n'
+    '                  // Live partial transcript'
+)
+
+FINAL_BLOCK_START = (
+    '} else {\n'
+    '                  // Final transcript from Google Speech - send immediately (restored simple approach)'
+)
+
+FINAL_BLOCK_END = (
+    '                  })();\n'
+    '                }\n'
+)
+
+
+def import_patch(name, line):
+    """Add an import below the GoogleSpeechStream import (all handler variants have it)"""
+    return InsertAfter(name, SPEECH_STREAM_IMPORT, line, applied=line)
+
+
+LATEST_PARTIAL_TRACKING = Replace(
+    'track-latest-partial',
+    PARTIAL_BRANCH,
+    """                if (isPartial) {
+                  lastPartialTime = Date.now(); // For the partial→final gap metric (utils/metrics.js)
+                  
+                  // CRITICAL: Track the latest partial text to prevent word loss
+                  // Google Speech can finalize a shorter phrase while a partial has more text
+                  // This happens during continuous speech when the API finalizes an earlier chunk
+                  if (transcriptText.length > latestPartialText.length || 
+                      !latestPartialText || 
+                      !transcriptText.startsWith(latestPartialText.substring(0, Math.min(latestPartialText.length, 50)))) {
+                    latestPartialText = transcriptText;
+                  }
+                  // Translate the tracked partial in the background once it stops changing (utils/speculativeTranslation.js)
+                  if (!isTranscriptionOnly) {
+                    speculation.onPartial(latestPartialText);
+                  }
+                  
+                  // Live partial transcript""",
+    applied='// CRITICAL: Track the latest partial text to prevent word loss',
+)
+
+
+MISSING_SENTENCES = [
+    import_patch(
+        'import-text-merge',
+        "import { TranscriptBuffer } from './utils/transcriptBuffer.js';\n"
+        "import { createFinalMergeQueue } from './utils/finalMergeQueue.js';\n"
+        "import { createMergeLogger } from './utils/mergeLogger.js';\n"
+        "import { createFinalTranslationQueue } from './utils/finalTranslationQueue.js';\n"
+        "import { createFinalDeduplicator } from './utils/finalDeduplicator.js';\n"
+        "import { createSpeculativeTranslator } from './utils/speculativeTranslation.js';\n",
+    ),
+    InsertAfter(
+        'declare-merge-state',
+        CURRENT_PARTIAL_DECLARATION,
+        """              // Track latest partial to prevent word loss when final arrives
+              // Google Speech can finalize a shorter phrase while partial has more text
+              let latestPartialText = ''; // Most recent partial text from Google Speech
+              let lastPartialTime = 0; // When the most recent partial arrived
+              // Accumulate multiple final results for long phrases (bounded, segment-chunked, tail-indexed)
+              const accumulatedFinals = new TranscriptBuffer({ sessionId: legacySessionId });
+              clientWs.once('close', () => accumulatedFinals.dispose());
+              // Merge + optional cleanup of each final on the shared worker pool, in order per session (utils/finalMergeQueue.js)
+              const finalMerges = createFinalMergeQueue({ sessionId: legacySessionId, buffer: accumulatedFinals });
+              clientWs.once('close', () => finalMerges.dispose());
+              // Rolling window of recent final fingerprints for exact/near-duplicate suppression (utils/finalDeduplicator.js)
+              const finalDedup = createFinalDeduplicator({ sessionId: legacySessionId });
+              clientWs.once('close', () => finalDedup.dispose());
+              // Level-gated, sampled merge-path logging with an error-flushed ring buffer (utils/mergeLogger.js)
+              const mergeLog = createMergeLogger({ mode: 'SoloMode', sessionId: legacySessionId });
+              clientWs.once('close', () => mergeLog.dispose());
+              // Speculative translation of stable partials, reused when the final matches (utils/speculativeTranslation.js)
+              const speculation = createSpeculativeTranslator({
+                sessionId: legacySessionId,
+                contextKey: () => `${currentSourceLang}:${currentTargetLang}`,
+                translate: (text, signal) => finalTranslationWorker.translateFinal(
+                  text,
+                  currentSourceLang,
+                  currentTargetLang,
+                  process.env.OPENAI_API_KEY,
+                  legacySessionId,
+                  { signal }
+                )
+              });
+              clientWs.once('close', () => speculation.dispose());
+              // Per-session final translation queue (utils/finalTranslationQueue.js)
+              const finalTranslations = createFinalTranslationQueue({
+                sessionId: legacySessionId,
+                translate: (text, signal) => speculation.translateFinal(text, signal),
+                deliver: ({ text, translatedText, error }) => {
+                  if (error) {
+                    mergeLog.error('translation_error', { error, text });
+                  } else {
+                    mergeLog.debug('final_sent', { text, translatedText });
+                  }
+                  sendWithSequence({
+                    type: 'translation',
+                    originalText: text,
+                    translatedText: error ? `[Translation error: ${error.message}]` : translatedText,
+                    timestamp: Date.now()
+                  }, false);
+                  // Clear accumulated finals after sending (they've been processed)
+                  accumulatedFinals.clear();
+                }
+              });
+              clientWs.once('close', () => finalTranslations.dispose());
+              
+""",
+        applied='const accumulatedFinals = new TranscriptBuffer(',
+    ),
+    LATEST_PARTIAL_TRACKING,
+    ReplaceBetween(
+        'merge-finals',
+        FINAL_BLOCK_START,
+        FINAL_BLOCK_END,
+        '''} else {
+                  // Final transcript from Google Speech
+                  // CRITICAL FIX: Handle multiple finals and merge with partials to prevent word loss
+                  mergeLog.debug('final_raw', { text: transcriptText, gapMs: lastPartialTime ? Date.now() - lastPartialTime : null });
+                  
+                  // Accumulate this final with any previous finals (Google can send multiple finals for long phrases)
+                  // and recover words the latest partial already had (utils/finalMerge.js). The merge and optional
+                  // cleanup run on the shared worker pool, one final at a time per session, results in order.
+                  const partialAtFinal = latestPartialText;
+                  // Reset latest partial now - partials from here on belong to the next segment
+                  latestPartialText = '';
+                  
+                  finalMerges.submit(transcriptText, partialAtFinal, ({ text: mergedText, cleanedText, events }) => {
+                    for (const { event, data } of events) {
+                      mergeLog.info(event, data);
+                    }
+                    const finalTextToProcess = cleanedText || mergedText;
+                    
+                    // Deduplicate: Skip if this final repeats (exactly or nearly) one of the recent finals
+                    const duplicate = finalDedup.checkAndRecord(finalTextToProcess, { translations: isTranscriptionOnly ? 0 : 1 });
+                    if (duplicate.duplicate) {
+                      mergeLog.info('duplicate', { kind: duplicate.kind, similarity: duplicate.similarity, text: finalTextToProcess, matched: duplicate.matched });
+                      return;
+                    }
+                  
+                    mergeLog.debug('final_processed', { text: finalTextToProcess });
+                  
+                    // Cancel any pending finalization timeout (in case we had delayed finalization)
+                    if (pendingFinalization && pendingFinalization.timeout) {
+                      clearTimeout(pendingFinalization.timeout);
+                      pendingFinalization = null;
+                    }
+                  
+                    // Process final - transcripts go out directly, translations go through the
+                    // per-session queue (superseded finals are coalesced or aborted, delivery stays in order)
+                    try {
+                      if (isTranscriptionOnly) {
+                        // Same language - just send transcript
+                        mergeLog.debug('final_sent', { text: finalTextToProcess });
+                        sendWithSequence({
+                          type: 'translation',
+                          originalText: '',
+                          translatedText: finalTextToProcess,
+                          timestamp: Date.now()
+                        }, false);
+                      
+                        // Clear accumulated finals after sending (they've been processed)
+                        accumulatedFinals.clear();
+                      } else {
+                        // Different language - queue for the dedicated final translation worker
+                        finalTranslations.enqueue(finalTextToProcess);
+                      }
+                    } catch (error) {
+                      mergeLog.error('final_error', { error, text: finalTextToProcess });
+                      accumulatedFinals.clear();
+                    }
+                  });
+                }
+''',
+        applied='// CRITICAL FIX: Handle multiple finals and merge with partials to prevent word loss',
+    ),
+]
+
+
+PARTIAL_TRACKING = [
+    import_patch(
+        'import-text-merge',
+        "import { findOverlap } from './utils/textMerge.js';\n"
+        "import { createMergeLogger } from './utils/mergeLogger.js';\n"
+        "import { createFinalDeduplicator } from './utils/finalDeduplicator.js';\n"
+        "import { createSpeculativeTranslator } from './utils/speculativeTranslation.js';\n",
+    ),
+    InsertAfter(
+        'declare-partial-state',
+        CURRENT_PARTIAL_DECLARATION,
+        """              // Track latest partial to prevent word loss when final arrives
+              // Google Speech can finalize a shorter phrase while partial has more text
+              let latestPartialText = ''; // Most recent partial text from Google Speech
+              let lastPartialTime = 0; // When the most recent partial arrived
+              // Rolling window of recent final fingerprints for exact/near-duplicate suppression (utils/finalDeduplicator.js)
+              const finalDedup = createFinalDeduplicator({ sessionId: legacySessionId });
+              clientWs.once('close', () => finalDedup.dispose());
+              // Level-gated, sampled merge-path logging with an error-flushed ring buffer (utils/mergeLogger.js)
+              const mergeLog = createMergeLogger({ mode: 'SoloMode', sessionId: legacySessionId });
+              clientWs.once('close', () => mergeLog.dispose());
+              // Speculative translation of stable partials, reused when the final matches (utils/speculativeTranslation.js)
+              const speculation = createSpeculativeTranslator({
+                sessionId: legacySessionId,
+                contextKey: () => `${currentSourceLang}:${currentTargetLang}`,
+                translate: (text, signal) => finalTranslationWorker.translateFinal(
+                  text,
+                  currentSourceLang,
+                  currentTargetLang,
+                  process.env.OPENAI_API_KEY,
+                  legacySessionId,
+                  { signal }
+                )
+              });
+              clientWs.once('close', () => speculation.dispose());
+              
+""",
+        applied="let latestPartialText = ''; // Most recent partial text from Google Speech",
+    ),
+    LATEST_PARTIAL_TRACKING,
+    ReplaceBetween(
+        'recover-truncated-final',
+        FINAL_BLOCK_START,
+        FINAL_BLOCK_END,
+        '''} else {
+                  // Final transcript from Google Speech
+                  mergeLog.debug('final_raw', { text: transcriptText, gapMs: lastPartialTime ? Date.now() - lastPartialTime : null });
+                  // CRITICAL FIX: Check if latest partial extends beyond this final
+                  // Google Speech can finalize an earlier chunk while partial has more text
+                  // This prevents word loss during continuous speech without pauses
+                  let finalTextToProcess = transcriptText;
+                  
+                  if (latestPartialText && latestPartialText.length > transcriptText.length) {
+                    // Check if partial extends beyond final (common case during continuous speech)
+                    // The partial might include the final plus additional words
+                    if (latestPartialText.startsWith(transcriptText.trim())) {
+                      // Partial extends beyond final - use the longer partial text
+                      finalTextToProcess = latestPartialText;
+                      mergeLog.info('partial_override', { finalChars: transcriptText.length, partialChars: latestPartialText.length, final: transcriptText, partial: latestPartialText });
+                    } else {
+                      // Partial might be for a different part - check for overlap
+                      // (linear-time suffix/prefix match, utils/textMerge.js)
+                      const overlap = findOverlap(transcriptText, latestPartialText);
+                      if (overlap > 0 && latestPartialText.length > transcriptText.length) {
+                        // Merge: final + new part from partial
+                        const newPart = latestPartialText.substring(overlap);
+                        finalTextToProcess = transcriptText.trim() + ' ' + newPart.trim();
+                        mergeLog.info('partial_merge', { finalChars: transcriptText.length, newPartChars: newPart.length, mergedChars: finalTextToProcess.length, final: transcriptText, partial: latestPartialText, merged: finalTextToProcess });
+                      }
+                    }
+                  }
+                  
+                  // Deduplicate: Skip if this final repeats (exactly or nearly) one of the recent finals
+                  const duplicate = finalDedup.checkAndRecord(finalTextToProcess, { translations: isTranscriptionOnly ? 0 : 1 });
+                  if (duplicate.duplicate) {
+                    mergeLog.info('duplicate', { kind: duplicate.kind, similarity: duplicate.similarity, text: finalTextToProcess, matched: duplicate.matched });
+                    // Reset partial tracking even if skipping
+                    latestPartialText = '';
+                    return;
+                  }
+                  
+                  // Reset latest partial after processing final
+                  latestPartialText = '';
+                  
+                  mergeLog.debug('final_processed', { text: finalTextToProcess });
+                  
+                  // Cancel any pending finalization timeout (in case we had delayed finalization)
+                  if (pendingFinalization && pendingFinalization.timeout) {
+                    clearTimeout(pendingFinalization.timeout);
+                    pendingFinalization = null;
+                  }
+                  
+                  // Process final immediately - translate and send to client
+                  (async () => {
+                    try {
+                      if (isTranscriptionOnly) {
+                        // Same language - just send transcript
+                        mergeLog.debug('final_sent', { text: finalTextToProcess });
+                        sendWithSequence({
+                          type: 'translation',
+                          originalText: '',
+                          translatedText: finalTextToProcess,
+                          timestamp: Date.now()
+                        }, false);
+                      } else {
+                        // Different language - translate the transcript
+                        try {
+                          // Dedicated final translation worker (high-quality, GPT-4o), or the
+                          // speculative translation of the partial this final matches
+                          const translatedText = await speculation.translateFinal(finalTextToProcess);
+                          
+                          mergeLog.debug('final_sent', { text: finalTextToProcess, translatedText });
+                          
+                          sendWithSequence({
+                            type: 'translation',
+                            originalText: finalTextToProcess,
+                            translatedText: translatedText,
+                            timestamp: Date.now()
+                          }, false);
+                        } catch (error) {
+                          mergeLog.error('translation_error', { error, text: finalTextToProcess });
+                          // Send transcript as fallback
+                          sendWithSequence({
+                            type: 'translation',
+                            originalText: finalTextToProcess,
+                            translatedText: `[Translation error: ${error.message}]`,
+                            timestamp: Date.now()
+                          }, false);
+                        }
+                      }
+                    } catch (error) {
+                      mergeLog.error('final_error', { error, text: finalTextToProcess });
+                    }
+                  })();
+                }
+''',
+        applied='// CRITICAL FIX: Check if latest partial extends beyond this final',
+    ),
+]
+
+
+PARTIAL_CHECK = [
+    import_patch('import-merge-logger', "import { createMergeLogger } from './utils/mergeLogger.js';\n"),
+    InsertAfter(
+        'declare-partial-state',
+        CURRENT_PARTIAL_DECLARATION,
+        """              // CRITICAL: Track latest partial to prevent word loss
+              let latestPartialText = ''; // Most recent partial text from Google Speech
+              let latestPartialTime = 0; // Timestamp of latest partial
+              const mergeLog = createMergeLogger({ mode: 'SoloMode', sessionId: legacySessionId });
+              clientWs.once('close', () => mergeLog.dispose());
+              
+""",
+        applied='let latestPartialTime = 0; // Timestamp of latest partial',
+    ),
+    Replace(
+        'track-latest-partial',
+        PARTIAL_BRANCH,
+        """                if (isPartial) {
+                  // Track latest partial
+                  if (!latestPartialText || transcriptText.length > latestPartialText.length) {
+                    latestPartialText = transcriptText;
+                    latestPartialTime = Date.now();
+                  }
+                  // Live partial transcript""",
+        applied='                  // Track latest partial\n',
+    ),
+    InsertAfter(
+        'prefer-recent-partial',
+        '// Final transcript from Google Speech - send immediately (restored simple approach)\n',
+        """                  mergeLog.debug('final_raw', { text: transcriptText, gapMs: latestPartialTime ? Date.now() - latestPartialTime : null });
+                  // CRITICAL: Check if partial has more text than final
+                  if (latestPartialText && latestPartialText.length > transcriptText.length && (Date.now() - latestPartialTime) < 500) {
+                    mergeLog.info('partial_override', { finalChars: transcriptText.length, partialChars: latestPartialText.length, final: transcriptText, partial: latestPartialText });
+                    transcriptText = latestPartialText;
+                  }
+                  latestPartialText = '';
+""",
+        applied='// CRITICAL: Check if partial has more text than final',
+    ),
+]
+
+
+PATCH_SETS = {
+    'missing-sentences': MISSING_SENTENCES,
+    'partial-tracking': PARTIAL_TRACKING,
+    'partial-check': PARTIAL_CHECK,
+}
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Reference implementation of backend/utils/textMerge.js
+
+Linear-time suffix/prefix overlap detection used when merging consecutive
+finals and partials. Kept in lockstep with the JS module so merge behavior can
+be checked and benchmarked offline.
+"""
+
+# Overlaps of 20 characters or fewer are treated as coincidental
+DEFAULT_MIN_OVERLAP = 21
+
+# The accumulated-finals merge only ever looked at the last 100 characters
+ACCUMULATED_MAX_OVERLAP = 100
+
+
+def prefix_function(text):
+    """KMP prefix function: pi[i] is the longest proper border of text[:i + 1]"""
+    n = len(text)
+    pi = [0] * n
+    for i in range(1, n):
+        k = pi[i - 1]
+        c = text[i]
+        while k > 0 and text[k] != c:
+            k = pi[k - 1]
+        if text[k] == c:
+            k += 1
+        pi[i] = k
+    return pi
+
+
+def find_overlap(old_text, new_text, min_overlap=DEFAULT_MIN_OVERLAP, max_overlap=None):
+    """Length of the longest suffix of old_text that is a prefix of new_text
+
+    Only the last min(len(old), len(new), max_overlap) characters of old_text
+    are scanned, so the cost does not grow with the accumulated text.
+    Returns 0 when the overlap is shorter than min_overlap.
+    """
+    if not old_text or not new_text:
+        return 0
+
+    limit = min(len(old_text), len(new_text))
+    if max_overlap is not None:
+        limit = min(limit, max_overlap)
+    if limit <= 0 or limit < min_overlap:
+        return 0
+
+    pattern = new_text[:limit]
+    pi = prefix_function(pattern)
+
+    k = 0
+    for c in old_text[len(old_text) - limit:]:
+        while k > 0 and pattern[k] != c:
+            k = pi[k - 1]
+        if pattern[k] == c:
+            k += 1
+
+    return k if k >= min_overlap else 0
+
+
+def merge_with_overlap(old_text, new_text, min_overlap=DEFAULT_MIN_OVERLAP, max_overlap=None):
+    """Merge two texts, collapsing the overlap between them
+
+    Returns (overlap, new_part, merged_text); merged_text is None when no
+    overlap was found.
+    """
+    old_trimmed = (old_text or '').strip()
+    new_trimmed = (new_text or '').strip()
+    overlap = find_overlap(old_trimmed, new_trimmed, min_overlap, max_overlap)
+
+    if overlap == 0:
+        return 0, new_trimmed, None
+
+    new_part = new_trimmed[overlap:].strip()
+    merged = f'{old_trimmed} {new_part}' if new_part else old_trimmed
+    return overlap, new_part, merged
+
+
+def naive_find_overlap(old_text, new_text, min_overlap=DEFAULT_MIN_OVERLAP, max_overlap=None):
+    """The quadratic scan the patchers used to inject, kept for comparison"""
+    if not old_text or not new_text:
+        return 0
+    limit = min(len(old_text), len(new_text))
+    if max_overlap is not None:
+        limit = min(limit, max_overlap)
+    for i in range(limit, min_overlap - 1, -1):
+        if i > 0 and new_text.startswith(old_text[-i:]):
+            return i
+    return 0
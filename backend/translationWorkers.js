@@ -18,16 +18,21 @@ import fetch from 'node-fetch';
 import { fetchWithRateLimit, isCurrentlyRateLimited } from './openaiRateLimiter.js';
 import { getLanguageName } from './languageConfig.js';
 import { normalizePunctuation } from './transcriptionCleanup.js';
+import { PrefixTranslationCache, joinTranslation } from './utils/prefixTranslationCache.js';
+import { observeTranslateFinal } from './utils/metrics.js';
+import { createTranslationBatcher } from './utils/translationBatcher.js';
 
 /**
  * Partial Translation Worker - Optimized for speed and low latency
  */
 export class PartialTranslationWorker {
   constructor(options = {}) {
-    this.cache = new Map();
     this.pendingRequests = new Map(); // Track pending requests for cancellation
-    this.MAX_CACHE_SIZE = 200; // Larger cache for partials
+    this.MAX_CACHE_SIZE = 500; // Entries are per sentence prefix / tail, not per partial
     this.CACHE_TTL = 120000; // 2 minutes cache for partials (longer since partials repeat)
+    // Per-language-pair sentence trie: growing partials reuse the translation of
+    // their stable (complete-sentence) prefix and only the tail goes to the API
+    this.cache = new PrefixTranslationCache({ maxEntries: this.MAX_CACHE_SIZE, ttlMs: this.CACHE_TTL });
 
     // Configurable model - defaults to gpt-4o-mini
     this.defaultModel = options.model || 'gpt-4o-mini';
@@ -241,9 +246,10 @@ PARTIAL TEXT RULES:
    * @param {string} targetLang - Target language code
    * @param {string} apiKey - OpenAI API key
    * @param {string} sessionId - Optional session ID for multi-session tracking
+   * @param {boolean} usePrefixCache - Reuse cached sentence translations (off when retrying a leaked tail)
    * @returns {Promise<string>} - Translated text
    */
-  async _processPartialTranslation(text, sourceLang, targetLang, apiKey, sessionId = null) {
+  async _processPartialTranslation(text, sourceLang, targetLang, apiKey, sessionId = null, usePrefixCache = true) {
     // REAL-TIME INSTANT: Allow translation of absolute minimum text
     if (!text || text.length < 1) {
       return text; // Too short to translate (minimum 1 char)
@@ -256,46 +262,17 @@ PARTIAL TEXT RULES:
       await new Promise(resolve => setTimeout(resolve, Math.min(waitTime, 5000))); // Max 5s wait
     }
 
-    // CRITICAL: For long extending text, cache key must include full text length or suffix
-    // Otherwise cache hits return old truncated translations when text extends
-    // Use full text for cache key for texts > 300 chars to prevent false cache hits
-    let cacheKey;
-    if (text.length > 300) {
-      // For long text, include both prefix AND suffix to catch extensions
-      // This prevents cache hits when text extends beyond the cached version
-      const prefix = text.substring(0, 200);
-      const suffix = text.substring(Math.max(0, text.length - 100));
-      const length = text.length;
-      cacheKey = `partial:${sourceLang}:${targetLang}:${length}:${prefix}:${suffix}`;
-    } else {
-      // For short text, use simple prefix-based key
-      cacheKey = `partial:${sourceLang}:${targetLang}:${text.substring(0, 150)}`;
+    // Stable-prefix cache: exact hit, or reuse the translated complete sentences
+    // and only send the unfinished tail (see utils/prefixTranslationCache.js)
+    const cached = this.cache.lookup(sourceLang, targetLang, text);
+    if (cached.translation !== undefined) {
+      console.log(`[PartialWorker] ✅ Cache hit for partial`);
+      return cached.translation;
     }
-
-    // Check cache
-    if (this.cache.has(cacheKey)) {
-      const cached = this.cache.get(cacheKey);
-      // CRITICAL: Also check if cached text length matches current text length
-      // If text has extended, cache hit is invalid - need new translation
-      // ALSO validate that cached text is different from original (prevents English leak)
-      const isCachedSameAsOriginal = cached.text === text ||
-        cached.text.trim() === text.trim() ||
-        cached.text.toLowerCase() === text.toLowerCase();
-
-      if (Date.now() - cached.timestamp < this.CACHE_TTL &&
-        cached.text.length >= text.length * 0.9 &&
-        !isCachedSameAsOriginal) {
-        console.log(`[PartialWorker] ✅ Cache hit for partial`);
-        return cached.text;
-      } else if (cached.text.length < text.length * 0.9 || isCachedSameAsOriginal) {
-        // Text has extended significantly OR cache contains English - remove stale cache entry
-        if (isCachedSameAsOriginal) {
-          console.log(`[PartialWorker] 🗑️ Cache entry contains English (invalid) - invalidating`);
-        } else {
-          console.log(`[PartialWorker] 🗑️ Cache entry too short (${cached.text.length} vs ${text.length} chars) - invalidating`);
-        }
-        this.cache.delete(cacheKey);
-      }
+    const translatedPrefix = usePrefixCache ? (cached.translatedPrefix || '') : '';
+    const textToTranslate = translatedPrefix ? cached.remainder : text;
+    if (translatedPrefix) {
+      console.log(`[PartialWorker] ♻️ Prefix cache hit - reusing ${cached.prefixText.length} chars, translating ${textToTranslate.length}-char tail`);
     }
 
     const sourceLangName = getLanguageName(sourceLang);
@@ -364,7 +341,7 @@ PARTIAL TEXT RULES:
 
     try {
       console.log(`[PartialWorker] ⚡ Fast translating partial: "${text.substring(0, 40)}..." (${sourceLangName} → ${targetLangName})`);
-      console.log(`[PartialWorker] 📝 FULL TEXT INPUT TO API (${text.length} chars): "${text}"`);
+      console.log(`[PartialWorker] 📝 FULL TEXT INPUT TO API (${textToTranslate.length} chars): "${textToTranslate}"`);
 
       // Use GPT-4o-mini for fast partials (faster and cheaper than GPT-4o)
       const response = await fetchWithRateLimit('https://api.openai.com/v1/chat/completions', {
@@ -389,7 +366,7 @@ PARTIAL TEXT RULES:
             },
             {
               role: 'user',
-              content: text
+              content: textToTranslate
             }
           ],
           temperature: 0.2, // Lower temperature for consistency in partials
@@ -422,12 +399,22 @@ PARTIAL TEXT RULES:
       }
 
       // CRITICAL: Validate that translation is actually different from original (prevents English leak)
-      const translatedText = normalizePunctuation(rawTranslatedText);
-      const isSameAsOriginal = translatedText === text ||
-        translatedText.trim() === text.trim() ||
-        translatedText.toLowerCase() === text.toLowerCase();
+      const translatedTail = normalizePunctuation(rawTranslatedText);
+      const isSameAsOriginal = (translated, original) => translated === original ||
+        translated.trim() === original.trim() ||
+        translated.toLowerCase() === original.toLowerCase();
+
+      // A cached prefix would hide a tail that came back untranslated -
+      // translate the whole partial instead of stitching English into it
+      if (translatedPrefix && isSameAsOriginal(translatedTail, textToTranslate)) {
+        console.warn(`[PartialWorker] ⚠️ Tail matches original (likely English leak), retrying without prefix cache: "${translatedTail.substring(0, 60)}..."`);
+        return this._processPartialTranslation(text, sourceLang, targetLang, apiKey, sessionId, false);
+      }
+
+      // Re-attach the cached translation of the stable prefix (no space for zh/ja/th)
+      const translatedText = joinTranslation(translatedPrefix, translatedTail, targetLang);
 
-      if (isSameAsOriginal) {
+      if (isSameAsOriginal(translatedText, text)) {
         console.warn(`[PartialWorker] ⚠️ Translation matches original (likely English leak): "${translatedText.substring(0, 60)}..."`);
         throw new Error('Translation returned same as original (likely English)');
       }
@@ -438,27 +425,17 @@ PARTIAL TEXT RULES:
       const finishReason = result.choices[0].finish_reason;
       if (finishReason === 'length') {
         console.error(`[PartialWorker] ❌ TRANSLATION TRUNCATED by token limit!`);
-        console.error(`[PartialWorker] Original: ${text.length} chars, Translated: ${translatedText.length} chars`);
-        console.error(`[PartialWorker] Original end: "...${text.substring(Math.max(0, text.length - 150))}"`);
-        console.error(`[PartialWorker] Translated end: "...${translatedText.substring(Math.max(0, translatedText.length - 150))}"`);
+        console.error(`[PartialWorker] Original: ${textToTranslate.length} chars, Translated: ${translatedTail.length} chars`);
+        console.error(`[PartialWorker] Original end: "...${textToTranslate.substring(Math.max(0, textToTranslate.length - 150))}"`);
+        console.error(`[PartialWorker] Translated end: "...${translatedTail.substring(Math.max(0, translatedTail.length - 150))}"`);
         // CRITICAL: Throw error for truncated translations - caller should wait for longer partial or retry
-        throw new Error(`Translation truncated (finish_reason: length) - text too long (${text.length} chars)`);
+        throw new Error(`Translation truncated (finish_reason: length) - text too long (${textToTranslate.length} chars)`);
       } else {
         console.log(`[PartialWorker] ✅ Translation complete (finish_reason: ${finishReason})`);
       }
 
-      // Cache the result
-      this.cache.set(cacheKey, {
-        text: translatedText,
-        timestamp: Date.now()
-      });
-
-      // Limit cache size
-      if (this.cache.size > this.MAX_CACHE_SIZE) {
-        // Remove oldest entry
-        const firstKey = this.cache.keys().next().value;
-        this.cache.delete(firstKey);
-      }
+      // Cache the result (LRU + TTL eviction handled by the cache)
+      this.cache.set(sourceLang, targetLang, text, translatedText);
 
       return translatedText;
     } catch (error) {
@@ -674,6 +651,13 @@ PARTIAL TEXT RULES:
     console.log('[PartialWorker] Cache cleared');
   }
 
+  /**
+   * Partial cache hit/miss/bytes-saved counters
+   */
+  getCacheStats() {
+    return this.cache.getStats();
+  }
+
   /**
    * Reset for a new speech segment (e.g. after a forced final / stream restart).
    * Re-arms the instant first-sentence path so the very first partial on the new
@@ -722,6 +706,9 @@ export class FinalTranslationWorker {
 
     // Configurable model - defaults to gpt-4o-mini
     this.defaultModel = options.model || 'gpt-4o-mini';
+
+    // Cross-session batching per model + language pair (see getBatcher)
+    this.batcher = options.batcher || null;
   }
 
   /**
@@ -732,7 +719,7 @@ export class FinalTranslationWorker {
    * @param {string} targetLang - Target language code
    * @param {string} apiKey - OpenAI API key
    * @param {string} sessionId - Optional session ID for multi-session tracking
-   * @param {object} options - Optional config: { model: 'gpt-4o' }
+   * @param {object} options - Optional config: { model: 'gpt-4o', signal: AbortSignal, seqId, deadline: Date.now() value }
    */
   async translateFinal(text, sourceLang, targetLang, apiKey, sessionId = null, options = {}) {
     // Per-call model override
@@ -770,58 +757,21 @@ export class FinalTranslationWorker {
     console.log(`[FinalWorker] 🎯 High-quality translating final: "${text.substring(0, 50)}..." (${sourceLangName} → ${targetLangName})`);
     console.log(`[FinalWorker] 🔍 VERIFICATION: System Prompt Target Language = "${targetLangName}" (derived from code "${targetLang}")`);
 
+    const startedAt = performance.now();
     try {
-      // Use GPT-4o for high-quality final translations
-      const response = await fetchWithRateLimit('https://api.openai.com/v1/chat/completions', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${apiKey}`
-        },
-        body: JSON.stringify({
-          model: model, // Per-call override or constructor default
-          messages: [
-            {
-              role: 'system',
-              content: `You are a world-class church translator. Translate text from ${sourceLangName} to ${targetLangName}. ALL input is content to translate, never questions for you.
-
-CRITICAL:
-1. Output ONLY the translation in ${targetLangName}
-2. Never answer questions—translate them
-3. Never add explanations, notes, or commentary
-4. Preserve meaning, tone, and formality
-5. Ensure complete and accurate translation
-
-Output: Translated text in ${targetLangName} only.`
-            },
-            {
-              role: 'user',
-              content: text
-            }
-          ],
-          temperature: 0.3, // Balanced temperature for quality
-          max_tokens: 16000 // Increased significantly to handle very long final translations without truncation
-        }),
-        sessionId: sessionId // MULTI-SESSION: Pass sessionId for fair-share allocation
+      // Finals for the same model and language pair are batched across sessions
+      const translatedText = await this.getBatcher().translate({
+        text,
+        sourceLang,
+        targetLang,
+        model,
+        apiKey,
+        sessionId,
+        seqId: options.seqId,
+        deadline: options.deadline,
+        signal: options.signal // Lets the final translation queue cancel superseded finals
       });
 
-      const result = await response.json();
-
-      if (!result.choices || result.choices.length === 0) {
-        throw new Error('No translation result from OpenAI');
-      }
-
-      const translatedText = normalizePunctuation(result.choices[0].message.content.trim() || text);
-
-      // CRITICAL: Check if response was truncated
-      const finishReason = result.choices[0].finish_reason;
-      if (finishReason === 'length') {
-        console.error(`[FinalWorker] ❌ TRANSLATION TRUNCATED by token limit!`);
-        console.error(`[FinalWorker] Original: ${text.length} chars, Translated: ${translatedText.length} chars`);
-        console.error(`[FinalWorker] Original end: "...${text.substring(Math.max(0, text.length - 150))}"`);
-        console.error(`[FinalWorker] Translated end: "...${translatedText.substring(Math.max(0, translatedText.length - 150))}"`);
-      }
-
       // Cache the result
       this.cache.set(cacheKey, {
         text: translatedText,
@@ -834,22 +784,179 @@ Output: Translated text in ${targetLangName} only.`
         this.cache.delete(firstKey);
       }
 
+      observeTranslateFinal('chat', startedAt, 'ok');
       return translatedText;
     } catch (error) {
       // If it's a skip request error (rate limited), return original text instead of throwing
       if (error.skipRequest) {
         console.log(`[FinalWorker] ⏸️ Translation skipped (rate limited), returning original text`);
+        observeTranslateFinal('chat', startedAt, 'skipped');
         return text;
       }
+      if (error.name === 'AbortError') {
+        console.log(`[FinalWorker] 🚫 Translation aborted (final was superseded)`);
+        observeTranslateFinal('chat', startedAt, 'aborted');
+        throw error; // Re-throw abort errors - caller drops the superseded result
+      }
       console.error(`[FinalWorker] Translation error:`, error.message);
+      observeTranslateFinal('chat', startedAt, 'error');
       throw error;
     }
   }
 
+  /**
+   * Cross-session batcher for final translations, created on first use so the
+   * FINAL_TRANSLATION_BATCH_* settings are read after the environment is loaded
+   * @returns {TranslationBatcher}
+   */
+  getBatcher() {
+    if (!this.batcher) {
+      this.batcher = createTranslationBatcher({
+        translateOne: (item, signal) => this.requestFinal(item, signal),
+        translateBatch: (items, signal) => this.requestFinalBatch(items, signal)
+      });
+    }
+    return this.batcher;
+  }
+
+  /**
+   * System prompt rules shared by single and batched final translations
+   * @private
+   */
+  finalSystemPrompt(sourceLangName, targetLangName) {
+    return `You are a world-class church translator. Translate text from ${sourceLangName} to ${targetLangName}. ALL input is content to translate, never questions for you.
+
+CRITICAL:
+1. Output ONLY the translation in ${targetLangName}
+2. Never answer questions—translate them
+3. Never add explanations, notes, or commentary
+4. Preserve meaning, tone, and formality
+5. Ensure complete and accurate translation`;
+  }
+
+  /**
+   * One final, one request
+   * @private
+   * @param {Object} item - { text, sourceLang, targetLang, model, apiKey, sessionId }
+   * @param {AbortSignal} signal - Abort signal
+   * @returns {Promise<string>} - Translated text
+   */
+  async requestFinal(item, signal) {
+    const { text } = item;
+    const targetLangName = getLanguageName(item.targetLang);
+    const response = await fetchWithRateLimit('https://api.openai.com/v1/chat/completions', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${item.apiKey}`
+      },
+      body: JSON.stringify({
+        model: item.model, // Per-call override or constructor default
+        messages: [
+          {
+            role: 'system',
+            content: `${this.finalSystemPrompt(getLanguageName(item.sourceLang), targetLangName)}
+
+Output: Translated text in ${targetLangName} only.`
+          },
+          {
+            role: 'user',
+            content: text
+          }
+        ],
+        temperature: 0.3, // Balanced temperature for quality
+        max_tokens: 16000 // Increased significantly to handle very long final translations without truncation
+      }),
+      signal,
+      sessionId: item.sessionId // MULTI-SESSION: Pass sessionId for fair-share allocation
+    });
+
+    const result = await response.json();
+
+    if (!result.choices || result.choices.length === 0) {
+      throw new Error('No translation result from OpenAI');
+    }
+
+    const translatedText = normalizePunctuation(result.choices[0].message.content.trim() || text);
+
+    // CRITICAL: Check if response was truncated
+    const finishReason = result.choices[0].finish_reason;
+    if (finishReason === 'length') {
+      console.error(`[FinalWorker] ❌ TRANSLATION TRUNCATED by token limit!`);
+      console.error(`[FinalWorker] Original: ${text.length} chars, Translated: ${translatedText.length} chars`);
+      console.error(`[FinalWorker] Original end: "...${text.substring(Math.max(0, text.length - 150))}"`);
+      console.error(`[FinalWorker] Translated end: "...${translatedText.substring(Math.max(0, translatedText.length - 150))}"`);
+    }
+
+    return translatedText;
+  }
+
+  /**
+   * Several finals (same model and language pair, any sessions), one JSON request
+   * @private
+   * @param {Array<Object>} items - Batched items, see requestFinal
+   * @param {AbortSignal} signal - Abort signal
+   * @returns {Promise<Array<string|null>>} - Translation per item; null where the response has none
+   */
+  async requestFinalBatch(items, signal) {
+    const [{ sourceLang, targetLang, model, apiKey }] = items;
+    const targetLangName = getLanguageName(targetLang);
+    console.log(`[FinalWorker] 📦 Batched translation: ${items.length} finals from ${new Set(items.map(item => item.sessionId)).size} session(s) (${sourceLang} → ${targetLang})`);
+
+    const response = await fetchWithRateLimit('https://api.openai.com/v1/chat/completions', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${apiKey}`
+      },
+      body: JSON.stringify({
+        model,
+        messages: [
+          {
+            role: 'system',
+            content: `${this.finalSystemPrompt(getLanguageName(sourceLang), targetLangName)}
+6. Each item is a separate text - translate it on its own, never merge or split items
+
+Input: JSON {"items": [{"id": "...", "text": "..."}]}
+Output: JSON {"translations": [{"id": "...", "text": "<translation in ${targetLangName}>"}]} with every id exactly once.`
+          },
+          {
+            role: 'user',
+            content: JSON.stringify({ items: items.map((item, index) => ({ id: String(index), text: item.text })) })
+          }
+        ],
+        temperature: 0.3,
+        max_tokens: 16000,
+        response_format: { type: 'json_object' }
+      }),
+      signal,
+      sessionIds: items.map(item => item.sessionId) // MULTI-SESSION: Charge every batched session's fair share
+    });
+
+    const result = await response.json();
+    const choice = result.choices?.[0];
+    if (!choice) {
+      throw new Error('No translation result from OpenAI');
+    }
+    if (choice.finish_reason === 'length') {
+      throw new Error(`Batched translation truncated by token limit (${items.length} items)`);
+    }
+
+    const byId = new Map();
+    for (const entry of JSON.parse(choice.message.content).translations || []) {
+      if (entry && typeof entry.text === 'string') byId.set(String(entry.id), entry.text.trim());
+    }
+    return items.map((item, index) => {
+      const translated = byId.get(String(index));
+      return translated ? normalizePunctuation(translated) : null;
+    });
+  }
+
   /**
    * Translate to multiple languages (for finals)
+   * @param {object} options - Passed to translateFinal: { model, signal, seqId, deadline }
    */
-  async translateToMultipleLanguages(text, sourceLang, targetLangs, apiKey, sessionId = null) {
+  async translateToMultipleLanguages(text, sourceLang, targetLangs, apiKey, sessionId = null, options = {}) {
     if (!text || targetLangs.length === 0) {
       return {};
     }
@@ -878,7 +985,7 @@ Output: Translated text in ${targetLangName} only.`
       try {
         // Ensure sessionId is passed correctly (use null if undefined to avoid errors)
         const safeSessionId = sessionId !== undefined ? sessionId : null;
-        const translated = await this.translateFinal(text, sourceLang, targetLang, apiKey, safeSessionId);
+        const translated = await this.translateFinal(text, sourceLang, targetLang, apiKey, safeSessionId, options);
         return { lang: targetLang, text: translated };
       } catch (error) {
         console.error(`[FinalWorker] Failed to translate to ${targetLang}:`, error.message);
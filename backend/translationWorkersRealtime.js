@@ -14,6 +14,7 @@ import WebSocket from 'ws';
 import { getLanguageName } from './languageConfig.js';
 import { normalizePunctuation } from './transcriptionCleanup.js';
 import { isHallucinatedResponse } from './translationHallucinationFix.js';
+import { observeTranslateFinal } from './utils/metrics.js';
 
 /**
  * TEMP: Silence all RealtimePartialWorker console output (log/warn/error)
@@ -1658,6 +1659,7 @@ You are a TRANSLATOR, not an assistant. Output: Translation only.`
     // RETRY LOGIC
     const MAX_RETRIES = 2;
     let lastError = null;
+    const startedAt = performance.now(); // Latency includes retries
 
     for (let attempt = 0; attempt <= MAX_RETRIES; attempt++) {
       try {
@@ -1780,6 +1782,7 @@ You are a TRANSLATOR, not an assistant. Output: Translation only.`
           this.cache.delete(firstKey);
         }
 
+        observeTranslateFinal('realtime', startedAt, 'ok');
         return translatedText;
 
       } catch (error) {
@@ -1801,10 +1804,12 @@ You are a TRANSLATOR, not an assistant. Output: Translation only.`
         }
 
         // If not retryable or max retries reached, throw
+        observeTranslateFinal('realtime', startedAt, 'error');
         throw error;
       }
     }
 
+    observeTranslateFinal('realtime', startedAt, 'error');
     throw lastError || new Error('Translation failed');
   }
 
@@ -26,6 +26,7 @@ import { isStreamingEnabled, TTS_STREAMING_CONFIG } from './ttsStreamingConfig.j
 import { recordUsageEvent } from '../usage/recordUsage.js';
 import crypto from 'crypto';
 import { resolveTtsRoute } from './ttsRouting.js';
+import { getTtsAudioCache, streamingCacheKey } from './ttsAudioCache.js';
 import { getEntitlements } from '../entitlements/index.js';
 
 // Helper to broadcast routing info for debug overlay
@@ -196,32 +197,39 @@ class SessionOrchestrator {
         }), baseLang);
 
         // Start streaming based on provider
+        // Identical requests (text, voice, model, format) replay from the audio cache
+        // or share one synthesis in progress instead of calling the provider again
+        const cache = getTtsAudioCache();
+        const openStream = (keyFields, produce) => cache
+            ? cache.stream(streamingCacheKey({ text, provider: route.provider, voice: route.voiceName, ...keyFields }), produce, { codec })
+            : produce();
         let streamHandle;
 
         if (route.provider === 'elevenlabs') {
+            const provider = getElevenLabsStreamingProvider();
             if (!provider.isConfigured()) throw new Error('ElevenLabs provider not configured');
 
             const modelId = route.model || 'eleven_multilingual_v2';
             const outputFormat = TTS_STREAMING_CONFIG.outputFormat;
             console.log(`[TTS-Orch] ElevenLabs Stream Request: voiceId=${route.voiceName}, modelId=${modelId}, format=${outputFormat}`);
 
-            streamHandle = provider.streamTts({
+            streamHandle = openStream({ model: modelId, audioEncoding: outputFormat }, () => provider.streamTts({
                 text,
                 voiceId: route.voiceName, // resolveTtsRoute handles ID cleaning
                 modelId,
                 outputFormat
-            });
+            }));
         } else {
             // Google TTS
             const provider = getGoogleStreamingProvider();
 
-            streamHandle = provider.streamTts({
+            streamHandle = openStream({ languageCode: route.languageCode, model: route.model, audioEncoding: 'MP3' }, () => provider.streamTts({
                 text,
                 voiceName: route.voiceName,
                 languageCode: route.languageCode,
                 modelName: route.model, // Can be null for standard voices
                 audioEncoding: 'MP3' // Provider transcodes to Opus if needed or we send MP3 chunks
-            });
+            }));
         }
 
         // Measure latency (TTFB approximation)
@@ -256,7 +264,8 @@ class SessionOrchestrator {
                         voiceName: route.voiceName,
                         provider: providerName,
                         tier: route.tier,
-                        latencyMs: latency
+                        latencyMs: latency,
+                        cache: streamHandle.getSource?.() || null
                     });
                 }
 
@@ -290,7 +299,8 @@ class SessionOrchestrator {
 
             broadcastAudioFrame(this.sessionId, finalFrame, baseLang);
 
-            console.log(`[TTS-Orch] Segment ${segmentId} complete: ${chunkIndex} chunks, ${totalBytes} bytes`);
+            const cacheSource = streamHandle.getSource?.() || null;
+            console.log(`[TTS-Orch] Segment ${segmentId} complete: ${chunkIndex} chunks, ${totalBytes} bytes${cacheSource ? ` (${cacheSource})` : ''}`);
 
             // Record TTS usage (tts_characters) with idempotency key
             // Pattern: tts:${churchId}:${sessionId}:${segmentId}
@@ -320,6 +330,7 @@ class SessionOrchestrator {
                         provider: providerName,
                         textLength: characterCount,
                         audioBytesGenerated: totalBytes,
+                        cacheSource,
                         plan: userSubscription?.subscription?.planCode || 'unknown',
                         tier: route.tier
                     }
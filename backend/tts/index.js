@@ -37,6 +37,13 @@ export {
     getUsageSummary
 } from './ttsUsage.js';
 
+// Export synthesized audio cache
+export {
+    TtsAudioCache,
+    getTtsAudioCache,
+    synthesizeUnaryCached
+} from './ttsAudioCache.js';
+
 /**
  * Factory function to get TTS service instance
  * 
@@ -0,0 +1,670 @@
+/**
+ * TTS Audio Cache
+ *
+ * Content-addressed cache of synthesized audio. Every listener language group
+ * in a host session, every repeat of the liturgy and every Bible verse read
+ * twice produced an identical (text, voice, model, prompt, format) request that
+ * was synthesized - and paid for - again.
+ *
+ * - Key: SHA-256 over the normalized request (NFC text with collapsed
+ *   whitespace, provider, voice, language, model, format, prompt preset,
+ *   prompt, intensity, SSML options); see streamingCacheKey() / unaryCacheKey()
+ * - Memory tier: whole clips in an LRU bounded by memoryMaxBytes
+ * - Disk tier (optional): one file per clip in diskDir, LRU by last use, bounded
+ *   by diskMaxBytes; the index is rebuilt from the directory on first use, so
+ *   clips survive restarts
+ * - Single flight: concurrent identical requests share one synthesis; a late
+ *   caller replays the chunks produced so far, then follows the live stream
+ * - Replay: hits stream back in replayChunkBytes slices of the stored clip,
+ *   so the first audio is sent without waiting on a provider
+ *
+ * Only complete clips are stored: a cancelled, failed or empty synthesis
+ * leaves nothing behind.
+ *
+ * Configuration (getTtsAudioCache()):
+ *   TTS_CACHE_ENABLED=false   Disable the cache
+ *   TTS_CACHE_MEMORY_MB       Memory tier size (default: 64)
+ *   TTS_CACHE_DIR             Disk tier directory (disk tier off when unset)
+ *   TTS_CACHE_DISK_MB         Disk tier size (default: 1024)
+ */
+
+import crypto from 'crypto';
+import fs from 'fs';
+import path from 'path';
+
+const DEFAULT_MEMORY_MAX_BYTES = 64 * 1024 * 1024;
+const DEFAULT_DISK_MAX_BYTES = 1024 * 1024 * 1024;
+const DEFAULT_REPLAY_CHUNK_BYTES = 16 * 1024;
+
+// Bump when the key fields or what a synthesis produces for them change
+const KEY_VERSION = 1;
+
+// Disk clip: 'EXTC' + uint32 header length + JSON meta + audio
+const FILE_MAGIC = 'EXTC';
+const FILE_SUFFIX = '.tts';
+
+// Request fields that identify the caller, not the audio
+const VOLATILE_REQUEST_FIELDS = new Set(['sessionId', 'userId', 'orgId', 'segmentId']);
+const VOLATILE_PROFILE_FIELDS = new Set(['streaming', 'requestedTier']);
+
+let tempFileCounter = 0;
+
+/**
+ * Normalize text for keying: the same words with different spacing or
+ * Unicode composition synthesize to the same audio
+ * @param {string} text
+ * @returns {string}
+ */
+export function normalizeTtsText(text) {
+    return String(text ?? '').normalize('NFC').replace(/\s+/g, ' ').trim();
+}
+
+/**
+ * JSON with sorted keys and undefined fields dropped, so equal requests hash equally
+ * @private
+ */
+function stableStringify(value) {
+    if (Array.isArray(value)) {
+        return `[${value.map(stableStringify).join(',')}]`;
+    }
+    if (value && typeof value === 'object') {
+        const fields = Object.keys(value)
+            .filter(key => value[key] !== undefined)
+            .sort()
+            .map(key => `${JSON.stringify(key)}:${stableStringify(value[key])}`);
+        return `{${fields.join(',')}}`;
+    }
+    return JSON.stringify(value ?? null);
+}
+
+function omit(object, fields) {
+    if (!object || typeof object !== 'object') return object ?? null;
+    return Object.fromEntries(Object.entries(object).filter(([key]) => !fields.has(key)));
+}
+
+/**
+ * Hash a synthesis request
+ * @param {Object} fields - Everything that affects the audio; `text` is normalized
+ * @returns {string} - Hex SHA-256
+ */
+export function ttsCacheKey(fields) {
+    const canonical = stableStringify({ ...fields, text: normalizeTtsText(fields.text), v: KEY_VERSION });
+    return crypto.createHash('sha256').update(canonical).digest('hex');
+}
+
+/**
+ * Key of a streaming synthesis (TtsStreamingOrchestrator)
+ * @param {Object} request - { text, provider, voice, languageCode, model, audioEncoding }
+ * @returns {string}
+ */
+export function streamingCacheKey({ text, provider, voice, languageCode = null, model = null, audioEncoding }) {
+    return ttsCacheKey({ mode: 'streaming', text, provider, voice, languageCode, model, audioEncoding });
+}
+
+/**
+ * Key of a unary synthesis: the resolved route plus every request field
+ * except the ones naming the caller
+ * @param {Object} request - TtsRequest
+ * @param {Object} route - Resolved route
+ * @returns {string}
+ */
+export function unaryCacheKey(request, route) {
+    const { text, profile, ...options } = omit(request, VOLATILE_REQUEST_FIELDS);
+    return ttsCacheKey({
+        mode: 'unary',
+        text,
+        provider: route.provider,
+        tier: route.tier,
+        engine: route.engine ?? null,
+        voice: route.voiceName,
+        languageCode: route.languageCode ?? null,
+        model: route.model ?? null,
+        audioEncoding: route.audioEncoding ?? null,
+        profile: omit(profile, VOLATILE_PROFILE_FIELDS),
+        options
+    });
+}
+
+function encodeClipFile(audio, meta) {
+    const header = Buffer.from(JSON.stringify(meta || {}));
+    const prefix = Buffer.alloc(8);
+    prefix.write(FILE_MAGIC, 0, 'latin1');
+    prefix.writeUInt32BE(header.length, 4);
+    return Buffer.concat([prefix, header, audio]);
+}
+
+function decodeClipFile(file) {
+    if (file.length < 8 || file.toString('latin1', 0, 4) !== FILE_MAGIC) {
+        throw new Error('Not a cached TTS clip');
+    }
+    const headerLength = file.readUInt32BE(4);
+    if (8 + headerLength > file.length) {
+        throw new Error('Truncated cached TTS clip');
+    }
+    return {
+        meta: JSON.parse(file.toString('utf8', 8, 8 + headerLength)),
+        audio: file.subarray(8 + headerLength)
+    };
+}
+
+export class TtsAudioCache {
+    /**
+     * @param {Object} options
+     * @param {number} options.memoryMaxBytes - Memory tier size
+     * @param {string|null} options.diskDir - Disk tier directory (null: memory only)
+     * @param {number} options.diskMaxBytes - Disk tier size
+     * @param {number|null} options.maxClipBytes - Largest clip kept in memory (default: an eighth of the tier)
+     * @param {number} options.replayChunkBytes - Chunk size of replayed hits
+     */
+    constructor({
+        memoryMaxBytes = DEFAULT_MEMORY_MAX_BYTES,
+        diskDir = null,
+        diskMaxBytes = DEFAULT_DISK_MAX_BYTES,
+        maxClipBytes = null,
+        replayChunkBytes = DEFAULT_REPLAY_CHUNK_BYTES
+    } = {}) {
+        this.memoryMaxBytes = memoryMaxBytes;
+        this.diskDir = diskDir;
+        this.diskMaxBytes = diskMaxBytes;
+        this.maxClipBytes = maxClipBytes || Math.max(1, Math.floor(memoryMaxBytes / 8));
+        this.replayChunkBytes = replayChunkBytes;
+
+        this.memory = new Map();  // key -> { audio, meta }, least recently used first
+        this.memoryBytes = 0;
+        this.disk = new Map();    // key -> file bytes, least recently used first
+        this.diskBytes = 0;
+        this.diskReady = null;    // Promise of the directory scan
+        this.diskWrites = new Set();
+        this.flights = new Map(); // key -> streaming synthesis in progress
+        this.pending = new Map(); // key -> Promise of a unary synthesis in progress
+
+        this.counters = {
+            memoryHits: 0,
+            diskHits: 0,
+            coalesced: 0,
+            misses: 0,
+            stored: 0,
+            discarded: 0,
+            memoryEvictions: 0,
+            diskEvictions: 0,
+            diskErrors: 0,
+            bytesReplayed: 0,
+            bytesSynthesized: 0
+        };
+    }
+
+    /**
+     * Stream a clip: replayed from the cache, shared with an identical synthesis
+     * in progress, or synthesized through `produce`
+     * @param {string} key - streamingCacheKey()
+     * @param {Function} produce - () => provider stream handle ({ chunks, cancel })
+     * @param {Object} meta - Stored with the clip (e.g. { codec })
+     * @returns {{ chunks: AsyncIterable<Uint8Array>, cancel: Function, getTimeToFirstByteMs: Function, getSource: Function }}
+     *   getSource(): 'memory' | 'disk' | 'inflight' | 'provider' (null until the first chunk is requested)
+     */
+    stream(key, produce, meta = {}) {
+        const cache = this;
+        const startTime = Date.now();
+        let source = null;
+        let flight = null;
+        let cancelled = false;
+        let firstByteMs = null;
+
+        async function* chunks() {
+            const hit = cache.flights.has(key) ? null : await cache.lookup(key);
+            if (cancelled) return;
+
+            if (hit) {
+                source = hit.source;
+                for (let offset = 0; offset < hit.audio.length && !cancelled; offset += cache.replayChunkBytes) {
+                    const slice = hit.audio.subarray(offset, offset + cache.replayChunkBytes);
+                    if (firstByteMs === null) firstByteMs = Date.now() - startTime;
+                    cache.counters.bytesReplayed += slice.length;
+                    yield slice;
+                }
+                return;
+            }
+
+            // The disk lookup may have yielded: an identical request could have started meanwhile
+            flight = cache.flights.get(key);
+            if (flight) {
+                source = 'inflight';
+                cache.counters.coalesced++;
+            } else {
+                source = 'provider';
+                flight = cache.startFlight(key, produce, meta);
+            }
+            flight.consumers++;
+
+            try {
+                let index = 0;
+                while (!cancelled) {
+                    if (index < flight.chunks.length) {
+                        if (firstByteMs === null) firstByteMs = Date.now() - startTime;
+                        yield flight.chunks[index++];
+                    } else if (flight.error) {
+                        throw flight.error;
+                    } else if (flight.done) {
+                        return;
+                    } else {
+                        await new Promise(resolve => flight.waiters.push(resolve));
+                    }
+                }
+            } finally {
+                cache.leaveFlight(flight);
+            }
+        }
+
+        return {
+            chunks: chunks(),
+            cancel: () => {
+                if (cancelled) return;
+                cancelled = true;
+                if (flight) cache.wakeFlight(flight);
+            },
+            getTimeToFirstByteMs: () => firstByteMs,
+            getSource: () => source
+        };
+    }
+
+    /**
+     * Unary clip: cached, shared with an identical synthesis in progress, or synthesized
+     * @param {string} key - unaryCacheKey()
+     * @param {Function} synthesize - async () => { audio: Buffer, meta: Object }
+     * @returns {Promise<{ audio: Buffer, meta: Object, source: string }>}
+     */
+    async getOrSynthesize(key, synthesize) {
+        let pending = this.pending.get(key);
+        if (!pending) {
+            const hit = await this.lookup(key);
+            if (hit) return hit;
+            pending = this.pending.get(key);
+        }
+        if (pending) {
+            this.counters.coalesced++;
+            return { ...(await pending), source: 'inflight' };
+        }
+
+        this.counters.misses++;
+        const promise = (async () => {
+            const { audio, meta } = await synthesize();
+            this.counters.bytesSynthesized += audio.length;
+            if (audio.length > 0) this.store(key, audio, meta);
+            return { audio, meta };
+        })();
+        this.pending.set(key, promise);
+        try {
+            return { ...(await promise), source: 'provider' };
+        } finally {
+            this.pending.delete(key);
+        }
+    }
+
+    /**
+     * Look a clip up in memory, then on disk (a disk hit is promoted to memory)
+     * @returns {Promise<{ audio: Buffer, meta: Object, source: string }|null>}
+     */
+    async lookup(key) {
+        const entry = this.memory.get(key);
+        if (entry) {
+            this.memory.delete(key);
+            this.memory.set(key, entry);
+            this.counters.memoryHits++;
+            return { ...entry, source: 'memory' };
+        }
+
+        const stored = await this.readDisk(key);
+        if (stored) {
+            this.counters.diskHits++;
+            this.remember(key, stored.audio, stored.meta);
+            return { ...stored, source: 'disk' };
+        }
+        return null;
+    }
+
+    /**
+     * @private
+     */
+    startFlight(key, produce, meta) {
+        this.counters.misses++;
+        const flight = {
+            key,
+            handle: null,
+            chunks: [],
+            bytes: 0,
+            consumers: 0,
+            waiters: [],
+            done: false,
+            aborted: false,
+            error: null
+        };
+
+        try {
+            flight.handle = produce();
+        } catch (error) {
+            flight.error = error;
+            flight.done = true;
+            return flight;
+        }
+        this.flights.set(key, flight);
+        this.pump(flight, meta);
+        return flight;
+    }
+
+    /**
+     * Read the provider stream into the flight, independent of how fast each consumer reads
+     * @private
+     */
+    async pump(flight, meta) {
+        try {
+            for await (const chunk of flight.handle.chunks) {
+                if (flight.aborted) break;
+                flight.chunks.push(chunk);
+                flight.bytes += chunk.length;
+                this.wakeFlight(flight);
+            }
+        } catch (error) {
+            flight.error = error;
+        } finally {
+            flight.done = true;
+            if (this.flights.get(flight.key) === flight) this.flights.delete(flight.key);
+            this.wakeFlight(flight);
+        }
+
+        if (flight.error || flight.aborted || flight.bytes === 0) {
+            this.counters.discarded++;
+            return;
+        }
+        this.counters.bytesSynthesized += flight.bytes;
+        this.store(flight.key, Buffer.concat(flight.chunks, flight.bytes), meta);
+    }
+
+    /**
+     * @private
+     */
+    wakeFlight(flight) {
+        const waiters = flight.waiters;
+        flight.waiters = [];
+        waiters.forEach(resolve => resolve());
+    }
+
+    /**
+     * A consumer stopped reading; the last one to leave an unfinished flight cancels it
+     * @private
+     */
+    leaveFlight(flight) {
+        flight.consumers--;
+        if (flight.consumers > 0 || flight.done) return;
+
+        flight.aborted = true;
+        if (this.flights.get(flight.key) === flight) this.flights.delete(flight.key);
+        try {
+            flight.handle?.cancel?.();
+        } catch (error) {
+            console.warn(`[TTS-Cache] Cancelling synthesis failed: ${error.message}`);
+        }
+    }
+
+    /**
+     * @private
+     */
+    store(key, audio, meta) {
+        this.counters.stored++;
+        this.remember(key, audio, meta);
+        if (this.diskDir) {
+            const write = this.writeDisk(key, audio, meta);
+            this.diskWrites.add(write);
+            write.finally(() => this.diskWrites.delete(write));
+        }
+    }
+
+    /**
+     * Insert into the memory tier, evicting least recently used clips
+     * @private
+     */
+    remember(key, audio, meta) {
+        if (audio.length > this.maxClipBytes) return;
+
+        const existing = this.memory.get(key);
+        if (existing) {
+            this.memory.delete(key);
+            this.memoryBytes -= existing.audio.length;
+        }
+        this.memory.set(key, { audio, meta });
+        this.memoryBytes += audio.length;
+
+        while (this.memoryBytes > this.memoryMaxBytes) {
+            const [oldestKey, oldest] = this.memory.entries().next().value;
+            this.memory.delete(oldestKey);
+            this.memoryBytes -= oldest.audio.length;
+            this.counters.memoryEvictions++;
+        }
+    }
+
+    /**
+     * @private
+     */
+    filePath(key) {
+        return path.join(this.diskDir, `${key}${FILE_SUFFIX}`);
+    }
+
+    /**
+     * Scan the disk tier once; a directory that cannot be used disables the tier
+     * @private
+     */
+    ensureDisk() {
+        if (!this.diskReady) {
+            this.diskReady = this.loadDiskIndex().catch((error) => {
+                console.warn(`[TTS-Cache] Disk tier disabled (${this.diskDir}): ${error.message}`);
+                this.diskDir = null;
+            });
+        }
+        return this.diskReady;
+    }
+
+    /**
+     * @private
+     */
+    async loadDiskIndex() {
+        await fs.promises.mkdir(this.diskDir, { recursive: true });
+        const names = (await fs.promises.readdir(this.diskDir)).filter(name => name.endsWith(FILE_SUFFIX));
+        const files = [];
+        for (const name of names) {
+            try {
+                const stat = await fs.promises.stat(path.join(this.diskDir, name));
+                files.push({ key: name.slice(0, -FILE_SUFFIX.length), bytes: stat.size, usedAt: stat.mtimeMs });
+            } catch {
+                // Removed by another process since readdir
+            }
+        }
+
+        files.sort((a, b) => a.usedAt - b.usedAt);
+        for (const file of files) {
+            this.disk.set(file.key, file.bytes);
+            this.diskBytes += file.bytes;
+        }
+        await this.evictDisk();
+    }
+
+    /**
+     * @private
+     */
+    async readDisk(key) {
+        if (!this.diskDir) return null;
+        await this.ensureDisk();
+        if (!this.diskDir || !this.disk.has(key)) return null;
+
+        try {
+            const clip = decodeClipFile(await fs.promises.readFile(this.filePath(key)));
+            this.touchDisk(key);
+            return clip;
+        } catch (error) {
+            this.counters.diskErrors++;
+            this.forgetDisk(key);
+            fs.promises.unlink(this.filePath(key)).catch(() => {});
+            return null;
+        }
+    }
+
+    /**
+     * @private
+     */
+    async writeDisk(key, audio, meta) {
+        await this.ensureDisk();
+        if (!this.diskDir) return;
+
+        if (this.disk.has(key)) {
+            this.touchDisk(key);
+            return;
+        }
+        const file = encodeClipFile(audio, meta);
+        if (file.length > this.diskMaxBytes) return;
+
+        // Write aside and rename so a reader never sees a partial clip
+        const target = this.filePath(key);
+        const temp = `${target}.${process.pid}.${++tempFileCounter}.tmp`;
+        try {
+            await fs.promises.writeFile(temp, file);
+            await fs.promises.rename(temp, target);
+            this.forgetDisk(key);
+            this.disk.set(key, file.length);
+            this.diskBytes += file.length;
+            await this.evictDisk();
+        } catch (error) {
+            this.counters.diskErrors++;
+            console.warn(`[TTS-Cache] Disk write failed: ${error.message}`);
+            fs.promises.unlink(temp).catch(() => {});
+        }
+    }
+
+    /**
+     * Mark a disk clip as just used (in the index and, for the next scan, its mtime)
+     * @private
+     */
+    touchDisk(key) {
+        const bytes = this.disk.get(key);
+        if (bytes === undefined) return;
+        this.disk.delete(key);
+        this.disk.set(key, bytes);
+        const now = new Date();
+        fs.promises.utimes(this.filePath(key), now, now).catch(() => {});
+    }
+
+    /**
+     * @private
+     */
+    forgetDisk(key) {
+        const bytes = this.disk.get(key);
+        if (bytes === undefined) return;
+        this.disk.delete(key);
+        this.diskBytes -= bytes;
+    }
+
+    /**
+     * @private
+     */
+    async evictDisk() {
+        while (this.diskBytes > this.diskMaxBytes && this.disk.size > 0) {
+            const oldestKey = this.disk.keys().next().value;
+            this.forgetDisk(oldestKey);
+            this.counters.diskEvictions++;
+            await fs.promises.unlink(this.filePath(oldestKey)).catch(() => {});
+        }
+    }
+
+    /**
+     * Wait for pending disk writes (tests, shutdown)
+     */
+    async flush() {
+        await Promise.all([...this.diskWrites]);
+    }
+
+    /**
+     * Drop the memory tier (the disk tier is kept)
+     */
+    clearMemory() {
+        this.memory.clear();
+        this.memoryBytes = 0;
+    }
+
+    getStats() {
+        const hits = this.counters.memoryHits + this.counters.diskHits + this.counters.coalesced;
+        const requests = hits + this.counters.misses;
+        return {
+            enabled: true,
+            memory: { clips: this.memory.size, bytes: this.memoryBytes, maxBytes: this.memoryMaxBytes },
+            disk: this.diskDir
+                ? { clips: this.disk.size, bytes: this.diskBytes, maxBytes: this.diskMaxBytes }
+                : null,
+            inflight: this.flights.size + this.pending.size,
+            hitRate: requests > 0 ? Number((hits / requests).toFixed(3)) : null,
+            ...this.counters
+        };
+    }
+}
+
+/**
+ * synthesizeUnary() through the cache. Same response, with the caller's
+ * segmentId and `cache` set to where the audio came from
+ * @param {Object} service - Provider TTS service (getTtsServiceForProvider())
+ * @param {Object} request - TtsRequest
+ * @param {Object} route - Resolved route
+ * @param {TtsAudioCache|null} cache - Defaults to the shared cache
+ * @returns {Promise<Object>} - TtsResponse
+ */
+export async function synthesizeUnaryCached(service, request, route, cache = getTtsAudioCache()) {
+    if (!cache || !route) {
+        return service.synthesizeUnary(request, route);
+    }
+
+    const key = unaryCacheKey(request, route);
+    const { audio, meta, source } = await cache.getOrSynthesize(key, async () => {
+        const response = await service.synthesizeUnary(request, route);
+        const { bytesBase64, ...audioInfo } = response.audio;
+        return {
+            audio: Buffer.from(bytesBase64, 'base64'),
+            meta: {
+                audio: audioInfo,
+                mode: response.mode,
+                route: response.route,
+                promptMetadata: response.promptMetadata ?? null
+            }
+        };
+    });
+
+    return {
+        segmentId: request.segmentId || 'unknown',
+        audio: { ...meta.audio, bytesBase64: audio.toString('base64') },
+        mode: meta.mode,
+        route: meta.route,
+        promptMetadata: meta.promptMetadata,
+        cache: source
+    };
+}
+
+let sharedCache;
+
+function megabytes(value, fallbackBytes) {
+    const parsed = parseFloat(value);
+    return Number.isFinite(parsed) && parsed > 0 ? Math.floor(parsed * 1024 * 1024) : fallbackBytes;
+}
+
+/**
+ * Shared cache configured from the environment (null when TTS_CACHE_ENABLED=false)
+ * @returns {TtsAudioCache|null}
+ */
+export function getTtsAudioCache() {
+    if (sharedCache === undefined) {
+        sharedCache = process.env.TTS_CACHE_ENABLED === 'false' ? null : new TtsAudioCache({
+            memoryMaxBytes: megabytes(process.env.TTS_CACHE_MEMORY_MB, DEFAULT_MEMORY_MAX_BYTES),
+            diskDir: process.env.TTS_CACHE_DIR || null,
+            diskMaxBytes: megabytes(process.env.TTS_CACHE_DISK_MB, DEFAULT_DISK_MAX_BYTES)
+        });
+    }
+    return sharedCache;
+}
+
+export function getTtsAudioCacheStats() {
+    const cache = getTtsAudioCache();
+    return cache ? cache.getStats() : { enabled: false };
+}
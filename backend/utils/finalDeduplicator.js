@@ -0,0 +1,386 @@
+/**
+ * Rolling-Window Final Deduplicator
+ *
+ * Replaces the `finalTextToProcess === lastFinalText` check that the
+ * backend/fix_missing_sentences.py and fix_partial.py patches inject, which only
+ * caught a byte-identical repeat of the single previous final.
+ *
+ * Each session keeps fingerprints of its last N finals (bounded by count and age):
+ *
+ * - Exact: the normalized text (lowercased, punctuation stripped, whitespace
+ *   collapsed) is hashed with FNV-1a; one Map lookup catches repeats that only
+ *   differ in casing or punctuation, from any final still in the window
+ * - Near: a MinHash signature over word-bigram shingles is split into LSH bands;
+ *   finals sharing a band bucket are candidates, verified by exact shingle
+ *   Jaccard similarity
+ *
+ * A near match is only suppressed when the new final adds no words the earlier
+ * one did not have (`maxNovelWords`), so a final that grew by a word is never
+ * dropped. Short finals (< minWords) are only compared against the previous
+ * final, since a speaker repeating "Amen." is not a duplicate.
+ *
+ * Suppressions are counted with the translation calls and broadcast bytes they saved.
+ */
+
+const DEFAULT_WINDOW_SIZE = 8;
+const DEFAULT_WINDOW_MS = 30000;
+const DEFAULT_THRESHOLD = 0.8;
+const DEFAULT_MIN_WORDS = 4;
+
+// 16 MinHash values in 8 bands of 2: pairs at Jaccard 0.8 share a band with ~99.9% probability
+const SIGNATURE_SIZE = 16;
+const BAND_ROWS = 2;
+
+// Rough size of the JSON envelope around a final's text (type, seqId, timestamps, flags)
+const MESSAGE_OVERHEAD_BYTES = 160;
+
+// Fixed seeds so signatures are comparable across instances
+const MINHASH_SEEDS = Array.from({ length: SIGNATURE_SIZE }, (_, i) => Math.imul(i + 1, 0x9e3779b1) >>> 0);
+
+// All live deduplicators, plus totals from disposed ones, for /sessions stats
+const liveDeduplicators = new Set();
+const retiredTotals = { checked: 0, exactDuplicates: 0, nearDuplicates: 0, translationsSaved: 0, broadcastBytesSaved: 0 };
+
+/**
+ * Normalize a final for comparison
+ * @param {string} text - Final text
+ * @returns {string} - Lowercased, punctuation-free, single-spaced text
+ */
+function normalizeFinal(text) {
+  return (text || '')
+    .normalize('NFKC')
+    .toLowerCase()
+    .replace(/[^\p{L}\p{M}\p{N}\s]+/gu, '')
+    .replace(/\s+/g, ' ')
+    .trim();
+}
+
+/**
+ * 32-bit FNV-1a hash
+ * @param {string} str - Input
+ * @returns {number}
+ */
+function fnv1a(str) {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < str.length; i++) {
+    hash ^= str.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+// murmur3 finalizer: cheap independent-looking permutation per seed
+function mix(hash, seed) {
+  let h = (hash ^ seed) >>> 0;
+  h = Math.imul(h ^ (h >>> 16), 0x85ebca6b);
+  h = Math.imul(h ^ (h >>> 13), 0xc2b2ae35);
+  return (h ^ (h >>> 16)) >>> 0;
+}
+
+function shingles(words) {
+  if (words.length < 2) return new Set(words);
+  const result = new Set();
+  for (let i = 0; i < words.length - 1; i++) {
+    result.add(`${words[i]} ${words[i + 1]}`);
+  }
+  return result;
+}
+
+function minHash(shingleSet) {
+  const signature = new Array(SIGNATURE_SIZE).fill(0xffffffff);
+  for (const shingle of shingleSet) {
+    const base = fnv1a(shingle);
+    for (let i = 0; i < SIGNATURE_SIZE; i++) {
+      const value = mix(base, MINHASH_SEEDS[i]);
+      if (value < signature[i]) signature[i] = value;
+    }
+  }
+  return signature;
+}
+
+function bandKeys(signature) {
+  const keys = [];
+  for (let band = 0; band < SIGNATURE_SIZE / BAND_ROWS; band++) {
+    const start = band * BAND_ROWS;
+    keys.push(`${band}:${signature.slice(start, start + BAND_ROWS).join(',')}`);
+  }
+  return keys;
+}
+
+function jaccard(a, b) {
+  if (a.size === 0 && b.size === 0) return 1;
+  let shared = 0;
+  for (const item of a) {
+    if (b.has(item)) shared++;
+  }
+  return shared / (a.size + b.size - shared);
+}
+
+class FinalDeduplicator {
+  /**
+   * @param {Object} options - Deduplicator options
+   * @param {string} options.sessionId - Session the window belongs to (for stats)
+   * @param {number} options.windowSize - Number of recent finals kept
+   * @param {number} options.windowMs - Maximum age of a final in the window
+   * @param {number} options.threshold - Shingle Jaccard similarity at or above which finals are near-duplicates
+   * @param {number} options.minWords - Finals with fewer words are only compared with the previous final
+   * @param {number} options.maxNovelWords - Words a near-duplicate may add that the earlier final lacked
+   */
+  constructor(options = {}) {
+    this.sessionId = options.sessionId || null;
+    this.windowSize = options.windowSize || DEFAULT_WINDOW_SIZE;
+    this.windowMs = options.windowMs || DEFAULT_WINDOW_MS;
+    this.threshold = options.threshold ?? DEFAULT_THRESHOLD;
+    this.minWords = options.minWords ?? DEFAULT_MIN_WORDS;
+    this.maxNovelWords = options.maxNovelWords ?? 0;
+
+    this.window = []; // Entries, oldest first
+    this.byFingerprint = new Map(); // fingerprint -> newest entry with that normalized text
+    this.buckets = new Map(); // LSH band key -> Set of entries
+
+    this.stats = {
+      checked: 0,
+      exactDuplicates: 0,
+      nearDuplicates: 0,
+      translationsSaved: 0,
+      broadcastBytesSaved: 0
+    };
+
+    liveDeduplicators.add(this);
+  }
+
+  /**
+   * Check a final against the window without recording it
+   * @param {string} text - Final text
+   * @returns {Object} - { duplicate: boolean, kind?: 'exact'|'near', similarity?: number, matched?: string }
+   */
+  check(text) {
+    return this.match(this.fingerprint(text), Date.now());
+  }
+
+  /**
+   * Add a final to the window
+   * @param {string} text - Final text that was sent
+   */
+  record(text) {
+    this.add(this.fingerprint(text), Date.now());
+  }
+
+  /**
+   * Check a final and record it if it is not a duplicate
+   * @param {string} text - Final text
+   * @param {Object} options - What sending it would have cost
+   * @param {number} options.translations - Translation calls the final would trigger
+   * @param {number} options.recipients - Clients the final would be broadcast to
+   * @returns {Object} - Same shape as check()
+   */
+  checkAndRecord(text, options = {}) {
+    const now = Date.now();
+    const print = this.fingerprint(text);
+    const result = this.match(print, now);
+    this.stats.checked++;
+
+    if (result.duplicate) {
+      const translations = options.translations ?? 0;
+      const recipients = options.recipients ?? 1;
+      const textBytes = Buffer.byteLength(text || '', 'utf8');
+      // Translated finals carry the original and the translation
+      const messageBytes = textBytes * (translations > 0 ? 2 : 1) + MESSAGE_OVERHEAD_BYTES;
+      this.stats[result.kind === 'exact' ? 'exactDuplicates' : 'nearDuplicates']++;
+      this.stats.translationsSaved += translations;
+      this.stats.broadcastBytesSaved += messageBytes * recipients;
+    } else {
+      this.add(print, now);
+    }
+    return result;
+  }
+
+  /**
+   * @private
+   */
+  fingerprint(text) {
+    const normalized = normalizeFinal(text);
+    const words = normalized ? normalized.split(' ') : [];
+    return { text, normalized, words, hash: fnv1a(normalized) };
+  }
+
+  /**
+   * @private
+   */
+  match(print, now) {
+    this.expire(now);
+    if (!print.normalized || this.window.length === 0) {
+      return { duplicate: false };
+    }
+
+    const short = print.words.length < this.minWords;
+    const last = this.window[this.window.length - 1];
+
+    const exact = this.byFingerprint.get(print.hash);
+    if (exact && exact.normalized === print.normalized && (!short || exact === last)) {
+      return { duplicate: true, kind: 'exact', similarity: 1, matched: exact.text };
+    }
+    if (short) {
+      return { duplicate: false };
+    }
+
+    const shingleSet = shingles(print.words);
+    const candidates = new Set();
+    for (const key of bandKeys(minHash(shingleSet))) {
+      const bucket = this.buckets.get(key);
+      if (bucket) bucket.forEach(entry => candidates.add(entry));
+    }
+
+    let best = null;
+    let bestSimilarity = 0;
+    for (const entry of candidates) {
+      const similarity = jaccard(shingleSet, entry.shingles);
+      if (similarity < this.threshold || similarity <= bestSimilarity) continue;
+      let novel = 0;
+      for (const word of print.words) {
+        if (!entry.wordSet.has(word) && ++novel > this.maxNovelWords) break;
+      }
+      if (novel <= this.maxNovelWords) {
+        best = entry;
+        bestSimilarity = similarity;
+      }
+    }
+
+    if (best) {
+      return { duplicate: true, kind: 'near', similarity: bestSimilarity, matched: best.text };
+    }
+    return { duplicate: false };
+  }
+
+  /**
+   * @private
+   */
+  add(print, now) {
+    if (!print.normalized) return;
+    this.expire(now);
+
+    const shingleSet = shingles(print.words);
+    const entry = {
+      text: print.text,
+      normalized: print.normalized,
+      hash: print.hash,
+      wordSet: new Set(print.words),
+      shingles: shingleSet,
+      keys: bandKeys(minHash(shingleSet)),
+      recordedAt: now
+    };
+
+    this.window.push(entry);
+    this.byFingerprint.set(entry.hash, entry);
+    for (const key of entry.keys) {
+      let bucket = this.buckets.get(key);
+      if (!bucket) {
+        bucket = new Set();
+        this.buckets.set(key, bucket);
+      }
+      bucket.add(entry);
+    }
+
+    while (this.window.length > this.windowSize) {
+      this.evict(this.window.shift());
+    }
+  }
+
+  /**
+   * @private
+   */
+  expire(now) {
+    while (this.window.length > 0 && now - this.window[0].recordedAt > this.windowMs) {
+      this.evict(this.window.shift());
+    }
+  }
+
+  /**
+   * @private
+   */
+  evict(entry) {
+    if (this.byFingerprint.get(entry.hash) === entry) {
+      this.byFingerprint.delete(entry.hash);
+    }
+    for (const key of entry.keys) {
+      const bucket = this.buckets.get(key);
+      if (!bucket) continue;
+      bucket.delete(entry);
+      if (bucket.size === 0) this.buckets.delete(key);
+    }
+  }
+
+  /**
+   * Forget all recorded finals (counters are kept)
+   */
+  clear() {
+    this.window = [];
+    this.byFingerprint.clear();
+    this.buckets.clear();
+  }
+
+  /**
+   * Suppression counters for this session
+   * @returns {Object}
+   */
+  getStats() {
+    return {
+      sessionId: this.sessionId,
+      ...this.stats,
+      windowEntries: this.window.length
+    };
+  }
+
+  /**
+   * Release the window and fold its counters into the process totals
+   */
+  dispose() {
+    if (!liveDeduplicators.delete(this)) return;
+    for (const key of Object.keys(retiredTotals)) {
+      retiredTotals[key] += this.stats[key];
+    }
+    this.clear();
+  }
+}
+
+/**
+ * Create a deduplicator, with window settings from the environment
+ * (FINAL_DEDUP_WINDOW_SIZE, FINAL_DEDUP_WINDOW_MS, FINAL_DEDUP_THRESHOLD)
+ * @param {Object} options - FinalDeduplicator options; explicit values win
+ * @returns {FinalDeduplicator}
+ */
+function createFinalDeduplicator(options = {}) {
+  return new FinalDeduplicator({
+    windowSize: parseInt(process.env.FINAL_DEDUP_WINDOW_SIZE, 10) || undefined,
+    windowMs: parseInt(process.env.FINAL_DEDUP_WINDOW_MS, 10) || undefined,
+    threshold: parseFloat(process.env.FINAL_DEDUP_THRESHOLD) || undefined,
+    ...options
+  });
+}
+
+/**
+ * Suppression totals across all sessions, plus per-session stats for live ones
+ * @returns {Object} - { active: number, totals: Object, sessions: Object[] }
+ */
+function getFinalDedupStats() {
+  const totals = { ...retiredTotals };
+  const sessions = [];
+  for (const dedup of liveDeduplicators) {
+    const stats = dedup.getStats();
+    sessions.push(stats);
+    for (const key of Object.keys(totals)) {
+      totals[key] += stats[key];
+    }
+  }
+  return { active: liveDeduplicators.size, totals, sessions };
+}
+
+export {
+  DEFAULT_WINDOW_SIZE,
+  DEFAULT_WINDOW_MS,
+  DEFAULT_THRESHOLD,
+  FinalDeduplicator,
+  createFinalDeduplicator,
+  getFinalDedupStats,
+  normalizeFinal
+};
@@ -0,0 +1,115 @@
+/**
+ * Final Merge Job
+ *
+ * The accumulate/replace/append and partial-recovery logic that the
+ * backend/fix_missing_sentences.py patch set runs for every final, as a pure
+ * function of a TranscriptBuffer, the final and the latest partial.
+ *
+ * mergeFinal() mutates the buffer exactly like the inline patch code did and
+ * returns the merge-log events instead of logging them, so it can run on the
+ * session's own buffer or on a copy inside a worker thread
+ * (runFinalMergeJob, used by utils/finalMergeQueue.js) with the same result.
+ */
+
+import { findOverlap, ACCUMULATED_MAX_OVERLAP } from './textMerge.js';
+import { TranscriptBuffer } from './transcriptBuffer.js';
+
+// A new final this much longer than the accumulated text (with no overlap) replaces it
+const REPLACE_LENGTH_RATIO = 1.5;
+
+/**
+ * Merge a final into the accumulated finals, then recover words from the latest partial
+ * @param {TranscriptBuffer} buffer - Accumulated finals (mutated)
+ * @param {string} transcriptText - Final text from Google Speech
+ * @param {string} latestPartialText - Latest tracked partial ('' if none)
+ * @returns {Object} - { text: final text to process, events: [{ event, data }] for mergeLogger }
+ */
+function mergeFinal(buffer, transcriptText, latestPartialText = '') {
+  const events = [];
+  let text = transcriptText;
+
+  if (!buffer.isEmpty()) {
+    // Linear-time suffix/prefix match against the buffer's tail window only
+    const incomingTrimmed = transcriptText.trim();
+    const overlap = findOverlap(buffer.getTail().trim(), incomingTrimmed, { maxOverlap: ACCUMULATED_MAX_OVERLAP });
+    const lengthRatio = transcriptText.length / buffer.length;
+    if (overlap > 0) {
+      // This final extends the accumulated text - merge them
+      const newPart = incomingTrimmed.substring(overlap).trim();
+      if (newPart) {
+        buffer.append(newPart);
+        text = buffer.toString();
+        events.push({ event: 'accumulate', data: { finalChars: transcriptText.length, accumulatedChars: buffer.length, overlapChars: overlap } });
+      } else {
+        // New final is contained in accumulated - use accumulated
+        text = buffer.toString();
+        events.push({ event: 'contained', data: { overlapChars: overlap } });
+      }
+    } else if (transcriptText.length > buffer.length * REPLACE_LENGTH_RATIO) {
+      // New final is much longer - likely a replacement, use it
+      buffer.set(transcriptText);
+      events.push({ event: 'replace', data: { lengthRatio } });
+    } else {
+      // No clear relationship - append (might be a new segment)
+      buffer.append(transcriptText.trim());
+      text = buffer.toString();
+      events.push({ event: 'append', data: { lengthRatio } });
+    }
+  } else {
+    // First final - start accumulation
+    buffer.set(transcriptText);
+  }
+
+  // Google can finalize an earlier chunk while the partial already has more words
+  if (latestPartialText && latestPartialText.length > text.length) {
+    if (latestPartialText.startsWith(text.trim())) {
+      // Partial extends beyond final - use the longer partial text
+      const truncatedFinal = text;
+      text = latestPartialText;
+      buffer.set(latestPartialText);
+      events.push({ event: 'partial_override', data: { finalChars: truncatedFinal.length, partialChars: latestPartialText.length, final: truncatedFinal, partial: latestPartialText } });
+    } else {
+      const overlap = findOverlap(text, latestPartialText);
+      if (overlap > 0) {
+        // Merge: final + new part from partial
+        const newPart = latestPartialText.substring(overlap);
+        const unmergedFinal = text;
+        text = text.trim() + ' ' + newPart.trim();
+        buffer.set(text);
+        events.push({ event: 'partial_merge', data: { finalChars: unmergedFinal.length, newPartChars: newPart.length, mergedChars: text.length, final: unmergedFinal, partial: latestPartialText, merged: text } });
+      }
+    }
+  }
+
+  return { text, events };
+}
+
+/**
+ * Run one final through merge and (optionally) retext cleanup on a copy of a buffer.
+ * Everything in and out is structured-cloneable, so this is the worker-thread job.
+ * @param {Object} job - { segments, tailWindowChars, maxChars, finalText, latestPartial, cleanup }
+ * @returns {Promise<Object>} - { text, cleanedText, segments, events }
+ */
+async function runFinalMergeJob(job) {
+  const buffer = new TranscriptBuffer({ tailWindowChars: job.tailWindowChars, maxChars: job.maxChars });
+  try {
+    buffer.load(job.segments || []);
+    const { text, events } = mergeFinal(buffer, job.finalText, job.latestPartial || '');
+
+    let cleanedText = text;
+    if (job.cleanup) {
+      // Loaded on first use: compromise/retext are only needed when cleanup is on
+      const { processWithRetext } = await import('../retext-processor.js');
+      cleanedText = await processWithRetext(text, job.cleanupOptions || {});
+    }
+    return { text, cleanedText, segments: buffer.getSegments(), events };
+  } finally {
+    buffer.dispose();
+  }
+}
+
+export {
+  REPLACE_LENGTH_RATIO,
+  mergeFinal,
+  runFinalMergeJob
+};
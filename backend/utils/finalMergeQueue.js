@@ -0,0 +1,192 @@
+/**
+ * Final Merge Queue
+ *
+ * Moves the per-final merge (utils/finalMerge.js) and optional retext cleanup
+ * that the backend/fix_missing_sentences.py patch set runs off the event loop.
+ *
+ * Every session shares one WorkerPool (utils/workerPool.js). A session's finals
+ * still depend on each other - each one merges into the accumulated text the
+ * previous one left behind - so each session queue runs one job at a time, in
+ * submission order, and hands its results back in that order:
+ *
+ * - A job carries a copy of the session's TranscriptBuffer segments; the
+ *   worker's merged segments are loaded back into the buffer when it finishes
+ * - If the buffer was cleared while the job ran (the previous final was sent),
+ *   the job runs again against the cleared buffer, so text that was already
+ *   delivered is never merged into the result a second time
+ * - Backpressure, time-budget overruns and worker failures fall back to running
+ *   the same job on the main thread; cleanup is skipped after a timeout
+ */
+
+import os from 'os';
+import { runFinalMergeJob } from './finalMerge.js';
+import { WorkerPool } from './workerPool.js';
+
+const DEFAULT_MAX_WORKERS = 4;
+
+let sharedPool = null;
+
+// All live queues, for getFinalMergeStats()
+const liveQueues = new Set();
+
+/**
+ * Main-thread fallback: the same job, minus cleanup when cleanup is what ran over budget
+ * @param {Object} job - Final merge job
+ * @param {string} reason - Why the pool could not run it
+ * @returns {Promise<Object>}
+ */
+function runOnMainThread(job, reason) {
+  return runFinalMergeJob(reason === 'timeout' ? { ...job, cleanup: false } : job);
+}
+
+/**
+ * Process-wide pool for final merge jobs, sized from FINAL_MERGE_WORKERS
+ * (default: cores - 1, at most 4; 0 keeps everything on the main thread),
+ * FINAL_MERGE_TIMEOUT_MS and FINAL_MERGE_MAX_QUEUE
+ * @returns {WorkerPool}
+ */
+function getFinalMergePool() {
+  if (!sharedPool) {
+    const envWorkers = parseInt(process.env.FINAL_MERGE_WORKERS, 10);
+    const cores = typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+    sharedPool = new WorkerPool({
+      name: 'final-merge',
+      script: new URL('./finalMergeWorker.js', import.meta.url),
+      size: Number.isNaN(envWorkers) ? Math.min(DEFAULT_MAX_WORKERS, Math.max(1, cores - 1)) : envWorkers,
+      timeoutMs: parseInt(process.env.FINAL_MERGE_TIMEOUT_MS, 10) || undefined,
+      maxQueue: parseInt(process.env.FINAL_MERGE_MAX_QUEUE, 10) || undefined,
+      fallback: runOnMainThread
+    });
+    sharedPool.warm();
+  }
+  return sharedPool;
+}
+
+class FinalMergeQueue {
+  /**
+   * @param {Object} options - Queue options
+   * @param {string} options.sessionId - Session the queue belongs to (for stats)
+   * @param {TranscriptBuffer} options.buffer - The session's accumulated finals
+   * @param {WorkerPool} options.pool - Pool to run on (defaults to the shared pool)
+   * @param {boolean} options.cleanup - Run retext cleanup on the merged text
+   */
+  constructor(options = {}) {
+    if (!options.buffer) {
+      throw new Error('FinalMergeQueue requires a TranscriptBuffer');
+    }
+    this.sessionId = options.sessionId || null;
+    this.buffer = options.buffer;
+    this.pool = options.pool || getFinalMergePool();
+    this.cleanup = options.cleanup ?? false;
+
+    this.pending = []; // { finalText, latestPartial, onResult }
+    this.running = false;
+    this.disposed = false;
+
+    this.stats = { submitted: 0, merged: 0, clearedWhileRunning: 0, failed: 0 };
+
+    liveQueues.add(this);
+  }
+
+  /**
+   * Queue a final for merging
+   * @param {string} finalText - Final text from Google Speech
+   * @param {string} latestPartial - Latest tracked partial when the final arrived
+   * @param {Function} onResult - ({ text, cleanedText, events }) => void, called in submission order
+   */
+  submit(finalText, latestPartial, onResult) {
+    if (this.disposed) return;
+    this.pending.push({ finalText, latestPartial, onResult });
+    this.stats.submitted++;
+    if (!this.running) this.drain();
+  }
+
+  /**
+   * Run queued finals one at a time
+   * @private
+   */
+  async drain() {
+    this.running = true;
+    while (this.pending.length > 0 && !this.disposed) {
+      const { finalText, latestPartial, onResult } = this.pending.shift();
+
+      let result = null;
+      try {
+        let clearsBefore;
+        do {
+          if (result) this.stats.clearedWhileRunning++;
+          clearsBefore = this.buffer.stats.clears;
+          result = await this.pool.run({
+            segments: this.buffer.getSegments(),
+            tailWindowChars: this.buffer.tailWindowChars,
+            maxChars: this.buffer.maxChars,
+            finalText,
+            latestPartial,
+            cleanup: this.cleanup
+          });
+        } while (!this.disposed && this.buffer.stats.clears !== clearsBefore);
+      } catch (error) {
+        this.stats.failed++;
+        console.error(`[FinalMergeQueue] Merge failed for session ${this.sessionId}: ${error.message}`);
+        continue;
+      }
+      if (this.disposed) break;
+
+      this.buffer.load(result.segments);
+      this.stats.merged++;
+
+      try {
+        onResult({ text: result.text, cleanedText: result.cleanedText, events: result.events });
+      } catch (error) {
+        console.error(`[FinalMergeQueue] Result handler failed for session ${this.sessionId}: ${error.message}`);
+      }
+    }
+    this.running = false;
+  }
+
+  /**
+   * @returns {Object}
+   */
+  getStats() {
+    return { sessionId: this.sessionId, queued: this.pending.length, running: this.running, ...this.stats };
+  }
+
+  /**
+   * Drop queued finals; a merge already running finishes but its result is discarded
+   */
+  dispose() {
+    this.disposed = true;
+    this.pending = [];
+    liveQueues.delete(this);
+  }
+}
+
+/**
+ * Create a session queue on the shared pool; SOLO_FINAL_CLEANUP=true enables retext cleanup
+ * @param {Object} options - FinalMergeQueue options; explicit values win
+ * @returns {FinalMergeQueue}
+ */
+function createFinalMergeQueue(options = {}) {
+  return new FinalMergeQueue({
+    cleanup: process.env.SOLO_FINAL_CLEANUP === 'true',
+    ...options
+  });
+}
+
+/**
+ * Shared pool stats plus per-session queues
+ * @returns {Object} - { pool: Object|null, sessions: Object[] }
+ */
+function getFinalMergeStats() {
+  return {
+    pool: sharedPool ? sharedPool.getStats() : null,
+    sessions: [...liveQueues].map(queue => queue.getStats())
+  };
+}
+
+export {
+  FinalMergeQueue,
+  createFinalMergeQueue,
+  getFinalMergePool,
+  getFinalMergeStats
+};
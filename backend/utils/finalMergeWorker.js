@@ -0,0 +1,16 @@
+/**
+ * Worker-thread entry point for final merge/cleanup jobs (utils/finalMergeQueue.js)
+ */
+
+import { parentPort } from 'worker_threads';
+import { runFinalMergeJob } from './finalMerge.js';
+
+parentPort.on('message', async ({ id, job }) => {
+  try {
+    parentPort.postMessage({ id, result: await runFinalMergeJob(job) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error?.message || String(error) });
+  }
+});
+
+parentPort.postMessage({ ready: true });
@@ -0,0 +1,222 @@
+/**
+ * Final Translation Queue
+ *
+ * Per-session queue for the final translations that the backend/*.py patch
+ * sets inject into soloModeHandler.js.
+ *
+ * The patched final block used to fire a fresh async IIFE per processed final.
+ * When Google emits a burst of finals, each one extends the accumulated text
+ * of the one before it, so every earlier request was paid for and then sent
+ * even though a longer final was already on its way.
+ *
+ * - Finals wait a short coalescing window before translation starts; a final
+ *   superseded within the window never reaches the API
+ * - Finals superseded while in flight are aborted via AbortController and
+ *   their results are dropped
+ * - Results are delivered strictly in enqueue order, so independent finals
+ *   can translate in parallel without reordering on the client
+ */
+
+// Short enough to be invisible next to a GPT round trip, long enough to catch
+// the back-to-back finals Google emits for one long phrase
+const DEFAULT_COALESCE_MS = 100;
+
+/**
+ * Default supersede rule: the newer final contains the older one (it was
+ * accumulated on top of it or replaced it with a longer version)
+ * @param {string} olderText - Text of a queued final
+ * @param {string} newerText - Text of the final being enqueued
+ * @returns {boolean}
+ */
+function isSupersededBy(olderText, newerText) {
+  const older = (olderText || '').trim();
+  const newer = (newerText || '').trim();
+  if (!older) return true;
+  return newer.length >= older.length && newer.includes(older);
+}
+
+class FinalTranslationQueue {
+  /**
+   * @param {Object} options - Queue options
+   * @param {string} options.sessionId - Session the queue belongs to (for logs/stats)
+   * @param {Function} options.translate - async (text, signal) => translatedText
+   * @param {Function} options.deliver - (result) => void, called in enqueue order with
+   *   { text, translatedText, error, context }; error is set when translation failed
+   * @param {number} options.coalesceMs - Coalescing window before a translation starts
+   * @param {Function} options.supersedes - (olderText, newerText) => boolean
+   */
+  constructor(options = {}) {
+    if (typeof options.translate !== 'function' || typeof options.deliver !== 'function') {
+      throw new Error('FinalTranslationQueue requires translate and deliver functions');
+    }
+    this.sessionId = options.sessionId || null;
+    this.translate = options.translate;
+    this.deliver = options.deliver;
+    this.supersedes = options.supersedes || isSupersededBy;
+
+    const envCoalesceMs = parseInt(process.env.SOLO_FINAL_COALESCE_MS, 10);
+    this.coalesceMs = options.coalesceMs ?? (Number.isNaN(envCoalesceMs) ? DEFAULT_COALESCE_MS : envCoalesceMs);
+
+    this.entries = []; // Undelivered entries, in enqueue order
+    this.nextId = 1;
+    this.disposed = false;
+
+    this.stats = {
+      enqueued: 0,
+      coalesced: 0, // Superseded before translation started (no API call)
+      aborted: 0, // Superseded while in flight
+      delivered: 0,
+      failed: 0
+    };
+  }
+
+  /**
+   * Queue a final for translation
+   * @param {string} text - Final text to translate
+   * @param {Object} context - Opaque data handed back with the result
+   * @returns {number} - Entry id
+   */
+  enqueue(text, context = {}) {
+    if (this.disposed) return -1;
+
+    // Drop or cancel every undelivered final this one replaces
+    for (const entry of this.entries) {
+      if (entry.state !== 'pending' && entry.state !== 'inflight') continue;
+      if (!this.supersedes(entry.text, text)) continue;
+
+      if (entry.state === 'pending') {
+        clearTimeout(entry.timer);
+        this.stats.coalesced++;
+      } else {
+        entry.abortController.abort();
+        this.stats.aborted++;
+      }
+      entry.state = 'superseded';
+    }
+    this.entries = this.entries.filter(entry => entry.state !== 'superseded');
+    // Finished finals that were only waiting on a now-aborted one can go out
+    this.drain();
+
+    const entry = {
+      id: this.nextId++,
+      text,
+      context,
+      state: 'pending',
+      timer: null,
+      abortController: null,
+      translatedText: null,
+      error: null,
+      enqueuedAt: Date.now()
+    };
+    this.entries.push(entry);
+    this.stats.enqueued++;
+
+    if (this.coalesceMs > 0) {
+      entry.timer = setTimeout(() => this.start(entry), this.coalesceMs);
+    } else {
+      this.start(entry);
+    }
+    return entry.id;
+  }
+
+  /**
+   * Start translating an entry
+   * @private
+   */
+  async start(entry) {
+    if (entry.state !== 'pending') return;
+    entry.state = 'inflight';
+    entry.timer = null;
+    entry.abortController = new AbortController();
+
+    try {
+      entry.translatedText = await this.translate(entry.text, entry.abortController.signal);
+    } catch (error) {
+      entry.error = error;
+    }
+
+    // Superseded (and aborted) while in flight - result is stale
+    if (entry.state !== 'inflight') return;
+    entry.state = 'done';
+    this.drain();
+  }
+
+  /**
+   * Deliver finished entries from the head of the queue
+   * @private
+   */
+  drain() {
+    while (this.entries.length > 0 && this.entries[0].state === 'done') {
+      const entry = this.entries.shift();
+      entry.state = 'delivered';
+      if (entry.error) {
+        this.stats.failed++;
+      } else {
+        this.stats.delivered++;
+      }
+      try {
+        this.deliver({
+          text: entry.text,
+          translatedText: entry.translatedText,
+          error: entry.error,
+          context: entry.context
+        });
+      } catch (error) {
+        console.error(`[FinalQueue] Deliver callback failed (session ${this.sessionId || 'unknown'}):`, error.message);
+      }
+    }
+  }
+
+  /**
+   * Number of finals queued or in flight
+   * @returns {number}
+   */
+  get size() {
+    return this.entries.length;
+  }
+
+  /**
+   * Queue activity statistics
+   * @returns {Object}
+   */
+  getStats() {
+    return {
+      sessionId: this.sessionId,
+      queued: this.entries.length,
+      inflight: this.entries.filter(entry => entry.state === 'inflight').length,
+      ...this.stats
+    };
+  }
+
+  /**
+   * Cancel everything (session closed); nothing is delivered afterwards
+   */
+  dispose() {
+    this.disposed = true;
+    for (const entry of this.entries) {
+      if (entry.state === 'pending') {
+        clearTimeout(entry.timer);
+      } else if (entry.state === 'inflight') {
+        entry.abortController.abort();
+      }
+      entry.state = 'superseded';
+    }
+    this.entries = [];
+  }
+}
+
+/**
+ * Create a final translation queue for one session
+ * @param {Object} options - See FinalTranslationQueue constructor
+ * @returns {FinalTranslationQueue}
+ */
+function createFinalTranslationQueue(options = {}) {
+  return new FinalTranslationQueue(options);
+}
+
+export {
+  DEFAULT_COALESCE_MS,
+  FinalTranslationQueue,
+  createFinalTranslationQueue,
+  isSupersededBy
+};
@@ -0,0 +1,338 @@
+/**
+ * PhraseSet Glossary Matcher
+ *
+ * googleSpeechStream logs when a recognized transcript contains a PhraseSet
+ * glossary term. That check used to read and parse glossary.json and scan
+ * every phrase on every result. The glossary is now loaded once, compiled into
+ * an Aho-Corasick automaton, and reloaded when the file changes:
+ *
+ * - match() costs time proportional to the transcript, not the glossary
+ * - Semantics are unchanged: lowercase, strip . , ! ? ; :, substring match of
+ *   any "/" variant, and the first phrase in glossary order is reported
+ * - glossary.index.json (python -m tools.glossary) is used when its source
+ *   hashes match; otherwise glossary.json (and glossary-segmented.json, for
+ *   categories) is compiled here
+ * - Loading and reloading are asynchronous; match() returns null until the
+ *   first load finishes, and a failed reload keeps the previous automaton
+ */
+
+import crypto from 'crypto';
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const REPO_ROOT = path.resolve(__dirname, '../..');
+
+const INDEX_VERSION = 1;
+const RELOAD_DEBOUNCE_MS = 250;
+const PUNCTUATION = /[.,!?;:]/g;
+
+// Edge keys pack (node, UTF-16 code unit) into one number
+const CODE_UNITS = 0x10000;
+
+/**
+ * Transcript normalization used for matching
+ * @param {string} text - Transcript
+ * @returns {string}
+ */
+function normalizeTranscript(text) {
+  return text.toLowerCase().replace(PUNCTUATION, '').trim();
+}
+
+/**
+ * Normalized, non-empty variants of a glossary phrase ("Aram/Aramea" has two)
+ * @param {string} value - Phrase value
+ * @returns {string[]}
+ */
+function phraseVariants(value) {
+  return value.toLowerCase().split('/')
+    .map(variant => variant.trim().replace(PUNCTUATION, '').trim())
+    .filter(Boolean);
+}
+
+class PhraseAutomaton {
+  /**
+   * Aho-Corasick automaton over UTF-16 code units (the same units String#includes compares)
+   * @param {Array<[string, number]>} patterns - [pattern, id]; a lower id wins when several match
+   */
+  constructor(patterns) {
+    const edges = new Map(); // node * CODE_UNITS + code -> child
+    const children = [[]]; // Build-time child lists, for the breadth-first pass
+    const ids = [-1];
+
+    for (const [pattern, id] of patterns) {
+      let node = 0;
+      for (let i = 0; i < pattern.length; i++) {
+        const key = node * CODE_UNITS + pattern.charCodeAt(i);
+        let next = edges.get(key);
+        if (next === undefined) {
+          next = ids.length;
+          ids.push(-1);
+          children.push([]);
+          edges.set(key, next);
+          children[node].push([pattern.charCodeAt(i), next]);
+        }
+        node = next;
+      }
+      if (ids[node] === -1 || id < ids[node]) ids[node] = id;
+    }
+
+    // Failure links; best[node] = lowest id ending at node or any of its suffixes
+    const fail = new Int32Array(ids.length);
+    const best = Int32Array.from(ids);
+    const queue = children[0].map(([, child]) => child);
+    for (let head = 0; head < queue.length; head++) {
+      const node = queue[head];
+      for (const [code, child] of children[node]) {
+        let f = fail[node];
+        while (f !== 0 && !edges.has(f * CODE_UNITS + code)) f = fail[f];
+        const target = edges.get(f * CODE_UNITS + code);
+        fail[child] = target !== undefined && target !== child ? target : 0;
+        const inherited = best[fail[child]];
+        if (inherited !== -1 && (best[child] === -1 || inherited < best[child])) best[child] = inherited;
+        queue.push(child);
+      }
+    }
+
+    this.edges = edges;
+    this.fail = fail;
+    this.best = best;
+    this.size = ids.length;
+  }
+
+  /**
+   * Lowest id of any pattern contained in text
+   * @param {string} text - Text to scan
+   * @returns {number} - Pattern id, or -1
+   */
+  firstMatch(text) {
+    const { edges, fail, best } = this;
+    let node = 0;
+    let found = -1;
+    for (let i = 0; i < text.length; i++) {
+      const code = text.charCodeAt(i);
+      let next = edges.get(node * CODE_UNITS + code);
+      while (next === undefined && node !== 0) {
+        node = fail[node];
+        next = edges.get(node * CODE_UNITS + code);
+      }
+      node = next ?? 0;
+      const id = best[node];
+      if (id !== -1 && (found === -1 || id < found)) found = id;
+    }
+    return found;
+  }
+}
+
+function sha256(data) {
+  return crypto.createHash('sha256').update(data).digest('hex');
+}
+
+/**
+ * Compile parsed glossary JSON into the index format tools/glossary writes
+ * @param {Object} glossary - glossary.json
+ * @param {Object|null} segmented - glossary-segmented.json
+ * @returns {Object} - { categories, phrases, phraseCategories }
+ */
+function compileIndex(glossary, segmented = null) {
+  const categories = Object.keys(segmented?.categories || {});
+  const masks = new Map();
+  categories.forEach((name, bit) => {
+    for (const phrase of segmented.categories[name].phrases || []) {
+      if (typeof phrase.value === 'string') masks.set(phrase.value, (masks.get(phrase.value) || 0) | (1 << bit));
+    }
+  });
+
+  // Phrases whose variants all belong to earlier phrases can never be reported
+  const seen = new Set();
+  const phrases = [];
+  for (const phrase of glossary.phrases || []) {
+    if (typeof phrase.value !== 'string') continue;
+    const fresh = phraseVariants(phrase.value).filter(variant => !seen.has(variant));
+    if (fresh.length === 0) continue;
+    fresh.forEach(variant => seen.add(variant));
+    phrases.push(phrase.value);
+  }
+  return { categories, phrases, phraseCategories: phrases.map(value => masks.get(value) || 0) };
+}
+
+async function readOptional(file) {
+  try {
+    return await fs.promises.readFile(file);
+  } catch (err) {
+    if (err.code === 'ENOENT') return null;
+    throw err;
+  }
+}
+
+class GlossaryMatcher {
+  /**
+   * @param {Object} options - Matcher options
+   * @param {string} options.glossaryPath - glossary.json
+   * @param {string} options.segmentedPath - glossary-segmented.json (optional file)
+   * @param {string} options.indexPath - glossary.index.json (optional file)
+   * @param {boolean} options.watch - Reload when any of the files change
+   */
+  constructor(options = {}) {
+    this.glossaryPath = options.glossaryPath || path.join(REPO_ROOT, 'glossary.json');
+    this.segmentedPath = options.segmentedPath || path.join(REPO_ROOT, 'glossary-segmented.json');
+    this.indexPath = options.indexPath || path.join(REPO_ROOT, 'glossary.index.json');
+    this.watchFiles = options.watch ?? false;
+
+    this.automaton = null;
+    this.phrases = [];
+    this.phraseCategories = [];
+    this.categories = [];
+    this.loading = null;
+    this.reloadTimer = null;
+    this.watchers = [];
+
+    this.stats = { loads: 0, fromIndex: 0, compiled: 0, loadErrors: 0, lastLoadMs: null, matches: 0, hits: 0 };
+  }
+
+  /**
+   * Load (or reload) the glossary; concurrent calls share one load
+   * @returns {Promise<void>}
+   */
+  load() {
+    if (!this.loading) {
+      this.loading = this.loadNow().finally(() => { this.loading = null; });
+    }
+    return this.loading;
+  }
+
+  /**
+   * @private
+   */
+  async loadNow() {
+    const started = performance.now();
+    try {
+      const [glossaryBytes, segmentedBytes, indexBytes] = await Promise.all([
+        fs.promises.readFile(this.glossaryPath),
+        readOptional(this.segmentedPath),
+        readOptional(this.indexPath)
+      ]);
+      const sources = {
+        glossary: sha256(glossaryBytes),
+        segmented: segmentedBytes ? sha256(segmentedBytes) : null
+      };
+
+      let index = null;
+      try {
+        index = indexBytes ? JSON.parse(indexBytes.toString('utf8')) : null;
+      } catch (err) {
+        // Truncated or hand-edited index - compile instead
+      }
+      if (index && index.version === INDEX_VERSION &&
+          index.sources?.glossary === sources.glossary && index.sources?.segmented === sources.segmented) {
+        this.stats.fromIndex++;
+      } else {
+        if (indexBytes) {
+          console.warn('[GlossaryMatcher] glossary.index.json is out of date - compiling glossary.json (run python -m tools.glossary)');
+        }
+        index = compileIndex(JSON.parse(glossaryBytes.toString('utf8')),
+          segmentedBytes ? JSON.parse(segmentedBytes.toString('utf8')) : null);
+        this.stats.compiled++;
+      }
+
+      const patterns = [];
+      index.phrases.forEach((value, id) => {
+        for (const variant of phraseVariants(value)) patterns.push([variant, id]);
+      });
+      this.automaton = new PhraseAutomaton(patterns);
+      this.phrases = index.phrases;
+      this.phraseCategories = index.phraseCategories;
+      this.categories = index.categories;
+      this.stats.loads++;
+      this.stats.lastLoadMs = Math.round(performance.now() - started);
+    } catch (err) {
+      this.stats.loadErrors++;
+      console.error(`[GlossaryMatcher] Failed to load glossary: ${err.message}`);
+    }
+  }
+
+  /**
+   * Start watching the glossary files (directory watch, so replaced files are seen too)
+   */
+  watch() {
+    const names = new Map();
+    for (const file of [this.glossaryPath, this.segmentedPath, this.indexPath]) {
+      const dir = path.dirname(file);
+      if (!names.has(dir)) names.set(dir, new Set());
+      names.get(dir).add(path.basename(file));
+    }
+    for (const [dir, files] of names) {
+      try {
+        const watcher = fs.watch(dir, { persistent: false }, (event, filename) => {
+          if (filename && !files.has(filename.toString())) return;
+          clearTimeout(this.reloadTimer);
+          this.reloadTimer = setTimeout(() => this.load(), RELOAD_DEBOUNCE_MS);
+        });
+        watcher.on('error', err => console.warn(`[GlossaryMatcher] Stopped watching ${dir}: ${err.message}`));
+        this.watchers.push(watcher);
+      } catch (err) {
+        console.warn(`[GlossaryMatcher] Cannot watch ${dir}: ${err.message}`);
+      }
+    }
+  }
+
+  /**
+   * First glossary phrase (in glossary order) contained in a transcript
+   * @param {string} transcript - Recognized text
+   * @returns {Object|null} - { value, categories: string[] }, or null (also while loading)
+   */
+  match(transcript) {
+    if (!this.automaton || !transcript) return null;
+    this.stats.matches++;
+    const id = this.automaton.firstMatch(normalizeTranscript(transcript));
+    if (id === -1) return null;
+    this.stats.hits++;
+    const mask = this.phraseCategories[id] || 0;
+    return {
+      value: this.phrases[id],
+      categories: this.categories.filter((_, bit) => mask & (1 << bit))
+    };
+  }
+
+  /**
+   * @returns {Object}
+   */
+  getStats() {
+    return { phrases: this.phrases.length, states: this.automaton?.size || 0, ...this.stats };
+  }
+
+  /**
+   * Stop watching
+   */
+  dispose() {
+    clearTimeout(this.reloadTimer);
+    this.watchers.forEach(watcher => watcher.close());
+    this.watchers = [];
+  }
+}
+
+let sharedMatcher = null;
+
+/**
+ * Process-wide matcher for the repo's glossary, loading in the background on first use
+ * and reloading on change (GLOSSARY_WATCH=false disables watching)
+ * @returns {GlossaryMatcher}
+ */
+function getGlossaryMatcher() {
+  if (!sharedMatcher) {
+    sharedMatcher = new GlossaryMatcher({ watch: process.env.GLOSSARY_WATCH !== 'false' });
+    sharedMatcher.load();
+    if (sharedMatcher.watchFiles) sharedMatcher.watch();
+  }
+  return sharedMatcher;
+}
+
+export {
+  GlossaryMatcher,
+  PhraseAutomaton,
+  compileIndex,
+  getGlossaryMatcher,
+  normalizeTranscript,
+  phraseVariants
+};
@@ -0,0 +1,421 @@
+/**
+ * Listener Fan-out
+ *
+ * Sends one session's broadcasts to its listeners. The old loop called
+ * socket.send(string) per listener and skipped any socket above 1 MB buffered,
+ * so every send re-encoded the same JSON and a slow phone lost finals outright.
+ *
+ * - Each message is serialized once into a Buffer shared by every listener it
+ *   goes to (sent as a text frame, so clients see the same JSON as before)
+ * - Groups of up to INLINE_LIMIT listeners are sent inline; larger groups go
+ *   `chunkSize` listeners per event-loop turn. Broadcasts are delivered in order.
+ * - A listener whose socket has more than `highWaterBytes` buffered gets a
+ *   bounded outbox instead of more writes. The outbox drains as bufferedAmount
+ *   falls. A newer partial for the same language replaces the queued one. When
+ *   the outbox is full, queued partials are dropped first, then the oldest messages.
+ * - Listeners that joined with `partialEncoding: 'delta'` get partials
+ *   delta-encoded (utils/partialDelta.js), encoded once per language group.
+ *   A listener's socket carries the broadcasts to everyone plus those to its own
+ *   group, so each group has its own encoder. A listener that is behind gets the
+ *   partial as a keyframe instead, since the outbox may collapse a delta's base.
+ */
+
+import { PartialDeltaEncoder } from './partialDelta.js';
+
+const DEFAULT_HIGH_WATER_BYTES = 256 * 1024;
+const DEFAULT_MAX_QUEUE_BYTES = 1024 * 1024;
+const DEFAULT_MAX_QUEUE_MESSAGES = 200;
+const DEFAULT_CHUNK_SIZE = 10;
+
+// Groups this small are sent inline for minimum latency
+const INLINE_LIMIT = 8;
+
+// How often outboxes of slow listeners are checked against bufferedAmount
+const DRAIN_INTERVAL_MS = 25;
+
+const SOCKET_OPEN = 1;
+
+// All live fan-outs, for getListenerFanoutStats()
+const liveFanouts = new Set();
+const retiredTotals = { messages: 0, serializedBytes: 0, sends: 0, sentBytes: 0, queued: 0, collapsed: 0, dropped: 0, yields: 0 };
+
+class ListenerFanout {
+  /**
+   * @param {Object} options - Fan-out options
+   * @param {string} options.label - Name used in logs and stats (session code)
+   * @param {number} options.highWaterBytes - bufferedAmount above which a listener's messages are queued
+   * @param {number} options.maxQueueBytes - Outbox size limit per listener
+   * @param {number} options.maxQueueMessages - Outbox length limit per listener
+   * @param {number} options.chunkSize - Sends per event-loop turn for large groups
+   */
+  constructor(options = {}) {
+    this.label = options.label || 'session';
+    this.highWaterBytes = options.highWaterBytes ?? DEFAULT_HIGH_WATER_BYTES;
+    this.maxQueueBytes = options.maxQueueBytes ?? DEFAULT_MAX_QUEUE_BYTES;
+    this.maxQueueMessages = options.maxQueueMessages ?? DEFAULT_MAX_QUEUE_MESSAGES;
+    this.chunkSize = options.chunkSize ?? DEFAULT_CHUNK_SIZE;
+
+    this.jobs = []; // Broadcasts still being sent to a large group, in order
+    this.jobScheduled = false;
+    this.outboxes = new WeakMap(); // socket -> outbox
+    this.lagging = new Set(); // Outboxes with queued messages
+    this.drainTimer = null;
+    this.disposed = false;
+    this.partialEncoders = new Map(); // targetLang -> PartialDeltaEncoder for delta listeners
+
+    this.stats = {
+      messages: 0,
+      serializedBytes: 0,
+      sends: 0,
+      sentBytes: 0,
+      queued: 0,
+      collapsed: 0,
+      dropped: 0,
+      yields: 0
+    };
+    liveFanouts.add(this);
+  }
+
+  /**
+   * Send a message to a set of listeners
+   * @param {Array<Object>} listeners - Listener data ({ socket, ... })
+   * @param {Object} message - Message (serialized once here)
+   * @returns {number} - Number of listeners the message was sent or queued to
+   */
+  broadcast(listeners, message) {
+    if (this.disposed || listeners.length === 0) return 0;
+
+    const isPartial = message?.type === 'translation' && message.isPartial === true;
+    if (isPartial && listeners.some(listener => listener.partialEncoding === 'delta')) {
+      return this.broadcastPartial(listeners, message);
+    }
+
+    this.dispatch(listeners, this.createFrame(message));
+    return listeners.length;
+  }
+
+  /**
+   * Send a partial to plain and delta listeners: plain listeners share the full
+   * message, the delta listeners of each language group share one encoding
+   * @private
+   */
+  broadcastPartial(listeners, message) {
+    const plain = [];
+    const groups = new Map(); // targetLang -> delta listeners
+    for (const listener of listeners) {
+      if (listener.partialEncoding !== 'delta') {
+        plain.push(listener);
+      } else if (groups.has(listener.targetLang)) {
+        groups.get(listener.targetLang).push(listener);
+      } else {
+        groups.set(listener.targetLang, [listener]);
+      }
+    }
+
+    if (plain.length > 0) this.dispatch(plain, this.createFrame(message));
+    for (const [targetLang, group] of groups) {
+      let encoder = this.partialEncoders.get(targetLang);
+      if (!encoder) {
+        encoder = new PartialDeltaEncoder();
+        this.partialEncoders.set(targetLang, encoder);
+      }
+      const encoded = encoder.encode(message);
+      const frame = this.createFrame(encoded);
+      if (!encoded.keyframe) frame.fallback = { ...message, keyframe: true };
+      this.dispatch(group, frame);
+    }
+    return listeners.length;
+  }
+
+  /**
+   * Start a language group's delta encoding over, so its next partial is a
+   * keyframe (a delta listener joined the group, or the group is gone)
+   * @param {string} targetLang - Language group
+   */
+  resetPartialEncoding(targetLang) {
+    this.partialEncoders.delete(targetLang);
+  }
+
+  /**
+   * Serialize a message once
+   * @private
+   */
+  createFrame(message) {
+    const data = Buffer.from(JSON.stringify(message));
+    this.stats.messages++;
+    this.stats.serializedBytes += data.length;
+    return {
+      data,
+      // Partials of the same language supersede each other in a slow listener's outbox
+      collapseKey: message?.type === 'translation' && message.isPartial === true ? `${message.targetLang}` : null,
+      fallback: null // Message queued instead for a listener that is behind
+    };
+  }
+
+  /**
+   * Send a frame inline to a small group, or queue it as a job
+   * @private
+   */
+  dispatch(listeners, frame) {
+    if (this.jobs.length === 0 && listeners.length <= INLINE_LIMIT) {
+      for (const listener of listeners) this.deliver(listener.socket, frame);
+      return;
+    }
+
+    this.jobs.push({ listeners, frame, index: 0 });
+    if (!this.jobScheduled) this.runJobs();
+  }
+
+  /**
+   * Work through queued broadcasts, `chunkSize` sends per turn
+   * @private
+   */
+  runJobs() {
+    this.jobScheduled = false;
+    let budget = this.chunkSize;
+    while (this.jobs.length > 0 && budget > 0) {
+      const job = this.jobs[0];
+      const end = Math.min(job.index + budget, job.listeners.length);
+      budget -= end - job.index;
+      for (; job.index < end; job.index++) {
+        this.deliver(job.listeners[job.index].socket, job.frame);
+      }
+      if (job.index >= job.listeners.length) this.jobs.shift();
+    }
+    if (this.jobs.length > 0 && !this.jobScheduled) {
+      this.jobScheduled = true;
+      this.stats.yields++;
+      setImmediate(() => this.runJobs());
+    }
+  }
+
+  /**
+   * Write a frame to a socket, or queue it behind what the socket still has to send
+   * @private
+   */
+  deliver(socket, frame) {
+    if (socket.readyState !== SOCKET_OPEN) {
+      this.discard(socket);
+      return;
+    }
+    const outbox = this.outboxes.get(socket);
+    if (outbox && outbox.queue.length > 0) this.drain(outbox);
+    if ((!outbox || outbox.queue.length === 0) && (socket.bufferedAmount || 0) <= this.highWaterBytes) {
+      this.write(socket, frame);
+      return;
+    }
+    this.enqueue(outbox || this.outboxFor(socket), this.queuedFrame(frame));
+  }
+
+  /**
+   * The frame to queue for a listener that is behind: the frame's fallback
+   * (a delta partial's keyframe), serialized once, or the frame itself
+   * @private
+   */
+  queuedFrame(frame) {
+    if (!frame.fallback) return frame;
+    if (!frame.queued) {
+      const data = Buffer.from(JSON.stringify(frame.fallback));
+      this.stats.serializedBytes += data.length;
+      frame.queued = { data, collapseKey: frame.collapseKey, fallback: null };
+    }
+    return frame.queued;
+  }
+
+  /**
+   * @private
+   */
+  write(socket, frame) {
+    try {
+      socket.send(frame.data, { binary: false });
+      this.stats.sends++;
+      this.stats.sentBytes += frame.data.length;
+    } catch (error) {
+      console.error(`[ListenerFanout] Error sending to listener:`, error.message);
+    }
+  }
+
+  /**
+   * @private
+   */
+  outboxFor(socket) {
+    const outbox = { socket, queue: [], bytes: 0, since: Date.now() };
+    this.outboxes.set(socket, outbox);
+    return outbox;
+  }
+
+  /**
+   * Queue a frame for a slow listener, keeping the outbox within its limits
+   * @private
+   */
+  enqueue(outbox, frame) {
+    const { queue } = outbox;
+    if (frame.collapseKey !== null) {
+      const index = queue.findIndex(queued => queued.collapseKey === frame.collapseKey);
+      if (index !== -1) {
+        outbox.bytes -= queue[index].data.length;
+        queue.splice(index, 1);
+        this.stats.collapsed++;
+      }
+    }
+    queue.push(frame);
+    outbox.bytes += frame.data.length;
+    this.stats.queued++;
+
+    while (queue.length > 1 && (queue.length > this.maxQueueMessages || outbox.bytes > this.maxQueueBytes)) {
+      const partialIndex = queue.findIndex(queued => queued.collapseKey !== null);
+      const [dropped] = queue.splice(partialIndex === -1 ? 0 : partialIndex, 1);
+      outbox.bytes -= dropped.data.length;
+      this.stats.dropped++;
+    }
+
+    if (!this.lagging.has(outbox)) {
+      outbox.since = Date.now();
+      this.lagging.add(outbox);
+      console.warn(`[ListenerFanout] ⚠️ ${this.label}: slow listener (bufferedAmount=${outbox.socket.bufferedAmount}), queueing`);
+      this.startDrainTimer();
+    }
+  }
+
+  /**
+   * Write queued frames while the socket is under the high-water mark (or all of them)
+   * @private
+   */
+  drain(outbox, force = false) {
+    const { socket, queue } = outbox;
+    if (socket.readyState !== SOCKET_OPEN) {
+      this.discard(socket);
+      return;
+    }
+    while (queue.length > 0 && (force || (socket.bufferedAmount || 0) <= this.highWaterBytes)) {
+      const frame = queue.shift();
+      outbox.bytes -= frame.data.length;
+      this.write(socket, frame);
+    }
+    if (queue.length === 0) this.lagging.delete(outbox);
+  }
+
+  /**
+   * Forget a closed socket's outbox
+   * @private
+   */
+  discard(socket) {
+    const outbox = this.outboxes.get(socket);
+    if (!outbox) return;
+    this.stats.dropped += outbox.queue.length;
+    this.lagging.delete(outbox);
+    this.outboxes.delete(socket);
+  }
+
+  /**
+   * @private
+   */
+  startDrainTimer() {
+    if (this.drainTimer) return;
+    this.drainTimer = setInterval(() => {
+      for (const outbox of this.lagging) this.drain(outbox);
+      if (this.lagging.size === 0) {
+        clearInterval(this.drainTimer);
+        this.drainTimer = null;
+      }
+    }, DRAIN_INTERVAL_MS);
+    this.drainTimer.unref?.();
+  }
+
+  /**
+   * Send everything now: finish queued broadcasts and write out every outbox,
+   * regardless of backpressure (before the session's sockets are closed)
+   */
+  flush() {
+    while (this.jobs.length > 0) {
+      const job = this.jobs.shift();
+      for (; job.index < job.listeners.length; job.index++) {
+        this.deliver(job.listeners[job.index].socket, job.frame);
+      }
+    }
+    for (const outbox of this.lagging) this.drain(outbox, true);
+  }
+
+  /**
+   * @returns {Object}
+   */
+  getStats() {
+    let queuedMessages = 0;
+    let queuedBytes = 0;
+    let maxBufferedAmount = 0;
+    let oldestLagMs = 0;
+    const now = Date.now();
+    for (const outbox of this.lagging) {
+      queuedMessages += outbox.queue.length;
+      queuedBytes += outbox.bytes;
+      maxBufferedAmount = Math.max(maxBufferedAmount, outbox.socket.bufferedAmount || 0);
+      oldestLagMs = Math.max(oldestLagMs, now - outbox.since);
+    }
+    return {
+      label: this.label,
+      pendingBroadcasts: this.jobs.length,
+      slowListeners: this.lagging.size,
+      queuedMessages,
+      queuedBytes,
+      maxBufferedAmount,
+      oldestLagMs,
+      ...this.stats
+    };
+  }
+
+  /**
+   * Stop sending and drop anything still queued
+   */
+  dispose() {
+    if (!liveFanouts.delete(this)) return;
+    this.disposed = true;
+    this.jobs = [];
+    clearInterval(this.drainTimer);
+    this.drainTimer = null;
+    for (const outbox of this.lagging) this.stats.dropped += outbox.queue.length;
+    this.lagging.clear();
+    this.partialEncoders.clear();
+    for (const key of Object.keys(retiredTotals)) {
+      retiredTotals[key] += this.stats[key];
+    }
+  }
+}
+
+/**
+ * Create a fan-out; LISTENER_HIGH_WATER_BYTES, LISTENER_MAX_QUEUE_BYTES and
+ * LISTENER_MAX_QUEUE_MESSAGES set the defaults
+ * @param {Object} options - ListenerFanout options; explicit values win
+ * @returns {ListenerFanout}
+ */
+function createListenerFanout(options = {}) {
+  return new ListenerFanout({
+    highWaterBytes: parseInt(process.env.LISTENER_HIGH_WATER_BYTES, 10) || undefined,
+    maxQueueBytes: parseInt(process.env.LISTENER_MAX_QUEUE_BYTES, 10) || undefined,
+    maxQueueMessages: parseInt(process.env.LISTENER_MAX_QUEUE_MESSAGES, 10) || undefined,
+    ...options
+  });
+}
+
+/**
+ * Fan-out totals across all sessions, plus per-session stats for live ones
+ * @returns {Object} - { active: number, totals: Object, sessions: Object[] }
+ */
+function getListenerFanoutStats() {
+  const totals = { ...retiredTotals };
+  const sessions = [];
+  for (const fanout of liveFanouts) {
+    const stats = fanout.getStats();
+    sessions.push(stats);
+    for (const key of Object.keys(totals)) {
+      totals[key] += stats[key];
+    }
+  }
+  return { active: liveFanouts.size, totals, sessions };
+}
+
+export {
+  DEFAULT_HIGH_WATER_BYTES,
+  ListenerFanout,
+  createListenerFanout,
+  getListenerFanoutStats
+};
@@ -0,0 +1,266 @@
+/**
+ * Merge-Path Logger
+ *
+ * Structured, level-gated logging for the SoloMode final-merge path that the
+ * backend/*.py patch sets inject into soloModeHandler.js.
+ *
+ * - Events are recorded as (time, level, event, data) entries; message strings
+ *   (and the text previews in them) are only built when an entry is printed
+ * - `data` may be a function so callers can skip building it: it is only called
+ *   when the entry is printed, either immediately or by a flush (so it should
+ *   capture values, not state that changes later)
+ * - Per-event sampling keeps noisy events (e.g. every processed final) cheap
+ * - Entries that are not printed (below the level or sampled out) go into a
+ *   fixed-size ring buffer that is printed in one write when an error is logged
+ *   or flush() is called; printed entries are not buffered, so a flush never
+ *   repeats a line
+ * - flushMergeLogs() flushes every live logger on demand (POST /merge-logs/flush)
+ * - Every event is also passed to utils/metrics.js (branch counters, recovered
+ *   chars, overlap/ratio histograms), regardless of level or sampling
+ *
+ * Configuration (environment):
+ *   SOLO_MERGE_LOG_LEVEL   debug | info | warn | error | silent (default: info)
+ *   SOLO_MERGE_LOG_SAMPLE  per-event sample rates, e.g. "final_raw=0.1,accumulate=0.5"
+ *   SOLO_MERGE_LOG_BUFFER  ring buffer capacity in entries (default: 200, 0 disables)
+ */
+
+import { recordMergeEvent } from './metrics.js';
+
+const LEVELS = { debug: 10, info: 20, warn: 30, error: 40, silent: 100 };
+
+const DEFAULT_LEVEL = 'info';
+const DEFAULT_BUFFER_SIZE = 200;
+const PREVIEW_CHARS = 80;
+
+/**
+ * Shorten text for log output
+ * @param {string} text - Text to preview
+ * @param {number} maxChars - Maximum characters to show
+ * @returns {string}
+ */
+function preview(text, maxChars = PREVIEW_CHARS) {
+  if (!text) return '';
+  return text.length > maxChars ? `${text.substring(0, maxChars)}...` : text;
+}
+
+// Human-readable formats, kept identical to the console.log lines the patches
+// used to write so existing log searches keep working
+const MESSAGES = {
+  final_raw: (d) => `📝 FINAL Transcript (raw): "${preview(d.text, 50)}"`,
+  accumulate: (d) => `📦 Accumulated final (${d.finalChars} → ${d.accumulatedChars} chars)`,
+  contained: () => '⏭️ Final already in accumulated text',
+  replace: () => '🔄 Replacing accumulated with longer final',
+  append: () => '➕ Appending final to accumulated',
+  partial_override: (d) => `⚠️ FINAL truncated - using partial instead (${d.finalChars} → ${d.partialChars} chars)\n` +
+    `  Final: "${preview(d.final)}"\n  Partial: "${preview(d.partial)}"`,
+  partial_merge: (d) => `⚠️ FINAL merged with partial (${d.finalChars} + ${d.newPartChars} = ${d.mergedChars} chars)\n` +
+    `  Final: "${preview(d.final)}"\n  Partial: "${preview(d.partial)}"\n  Merged: "${preview(d.merged)}"`,
+  duplicate: (d) => d.kind === 'near'
+    ? `⏭️ Skipping near-duplicate final (similarity ${d.similarity.toFixed(2)}): "${preview(d.text, 50)}"`
+    : `⏭️ Skipping duplicate final: "${preview(d.text, 50)}"`,
+  final_processed: (d) => `📝 FINAL Transcript (processed): "${preview(d.text)}"`,
+  final_sent: (d) => d.translatedText !== undefined
+    ? `✅ Sending final translation: "${preview(d.translatedText, 50)}" (original: "${preview(d.text, 50)}")`
+    : `✅ Sending final transcript: "${preview(d.text, 50)}"`,
+  translation_error: (d) => `Final translation error: ${d.error?.message || d.error}`,
+  final_error: (d) => `Error processing final: ${d.error?.message || d.error}`
+};
+
+/**
+ * Parse "event=rate,event=rate" into a map of sample rates
+ * @param {string} spec - Sample rate specification
+ * @returns {Object} - { event: rate }
+ */
+function parseSampleRates(spec) {
+  const rates = {};
+  if (!spec) return rates;
+  for (const part of spec.split(',')) {
+    const [event, rate] = part.split('=').map(s => s && s.trim());
+    const value = parseFloat(rate);
+    if (event && !Number.isNaN(value)) {
+      rates[event] = Math.min(1, Math.max(0, value));
+    }
+  }
+  return rates;
+}
+
+// All live loggers, for flushMergeLogs()
+const liveLoggers = new Set();
+
+class MergeLogger {
+  /**
+   * @param {Object} options - Logger options
+   * @param {string} options.mode - Log prefix, e.g. 'SoloMode'
+   * @param {string} options.sessionId - Session identifier recorded with each entry
+   * @param {string} options.level - Minimum level printed immediately
+   * @param {Object} options.sampleRates - Per-event sample rates (0..1)
+   * @param {number} options.bufferSize - Ring buffer capacity (0 disables buffering)
+   * @param {Object} options.sink - Object with log/error methods (default: console)
+   */
+  constructor(options = {}) {
+    this.mode = options.mode || 'SoloMode';
+    this.sessionId = options.sessionId || null;
+    this.level = LEVELS[options.level || process.env.SOLO_MERGE_LOG_LEVEL] ?? LEVELS[DEFAULT_LEVEL];
+    this.sampleRates = options.sampleRates || parseSampleRates(process.env.SOLO_MERGE_LOG_SAMPLE);
+    this.sink = options.sink || console;
+
+    const envBufferSize = parseInt(process.env.SOLO_MERGE_LOG_BUFFER, 10);
+    this.bufferSize = options.bufferSize ?? (Number.isNaN(envBufferSize) ? DEFAULT_BUFFER_SIZE : envBufferSize);
+    this.buffer = new Array(this.bufferSize);
+    this.bufferHead = 0;
+    this.bufferCount = 0;
+
+    this.counters = {};
+    liveLoggers.add(this);
+  }
+
+  debug(event, data) { this.log('debug', event, data); }
+  info(event, data) { this.log('info', event, data); }
+  warn(event, data) { this.log('warn', event, data); }
+
+  error(event, data) {
+    this.log('error', event, data);
+    this.flush(`error: ${event}`);
+  }
+
+  /**
+   * Record an event
+   * @param {string} level - debug | info | warn | error
+   * @param {string} event - Event type (see MESSAGES)
+   * @param {Object|Function} data - Event fields, or a function returning them
+   */
+  log(level, event, data) {
+    this.counters[event] = (this.counters[event] || 0) + 1;
+    // Lazy data is not built just for metrics; the event is still counted
+    recordMergeEvent(this.mode, event, typeof data === 'function' ? {} : (data || {}));
+
+    const levelValue = LEVELS[level];
+    const print = levelValue >= this.level && this.isSampled(event, levelValue);
+    if (!print && this.bufferSize === 0) return;
+
+    // Lazy data stays a function in the buffer until a flush prints it
+    const entry = { time: Date.now(), level, event, data: data || {} };
+
+    if (!print) {
+      this.buffer[this.bufferHead] = entry;
+      this.bufferHead = (this.bufferHead + 1) % this.bufferSize;
+      if (this.bufferCount < this.bufferSize) this.bufferCount++;
+      return;
+    }
+
+    const line = this.format(entry);
+    if (levelValue >= LEVELS.error) {
+      this.sink.error(line, entry.data.error || '');
+    } else {
+      this.sink.log(line);
+    }
+  }
+
+  /**
+   * Build an entry's data if it was recorded lazily
+   * @param {Object} entry - Recorded entry
+   * @returns {Object} - The entry, with data built
+   * @private
+   */
+  resolve(entry) {
+    if (typeof entry.data === 'function') {
+      entry.data = entry.data() || {};
+    }
+    return entry;
+  }
+
+  /**
+   * Errors and warnings are never sampled away
+   * @private
+   */
+  isSampled(event, levelValue) {
+    const rate = this.sampleRates[event];
+    if (rate === undefined || rate >= 1 || levelValue >= LEVELS.warn) return true;
+    return Math.random() < rate;
+  }
+
+  /**
+   * Build the printable line for an entry
+   * @param {Object} entry - Buffered entry
+   * @returns {string}
+   */
+  format(entry) {
+    this.resolve(entry);
+    const build = MESSAGES[entry.event];
+    const message = build ? build(entry.data) : `${entry.event} ${JSON.stringify(entry.data)}`;
+    return `[${this.mode}] ${message}`.replace(/\n/g, `\n[${this.mode}] `);
+  }
+
+  /**
+   * Buffered (not yet printed) entries, oldest first, with their data built
+   * @returns {Object[]}
+   */
+  snapshot() {
+    const entries = [];
+    const start = (this.bufferHead - this.bufferCount + this.bufferSize) % (this.bufferSize || 1);
+    for (let i = 0; i < this.bufferCount; i++) {
+      entries.push(this.resolve(this.buffer[(start + i) % this.bufferSize]));
+    }
+    return entries;
+  }
+
+  /**
+   * Print the buffered entries that were not printed when logged, in a single
+   * write, and empty the buffer
+   * @param {string} reason - Why the buffer is being flushed
+   * @returns {number} - Number of entries flushed
+   */
+  flush(reason = 'on demand') {
+    const entries = this.snapshot();
+    if (entries.length === 0) return 0;
+
+    const lines = entries.map(entry => `  ${new Date(entry.time).toISOString()} ${entry.level.toUpperCase()} ${this.format(entry)}`);
+    this.sink.log(`[${this.mode}] 🧾 Merge log (${entries.length} unprinted entries, session ${this.sessionId || 'unknown'}, ${reason}):\n${lines.join('\n')}`);
+
+    this.buffer = new Array(this.bufferSize);
+    this.bufferHead = 0;
+    this.bufferCount = 0;
+    return entries.length;
+  }
+
+  /**
+   * Stop tracking this logger
+   */
+  dispose() {
+    liveLoggers.delete(this);
+  }
+}
+
+/**
+ * Create a merge logger for one session
+ * @param {Object} options - See MergeLogger constructor
+ * @returns {MergeLogger}
+ */
+function createMergeLogger(options = {}) {
+  return new MergeLogger(options);
+}
+
+/**
+ * Flush the ring buffers of all live loggers (optionally one session only)
+ * @param {string} sessionId - Only flush this session's logger
+ * @returns {number} - Total entries flushed
+ */
+function flushMergeLogs(sessionId = null) {
+  let total = 0;
+  for (const logger of liveLoggers) {
+    if (!sessionId || logger.sessionId === sessionId) {
+      total += logger.flush('on demand');
+    }
+  }
+  return total;
+}
+
+export {
+  LEVELS,
+  MESSAGES,
+  MergeLogger,
+  createMergeLogger,
+  flushMergeLogs,
+  parseSampleRates,
+  preview
+};
@@ -0,0 +1,445 @@
+/**
+ * Final-Path Metrics
+ *
+ * In-process counters and histograms for the solo/host final path, so merge
+ * constants (the 500 ms partial window in add_partial_check.py, the 21-char
+ * minimum overlap, the 1.5× replacement ratio) can be tuned from production
+ * distributions:
+ *
+ * - exbabel_partial_final_gap_seconds      time from the latest partial to the final
+ * - exbabel_final_merge_events_total       merge branch taken (accumulate, replace, append, partial_override, ...)
+ * - exbabel_final_recovered_chars          characters a partial added to a truncated final
+ * - exbabel_final_overlap_chars            overlap found when a final extends the accumulated text
+ * - exbabel_final_length_ratio             new final / accumulated length when there was no overlap
+ * - exbabel_translate_final_seconds        translateFinal latency by worker and outcome
+ * - exbabel_event_loop_lag_seconds         event-loop lag, sampled by a drift timer
+ * - exbabel_speculative_translations_total speculative final translations by outcome
+ * - exbabel_stt_restarts_total             recognizer restarts by mode (cold, warm handoff) and reason
+ * - exbabel_stt_restart_audio_gap_seconds  time no recognizer accepted audio during a restart
+ * - exbabel_stt_restart_result_gap_seconds time from a restart to the next result delivered
+ * - exbabel_stt_handoffs_retired_total     how the outgoing recognizer of a warm handoff ended
+ *
+ * Exposed in Prometheus text format (renderPrometheus, GET /metrics) and as a
+ * JSON snapshot (getMetricsSnapshot, GET /metrics.json, or METRICS_SNAPSHOT_FILE)
+ * that tools/metrics_report reads. No external client library; recording is a
+ * Map lookup plus a bucket scan.
+ */
+
+import fs from 'fs';
+import path from 'path';
+
+const DEFAULT_LAG_INTERVAL_MS = 500;
+const DEFAULT_SNAPSHOT_INTERVAL_MS = 60000;
+
+class Counter {
+  /**
+   * @param {string} name - Metric name
+   * @param {string} help - Help text
+   * @param {string[]} labelNames - Label names, in series-key order
+   */
+  constructor(name, help, labelNames = []) {
+    this.type = 'counter';
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.series = new Map(); // label key -> { labels, value }
+  }
+
+  /**
+   * @param {Object} labels - Label values
+   * @param {number} value - Increment
+   */
+  inc(labels = {}, value = 1) {
+    seriesFor(this, labels, () => ({ value: 0 })).value += value;
+  }
+
+  reset() {
+    this.series.clear();
+  }
+}
+
+class Histogram {
+  /**
+   * @param {string} name - Metric name
+   * @param {string} help - Help text
+   * @param {string[]} labelNames - Label names, in series-key order
+   * @param {number[]} buckets - Ascending upper bounds (+Inf is implicit)
+   */
+  constructor(name, help, labelNames = [], buckets = []) {
+    this.type = 'histogram';
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.buckets = [...buckets].sort((a, b) => a - b);
+    this.series = new Map(); // label key -> { labels, counts (per bucket, non-cumulative), count, sum }
+  }
+
+  /**
+   * @param {Object} labels - Label values
+   * @param {number} value - Observation
+   */
+  observe(labels, value) {
+    if (!Number.isFinite(value)) return;
+    const series = seriesFor(this, labels, () => ({
+      counts: new Array(this.buckets.length).fill(0),
+      count: 0,
+      sum: 0
+    }));
+    const index = this.buckets.findIndex(bound => value <= bound);
+    if (index !== -1) series.counts[index]++;
+    series.count++;
+    series.sum += value;
+  }
+
+  reset() {
+    this.series.clear();
+  }
+}
+
+function seriesFor(metric, labels, create) {
+  const values = metric.labelNames.map(name => String(labels?.[name] ?? ''));
+  const key = values.join('\u0000');
+  let series = metric.series.get(key);
+  if (!series) {
+    const labelObject = {};
+    metric.labelNames.forEach((name, i) => { labelObject[name] = values[i]; });
+    series = { labels: labelObject, ...create() };
+    metric.series.set(key, series);
+  }
+  return series;
+}
+
+const registry = new Map(); // name -> Counter | Histogram
+
+function register(metric) {
+  registry.set(metric.name, metric);
+  return metric;
+}
+
+const partialFinalGap = register(new Histogram(
+  'exbabel_partial_final_gap_seconds',
+  'Time between the latest partial and the final that followed it',
+  ['mode'],
+  [0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10]
+));
+
+const mergeEvents = register(new Counter(
+  'exbabel_final_merge_events_total',
+  'Final-path merge branches taken',
+  ['mode', 'branch']
+));
+
+const recoveredChars = register(new Histogram(
+  'exbabel_final_recovered_chars',
+  'Characters recovered from a partial when a final was truncated',
+  ['mode', 'branch'],
+  [1, 5, 10, 20, 40, 80, 160, 320, 640]
+));
+
+const overlapChars = register(new Histogram(
+  'exbabel_final_overlap_chars',
+  'Overlap between the accumulated finals and a new final that extends them',
+  ['mode'],
+  [5, 10, 15, 21, 25, 30, 40, 60, 80, 100] // 21 = textMerge DEFAULT_MIN_OVERLAP
+));
+
+const lengthRatio = register(new Histogram(
+  'exbabel_final_length_ratio',
+  'New final length / accumulated length for finals without overlap (replace above 1.5)',
+  ['mode'],
+  [0.25, 0.5, 0.75, 1, 1.25, 1.5, 2, 3, 5]
+));
+
+const translateFinalLatency = register(new Histogram(
+  'exbabel_translate_final_seconds',
+  'translateFinal latency',
+  ['worker', 'status'],
+  [0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 8, 13]
+));
+
+const translateFinalBatchSize = register(new Histogram(
+  'exbabel_translate_final_batch_size',
+  'Finals per translation request sent by the cross-session batcher',
+  [],
+  [1, 2, 3, 4, 6, 8, 12, 16]
+));
+
+const eventLoopLag = register(new Histogram(
+  'exbabel_event_loop_lag_seconds',
+  'Event-loop lag (timer drift)',
+  [],
+  [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+));
+
+const speculativeTranslations = register(new Counter(
+  'exbabel_speculative_translations_total',
+  'Speculative final translations from stable partials (started, hit, wasted, failed, budget_skipped)',
+  ['outcome']
+));
+
+const sttRestarts = register(new Counter(
+  'exbabel_stt_restarts_total',
+  'Streaming recognizer restarts (cold: close then reopen; warm: standby handoff)',
+  ['mode', 'reason']
+));
+
+const sttRestartAudioGap = register(new Histogram(
+  'exbabel_stt_restart_audio_gap_seconds',
+  'Time no recognizer accepted audio during a restart',
+  ['mode'],
+  [0, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2, 5]
+));
+
+const sttRestartResultGap = register(new Histogram(
+  'exbabel_stt_restart_result_gap_seconds',
+  'Time from a recognizer restart to the next result delivered',
+  ['mode'],
+  [0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 8]
+));
+
+const sttHandoffsRetired = register(new Counter(
+  'exbabel_stt_handoffs_retired_total',
+  'Outgoing recognizers of warm handoffs by how they ended (final, timeout, error, ended)',
+  ['outcome']
+));
+
+// Merge events that mean a final was truncated and a partial filled it in
+const RECOVERY_BRANCHES = new Set(['partial_override', 'partial_merge']);
+
+// Merge-path events counted as branches (the rest of the mergeLogger events are not)
+const MERGE_BRANCHES = new Set([
+  'accumulate', 'contained', 'replace', 'append', 'partial_override', 'partial_merge', 'duplicate', 'forced_final',
+  'timeline_segment'
+]);
+
+/**
+ * Record the gap between the latest partial and a final
+ * @param {string} mode - 'SoloMode' | 'HostMode'
+ * @param {number} latestPartialTime - Date.now() of the latest partial (0 if none)
+ * @param {number} now - Final arrival time
+ */
+function observePartialFinalGap(mode, latestPartialTime, now = Date.now()) {
+  if (!latestPartialTime) return;
+  partialFinalGap.observe({ mode }, Math.max(0, now - latestPartialTime) / 1000);
+}
+
+/**
+ * Record a merge-path event (mergeLogger calls this for every event it sees)
+ * @param {string} mode - 'SoloMode' | 'HostMode'
+ * @param {string} event - Merge event name
+ * @param {Object} data - Event fields: finalChars/partialChars/newPartChars, overlapChars, lengthRatio, gapMs
+ */
+function recordMergeEvent(mode, event, data = {}) {
+  if (event === 'final_raw' && data.gapMs != null) {
+    partialFinalGap.observe({ mode }, data.gapMs / 1000);
+  }
+  if (!MERGE_BRANCHES.has(event)) return;
+
+  mergeEvents.inc({ mode, branch: event });
+  if (RECOVERY_BRANCHES.has(event)) {
+    const recovered = data.newPartChars ?? (data.partialChars - data.finalChars);
+    recoveredChars.observe({ mode, branch: event }, recovered);
+  }
+  if (data.overlapChars != null) {
+    overlapChars.observe({ mode }, data.overlapChars);
+  }
+  if (data.lengthRatio != null) {
+    lengthRatio.observe({ mode }, data.lengthRatio);
+  }
+}
+
+/**
+ * Record one translateFinal call
+ * @param {string} worker - 'chat' | 'realtime'
+ * @param {number} startedAt - performance.now() when the call started
+ * @param {string} status - 'ok' | 'error' | 'aborted' | 'skipped'
+ */
+function observeTranslateFinal(worker, startedAt, status) {
+  translateFinalLatency.observe({ worker, status }, (performance.now() - startedAt) / 1000);
+}
+
+/**
+ * Record the size of a final translation request (utils/translationBatcher.js)
+ * @param {number} size - Finals in the request
+ */
+function observeTranslationBatch(size) {
+  translateFinalBatchSize.observe({}, size);
+}
+
+/**
+ * Record a speculative translation outcome (utils/speculativeTranslation.js)
+ * @param {string} outcome - 'started' | 'hit' | 'wasted' | 'failed' | 'budget_skipped'
+ */
+function recordSpeculation(outcome) {
+  speculativeTranslations.inc({ outcome });
+}
+
+/**
+ * Record a streaming recognizer restart (googleSpeechStream.js)
+ * @param {string} mode - 'cold' | 'warm'
+ * @param {string} reason - 'streaming_limit' | 'vad_cutoff' | 'chunk_timeout' | 'recover'
+ * @param {number} audioGapMs - Time no recognizer accepted audio
+ */
+function recordRecognizerRestart(mode, reason, audioGapMs) {
+  sttRestarts.inc({ mode, reason });
+  sttRestartAudioGap.observe({ mode }, audioGapMs / 1000);
+}
+
+/**
+ * Record the time from a recognizer restart to the next result delivered
+ * @param {string} mode - 'cold' | 'warm'
+ * @param {number} gapMs - Milliseconds
+ */
+function observeRestartResultGap(mode, gapMs) {
+  sttRestartResultGap.observe({ mode }, gapMs / 1000);
+}
+
+/**
+ * Record how the outgoing recognizer of a warm handoff ended
+ * @param {string} outcome - 'final' | 'timeout' | 'error' | 'ended'
+ */
+function recordHandoffRetired(outcome) {
+  sttHandoffsRetired.inc({ outcome });
+}
+
+let lagTimer = null;
+let snapshotTimer = null;
+
+/**
+ * Start sampling event-loop lag; the timer is unref'd so it never keeps the process alive
+ * @param {number} intervalMs - Sampling interval
+ */
+function startEventLoopMonitor(intervalMs = DEFAULT_LAG_INTERVAL_MS) {
+  if (lagTimer) return;
+  let expected = performance.now() + intervalMs;
+  lagTimer = setInterval(() => {
+    const now = performance.now();
+    eventLoopLag.observe({}, Math.max(0, now - expected) / 1000);
+    expected = now + intervalMs;
+  }, intervalMs);
+  lagTimer.unref();
+}
+
+function stopEventLoopMonitor() {
+  clearInterval(lagTimer);
+  lagTimer = null;
+}
+
+function formatLabels(labels, extra = null) {
+  const pairs = Object.entries(extra ? { ...labels, ...extra } : labels);
+  if (pairs.length === 0) return '';
+  const escaped = pairs.map(([name, value]) =>
+    `${name}="${String(value).replace(/\\/g, '\\\\').replace(/\n/g, '\\n').replace(/"/g, '\\"')}"`);
+  return `{${escaped.join(',')}}`;
+}
+
+/**
+ * All metrics in Prometheus text exposition format (0.0.4)
+ * @returns {string}
+ */
+function renderPrometheus() {
+  const lines = [];
+  for (const metric of registry.values()) {
+    lines.push(`# HELP ${metric.name} ${metric.help}`);
+    lines.push(`# TYPE ${metric.name} ${metric.type}`);
+    for (const series of metric.series.values()) {
+      if (metric.type === 'counter') {
+        lines.push(`${metric.name}${formatLabels(series.labels)} ${series.value}`);
+        continue;
+      }
+      let cumulative = 0;
+      metric.buckets.forEach((bound, i) => {
+        cumulative += series.counts[i];
+        lines.push(`${metric.name}_bucket${formatLabels(series.labels, { le: bound })} ${cumulative}`);
+      });
+      lines.push(`${metric.name}_bucket${formatLabels(series.labels, { le: '+Inf' })} ${series.count}`);
+      lines.push(`${metric.name}_sum${formatLabels(series.labels)} ${series.sum}`);
+      lines.push(`${metric.name}_count${formatLabels(series.labels)} ${series.count}`);
+    }
+  }
+  return `${lines.join('\n')}\n`;
+}
+
+/**
+ * All metrics as plain JSON (bucket counts are cumulative, like Prometheus)
+ * @returns {Object} - { generatedAt, uptimeSeconds, metrics: { name: { type, help, labelNames, buckets?, series } } }
+ */
+function getMetricsSnapshot() {
+  const metrics = {};
+  for (const metric of registry.values()) {
+    const series = [];
+    for (const entry of metric.series.values()) {
+      if (metric.type === 'counter') {
+        series.push({ labels: entry.labels, value: entry.value });
+        continue;
+      }
+      let cumulative = 0;
+      series.push({
+        labels: entry.labels,
+        count: entry.count,
+        sum: entry.sum,
+        buckets: entry.counts.map(count => (cumulative += count))
+      });
+    }
+    metrics[metric.name] = {
+      type: metric.type,
+      help: metric.help,
+      labelNames: metric.labelNames,
+      ...(metric.type === 'histogram' ? { buckets: metric.buckets } : {}),
+      series
+    };
+  }
+  return { generatedAt: new Date().toISOString(), uptimeSeconds: process.uptime(), metrics };
+}
+
+/**
+ * Periodically write the JSON snapshot to a file (atomically, via rename)
+ * @param {string} file - Destination path
+ * @param {number} intervalMs - Write interval
+ */
+function startSnapshotWriter(file, intervalMs = DEFAULT_SNAPSHOT_INTERVAL_MS) {
+  if (snapshotTimer || !file) return;
+  fs.mkdirSync(path.dirname(path.resolve(file)), { recursive: true });
+  const write = () => {
+    const tmp = `${file}.tmp`;
+    fs.writeFile(tmp, JSON.stringify(getMetricsSnapshot()), err => {
+      if (err) {
+        console.warn(`[Metrics] Failed to write snapshot: ${err.message}`);
+        return;
+      }
+      fs.rename(tmp, file, renameErr => {
+        if (renameErr) console.warn(`[Metrics] Failed to write snapshot: ${renameErr.message}`);
+      });
+    });
+  };
+  snapshotTimer = setInterval(write, intervalMs);
+  snapshotTimer.unref();
+}
+
+/**
+ * Clear every series (tests)
+ */
+function resetMetrics() {
+  for (const metric of registry.values()) {
+    metric.reset();
+  }
+}
+
+export {
+  Counter,
+  Histogram,
+  getMetricsSnapshot,
+  observePartialFinalGap,
+  observeRestartResultGap,
+  observeTranslateFinal,
+  observeTranslationBatch,
+  recordHandoffRetired,
+  recordMergeEvent,
+  recordRecognizerRestart,
+  recordSpeculation,
+  renderPrometheus,
+  resetMetrics,
+  startEventLoopMonitor,
+  startSnapshotWriter,
+  stopEventLoopMonitor
+};
@@ -0,0 +1,195 @@
+/**
+ * Delta-Encoded Partial Wire Format
+ *
+ * Opt-in encoding for partial `translation` messages. A partial is almost
+ * always the previous partial plus a word or two, so instead of resending
+ * every text field in full, each field is sent as
+ * (common-prefix length, new suffix) against a recent partial.
+ *
+ * Wire format (solo clients opt in with `partialEncoding: 'delta'` on init,
+ * listeners with `partialEncoding=delta` on the listener URL, see
+ * utils/listenerFanout.js):
+ *
+ *   Keyframe - the normal message plus `keyframe: true`:
+ *     { type: 'translation', isPartial: true, seqId: 41, keyframe: true, originalText: '...', ... }
+ *
+ *   Delta - text fields replaced by a `delta` object:
+ *     { type: 'translation', isPartial: true, seqId: 42, ...non-text fields,
+ *       delta: { baseSeqId: 41, fields: { originalText: [37, ' and the'], translatedText: null } } }
+ *
+ *   - `[prefixLength, suffix]` => base.substring(0, prefixLength) + suffix
+ *   - `null` => field removed
+ *   - fields not listed are unchanged from the base
+ *
+ * The base is one of the last `MAX_BASES` partials (whichever gives the
+ * smallest delta), because transcript partials and translated partials are
+ * interleaved on the same socket. A keyframe drops all older bases.
+ *
+ * Keyframes are sent for the first partial, every `keyframeInterval`
+ * partials, and whenever a delta would not be smaller than the full text.
+ * Finals are never delta-encoded and do not move the base.
+ *
+ * The matching decoder lives in packages/exbabel-caption-engine
+ * (src/utils/partialDelta.ts).
+ */
+
+// Text fields of a translation message that get delta-encoded
+const DELTA_FIELDS = ['originalText', 'correctedText', 'translatedText', 'transcript', 'translation'];
+
+const DEFAULT_KEYFRAME_INTERVAL = 20;
+
+// Recent partials both sides keep as candidate bases
+const MAX_BASES = 4;
+
+/**
+ * Length of the common prefix of two strings, never splitting a surrogate pair
+ * @param {string} a - First string
+ * @param {string} b - Second string
+ * @returns {number}
+ */
+function commonPrefixLength(a, b) {
+  const max = Math.min(a.length, b.length);
+  let i = 0;
+  while (i < max && a.charCodeAt(i) === b.charCodeAt(i)) {
+    i++;
+  }
+  // Don't end the prefix between the halves of a surrogate pair
+  if (i > 0 && i < max) {
+    const code = a.charCodeAt(i - 1);
+    if (code >= 0xd800 && code <= 0xdbff) i--;
+  }
+  return i;
+}
+
+class PartialDeltaEncoder {
+  /**
+   * @param {Object} options - Encoder options
+   * @param {number} options.keyframeInterval - Send a full keyframe at least every N partials
+   */
+  constructor(options = {}) {
+    this.keyframeInterval = Math.max(1, options.keyframeInterval || DEFAULT_KEYFRAME_INTERVAL);
+    this.bases = []; // { seqId, fields } of the most recent partials sent, oldest first
+    this.sinceKeyframe = 0;
+
+    this.stats = {
+      keyframes: 0,
+      deltas: 0,
+      fullChars: 0, // Text chars the partials would have carried in full
+      sentChars: 0 // Text chars actually sent
+    };
+  }
+
+  /**
+   * Encode an outgoing message. Finals and non-translation messages pass
+   * through unchanged.
+   * @param {Object} message - Fully built message (with seqId)
+   * @returns {Object} - Message to serialize
+   */
+  encode(message) {
+    if (message.type !== 'translation' || !message.isPartial || message.seqId === undefined) {
+      return message;
+    }
+
+    const fields = {};
+    let fullChars = 0;
+    for (const name of DELTA_FIELDS) {
+      if (typeof message[name] === 'string') {
+        fields[name] = message[name];
+        fullChars += message[name].length;
+      }
+    }
+    this.stats.fullChars += fullChars;
+
+    let delta = null;
+    if (this.sinceKeyframe < this.keyframeInterval) {
+      for (const base of this.bases) {
+        const candidate = this.diff(base, fields);
+        if (!delta || candidate.chars < delta.chars) delta = candidate;
+      }
+    }
+
+    if (!delta || delta.chars >= fullChars) {
+      this.bases = [{ seqId: message.seqId, fields }];
+      this.sinceKeyframe = 1;
+      this.stats.keyframes++;
+      this.stats.sentChars += fullChars;
+      return { ...message, keyframe: true };
+    }
+
+    const encoded = { ...message };
+    for (const name of DELTA_FIELDS) {
+      delete encoded[name];
+    }
+    encoded.delta = { baseSeqId: delta.baseSeqId, fields: delta.fields };
+
+    this.bases.push({ seqId: message.seqId, fields });
+    if (this.bases.length > MAX_BASES) this.bases.shift();
+    this.sinceKeyframe++;
+    this.stats.deltas++;
+    this.stats.sentChars += delta.chars;
+    return encoded;
+  }
+
+  /**
+   * Per-field (prefix, suffix) diff against a base
+   * @private
+   * @returns {Object} - { baseSeqId, fields, chars }
+   */
+  diff(base, fields) {
+    const baseFields = base.fields;
+    const out = {};
+    let chars = 0;
+    for (const name of DELTA_FIELDS) {
+      const previous = baseFields[name];
+      const current = fields[name];
+      if (current === previous) continue;
+      if (current === undefined) {
+        out[name] = null;
+        continue;
+      }
+      const prefix = previous === undefined ? 0 : commonPrefixLength(previous, current);
+      const suffix = current.substring(prefix);
+      out[name] = [prefix, suffix];
+      chars += suffix.length;
+    }
+    return { baseSeqId: base.seqId, fields: out, chars };
+  }
+
+  /**
+   * Force the next partial to be a keyframe
+   */
+  reset() {
+    this.bases = [];
+    this.sinceKeyframe = 0;
+  }
+
+  /**
+   * Encoding statistics
+   * @returns {Object}
+   */
+  getStats() {
+    return {
+      ...this.stats,
+      savedRatio: this.stats.fullChars > 0 ? 1 - this.stats.sentChars / this.stats.fullChars : 0
+    };
+  }
+}
+
+/**
+ * Create an encoder if the client asked for delta-encoded partials
+ * @param {string} partialEncoding - Value of `partialEncoding` from the client's init message
+ * @param {Object} options - See PartialDeltaEncoder constructor
+ * @returns {PartialDeltaEncoder|null}
+ */
+function createPartialEncoder(partialEncoding, options = {}) {
+  return partialEncoding === 'delta' ? new PartialDeltaEncoder(options) : null;
+}
+
+export {
+  DELTA_FIELDS,
+  DEFAULT_KEYFRAME_INTERVAL,
+  MAX_BASES,
+  PartialDeltaEncoder,
+  commonPrefixLength,
+  createPartialEncoder
+};
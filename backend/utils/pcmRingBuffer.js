@@ -0,0 +1,212 @@
+/**
+ * PCM Ring Buffer
+ *
+ * One preallocated byte ring per stream for the recent-audio window that
+ * recovery reads from. Chunk metadata lives in typed arrays indexed by chunk
+ * sequence number, so adding a chunk allocates nothing:
+ *
+ * - Chunks are copied into the ring back to back; a chunk's position is its
+ *   absolute byte offset (total bytes written before it), modulo the capacity
+ * - A slot table (one entry per SLOT_MS of wall time) maps a timestamp to the
+ *   first chunk at or after it in O(1), plus a short walk within the slot
+ * - Reads return views into the ring (one, or two when the range wraps), or a
+ *   single Buffer with one copy. Views are only valid until new audio
+ *   overwrites that part of the ring; copy anything that has to outlive it.
+ *
+ * A chunk drops out of the window when it is older than windowMs, when its
+ * bytes have been overwritten (more audio than capacityBytes arrived within the
+ * window) or when more than maxChunks newer chunks have arrived.
+ */
+
+// Width of one slot-table entry
+const SLOT_MS = 10;
+
+class PcmRingBuffer {
+  /**
+   * @param {Object} options - Ring options
+   * @param {number} options.capacityBytes - Ring size in bytes
+   * @param {number} options.maxChunks - Chunks the metadata arrays hold
+   * @param {number} options.windowMs - How long a chunk stays readable
+   */
+  constructor({ capacityBytes, maxChunks, windowMs }) {
+    this.capacity = capacityBytes;
+    this.maxChunks = maxChunks;
+    this.windowMs = windowMs;
+    this.ring = Buffer.alloc(capacityBytes);
+
+    // Per-chunk metadata, indexed by seq % maxChunks
+    this.timestamps = new Float64Array(maxChunks);
+    this.starts = new Float64Array(maxChunks); // Absolute byte offset (exceeds 2^32 on long streams)
+    this.sizes = new Uint32Array(maxChunks);
+
+    // Slot table: slotKeys[i] = slot number stored at i, slotSeqs[i] = first chunk at or after its start
+    this.slotCount = Math.ceil(windowMs / SLOT_MS) + 2;
+    this.slotKeys = new Float64Array(this.slotCount).fill(-1);
+    this.slotSeqs = new Float64Array(this.slotCount);
+    this.lastSlot = -Infinity;
+
+    this.nextSeq = 0; // Sequence number of the next chunk
+    this.oldestSeq = 0; // Oldest chunk still in the window (== nextSeq when empty)
+    this.bytesWritten = 0;
+    this.overwritten = 0; // Chunks lost to capacity or maxChunks before they aged out
+  }
+
+  /**
+   * Copy a chunk into the ring
+   * @param {Buffer} chunk - PCM bytes
+   * @param {number} timestamp - Arrival time (ms); clamped so timestamps never decrease
+   * @returns {number} - Chunk sequence number
+   */
+  write(chunk, timestamp) {
+    const seq = this.nextSeq;
+    if (seq > this.oldestSeq) {
+      timestamp = Math.max(timestamp, this.timestamps[(seq - 1) % this.maxChunks]);
+    }
+
+    // A chunk larger than the ring keeps only its tail
+    const skip = Math.max(0, chunk.length - this.capacity);
+    const size = chunk.length - skip;
+    const start = this.bytesWritten + skip;
+    const offset = start % this.capacity;
+    const first = Math.min(size, this.capacity - offset);
+    chunk.copy(this.ring, offset, skip, skip + first);
+    if (first < size) chunk.copy(this.ring, 0, skip + first);
+
+    const index = seq % this.maxChunks;
+    this.timestamps[index] = timestamp;
+    this.starts[index] = start;
+    this.sizes[index] = size;
+    this.bytesWritten = start + size;
+    this.nextSeq = seq + 1;
+    this.indexSlots(seq, timestamp);
+
+    // Drop chunks whose metadata slot or bytes were just reused
+    const oldestAllowed = Math.max(this.oldestSeq, this.nextSeq - this.maxChunks);
+    this.overwritten += oldestAllowed - this.oldestSeq;
+    this.oldestSeq = oldestAllowed;
+    while (this.oldestSeq < seq && this.starts[this.oldestSeq % this.maxChunks] < this.bytesWritten - this.capacity) {
+      this.oldestSeq++;
+      this.overwritten++;
+    }
+    return seq;
+  }
+
+  /**
+   * Point every slot from the last indexed one up to this chunk's slot at it
+   * @private
+   */
+  indexSlots(seq, timestamp) {
+    const slot = Math.floor(timestamp / SLOT_MS);
+    for (let s = Math.max(this.lastSlot + 1, slot - this.slotCount + 1); s <= slot; s++) {
+      const i = s % this.slotCount;
+      this.slotKeys[i] = s;
+      this.slotSeqs[i] = seq;
+    }
+    this.lastSlot = Math.max(this.lastSlot, slot);
+  }
+
+  /**
+   * Drop chunks older than windowMs
+   * @param {number} now - Current time (ms)
+   * @returns {number} - Chunks expired
+   */
+  expire(now) {
+    const threshold = now - this.windowMs;
+    const before = this.oldestSeq;
+    while (this.oldestSeq < this.nextSeq && this.timestamps[this.oldestSeq % this.maxChunks] <= threshold) {
+      this.oldestSeq++;
+    }
+    return this.oldestSeq - before;
+  }
+
+  /**
+   * First chunk with a timestamp at or after `timestamp`
+   * @param {number} timestamp - Time (ms)
+   * @returns {number} - Sequence number (nextSeq if none)
+   */
+  seqAtOrAfter(timestamp) {
+    if (this.oldestSeq === this.nextSeq) return this.nextSeq;
+    if (timestamp <= this.timestamps[this.oldestSeq % this.maxChunks]) return this.oldestSeq;
+    if (timestamp > this.timestamps[(this.nextSeq - 1) % this.maxChunks]) return this.nextSeq;
+
+    const slot = Math.floor(timestamp / SLOT_MS);
+    const i = slot % this.slotCount;
+    let seq = this.slotKeys[i] === slot ? Math.max(this.slotSeqs[i], this.oldestSeq) : this.oldestSeq;
+    while (seq < this.nextSeq && this.timestamps[seq % this.maxChunks] < timestamp) seq++;
+    return seq;
+  }
+
+  /**
+   * Chunks with fromTimestamp <= timestamp <= toTimestamp, as views into the ring
+   * @param {number} fromTimestamp - Start (ms, inclusive)
+   * @param {number} toTimestamp - End (ms, inclusive)
+   * @returns {Object} - { views: Buffer[] (0-2, zero-copy), chunks, bytes }
+   */
+  views(fromTimestamp, toTimestamp) {
+    const first = this.seqAtOrAfter(fromTimestamp);
+    const last = this.seqAtOrAfter(Math.floor(toTimestamp) + 1) - 1;
+    if (last < first) return { views: [], chunks: 0, bytes: 0 };
+
+    const start = this.starts[first % this.maxChunks];
+    const bytes = this.starts[last % this.maxChunks] + this.sizes[last % this.maxChunks] - start;
+    const offset = start % this.capacity;
+    const views = offset + bytes <= this.capacity
+      ? [this.ring.subarray(offset, offset + bytes)]
+      : [this.ring.subarray(offset), this.ring.subarray(0, offset + bytes - this.capacity)];
+    return { views, chunks: last - first + 1, bytes };
+  }
+
+  /**
+   * Same range as views(), copied into one new Buffer
+   * @param {number} fromTimestamp - Start (ms, inclusive)
+   * @param {number} toTimestamp - End (ms, inclusive)
+   * @returns {Buffer}
+   */
+  copy(fromTimestamp, toTimestamp) {
+    const { views, bytes } = this.views(fromTimestamp, toTimestamp);
+    return views.length === 0 ? Buffer.alloc(0) : Buffer.concat(views, bytes);
+  }
+
+  /** Chunks in the window */
+  get chunkCount() {
+    return this.nextSeq - this.oldestSeq;
+  }
+
+  /** Bytes in the window */
+  get byteCount() {
+    if (this.chunkCount === 0) return 0;
+    return this.bytesWritten - this.starts[this.oldestSeq % this.maxChunks];
+  }
+
+  /** Timestamp of the oldest chunk in the window (null when empty) */
+  get oldestTimestamp() {
+    return this.chunkCount === 0 ? null : this.timestamps[this.oldestSeq % this.maxChunks];
+  }
+
+  /** Timestamp of the newest chunk in the window (null when empty) */
+  get newestTimestamp() {
+    return this.chunkCount === 0 ? null : this.timestamps[(this.nextSeq - 1) % this.maxChunks];
+  }
+
+  /**
+   * Empty the window (the ring stays allocated)
+   * @returns {number} - Chunks dropped
+   */
+  clear() {
+    const dropped = this.chunkCount;
+    this.oldestSeq = this.nextSeq;
+    return dropped;
+  }
+
+  /**
+   * Release the ring (the buffer cannot be written afterwards)
+   */
+  release() {
+    this.clear();
+    this.ring = Buffer.alloc(0);
+  }
+}
+
+export {
+  PcmRingBuffer
+};
@@ -0,0 +1,329 @@
+/**
+ * Stable-Prefix Translation Cache
+ *
+ * Cache for partial translations that keeps working while a partial grows.
+ *
+ * The old partial cache keyed on `text.substring(0, 150)` (or a length/prefix/
+ * suffix composite), so a partial that grew by one word was a new key and the
+ * cache almost never hit. Here each language pair has a trie whose edges are
+ * complete sentences of the source text:
+ *
+ *   "In the beginning God created. And the earth was" →
+ *     root ─"In the beginning God created."→ node (translation of the prefix)
+ *          tail "And the earth was" → exact translation
+ *
+ * - A partial whose complete sentences are already in the trie reuses the
+ *   translation of that stable prefix and only the tail is sent to the API
+ * - Sentence-level translations are only stored when the translated text has
+ *   the same sentence structure as the source, so a cached prefix translation
+ *   always corresponds to exactly those source sentences
+ * - Entries are evicted LRU once `maxEntries` is exceeded and expire after `ttlMs`
+ */
+
+const DEFAULT_MAX_ENTRIES = 500;
+const DEFAULT_TTL_MS = 120000; // Same 2 minutes the old partial cache used
+
+// A sentence: text up to terminal punctuation plus closing quotes/brackets. ASCII
+// terminators only count when followed by whitespace or the end ("3.14", "U.S.A"
+// stay inside a sentence); CJK terminators always end one. An inner run of ASCII
+// terminators is always taken whole (it may not be followed by another one), so
+// "Wait.....x" has a single parse instead of exponentially many. Sticky so each
+// exec only tries the current offset.
+const SENTENCE_PATTERN = /(?:[^.!?。！？]|[.!?]+(?![.!?]|["'”’)\]]*(?:\s|$)))*(?:[。！？]+["'”’)\]]*\s*|[.!?]+["'”’)\]]*(?:\s+|$))/gy;
+
+// Target languages written without spaces between sentences (and words)
+const UNSPACED_LANGUAGES = new Set(['zh', 'ja', 'th', 'lo', 'km', 'my']);
+
+/**
+ * Separator between translated sentences in a target language
+ * @param {string} lang - Language code ('ja', 'zh-CN', ...)
+ * @returns {string} - '' for unspaced scripts, ' ' otherwise
+ */
+function sentenceSeparator(lang) {
+  const base = String(lang || '').toLowerCase().split(/[-_]/)[0];
+  return UNSPACED_LANGUAGES.has(base) ? '' : ' ';
+}
+
+/**
+ * Re-attach a cached prefix translation to the translation of the tail
+ * @param {string} translatedPrefix - Cached translation of the stable prefix
+ * @param {string} translatedTail - Translation of the remainder
+ * @param {string} targetLang - Target language code
+ * @returns {string}
+ */
+function joinTranslation(translatedPrefix, translatedTail, targetLang) {
+  if (!translatedPrefix) return translatedTail;
+  if (!translatedTail) return translatedPrefix;
+  return `${translatedPrefix}${sentenceSeparator(targetLang)}${translatedTail}`;
+}
+
+/**
+ * Split text into complete sentences and an unfinished tail
+ * @param {string} text - Source or translated text
+ * @returns {Object} - { sentences: string[] (trimmed), ends: number[] (offset after each), tail: string }
+ */
+function splitSentences(text) {
+  const sentences = [];
+  const ends = [];
+  let offset = 0;
+  SENTENCE_PATTERN.lastIndex = 0;
+  let match;
+  while ((match = SENTENCE_PATTERN.exec(text)) !== null && match.index === offset && match[0].length > 0) {
+    const sentence = match[0].trim();
+    offset += match[0].length;
+    if (sentence) {
+      sentences.push(sentence);
+      ends.push(offset);
+    }
+  }
+  return { sentences, ends, tail: text.substring(offset).trim() };
+}
+
+class TrieNode {
+  constructor(parent = null, key = null) {
+    this.parent = parent;
+    this.key = key;
+    this.children = new Map(); // sentence -> TrieNode
+    this.prefix = null; // Entry: translation of all sentences up to this node
+    this.tails = new Map(); // tail text -> Entry: translation of prefix + tail
+  }
+
+  isEmpty() {
+    return !this.prefix && this.tails.size === 0 && this.children.size === 0;
+  }
+}
+
+class PrefixTranslationCache {
+  /**
+   * @param {Object} options - Cache options
+   * @param {number} options.maxEntries - Maximum cached translations across all language pairs
+   * @param {number} options.ttlMs - Time to live for each entry
+   */
+  constructor(options = {}) {
+    this.maxEntries = options.maxEntries || DEFAULT_MAX_ENTRIES;
+    this.ttlMs = options.ttlMs || DEFAULT_TTL_MS;
+
+    this.roots = new Map(); // "source:target" -> TrieNode
+    this.lru = new Set(); // Entries, least recently used first
+
+    this.stats = {
+      hits: 0, // Exact text found
+      prefixHits: 0, // Stable prefix reused, tail translated
+      misses: 0,
+      bytesSaved: 0, // Source chars not sent to the API thanks to hits
+      evictions: 0,
+      expirations: 0
+    };
+  }
+
+  /**
+   * Look up a partial
+   * @param {string} sourceLang - Source language code
+   * @param {string} targetLang - Target language code
+   * @param {string} text - Partial text
+   * @returns {Object} - One of:
+   *   { translation } - exact hit
+   *   { translatedPrefix, prefixText, remainder } - stable prefix hit; translate `remainder` only
+   *   {} - miss
+   */
+  lookup(sourceLang, targetLang, text) {
+    const root = this.roots.get(`${sourceLang}:${targetLang}`);
+    const source = text.trim();
+    if (!root || !source) {
+      this.stats.misses++;
+      return {};
+    }
+
+    const { sentences, ends, tail } = splitSentences(source);
+    const now = Date.now();
+
+    // Walk as deep as the complete sentences go, remembering the deepest usable prefix
+    let node = root;
+    let depth = 0;
+    let best = null;
+    let bestDepth = 0;
+    for (const sentence of sentences) {
+      const child = node.children.get(sentence);
+      if (!child) break;
+      node = child;
+      depth++;
+      if (node.prefix && this.touch(node.prefix, now)) {
+        best = node.prefix;
+        bestDepth = depth;
+      }
+    }
+
+    // Exact: every sentence matched and the tail (if any) was translated before
+    if (depth === sentences.length) {
+      const exact = tail ? node.tails.get(tail) : node.prefix;
+      if (exact && this.touch(exact, now)) {
+        this.stats.hits++;
+        this.stats.bytesSaved += source.length;
+        return { translation: exact.translation };
+      }
+    }
+
+    if (best) {
+      const prefixEnd = ends[bestDepth - 1];
+      this.stats.prefixHits++;
+      this.stats.bytesSaved += prefixEnd;
+      return {
+        translatedPrefix: best.translation,
+        prefixText: source.substring(0, prefixEnd).trim(),
+        remainder: source.substring(prefixEnd).trim()
+      };
+    }
+
+    this.stats.misses++;
+    return {};
+  }
+
+  /**
+   * Store a translation of a partial
+   * @param {string} sourceLang - Source language code
+   * @param {string} targetLang - Target language code
+   * @param {string} text - Partial text
+   * @param {string} translation - Its translation
+   */
+  set(sourceLang, targetLang, text, translation) {
+    const source = text.trim();
+    const translated = (translation || '').trim();
+    if (!source || !translated) return;
+
+    const pairKey = `${sourceLang}:${targetLang}`;
+    let root = this.roots.get(pairKey);
+    if (!root) {
+      root = new TrieNode(null, pairKey);
+      this.roots.set(pairKey, root);
+    }
+
+    const src = splitSentences(source);
+    const dst = splitSentences(translated);
+
+    // Sentence translations line up if the translation has the same number of
+    // complete sentences (tail still unfinished), or one more when the only
+    // difference is that the translator punctuated the tail
+    const aligned = dst.sentences.length === src.sentences.length ||
+      (src.tail && !dst.tail && dst.sentences.length === src.sentences.length + 1);
+
+    let node = root;
+    for (let i = 0; i < src.sentences.length; i++) {
+      const sentence = src.sentences[i];
+      let child = node.children.get(sentence);
+      if (!child) {
+        child = new TrieNode(node, sentence);
+        node.children.set(sentence, child);
+      }
+      node = child;
+      if (aligned) {
+        this.store(node, null, dst.sentences.slice(0, i + 1).join(sentenceSeparator(targetLang)));
+      }
+    }
+
+    if (src.tail) {
+      this.store(node, src.tail, translated);
+    } else if (!aligned) {
+      this.store(node, null, translated);
+    }
+  }
+
+  /**
+   * @private
+   */
+  store(node, tail, translation) {
+    const existing = tail === null ? node.prefix : node.tails.get(tail);
+    if (existing) {
+      this.lru.delete(existing);
+    }
+    const entry = { node, tail, translation, expiresAt: Date.now() + this.ttlMs };
+    if (tail === null) {
+      node.prefix = entry;
+    } else {
+      node.tails.set(tail, entry);
+    }
+    this.lru.add(entry);
+
+    while (this.lru.size > this.maxEntries) {
+      const oldest = this.lru.values().next().value;
+      this.remove(oldest);
+      this.stats.evictions++;
+    }
+  }
+
+  /**
+   * Refresh an entry's LRU position; false (and removed) if it expired
+   * @private
+   */
+  touch(entry, now) {
+    if (now >= entry.expiresAt) {
+      this.remove(entry);
+      this.stats.expirations++;
+      return false;
+    }
+    this.lru.delete(entry);
+    this.lru.add(entry);
+    return true;
+  }
+
+  /**
+   * Drop an entry and prune trie nodes left empty
+   * @private
+   */
+  remove(entry) {
+    this.lru.delete(entry);
+    const { node, tail } = entry;
+    if (tail === null) {
+      if (node.prefix === entry) node.prefix = null;
+    } else if (node.tails.get(tail) === entry) {
+      node.tails.delete(tail);
+    }
+
+    let current = node;
+    while (current.parent && current.isEmpty()) {
+      current.parent.children.delete(current.key);
+      current = current.parent;
+    }
+    if (!current.parent && current.isEmpty()) {
+      this.roots.delete(current.key);
+    }
+  }
+
+  /**
+   * Number of cached translations
+   * @returns {number}
+   */
+  get size() {
+    return this.lru.size;
+  }
+
+  /**
+   * Drop everything
+   */
+  clear() {
+    this.roots.clear();
+    this.lru.clear();
+  }
+
+  /**
+   * Hit/miss counters
+   * @returns {Object}
+   */
+  getStats() {
+    const lookups = this.stats.hits + this.stats.prefixHits + this.stats.misses;
+    return {
+      ...this.stats,
+      entries: this.lru.size,
+      languagePairs: this.roots.size,
+      hitRate: lookups > 0 ? (this.stats.hits + this.stats.prefixHits) / lookups : 0
+    };
+  }
+}
+
+export {
+  DEFAULT_MAX_ENTRIES,
+  DEFAULT_TTL_MS,
+  PrefixTranslationCache,
+  joinTranslation,
+  sentenceSeparator,
+  splitSentences
+};
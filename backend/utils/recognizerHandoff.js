@@ -0,0 +1,274 @@
+/**
+ * Recognizer Handoff
+ *
+ * De-overlap for warm-standby restarts of the Google streaming recognizer
+ * (googleSpeechStream.js). Instead of tearing the recognizer down at
+ * STREAMING_LIMIT / VAD_CUTOFF_LIMIT and opening a new one, the stream opens a
+ * standby recognizer, primes it with the last overlapMs of audio from the PCM
+ * ring and keeps feeding both until the outgoing one has finalized the
+ * utterance in flight (or drainMs passes). Both have then transcribed the
+ * overlap; this class decides which one owns each word:
+ *
+ * - Positions are ms on the stream's audio timeline (bytes sent / bytes per ms).
+ *   A recognizer's resultEndTime and word offsets are relative to the first
+ *   byte it was sent, so its origin maps them onto that timeline
+ * - The outgoing recognizer owns the audio up to the end of its last final (the
+ *   boundary); its results always pass through
+ * - While it drains, standby partials are dropped and standby finals are held
+ * - Once it is retired, standby finals lose the words that end before the
+ *   boundary (word time offsets are requested in handoff mode). Partials carry
+ *   no word offsets, so a leading run that repeats the tail of the outgoing
+ *   text is stripped instead
+ * - The first standby final that gets through ends the handoff
+ */
+
+const DEFAULT_HANDOFF_OVERLAP_MS = 1500;
+const DEFAULT_HANDOFF_DRAIN_MS = 4000;
+
+// Tail of an untimed outgoing text (forced final) compared against standby results
+const MAX_UNTIMED_OVERLAP_WORDS = 30;
+
+/**
+ * Convert a protobuf Duration ({ seconds, nanos }) to milliseconds
+ * @param {Object} duration - Duration; seconds may be a number, string or Long
+ * @returns {number}
+ */
+function durationToMs(duration) {
+  if (!duration) return 0;
+  const { seconds = 0, nanos = 0 } = duration;
+  const wholeSeconds = typeof seconds === 'object' && seconds.toNumber ? seconds.toNumber() : Number(seconds);
+  return wholeSeconds * 1000 + Number(nanos) / 1e6;
+}
+
+function normalizeWord(word) {
+  return word.toLowerCase().replace(/[^\p{L}\p{N}']/gu, '');
+}
+
+function splitWords(text) {
+  return (text || '').trim().split(/\s+/).filter(Boolean);
+}
+
+/**
+ * Absolute positions of a streaming response
+ * @param {Object} data - StreamingRecognizeResponse
+ * @param {number|null} originMs - Audio position of the recognizer's first byte
+ * @returns {Object|null} - { isFinal, endMs, text, words: [{ word, startMs, endMs }] },
+ *   null without results or origin
+ */
+function resultTimeline(data, originMs) {
+  if (!data?.results?.length || originMs === null || originMs === undefined) return null;
+
+  let isFinal = false;
+  let endMs = originMs;
+  const texts = [];
+  const words = [];
+  for (const result of data.results) {
+    const alternative = result.alternatives?.[0];
+    if (!alternative?.transcript?.trim()) continue;
+    texts.push(alternative.transcript.trim());
+    if (result.isFinal) isFinal = true;
+    endMs = Math.max(endMs, originMs + durationToMs(result.resultEndTime));
+    for (const info of alternative.words || []) {
+      words.push({
+        word: info.word,
+        startMs: originMs + durationToMs(info.startTime),
+        endMs: originMs + durationToMs(info.endTime)
+      });
+    }
+  }
+  if (texts.length === 0) return null;
+  return { isFinal, endMs, text: texts.join(' '), words };
+}
+
+/**
+ * Drop the leading words of `text` that repeat the end of `overlapWords`
+ *
+ * The standby recognizer starts inside audio the outgoing one already
+ * transcribed, so its text begins somewhere in overlapWords: either it runs
+ * past their end (strip the matching run) or it lies entirely inside them.
+ *
+ * @param {string} text - Standby transcript
+ * @param {string[]} overlapWords - Normalized outgoing words, in order
+ * @param {number} minMatch - Shortest run that counts as a repeat
+ * @returns {string} - Rest of the text ('' when all of it repeats)
+ */
+function stripOverlapWords(text, overlapWords, minMatch = 1) {
+  const words = splitWords(text);
+  const normalized = words.map(normalizeWord);
+  const n = overlapWords.length;
+
+  for (let start = 0; start < n; start++) {
+    const length = Math.min(words.length, n - start);
+    if (length < minMatch) break;
+    let matches = true;
+    for (let i = 0; i < length && matches; i++) {
+      matches = normalized[i] === overlapWords[start + i];
+    }
+    if (matches) return words.slice(length).join(' ');
+  }
+  return words.join(' ');
+}
+
+class RecognizerHandoff {
+  /**
+   * @param {Object} options - Handoff positions
+   * @param {number} options.outgoingOriginMs - Audio position of the outgoing recognizer's first byte
+   * @param {number} options.standbyOriginMs - Audio position of the first primed byte
+   * @param {number} options.handoffMs - Audio position when the standby was opened (end of the primed audio)
+   * @param {Object|null} options.lastFinal - resultTimeline() of the outgoing recognizer's last final
+   */
+  constructor({ outgoingOriginMs, standbyOriginMs, handoffMs, lastFinal = null }) {
+    this.outgoingOriginMs = outgoingOriginMs;
+    this.standbyOriginMs = standbyOriginMs;
+    this.handoffMs = handoffMs;
+
+    this.boundaryMs = standbyOriginMs; // Standby audio before this was already transcribed
+    this.overlapWords = [];            // Normalized outgoing words inside the primed audio
+    this.minMatch = 1;
+    this.lastOutgoingPartial = null;   // Timeline of the outgoing partial not finalized yet
+    this.heldFinals = [];              // Standby finals that arrived while the outgoing one drained
+    this.draining = true;
+    this.done = false;
+    this.droppedResults = 0;
+    this.trimmedWords = 0;
+
+    if (lastFinal) this.setBoundary(lastFinal);
+  }
+
+  /**
+   * Move the boundary to the end of outgoing text
+   * @private
+   */
+  setBoundary(timeline) {
+    this.boundaryMs = Math.max(this.boundaryMs, timeline.endMs);
+    if (timeline.words.length > 0) {
+      this.overlapWords = timeline.words
+        .filter(word => word.endMs > this.standbyOriginMs)
+        .map(word => normalizeWord(word.word))
+        .filter(Boolean);
+      this.minMatch = 1;
+    } else {
+      // No word offsets: any tail of the text may fall inside the primed audio
+      this.overlapWords = splitWords(timeline.text)
+        .slice(-MAX_UNTIMED_OVERLAP_WORDS)
+        .map(normalizeWord)
+        .filter(Boolean);
+      this.minMatch = 2;
+    }
+  }
+
+  /**
+   * Note a result from the outgoing recognizer (it is delivered unchanged)
+   * @param {Object|null} timeline - resultTimeline() at outgoingOriginMs
+   * @returns {boolean} - true once it has finalized audio up to the handoff point (retire it)
+   */
+  fromOutgoing(timeline) {
+    if (!timeline) return false;
+    if (!timeline.isFinal) {
+      this.lastOutgoingPartial = timeline;
+      return false;
+    }
+    this.lastOutgoingPartial = null;
+    this.setBoundary(timeline);
+    return timeline.endMs >= this.handoffMs;
+  }
+
+  /**
+   * The outgoing recognizer was closed
+   * @param {string|null} forcedText - Its partial, force-committed as a final because it never finalized
+   * @returns {Object[]} - Held standby finals that survive de-overlap, in arrival order
+   */
+  retire(forcedText = null) {
+    if (forcedText) {
+      this.setBoundary({
+        endMs: this.lastOutgoingPartial?.endMs ?? this.boundaryMs,
+        text: forcedText,
+        words: []
+      });
+    }
+    this.lastOutgoingPartial = null;
+    this.draining = false;
+
+    const held = this.heldFinals;
+    this.heldFinals = [];
+    return held.map(({ data, timeline }) => this.trim(data, timeline)).filter(Boolean);
+  }
+
+  /**
+   * Filter a result from the standby recognizer
+   * @param {Object} data - StreamingRecognizeResponse
+   * @param {Object|null} timeline - resultTimeline() at standbyOriginMs
+   * @returns {Object|null} - Response to deliver (trimmed copy when needed), or null to drop it
+   */
+  fromStandby(data, timeline) {
+    if (this.draining) {
+      if (timeline?.isFinal) this.heldFinals.push({ data, timeline });
+      return null;
+    }
+    return this.trim(data, timeline);
+  }
+
+  /**
+   * Remove what the outgoing recognizer already delivered
+   * @private
+   */
+  trim(data, timeline) {
+    if (!timeline || this.done) return data;
+
+    let changed = false;
+    const results = [];
+    for (const result of data.results) {
+      const trimmed = this.trimResult(result);
+      if (trimmed !== result) changed = true;
+      if (trimmed) results.push(trimmed);
+    }
+
+    if (results.length === 0) {
+      this.droppedResults++;
+      return null;
+    }
+    if (timeline.isFinal) this.done = true;
+    return changed ? { ...data, results } : data;
+  }
+
+  /**
+   * @private
+   * @returns {Object|null} - The result, a trimmed copy, or null when all of it was already delivered
+   */
+  trimResult(result) {
+    const alternative = result.alternatives?.[0];
+    if (!alternative?.transcript?.trim()) return result;
+    if (this.standbyOriginMs + durationToMs(result.resultEndTime) <= this.boundaryMs) return null;
+
+    const words = alternative.words || [];
+    let transcript;
+    let keptWords = words;
+    if (result.isFinal && words.length > 0) {
+      // A word belongs to whichever side of the boundary its midpoint is on
+      keptWords = words.filter(info =>
+        this.standbyOriginMs + (durationToMs(info.startTime) + durationToMs(info.endTime)) / 2 > this.boundaryMs);
+      if (keptWords.length === words.length) return result;
+      transcript = keptWords.map(info => info.word).join(' ');
+      this.trimmedWords += words.length - keptWords.length;
+    } else {
+      transcript = stripOverlapWords(alternative.transcript, this.overlapWords, this.minMatch);
+      if (transcript === alternative.transcript.trim()) return result;
+      this.trimmedWords += splitWords(alternative.transcript).length - splitWords(transcript).length;
+    }
+
+    if (!transcript) return null;
+    return {
+      ...result,
+      alternatives: [{ ...alternative, transcript, words: keptWords }, ...result.alternatives.slice(1)]
+    };
+  }
+}
+
+export {
+  DEFAULT_HANDOFF_DRAIN_MS,
+  DEFAULT_HANDOFF_OVERLAP_MS,
+  RecognizerHandoff,
+  durationToMs,
+  resultTimeline,
+  stripOverlapWords
+};
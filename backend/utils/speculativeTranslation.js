@@ -0,0 +1,280 @@
+/**
+ * Speculative Final Translation
+ *
+ * The merge patch sets often promote the tracked partial to the final ("partial
+ * extends beyond final"), yet translateFinal only started once the final
+ * arrived, so the whole GPT round trip sat on the critical path.
+ *
+ * A SpeculativeTranslator watches the tracked partial. Once it has been stable
+ * for `stableMs`, it is translated in the background, keyed by language pair
+ * and normalized text (utils/finalDeduplicator.js normalizeFinal, so the
+ * punctuation and casing Google adds to the final still match):
+ *
+ * - translateFinal(text) reuses a matching speculation - finished or still in
+ *   flight - and otherwise translates normally
+ * - Speculations the final did not match are aborted and counted as wasted;
+ *   once `maxWastedPerMinute` is used up, no new speculation starts until the
+ *   oldest waste ages out of the minute
+ * - A failed speculation falls back to a normal translation of the final
+ */
+
+import { normalizeFinal } from './finalDeduplicator.js';
+import { recordSpeculation } from './metrics.js';
+
+const DEFAULT_STABLE_MS = 400;
+const DEFAULT_MIN_WORDS = 3;
+const DEFAULT_MAX_SPECULATIONS = 2;
+const DEFAULT_MAX_WASTED_PER_MINUTE = 20;
+const BUDGET_WINDOW_MS = 60000;
+
+// All live translators, for getSpeculationStats()
+const liveTranslators = new Set();
+const retiredTotals = { started: 0, hits: 0, inFlightHits: 0, wasted: 0, failed: 0, budgetSkipped: 0, savedMs: 0 };
+
+function isAbortError(error) {
+  return error?.name === 'AbortError';
+}
+
+class SpeculativeTranslator {
+  /**
+   * @param {Object} options - Translator options
+   * @param {string} options.sessionId - Session the translator belongs to (for stats)
+   * @param {Function} options.translate - async (text, signal) => translatedText; used for
+   *   speculative and normal translations alike
+   * @param {Function} options.contextKey - () => string identifying the language pair;
+   *   speculations from another context never match
+   * @param {boolean} options.enabled - When false, translateFinal() always translates normally
+   * @param {number} options.stableMs - How long a partial must stay unchanged before it is translated
+   * @param {number} options.minWords - Shorter partials are not speculated on
+   * @param {number} options.maxSpeculations - Live speculations kept; the oldest is dropped beyond this
+   * @param {number} options.maxWastedPerMinute - Wasted speculative calls allowed per minute
+   */
+  constructor(options = {}) {
+    if (typeof options.translate !== 'function') {
+      throw new Error('SpeculativeTranslator requires a translate function');
+    }
+    this.sessionId = options.sessionId || null;
+    this.translateText = options.translate;
+    this.contextKey = options.contextKey || (() => '');
+    this.enabled = options.enabled ?? true;
+    this.stableMs = options.stableMs ?? DEFAULT_STABLE_MS;
+    this.minWords = options.minWords ?? DEFAULT_MIN_WORDS;
+    this.maxSpeculations = options.maxSpeculations ?? DEFAULT_MAX_SPECULATIONS;
+    this.maxWastedPerMinute = options.maxWastedPerMinute ?? DEFAULT_MAX_WASTED_PER_MINUTE;
+
+    this.speculations = new Map(); // key -> { text, promise, abortController, startedAt, finishedAt }
+    this.wastedAt = []; // Times of recent wasted calls (budget window)
+    this.stableTimer = null;
+    this.stableKey = null;
+    this.stableText = '';
+    this.disposed = false;
+
+    this.stats = { started: 0, hits: 0, inFlightHits: 0, wasted: 0, failed: 0, budgetSkipped: 0, savedMs: 0 };
+
+    liveTranslators.add(this);
+  }
+
+  /**
+   * Key for a text in the current context
+   * @private
+   */
+  keyFor(text) {
+    return `${this.contextKey()}\u0000${normalizeFinal(text)}`;
+  }
+
+  /**
+   * Report the tracked partial; it is speculated on once it stays unchanged for stableMs
+   * @param {string} text - Latest tracked partial text
+   */
+  onPartial(text) {
+    if (!this.enabled || this.disposed) return;
+    const normalized = normalizeFinal(text);
+    if (!normalized || normalized.split(' ').length < this.minWords) return;
+
+    const key = `${this.contextKey()}\u0000${normalized}`;
+    this.stableText = text;
+    if (key === this.stableKey) return; // Unchanged (up to punctuation/case) - keep the timer running
+    this.stableKey = key;
+    clearTimeout(this.stableTimer);
+    this.stableTimer = setTimeout(() => {
+      this.stableTimer = null;
+      this.speculate(key, this.stableText);
+    }, this.stableMs);
+  }
+
+  /**
+   * Start a speculative translation
+   * @private
+   */
+  speculate(key, text) {
+    if (this.disposed || this.speculations.has(key)) return;
+    if (!this.hasBudget()) {
+      this.stats.budgetSkipped++;
+      recordSpeculation('budget_skipped');
+      return;
+    }
+
+    // The partial grew or changed - the oldest speculation is least likely to match
+    while (this.speculations.size >= this.maxSpeculations) {
+      const oldest = this.speculations.keys().next().value;
+      this.discard(oldest);
+    }
+
+    const abortController = new AbortController();
+    const speculation = { text, abortController, startedAt: Date.now(), finishedAt: null, promise: null };
+    speculation.promise = this.translateText(text, abortController.signal);
+    speculation.promise.then(
+      () => { speculation.finishedAt = Date.now(); },
+      (error) => {
+        speculation.finishedAt = Date.now();
+        if (isAbortError(error)) return;
+        speculation.failed = true;
+        this.stats.failed++;
+        recordSpeculation('failed');
+      }
+    );
+    this.speculations.set(key, speculation);
+    this.stats.started++;
+    recordSpeculation('started');
+  }
+
+  /**
+   * Whether another speculation may start without exceeding the wasted-call budget
+   * @private
+   */
+  hasBudget() {
+    const cutoff = Date.now() - BUDGET_WINDOW_MS;
+    while (this.wastedAt.length > 0 && this.wastedAt[0] <= cutoff) {
+      this.wastedAt.shift();
+    }
+    return this.wastedAt.length < this.maxWastedPerMinute;
+  }
+
+  /**
+   * Drop a speculation the final did not use
+   * @private
+   */
+  discard(key) {
+    const speculation = this.speculations.get(key);
+    if (!speculation) return;
+    this.speculations.delete(key);
+    if (speculation.failed) return; // Already counted as failed
+    if (!speculation.finishedAt) speculation.abortController.abort();
+    this.wastedAt.push(Date.now());
+    this.stats.wasted++;
+    recordSpeculation('wasted');
+  }
+
+  /**
+   * Translate a processed final, reusing a matching speculation when there is one
+   * @param {string} text - Final text
+   * @param {AbortSignal} signal - Aborts the translation (and a matching in-flight speculation)
+   * @returns {Promise<string>} - Translated text
+   */
+  async translateFinal(text, signal) {
+    const key = this.keyFor(text);
+    const speculation = this.speculations.get(key);
+    this.speculations.delete(key);
+
+    // Whatever else was speculated belongs to partials this final did not become
+    clearTimeout(this.stableTimer);
+    this.stableTimer = null;
+    this.stableKey = null;
+    for (const other of [...this.speculations.keys()]) {
+      this.discard(other);
+    }
+
+    if (!speculation || speculation.failed) {
+      return this.translateText(text, signal);
+    }
+
+    // Latency taken off the critical path: all of it if the speculation already finished
+    this.stats.hits++;
+    if (!speculation.finishedAt) this.stats.inFlightHits++;
+    this.stats.savedMs += (speculation.finishedAt ?? Date.now()) - speculation.startedAt;
+    recordSpeculation('hit');
+
+    const onAbort = () => speculation.abortController.abort();
+    signal?.addEventListener('abort', onAbort, { once: true });
+    try {
+      return await speculation.promise;
+    } catch (error) {
+      if (isAbortError(error) || signal?.aborted) throw error;
+      return this.translateText(text, signal); // Speculation failed - counted when it settled
+    } finally {
+      signal?.removeEventListener('abort', onAbort);
+    }
+  }
+
+  /**
+   * @returns {Object} - Counters plus live speculation count
+   */
+  getStats() {
+    return {
+      sessionId: this.sessionId,
+      enabled: this.enabled,
+      ...this.stats,
+      live: this.speculations.size,
+      wastedLastMinute: this.wastedAt.length
+    };
+  }
+
+  /**
+   * Abort live speculations and fold the counters into the process totals
+   */
+  dispose() {
+    if (!liveTranslators.delete(this)) return;
+    this.disposed = true;
+    clearTimeout(this.stableTimer);
+    this.stableTimer = null;
+    for (const speculation of this.speculations.values()) {
+      if (!speculation.finishedAt) speculation.abortController.abort();
+    }
+    this.speculations.clear();
+    for (const key of Object.keys(retiredTotals)) {
+      retiredTotals[key] += this.stats[key];
+    }
+  }
+}
+
+/**
+ * Create a translator, with settings from the environment (SPECULATIVE_TRANSLATION=true
+ * enables it; SPECULATIVE_STABLE_MS, SPECULATIVE_MAX_WASTED_PER_MINUTE)
+ * @param {Object} options - SpeculativeTranslator options; explicit values win
+ * @returns {SpeculativeTranslator}
+ */
+function createSpeculativeTranslator(options = {}) {
+  const stableMs = parseInt(process.env.SPECULATIVE_STABLE_MS, 10);
+  const maxWasted = parseInt(process.env.SPECULATIVE_MAX_WASTED_PER_MINUTE, 10);
+  return new SpeculativeTranslator({
+    enabled: process.env.SPECULATIVE_TRANSLATION === 'true',
+    stableMs: Number.isNaN(stableMs) ? undefined : stableMs,
+    maxWastedPerMinute: Number.isNaN(maxWasted) ? undefined : maxWasted,
+    ...options
+  });
+}
+
+/**
+ * Speculation totals across all sessions, plus per-session stats for live ones
+ * @returns {Object} - { active: number, totals: Object, sessions: Object[] }
+ */
+function getSpeculationStats() {
+  const totals = { ...retiredTotals };
+  const sessions = [];
+  for (const translator of liveTranslators) {
+    const stats = translator.getStats();
+    sessions.push(stats);
+    for (const key of Object.keys(totals)) {
+      totals[key] += stats[key];
+    }
+  }
+  return { active: liveTranslators.size, totals, sessions };
+}
+
+export {
+  DEFAULT_STABLE_MS,
+  DEFAULT_MAX_WASTED_PER_MINUTE,
+  SpeculativeTranslator,
+  createSpeculativeTranslator,
+  getSpeculationStats
+};
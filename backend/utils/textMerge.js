@@ -0,0 +1,128 @@
+/**
+ * Transcript Text Merge Utility
+ *
+ * Linear-time suffix/prefix overlap detection for merging consecutive finals
+ * and partials from Google Speech.
+ *
+ * Replaces the inline `findOverlap` closures that the backend/*.py patchers used
+ * to inject into soloModeHandler.js. Those closures tried every suffix length
+ * from the shorter text's length down to 21 and called `startsWith` for each,
+ * which is quadratic in the text length and gets slow once the accumulated
+ * finals hold several minutes of speech.
+ *
+ * This module uses the KMP prefix (failure) function instead: only the last
+ * `min(|old|, |new|, maxOverlap)` characters of the old text are scanned once,
+ * so the cost of a merge depends on the size of the incoming text, not on how
+ * much text has been accumulated.
+ *
+ * A Python reference implementation with the same semantics lives in
+ * backend/tools/textmerge.py.
+ */
+
+// Overlaps of 20 characters or fewer are treated as coincidental (matches the
+// `i > 20` loop bound of the original closures)
+const DEFAULT_MIN_OVERLAP = 21;
+
+// The accumulated-finals merge only ever looked at the last 100 characters
+const ACCUMULATED_MAX_OVERLAP = 100;
+
+/**
+ * Compute the KMP prefix function of a string
+ *
+ * pi[i] is the length of the longest proper prefix of text[0..i] that is also
+ * a suffix of text[0..i].
+ *
+ * @param {string} text - Text to analyze
+ * @returns {Int32Array} - Prefix function values
+ */
+function prefixFunction(text) {
+  const n = text.length;
+  const pi = new Int32Array(n);
+  for (let i = 1; i < n; i++) {
+    let k = pi[i - 1];
+    const c = text.charCodeAt(i);
+    while (k > 0 && text.charCodeAt(k) !== c) {
+      k = pi[k - 1];
+    }
+    if (text.charCodeAt(k) === c) {
+      k++;
+    }
+    pi[i] = k;
+  }
+  return pi;
+}
+
+/**
+ * Find the longest suffix of oldText that is also a prefix of newText
+ *
+ * Runs in O(min(|oldText|, |newText|, maxOverlap)) time.
+ *
+ * @param {string} oldText - Text that came first (e.g. accumulated finals)
+ * @param {string} newText - Text that may continue oldText (e.g. a new final or partial)
+ * @param {Object} options - Matching options
+ * @param {number} options.minOverlap - Shortest overlap that counts as a match (default 21)
+ * @param {number} options.maxOverlap - Longest overlap to consider (default unbounded)
+ * @returns {number} - Overlap length in characters, or 0 if there is no overlap
+ */
+function findOverlap(oldText, newText, options = {}) {
+  const { minOverlap = DEFAULT_MIN_OVERLAP, maxOverlap = Infinity } = options;
+  if (!oldText || !newText) return 0;
+
+  const limit = Math.min(oldText.length, newText.length, maxOverlap);
+  if (limit < minOverlap || limit <= 0) return 0;
+
+  // Only the last `limit` characters of oldText can take part in an overlap
+  const pattern = newText.substring(0, limit);
+  const pi = prefixFunction(pattern);
+  const start = oldText.length - limit;
+
+  // Feed the old tail through the KMP automaton for the pattern; the final
+  // state is the longest pattern prefix that ends the tail
+  let k = 0;
+  for (let i = start; i < oldText.length; i++) {
+    const c = oldText.charCodeAt(i);
+    while (k > 0 && pattern.charCodeAt(k) !== c) {
+      k = pi[k - 1];
+    }
+    if (pattern.charCodeAt(k) === c) {
+      k++;
+    }
+  }
+
+  return k >= minOverlap ? k : 0;
+}
+
+/**
+ * Merge two texts, collapsing the overlap between the end of oldText and the
+ * start of newText
+ *
+ * @param {string} oldText - Text that came first
+ * @param {string} newText - Text that may continue oldText
+ * @param {Object} options - Matching options (see findOverlap)
+ * @returns {Object} - { overlap: number, newPart: string, mergedText: string|null }
+ *   mergedText is null when no overlap was found
+ */
+function mergeWithOverlap(oldText, newText, options = {}) {
+  const oldTrimmed = (oldText || '').trim();
+  const newTrimmed = (newText || '').trim();
+  const overlap = findOverlap(oldTrimmed, newTrimmed, options);
+
+  if (overlap === 0) {
+    return { overlap: 0, newPart: newTrimmed, mergedText: null };
+  }
+
+  const newPart = newTrimmed.substring(overlap).trim();
+  return {
+    overlap,
+    newPart,
+    mergedText: newPart ? `${oldTrimmed} ${newPart}` : oldTrimmed
+  };
+}
+
+export {
+  DEFAULT_MIN_OVERLAP,
+  ACCUMULATED_MAX_OVERLAP,
+  prefixFunction,
+  findOverlap,
+  mergeWithOverlap
+};
@@ -0,0 +1,245 @@
+/**
+ * Rolling Transcript Buffer
+ *
+ * Bounded replacement for the ever-growing `accumulatedFinals` string that the
+ * backend/fix_missing_sentences.py patch injects into soloModeHandler.js.
+ *
+ * - Committed finals are stored as segment chunks instead of one concatenated string
+ * - A fixed-size tail window is kept up to date for overlap matching, so merging a
+ *   new final never has to look at the whole accumulated text
+ * - Total size is capped; the oldest segments are evicted (and counted) if sends
+ *   keep failing and the buffer is never cleared
+ * - Live buffers are registered per session so memory usage can be inspected
+ */
+
+import { ACCUMULATED_MAX_OVERLAP } from './textMerge.js';
+
+// Tail kept for overlap matching - comfortably larger than the 100-char overlap cap
+const DEFAULT_TAIL_WINDOW_CHARS = 512;
+
+// ~3-4 minutes of continuous speech; anything beyond this was never sent anyway
+const DEFAULT_MAX_CHARS = 20000;
+
+const SEPARATOR = ' ';
+
+// All live buffers, for per-session memory stats
+const liveBuffers = new Set();
+
+class TranscriptBuffer {
+  /**
+   * @param {Object} options - Buffer options
+   * @param {string} options.sessionId - Session the buffer belongs to (for stats)
+   * @param {number} options.tailWindowChars - Characters kept in the overlap tail window
+   * @param {number} options.maxChars - Maximum characters retained before evicting old segments
+   */
+  constructor(options = {}) {
+    this.sessionId = options.sessionId || null;
+    this.tailWindowChars = Math.max(options.tailWindowChars || DEFAULT_TAIL_WINDOW_CHARS, ACCUMULATED_MAX_OVERLAP);
+    this.maxChars = Math.max(options.maxChars || DEFAULT_MAX_CHARS, this.tailWindowChars);
+
+    this.segments = [];
+    this.charCount = 0;
+    this.tail = '';
+    this.joined = '';
+    this.joinedValid = true;
+
+    this.stats = {
+      appends: 0,
+      clears: 0,
+      peakChars: 0,
+      evictedSegments: 0,
+      evictedChars: 0
+    };
+
+    this.createdAt = Date.now();
+    liveBuffers.add(this);
+  }
+
+  /**
+   * Total length in characters (segments joined with single spaces)
+   * @returns {number}
+   */
+  get length() {
+    return this.charCount;
+  }
+
+  /**
+   * @returns {boolean} - True if no text is buffered
+   */
+  isEmpty() {
+    return this.charCount === 0;
+  }
+
+  /**
+   * Replace the buffer contents with a single segment
+   * @param {string} text - New contents
+   */
+  set(text) {
+    this.segments = [];
+    this.charCount = 0;
+    this.tail = '';
+    this.append(text);
+  }
+
+  /**
+   * Append a segment, separated from the previous one by a space
+   * @param {string} text - Text to append
+   */
+  append(text) {
+    if (!text) return;
+
+    const added = this.segments.length > 0 ? SEPARATOR.length + text.length : text.length;
+    this.segments.push(text);
+    this.charCount += added;
+    this.stats.appends++;
+
+    const tailSource = this.tail ? this.tail + SEPARATOR + text : text;
+    this.tail = tailSource.length > this.tailWindowChars
+      ? tailSource.substring(tailSource.length - this.tailWindowChars)
+      : tailSource;
+
+    this.joinedValid = false;
+    this.evictIfNeeded();
+
+    if (this.charCount > this.stats.peakChars) {
+      this.stats.peakChars = this.charCount;
+    }
+  }
+
+  /**
+   * Drop all buffered text
+   */
+  clear() {
+    this.segments = [];
+    this.charCount = 0;
+    this.tail = '';
+    this.joined = '';
+    this.joinedValid = true;
+    this.stats.clears++;
+  }
+
+  /**
+   * Get the most recent text for overlap matching
+   * @param {number} maxChars - Maximum characters to return (defaults to the tail window)
+   * @returns {string}
+   */
+  getTail(maxChars = this.tailWindowChars) {
+    return maxChars >= this.tail.length ? this.tail : this.tail.substring(this.tail.length - maxChars);
+  }
+
+  /**
+   * Full buffered text. Joined lazily and cached until the next mutation.
+   * @returns {string}
+   */
+  toString() {
+    if (!this.joinedValid) {
+      this.joined = this.segments.join(SEPARATOR);
+      this.joinedValid = true;
+    }
+    return this.joined;
+  }
+
+  /**
+   * Copy of the buffered segments (e.g. to merge in a worker thread)
+   * @returns {string[]}
+   */
+  getSegments() {
+    return this.segments.slice();
+  }
+
+  /**
+   * Replace the contents with segments from a copy of this buffer that was
+   * merged elsewhere (see utils/finalMergeQueue.js). Not counted as appends.
+   * @param {string[]} segments - Segments, oldest first
+   */
+  load(segments) {
+    this.segments = segments.filter(Boolean);
+    this.charCount = this.segments.reduce((sum, segment) => sum + segment.length, 0) +
+      Math.max(0, this.segments.length - 1) * SEPARATOR.length;
+
+    // The tail window is the end of the joined text; only the last few segments can reach it
+    let tail = '';
+    for (let i = this.segments.length - 1; i >= 0 && tail.length < this.tailWindowChars; i--) {
+      tail = tail ? this.segments[i] + SEPARATOR + tail : this.segments[i];
+    }
+    this.tail = tail.length > this.tailWindowChars ? tail.substring(tail.length - this.tailWindowChars) : tail;
+
+    this.joinedValid = false;
+    this.evictIfNeeded();
+    if (this.charCount > this.stats.peakChars) {
+      this.stats.peakChars = this.charCount;
+    }
+  }
+
+  /**
+   * Evict the oldest segments once the buffer exceeds maxChars
+   * @private
+   */
+  evictIfNeeded() {
+    while (this.charCount > this.maxChars && this.segments.length > 1) {
+      const dropped = this.segments.shift();
+      this.charCount -= dropped.length + SEPARATOR.length;
+      this.stats.evictedSegments++;
+      this.stats.evictedChars += dropped.length;
+    }
+
+    // A single oversized segment keeps only its most recent text
+    if (this.charCount > this.maxChars) {
+      const only = this.segments[0];
+      const overflow = only.length - this.maxChars;
+      this.segments[0] = only.substring(overflow);
+      this.charCount = this.segments[0].length;
+      this.stats.evictedChars += overflow;
+    }
+  }
+
+  /**
+   * Memory and activity statistics for this buffer
+   * @returns {Object}
+   */
+  getStats() {
+    return {
+      sessionId: this.sessionId,
+      segments: this.segments.length,
+      chars: this.charCount,
+      tailChars: this.tail.length,
+      // JS strings are UTF-16; cached join doubles the footprint until invalidated
+      estimatedBytes: (this.charCount + this.tail.length + (this.joinedValid ? this.joined.length : 0)) * 2,
+      maxChars: this.maxChars,
+      ageMs: Date.now() - this.createdAt,
+      ...this.stats
+    };
+  }
+
+  /**
+   * Release the buffer and remove it from the live-buffer registry
+   */
+  dispose() {
+    this.clear();
+    liveBuffers.delete(this);
+  }
+}
+
+/**
+ * Memory stats for every live transcript buffer
+ * @returns {Object} - { buffers: number, totalChars: number, totalEstimatedBytes: number, sessions: Object[] }
+ */
+function getTranscriptBufferStats() {
+  const sessions = [];
+  let totalChars = 0;
+  let totalEstimatedBytes = 0;
+  for (const buffer of liveBuffers) {
+    const stats = buffer.getStats();
+    sessions.push(stats);
+    totalChars += stats.chars;
+    totalEstimatedBytes += stats.estimatedBytes;
+  }
+  return { buffers: sessions.length, totalChars, totalEstimatedBytes, sessions };
+}
+
+export {
+  DEFAULT_TAIL_WINDOW_CHARS,
+  DEFAULT_MAX_CHARS,
+  TranscriptBuffer,
+  getTranscriptBufferStats
+};
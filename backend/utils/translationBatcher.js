@@ -0,0 +1,356 @@
+/**
+ * Cross-Session Final Translation Batcher
+ *
+ * At peak, many sessions translate short finals into the same languages at the
+ * same moment, and the OpenAI limit we hit is requests per minute, not tokens.
+ * The batcher collects finals for the same model + language pair, from any
+ * session, for a few milliseconds and sends them as one request:
+ *
+ * - A batch is sent when its window (FINAL_TRANSLATION_BATCH_MS) closes, when it
+ *   reaches maxItems / maxChars, or earlier if an item's deadline needs the time
+ * - A batch of one is sent as a normal single translation
+ * - Results are split back out per item; items the batch response does not
+ *   cover (or a failed batch) fall back to single translations
+ * - Each session's results for a language pair resolve in the order they were
+ *   requested, whichever batches they ended up in
+ * - Aborting an item (its signal) or passing its deadline rejects that item only;
+ *   the request is aborted once no item in it is still waiting
+ */
+
+import { observeTranslationBatch } from './metrics.js';
+
+const DEFAULT_WINDOW_MS = 10;
+const DEFAULT_MAX_ITEMS = 8;
+const DEFAULT_MAX_CHARS = 6000;
+
+// Weight of the newest batch when updating the request latency estimate
+const LATENCY_EWMA_ALPHA = 0.2;
+
+// All live batchers, for getTranslationBatcherStats()
+const liveBatchers = new Set();
+
+function abortError() {
+  const error = new Error('Translation aborted');
+  error.name = 'AbortError';
+  return error;
+}
+
+function deadlineError(item) {
+  const error = new Error(`Final translation timeout: deadline passed after ${Date.now() - item.enqueuedAt}ms`);
+  error.name = 'TimeoutError';
+  return error;
+}
+
+class TranslationBatcher {
+  /**
+   * @param {Object} options - Batcher options
+   * @param {Function} options.translateOne - async (item, signal) => translated text
+   * @param {Function} options.translateBatch - async (items, signal) => Array<string|null>, one per item
+   * @param {number} options.windowMs - How long a batch collects items (0 sends every item on its own)
+   * @param {number} options.maxItems - Items per batch
+   * @param {number} options.maxChars - Source characters per batch
+   */
+  constructor(options = {}) {
+    if (typeof options.translateOne !== 'function' || typeof options.translateBatch !== 'function') {
+      throw new Error('TranslationBatcher requires translateOne and translateBatch functions');
+    }
+    this.translateOne = options.translateOne;
+    this.translateBatch = options.translateBatch;
+    this.windowMs = options.windowMs ?? DEFAULT_WINDOW_MS;
+    this.maxItems = options.maxItems ?? DEFAULT_MAX_ITEMS;
+    this.maxChars = options.maxChars ?? DEFAULT_MAX_CHARS;
+
+    this.open = new Map(); // group key -> batch still collecting items
+    this.tails = new Map(); // session + group key -> last promise handed out, for ordering
+    this.latencyMs = 0; // EWMA of request time, used to leave room before deadlines
+    this.disposed = false;
+
+    this.stats = {
+      items: 0,
+      requests: 0,
+      batchRequests: 0,
+      batchedItems: 0,
+      fallbacks: 0,
+      aborted: 0,
+      expired: 0
+    };
+    liveBatchers.add(this);
+  }
+
+  /**
+   * Translate one final, batched with others for the same model and language pair
+   * @param {Object} request - Translation request
+   * @param {string} request.text - Final text
+   * @param {string} request.sourceLang - Source language code
+   * @param {string} request.targetLang - Target language code
+   * @param {string} request.model - Model name
+   * @param {string} request.apiKey - OpenAI API key
+   * @param {string} request.sessionId - Session (results are ordered per session)
+   * @param {number} request.seqId - Sequence id (logs and stats only)
+   * @param {number} request.deadline - Date.now() value by which the result is needed
+   * @param {AbortSignal} request.signal - Cancels this item
+   * @returns {Promise<string>} - Translated text
+   */
+  translate(request) {
+    if (this.disposed) return Promise.reject(new Error('TranslationBatcher disposed'));
+    if (request.signal?.aborted) return Promise.reject(abortError());
+    this.stats.items++;
+
+    const key = [request.model, request.sourceLang, request.targetLang, request.apiKey].join('\u0000');
+    let resolveItem;
+    let rejectItem;
+    const result = new Promise((resolve, reject) => {
+      resolveItem = resolve;
+      rejectItem = reject;
+    });
+    // Handled through `ordered`, possibly only after an earlier item settles
+    result.catch(() => {});
+    const item = {
+      ...request,
+      key,
+      settled: false,
+      batch: null,
+      enqueuedAt: Date.now(),
+      resolve: (text) => {
+        if (item.settled) return;
+        item.settled = true;
+        resolveItem(text);
+      },
+      reject: (error) => {
+        if (item.settled) return;
+        item.settled = true;
+        rejectItem(error);
+      }
+    };
+
+    // Resolve after the same session's earlier item for this pair has settled
+    const orderKey = `${request.sessionId ?? ''}\u0000${key}`;
+    const previous = this.tails.get(orderKey);
+    const ordered = previous ? previous.catch(() => {}).then(() => result) : result;
+    this.tails.set(orderKey, ordered);
+    ordered.catch(() => {}).finally(() => {
+      if (this.tails.get(orderKey) === ordered) this.tails.delete(orderKey);
+    });
+
+    return new Promise((resolve, reject) => {
+      let deadlineTimer = null;
+      const cleanup = () => {
+        clearTimeout(deadlineTimer);
+        request.signal?.removeEventListener('abort', onAbort);
+      };
+      const onAbort = () => {
+        this.stats.aborted++;
+        this.drop(item, abortError());
+        cleanup();
+        reject(abortError());
+      };
+      request.signal?.addEventListener('abort', onAbort, { once: true });
+      if (request.deadline) {
+        deadlineTimer = setTimeout(() => {
+          this.stats.expired++;
+          const error = deadlineError(item);
+          this.drop(item, error);
+          cleanup();
+          reject(error);
+        }, Math.max(0, request.deadline - Date.now()));
+      }
+      ordered.then(
+        (text) => { cleanup(); resolve(text); },
+        (error) => { cleanup(); reject(error); }
+      );
+
+      this.add(item);
+    });
+  }
+
+  /**
+   * Put an item into its open batch (or send it straight away)
+   * @private
+   */
+  add(item) {
+    if (this.windowMs <= 0) {
+      this.send({ key: item.key, items: [item], chars: item.text.length });
+      return;
+    }
+
+    let batch = this.open.get(item.key);
+    if (batch && (batch.items.length >= this.maxItems || batch.chars + item.text.length > this.maxChars)) {
+      this.flush(batch);
+      batch = null;
+    }
+    if (!batch) {
+      batch = { key: item.key, items: [], chars: 0, timer: null, sendAt: Date.now() + this.windowMs };
+      this.open.set(item.key, batch);
+    }
+    batch.items.push(item);
+    batch.chars += item.text.length;
+    item.batch = batch;
+
+    // Leave the expected request time before the earliest deadline (the whole
+    // window until a request time has been measured)
+    if (item.deadline) {
+      batch.sendAt = Math.min(batch.sendAt, item.deadline - (this.latencyMs || this.windowMs));
+    }
+    if (batch.items.length >= this.maxItems || batch.sendAt <= Date.now()) {
+      this.flush(batch);
+      return;
+    }
+    clearTimeout(batch.timer);
+    batch.timer = setTimeout(() => this.flush(batch), batch.sendAt - Date.now());
+  }
+
+  /**
+   * Close a collecting batch and send it
+   * @private
+   */
+  flush(batch) {
+    clearTimeout(batch.timer);
+    batch.timer = null;
+    if (this.open.get(batch.key) === batch) this.open.delete(batch.key);
+    batch.items = batch.items.filter(item => !item.settled);
+    if (batch.items.length > 0) this.send(batch);
+  }
+
+  /**
+   * Item was aborted or expired: take it out of a collecting batch, and abort the
+   * request once nothing in it is still waiting
+   * @private
+   */
+  drop(item, error) {
+    item.reject(error);
+    const batch = item.batch;
+    if (!batch) return;
+    if (batch.controller) {
+      if (batch.items.every(other => other.settled)) batch.controller.abort();
+    } else {
+      batch.items = batch.items.filter(other => other !== item);
+      batch.chars -= item.text.length;
+      if (batch.items.length === 0) {
+        clearTimeout(batch.timer);
+        if (this.open.get(batch.key) === batch) this.open.delete(batch.key);
+      }
+    }
+  }
+
+  /**
+   * Send a batch: one item as a single translation, more as one structured request
+   * @private
+   */
+  async send(batch) {
+    const { items } = batch;
+    batch.controller = new AbortController();
+    for (const item of items) item.batch = batch;
+    this.stats.requests++;
+    observeTranslationBatch(items.length);
+
+    const startedAt = Date.now();
+    let results = null;
+    let batchError = null;
+    try {
+      if (items.length === 1) {
+        results = [await this.translateOne(items[0], batch.controller.signal)];
+      } else {
+        this.stats.batchRequests++;
+        this.stats.batchedItems += items.length;
+        results = await this.translateBatch(items, batch.controller.signal);
+      }
+      this.latencyMs = this.latencyMs === 0
+        ? Date.now() - startedAt
+        : this.latencyMs + LATENCY_EWMA_ALPHA * (Date.now() - startedAt - this.latencyMs);
+    } catch (error) {
+      batchError = error;
+    }
+
+    if (items.length === 1) {
+      if (batchError) items[0].reject(batchError);
+      else items[0].resolve(results[0]);
+      return;
+    }
+
+    // Rate-limit skips and aborts apply to every item; anything else falls back per item
+    const shared = batchError && (batchError.skipRequest || batchError.name === 'AbortError');
+    for (let i = 0; i < items.length; i++) {
+      const item = items[i];
+      if (item.settled) continue;
+      const text = results?.[i];
+      if (typeof text === 'string' && text.trim()) {
+        item.resolve(text);
+      } else if (shared) {
+        item.reject(batchError);
+      } else {
+        this.stats.fallbacks++;
+        this.sendAlone(item);
+      }
+    }
+    if (batchError && !shared) {
+      console.warn(`[TranslationBatcher] Batch of ${items.length} failed (${batchError.message}), translating individually`);
+    }
+  }
+
+  /**
+   * @private
+   */
+  sendAlone(item) {
+    this.send({ key: item.key, items: [item], chars: item.text.length });
+  }
+
+  /**
+   * @returns {Object}
+   */
+  getStats() {
+    let collecting = 0;
+    for (const batch of this.open.values()) collecting += batch.items.length;
+    return {
+      windowMs: this.windowMs,
+      collecting,
+      latencyMs: Math.round(this.latencyMs),
+      // Requests the same items would have cost one at a time, minus the requests sent
+      requestsSaved: this.stats.items - this.stats.aborted - this.stats.expired - this.stats.requests,
+      ...this.stats
+    };
+  }
+
+  /**
+   * Reject everything still collecting and stop accepting items
+   */
+  dispose() {
+    this.disposed = true;
+    for (const batch of this.open.values()) {
+      clearTimeout(batch.timer);
+      for (const item of batch.items) item.reject(new Error('TranslationBatcher disposed'));
+    }
+    this.open.clear();
+    liveBatchers.delete(this);
+  }
+}
+
+/**
+ * Create a batcher; FINAL_TRANSLATION_BATCH_MS (0 disables batching),
+ * FINAL_TRANSLATION_BATCH_MAX_ITEMS and FINAL_TRANSLATION_BATCH_MAX_CHARS set the defaults
+ * @param {Object} options - TranslationBatcher options; explicit values win
+ * @returns {TranslationBatcher}
+ */
+function createTranslationBatcher(options = {}) {
+  const envWindowMs = parseInt(process.env.FINAL_TRANSLATION_BATCH_MS, 10);
+  return new TranslationBatcher({
+    windowMs: Number.isNaN(envWindowMs) ? undefined : envWindowMs,
+    maxItems: parseInt(process.env.FINAL_TRANSLATION_BATCH_MAX_ITEMS, 10) || undefined,
+    maxChars: parseInt(process.env.FINAL_TRANSLATION_BATCH_MAX_CHARS, 10) || undefined,
+    ...options
+  });
+}
+
+/**
+ * Stats for every live batcher
+ * @returns {Object[]}
+ */
+function getTranslationBatcherStats() {
+  return [...liveBatchers].map(batcher => batcher.getStats());
+}
+
+export {
+  DEFAULT_WINDOW_MS,
+  TranslationBatcher,
+  createTranslationBatcher,
+  getTranslationBatcherStats
+};
@@ -0,0 +1,301 @@
+/**
+ * Worker Thread Pool
+ *
+ * Runs structured-cloneable jobs on a fixed set of worker_threads so CPU-heavy
+ * per-final work stays off the event loop that serves every WebSocket.
+ *
+ * - Jobs are tagged with a sequence id; results are matched back by id, so any
+ *   worker can take any job
+ * - Backpressure: once `maxQueue` jobs are waiting for a worker, new jobs run
+ *   through the fallback instead of growing the queue
+ * - Time budget: a job that runs longer than `timeoutMs` has its worker
+ *   terminated (and replaced) and is answered by the fallback
+ * - The fallback (run on the main thread) also covers worker errors and a pool
+ *   of size 0, so callers always get a result
+ *
+ * Worker scripts post { ready: true } once loaded (module loading does not count
+ * against a job's budget), then receive { id, job } messages and reply with
+ * { id, result } or { id, error }.
+ */
+
+import { Worker } from 'worker_threads';
+
+const DEFAULT_MAX_QUEUE = 64;
+const DEFAULT_TIMEOUT_MS = 500;
+
+// A worker that dies this many times in a row without finishing a job is not respawned
+const MAX_CONSECUTIVE_CRASHES = 3;
+
+// All live pools, for getWorkerPoolStats()
+const livePools = new Set();
+
+class WorkerPool {
+  /**
+   * @param {Object} options - Pool options
+   * @param {string} options.name - Pool name (for logs/stats)
+   * @param {string|URL} options.script - Worker script (or source, with workerOptions.eval)
+   * @param {number} options.size - Worker threads; 0 runs every job through the fallback
+   * @param {number} options.maxQueue - Jobs allowed to wait for a worker before falling back
+   * @param {number} options.timeoutMs - Per-job time budget once a worker has picked it up
+   * @param {Function} options.fallback - async (job, reason) => result; reason is
+   *   'unavailable' | 'backpressure' | 'timeout' | 'error'
+   * @param {Object} options.workerOptions - Extra options for new Worker()
+   */
+  constructor(options = {}) {
+    if (!options.script || typeof options.fallback !== 'function') {
+      throw new Error('WorkerPool requires a script and a fallback function');
+    }
+    this.name = options.name || 'pool';
+    this.script = options.script;
+    this.size = Math.max(0, options.size ?? 1);
+    this.maxQueue = options.maxQueue ?? DEFAULT_MAX_QUEUE;
+    this.timeoutMs = options.timeoutMs ?? DEFAULT_TIMEOUT_MS;
+    this.fallback = options.fallback;
+    this.workerOptions = options.workerOptions || {};
+
+    this.workers = []; // { worker, task, ready }
+    this.queue = []; // Tasks waiting for a worker, oldest first
+    this.nextId = 1;
+    this.crashes = 0;
+    this.disposed = false;
+
+    this.stats = {
+      submitted: 0,
+      completed: 0, // Finished on a worker
+      fallbacks: { unavailable: 0, backpressure: 0, timeout: 0, error: 0 },
+      restarts: 0,
+      maxQueued: 0
+    };
+
+    livePools.add(this);
+  }
+
+  /**
+   * Run a job on a worker (or the fallback)
+   * @param {*} job - Structured-cloneable job
+   * @returns {Promise<*>} - Job result
+   */
+  run(job) {
+    this.stats.submitted++;
+    if (this.disposed || this.size === 0) {
+      return this.runFallback(job, 'unavailable');
+    }
+    this.spawnWorkers();
+    if (this.workers.length === 0) {
+      return this.runFallback(job, 'unavailable');
+    }
+    if (this.queue.length >= this.maxQueue) {
+      return this.runFallback(job, 'backpressure');
+    }
+
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, job, resolve, reject, timer: null });
+      this.stats.maxQueued = Math.max(this.stats.maxQueued, this.queue.length);
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Start the workers ahead of the first job, so it does not wait for them to load
+   */
+  warm() {
+    if (!this.disposed && this.size > 0) this.spawnWorkers();
+  }
+
+  /**
+   * @private
+   */
+  async runFallback(job, reason) {
+    this.stats.fallbacks[reason]++;
+    return this.fallback(job, reason);
+  }
+
+  /**
+   * Start workers up to the pool size
+   * @private
+   */
+  spawnWorkers() {
+    while (this.workers.length < this.size && this.crashes < MAX_CONSECUTIVE_CRASHES) {
+      let worker;
+      try {
+        worker = new Worker(this.script, this.workerOptions);
+      } catch (error) {
+        console.error(`[WorkerPool:${this.name}] Failed to start worker: ${error.message}`);
+        this.crashes++;
+        continue;
+      }
+      const slot = { worker, task: null, ready: false };
+      worker.on('message', (message) => this.onMessage(slot, message));
+      worker.on('error', (error) => this.onCrash(slot, error));
+      worker.on('exit', (code) => {
+        if (slot.worker) this.onCrash(slot, new Error(`Worker exited with code ${code}`));
+      });
+      this.workers.push(slot);
+    }
+    this.updateRefs();
+  }
+
+  /**
+   * Workers keep the process alive only while there is work for them
+   * @private
+   */
+  updateRefs() {
+    const active = this.queue.length > 0 || this.workers.some(slot => slot.task);
+    for (const slot of this.workers) {
+      if (active) slot.worker.ref();
+      else slot.worker.unref();
+    }
+  }
+
+  /**
+   * Hand queued tasks to idle workers
+   * @private
+   */
+  dispatch() {
+    for (const slot of this.workers) {
+      if (this.queue.length === 0) break;
+      if (slot.task || !slot.ready) continue;
+      const task = this.queue.shift();
+      slot.task = task;
+      task.timer = setTimeout(() => this.onTimeout(slot, task), this.timeoutMs);
+      slot.worker.postMessage({ id: task.id, job: task.job });
+    }
+    this.updateRefs();
+  }
+
+  /**
+   * @private
+   */
+  onMessage(slot, message) {
+    if (message?.ready) {
+      slot.ready = true;
+      this.dispatch();
+      return;
+    }
+    const task = slot.task;
+    if (!task || message?.id !== task.id) return; // Late reply for a task that already timed out
+    clearTimeout(task.timer);
+    slot.task = null;
+    this.crashes = 0;
+
+    if (message.error) {
+      this.settle(task, 'error');
+    } else {
+      this.stats.completed++;
+      task.resolve(message.result);
+    }
+    this.dispatch();
+  }
+
+  /**
+   * The job blew its budget: replace the worker, answer with the fallback
+   * @private
+   */
+  onTimeout(slot, task) {
+    if (slot.task !== task) return;
+    console.warn(`[WorkerPool:${this.name}] Job ${task.id} exceeded ${this.timeoutMs}ms - restarting worker`);
+    this.retire(slot);
+    this.settle(task, 'timeout');
+    this.stats.restarts++;
+    this.spawnWorkers();
+    this.dispatch();
+  }
+
+  /**
+   * @private
+   */
+  onCrash(slot, error) {
+    if (!slot.worker) return;
+    console.error(`[WorkerPool:${this.name}] Worker failed: ${error.message}`);
+    const task = slot.task;
+    this.retire(slot);
+    this.crashes++;
+    if (task) {
+      clearTimeout(task.timer);
+      this.settle(task, 'error');
+    }
+    if (this.disposed) return;
+    this.stats.restarts++;
+    this.spawnWorkers();
+    if (this.workers.length === 0) {
+      // Nothing left to run on - drain the queue through the fallback
+      for (const queued of this.queue.splice(0)) {
+        this.settle(queued, 'unavailable');
+      }
+      return;
+    }
+    this.dispatch();
+  }
+
+  /**
+   * Remove a worker from the pool and terminate it
+   * @private
+   */
+  retire(slot) {
+    const worker = slot.worker;
+    slot.worker = null;
+    slot.task = null;
+    this.workers = this.workers.filter(s => s !== slot);
+    worker.terminate().catch(() => {});
+  }
+
+  /**
+   * Answer a task through the fallback
+   * @private
+   */
+  settle(task, reason) {
+    this.runFallback(task.job, reason).then(task.resolve, task.reject);
+  }
+
+  /**
+   * @returns {Object} - Pool size, activity and fallback counters
+   */
+  getStats() {
+    return {
+      name: this.name,
+      size: this.size,
+      workers: this.workers.length,
+      ready: this.workers.filter(slot => slot.ready).length,
+      busy: this.workers.filter(slot => slot.task).length,
+      queued: this.queue.length,
+      timeoutMs: this.timeoutMs,
+      maxQueue: this.maxQueue,
+      ...this.stats,
+      fallbacks: { ...this.stats.fallbacks }
+    };
+  }
+
+  /**
+   * Terminate all workers; queued and running jobs are answered by the fallback
+   */
+  dispose() {
+    if (!livePools.delete(this)) return;
+    this.disposed = true;
+    for (const slot of [...this.workers]) {
+      const task = slot.task;
+      this.retire(slot);
+      if (task) {
+        clearTimeout(task.timer);
+        this.settle(task, 'unavailable');
+      }
+    }
+    for (const task of this.queue.splice(0)) {
+      this.settle(task, 'unavailable');
+    }
+  }
+}
+
+/**
+ * Stats for every live pool
+ * @returns {Object[]}
+ */
+function getWorkerPoolStats() {
+  return [...livePools].map(pool => pool.getStats());
+}
+
+export {
+  DEFAULT_MAX_QUEUE,
+  DEFAULT_TIMEOUT_MS,
+  WorkerPool,
+  getWorkerPoolStats
+};
@@ -519,6 +519,8 @@ export async function handleListenerConnection(clientWs, req, sessionId, targetL
   // Fallback to generating a new UUID if not provided (backward compatibility)
   const query = new URL(req.url, 'http://localhost').searchParams;
   const clientListenerId = query.get('listenerId');
+  // Opt-in wire format for partials ('delta', see utils/partialDelta.js)
+  const partialEncoding = query.get('partialEncoding');
 
   // Use provided ID if valid UUID, otherwise generate new one
   const listenerSpanUserId = (clientListenerId && /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i.test(clientListenerId))
@@ -533,7 +535,7 @@ export async function handleListenerConnection(clientWs, req, sessionId, targetL
 
   try {
     // Add listener to session
-    sessionStore.addListener(sessionId, socketId, clientWs, targetLang, userName);
+    sessionStore.addListener(sessionId, socketId, clientWs, targetLang, userName, partialEncoding);
 
     // Notify host about new listener
     const hostSocket = session.hostSocket;
@@ -1088,6 +1090,7 @@ export async function handleListenerConnection(clientWs, req, sessionId, targetL
 
           // Import TTS modules
           const { getTtsServiceForProvider } = await import('./tts/ttsService.js');
+          const { synthesizeUnaryCached } = await import('./tts/ttsAudioCache.js');
           const { validateTtsRequest } = await import('./tts/ttsPolicy.js');
           const { canSynthesize } = await import('./tts/ttsQuota.js');
           const { recordUsage } = await import('./tts/ttsUsage.js');
@@ -1329,7 +1332,7 @@ export async function handleListenerConnection(clientWs, req, sessionId, targetL
 
             // 5. Synthesize audio using the resolved route (provider-based)
             const ttsService = getTtsServiceForProvider(route.provider);
-            const response = await ttsService.synthesizeUnary(ttsRequest, route);
+            const response = await synthesizeUnaryCached(ttsService, ttsRequest, route);
 
             // PR4: Record metering event (feature-flagged)
             if (process.env.TTS_METERING_DEBUG === 'true') {
@@ -10,6 +10,7 @@
  * - Finalization Engine (finalization timing)
  * - Forced Commit Engine (forced final buffering and recovery)
  * - Bible Reference Engine (Bible verse reference detection)
+ * - Segment Assembler (word-timeline segment commits)
  * 
  * CRITICAL: This must maintain exact same behavior as current solo mode logic
  */
@@ -22,6 +23,7 @@ import { FinalizationEngine } from './finalizationEngine.js';
 import { ForcedCommitEngine } from './forcedCommitEngine.js';
 import { RecoveryStreamEngine } from './recoveryStreamEngine.js';
 import { BibleReferenceEngine } from './bibleReferenceEngine.js';
+import { SegmentAssembler } from './segmentAssembler.js';
 import { EVENT_TYPES } from '../events/eventTypes.js';
 
 /**
@@ -39,6 +41,7 @@ export class CoreEngine extends EventEmitter {
    * @param {ForcedCommitEngine} [options.forcedCommitEngine] - Optional forced commit engine instance
    * @param {BibleReferenceEngine} [options.bibleReferenceEngine] - Optional Bible reference engine instance
    * @param {Object} [options.bibleConfig] - Bible reference engine configuration
+   * @param {SegmentAssembler} [options.segmentAssembler] - Optional segment assembler instance
    */
   constructor(options = {}) {
     super();
@@ -61,6 +64,9 @@ export class CoreEngine extends EventEmitter {
     this.bibleReferenceEngine = options.bibleReferenceEngine || 
       new BibleReferenceEngine(options.bibleConfig || {});
     
+    // Segment assembler (fed only results that carry a word timeline)
+    this.segmentAssembler = options.segmentAssembler || new SegmentAssembler();
+    
     // State tracking
     this.isInitialized = false;
   }
@@ -90,6 +96,7 @@ export class CoreEngine extends EventEmitter {
     this.finalizationEngine.clearPendingFinalization();
     this.forcedCommitEngine.clearForcedFinalBuffer();
     this.bibleReferenceEngine.reset();
+    this.segmentAssembler.reset();
     this.emit('reset');
   }
 
@@ -326,6 +333,43 @@ export class CoreEngine extends EventEmitter {
     return this.bibleReferenceEngine.detectReferences(text, options);
   }
 
+  /**
+   * Feed a recognizer result to the segment assembler
+   * Results carry meta.timeline when word time offsets are on (STT_WORD_TIMELINE);
+   * the handlers send the returned segments as finals
+   * 
+   * @param {string} text - Transcript text
+   * @param {boolean} isPartial - Whether this is a partial result
+   * @param {Object} meta - Result metadata (timeline, stability, forced)
+   * @returns {Array<Object>} Committed segments
+   */
+  assembleResult(text, isPartial, meta = {}) {
+    // Forced finals have no timeline; they close whatever the timeline opened
+    if (!meta.timeline && !(meta.forced && this.segmentAssembler.hasOpenWords())) {
+      return [];
+    }
+    
+    return this.segmentAssembler.addResult(text, isPartial, meta);
+  }
+
+  /**
+   * Whether the segment assembler holds final words waiting for a boundary
+   * 
+   * @returns {boolean}
+   */
+  hasOpenSegment() {
+    return this.segmentAssembler.hasOpenFinalWords();
+  }
+
+  /**
+   * Commit the open final words without waiting for a boundary (speaker paused)
+   * 
+   * @returns {Array<Object>} Committed segments
+   */
+  flushSegments() {
+    return this.segmentAssembler.flush();
+  }
+
   /**
    * Get current engine state (for debugging)
    * 
@@ -349,7 +393,8 @@ export class CoreEngine extends EventEmitter {
       forcedCommit: this.forcedCommitEngine.getState(),
       bibleReference: {
         windowSize: this.bibleReferenceEngine.transcriptWindow.length
-      }
+      },
+      segments: this.segmentAssembler.getState()
     };
   }
 }
@@ -1,412 +1,430 @@
 /**
  * Segment Assembler Engine
- * 
- * Assembles ASR partials and finals into stable, complete segments BEFORE finalization.
- * 
+ *
+ * Assembles ASR partials and finals into committed segments by audio time
+ * instead of by comparing strings.
+ *
+ * The open transcript is a run of compact word records (startMs, endMs, word,
+ * stability) held in parallel typed arrays, ordered by time. Positions are ms on
+ * the stream's audio timeline (meta.timeline from googleSpeechStream.js), which
+ * stays continuous across recognizer restarts and warm handoffs.
+ *
  * CRITICAL INVARIANTS:
- * 1. Segment Identity Stability: Segments identified by normalized prefix (first 10-15 tokens)
- * 2. FINAL ≠ CLOSE: Google FINAL flags mark tokens as stable but don't close segments
- * 3. Monotonic Growth: Segment text only grows (appending tokens, minor rewrites in tail)
- * 4. Structural Finalization Only: Segments finalize on new segment start or hard boundaries
- * 
- * This runs BEFORE FinalityGate, which only prevents duplicate emissions.
+ * 1. Final records carry Google's word time offsets and stability 1. Records after
+ *    them are the current partial: partials have no word offsets, so their words
+ *    are spread over [end of the last final, resultEndTime] with the partial's stability
+ * 2. O(changed words): a final replaces only the final records its audio span
+ *    covers (found by binary search), a partial rewrites the tail from its first
+ *    changed word. Nothing is re-read or re-matched as the transcript grows
+ * 3. FINAL ≠ CLOSE: a segment is committed once all of its audio is final AND it
+ *    reaches a boundary (sentence-ending punctuation, a pause between final words,
+ *    maxSegmentWords) or a hard/explicit boundary is signalled
+ * 4. Committed audio is never committed again: final words whose midpoint is at or
+ *    before the end of the last committed segment (audio re-recognized after a
+ *    restart) are dropped
  */
 
+import { SEGMENT_ASSEMBLY_CONSTANTS } from '../shared/types/config.js';
+
+// Sentence-ending punctuation, optionally followed by closing quotes/brackets
+const SENTENCE_END = /[.!?…。？！]["'”’)\]]*$/;
+
 /**
- * @typedef {Object} OpenSegment
- * @property {string} segmentId - Unique identifier for this segment
- * @property {string} text - Current assembled text
- * @property {string} normalizedPrefix - Normalized prefix for identity matching (first 10-15 tokens)
- * @property {number} createdAt - Timestamp when segment was created
- * @property {number} lastUpdatedAt - Timestamp of last update
- * @property {boolean} hasStableTokens - Whether any FINAL tokens have been received
- * @property {string|null} lastFinalText - Last FINAL text received (for tracking)
- * @property {number} finalCount - Number of FINAL events received for this segment
+ * @typedef {Object} WordTimeline
+ * @property {number} endMs - Audio position of the result's end (resultEndTime)
+ * @property {Array<{word: string, startMs: number, endMs: number}>} words - Word offsets (finals only)
  */
 
 /**
  * @typedef {Object} AssembledSegment
  * @property {string} segmentId - Segment identifier
  * @property {string} text - Complete segment text
- * @property {boolean} isComplete - Whether segment is complete (ready for finalization)
- * @property {string} reason - Reason for completion ('new_segment', 'hard_boundary', 'explicit_boundary')
+ * @property {number} startMs - Audio position of the first word
+ * @property {number} endMs - Audio position of the end of the last word
+ * @property {number} wordCount - Number of words
+ * @property {boolean} isComplete - Always true (committed segments are final)
+ * @property {boolean} isForced - Committed by a forced final
+ * @property {string} reason - 'sentence_end', 'pause', 'max_words', 'forced', 'hard_boundary', 'explicit_boundary' or 'flush'
  */
 
+function splitWords(text) {
+  return (text || '').trim().split(/\s+/).filter(Boolean);
+}
+
+// Index of the first non-space character at or after `pos` (ASR text is space-separated)
+function skipSpaces(text, pos) {
+  while (pos < text.length && text.charCodeAt(pos) <= 32) pos++;
+  return pos;
+}
+
 export class SegmentAssembler {
-  constructor() {
-    // Map segmentId -> OpenSegment
-    this.openSegments = new Map();
-    
-    // Track the most recent segment ID for boundary detection
-    this.mostRecentSegmentId = null;
-    
-    // Configuration
-    this.PREFIX_TOKEN_COUNT = 12; // Use first 12 tokens for prefix matching
-    this.MIN_PREFIX_LENGTH = 20; // Minimum characters for prefix matching
-    this.MAX_SEGMENT_AGE_MS = 30000; // Max age for open segments (30 seconds)
-    
-    // Cleanup interval for stale segments
-    this.startCleanupInterval();
+  /**
+   * @param {Object} [options]
+   * @param {number} [options.pauseBoundaryMs] - Gap between final words that ends a segment
+   * @param {number} [options.maxSegmentWords] - Commit a run-on segment at this many words
+   * @param {number} [options.initialCapacity] - Word records preallocated
+   */
+  constructor(options = {}) {
+    this.pauseBoundaryMs = options.pauseBoundaryMs ?? SEGMENT_ASSEMBLY_CONSTANTS.PAUSE_BOUNDARY_MS;
+    this.maxSegmentWords = options.maxSegmentWords ?? SEGMENT_ASSEMBLY_CONSTANTS.MAX_SEGMENT_WORDS;
+
+    this.capacity = options.initialCapacity ?? SEGMENT_ASSEMBLY_CONSTANTS.INITIAL_CAPACITY;
+    this.starts = new Float64Array(this.capacity);
+    this.ends = new Float64Array(this.capacity);
+    this.stabilities = new Float32Array(this.capacity);
+    this.words = new Array(this.capacity).fill('');
+
+    this.head = 0;            // First uncommitted record
+    this.finalEnd = 0;        // One past the last final record
+    this.length = 0;          // One past the last record (partial tail included)
+    this.scanIndex = 0;       // Final records before this were checked for boundaries
+    this.finalEndMs = 0;      // resultEndTime of the latest final
+    this.committedEndMs = -1; // Audio up to here is committed
+
+    this.stats = {
+      results: 0,
+      recordsWritten: 0,
+      overlapWordsDropped: 0,
+      segmentsCommitted: 0,
+      compactions: 0
+    };
   }
 
   /**
-   * Normalize text for prefix matching
-   * @private
+   * Apply an ASR result (partial or final)
+   *
+   * @param {string} text - Text from ASR
+   * @param {boolean} isPartial - Whether this is a partial result
+   * @param {Object} [meta] - Result metadata
+   * @param {WordTimeline} [meta.timeline] - Audio positions of the result
+   * @param {number} [meta.stability] - Partial stability (0-1)
+   * @param {boolean} [meta.forced] - Forced final: the recognizer closed with this partial pending
+   * @returns {AssembledSegment[]} Segments committed by this result (may be empty)
    */
-  _normalizePrefix(text) {
-    if (!text || text.length === 0) return '';
-    
-    // Normalize: lowercase, collapse whitespace, remove punctuation
-    const normalized = text
-      .toLowerCase()
-      .replace(/[.,!?;:…]/g, ' ')
-      .replace(/\s+/g, ' ')
-      .trim();
-    
-    // Extract first N tokens
-    const tokens = normalized.split(/\s+/).filter(t => t.length > 0);
-    const prefixTokens = tokens.slice(0, this.PREFIX_TOKEN_COUNT);
-    
-    return prefixTokens.join(' ');
+  addResult(text, isPartial, meta = {}) {
+    this.stats.results++;
+    text = text || '';
+    const timeline = meta.timeline || null;
+    let segments = [];
+
+    if (isPartial) {
+      if (timeline) this._writeTail(text, timeline.endMs, meta.stability ?? 0);
+    } else if (meta.forced) {
+      // No word offsets: the pending partial becomes final as is and closes the segment
+      this._finalizeTail(text, timeline?.endMs);
+      segments = this._commitOpen('forced', true);
+    } else if (timeline?.words?.length) {
+      this._applyFinal(timeline);
+      segments = this._collectSegments();
+    } else {
+      this._finalizeTail(text, timeline?.endMs);
+      segments = this._collectSegments();
+    }
+
+    this._compact();
+    return segments;
   }
 
   /**
-   * Check if two texts share a normalized prefix (same segment identity)
+   * Rewrite the partial tail with the words of `text`
+   * Leading words equal to the tail keep their records; only the rest of the text is split
    * @private
    */
-  _sharesPrefix(text1, text2) {
-    const prefix1 = this._normalizePrefix(text1);
-    const prefix2 = this._normalizePrefix(text2);
-    
-    if (prefix1.length < this.MIN_PREFIX_LENGTH || prefix2.length < this.MIN_PREFIX_LENGTH) {
-      return false; // Too short to match reliably
+  _writeTail(text, endMs, stability) {
+    const tailStart = this.finalEnd;
+    const tailCount = this.length - tailStart;
+    let same = 0;
+    let pos = skipSpaces(text, 0);
+    while (same < tailCount) {
+      const word = this.words[tailStart + same];
+      const end = pos + word.length;
+      if (!text.startsWith(word, pos) || (end < text.length && text.charCodeAt(end) > 32)) break;
+      same++;
+      pos = skipSpaces(text, end);
+    }
+
+    const incoming = splitWords(text.slice(pos));
+    const changed = incoming.length;
+    this._ensureCapacity(tailStart + same + changed);
+    const fromMs = same > 0 ? this.ends[tailStart + same - 1] : this._tailStartMs();
+    const step = changed > 0 ? (Math.max(endMs, fromMs) - fromMs) / changed : 0;
+    for (let k = 0; k < changed; k++) {
+      const i = tailStart + same + k;
+      this.words[i] = incoming[k];
+      this.starts[i] = fromMs + step * k;
+      this.ends[i] = fromMs + step * (k + 1);
+      this.stabilities[i] = stability;
     }
-    
-    // Check if one prefix starts with the other (or vice versa)
-    const minLen = Math.min(prefix1.length, prefix2.length);
-    const overlap = Math.min(minLen, Math.max(prefix1.length, prefix2.length) * 0.7); // 70% overlap threshold
-    
-    return prefix1.substring(0, overlap) === prefix2.substring(0, overlap);
+    this.stats.recordsWritten += changed;
+    this.length = tailStart + same + changed;
   }
 
   /**
-   * Find existing open segment that matches this text (by prefix)
+   * Audio position where the partial tail starts
    * @private
    */
-  _findMatchingSegment(text) {
-    const textPrefix = this._normalizePrefix(text);
-    
-    if (textPrefix.length < this.MIN_PREFIX_LENGTH) {
-      return null; // Too short to match
-    }
-    
-    for (const [segmentId, segment] of this.openSegments.entries()) {
-      if (this._sharesPrefix(text, segment.text)) {
-        return segment;
-      }
-    }
-    
-    return null;
+  _tailStartMs() {
+    let startMs = Math.max(this.finalEndMs, this.committedEndMs, 0);
+    if (this.finalEnd > this.head) startMs = Math.max(startMs, this.ends[this.finalEnd - 1]);
+    return startMs;
+  }
+
+  /**
+   * Promote the partial tail, rewritten to `text`, to final records
+   * @private
+   */
+  _finalizeTail(text, endMs) {
+    const tailEndMs = endMs ?? (this.length > this.finalEnd ? this.ends[this.length - 1] : this._tailStartMs());
+    this._writeTail(text, tailEndMs, 1);
+    this.stabilities.fill(1, this.finalEnd, this.length);
+    this.finalEnd = this.length;
+    this.finalEndMs = Math.max(this.finalEndMs, tailEndMs);
   }
 
   /**
-   * Merge new text into existing segment text
-   * Handles appending and minor rewrites in unstable tail
+   * Replace the final records covered by a final's word offsets
    * @private
    */
-  _mergeText(existingText, newText) {
-    const existingTrimmed = existingText.trim();
-    const newTrimmed = newText.trim();
-    
-    // Exact match or new text is shorter - use existing
-    if (newTrimmed === existingTrimmed || newTrimmed.length <= existingTrimmed.length) {
-      return existingTrimmed;
+  _applyFinal(timeline) {
+    const incoming = timeline.words;
+    // The final supersedes the partial tail
+    this.length = this.finalEnd;
+    this.finalEndMs = Math.max(this.finalEndMs, timeline.endMs);
+
+    let skip = 0;
+    while (skip < incoming.length && (incoming[skip].startMs + incoming[skip].endMs) / 2 <= this.committedEndMs) skip++;
+    this.stats.overlapWordsDropped += skip;
+    if (skip === incoming.length) return;
+
+    const from = this._lowerBound(this.head, this.finalEnd, incoming[skip].startMs);
+    const to = this._lowerBound(from, this.finalEnd, incoming[incoming.length - 1].endMs);
+    const count = incoming.length - skip;
+    const newFinalEnd = from + count + (this.finalEnd - to);
+    this._ensureCapacity(newFinalEnd);
+
+    // Final records after the span move to follow the new words
+    if (to < this.finalEnd && to !== from + count) {
+      this.starts.copyWithin(from + count, to, this.finalEnd);
+      this.ends.copyWithin(from + count, to, this.finalEnd);
+      this.stabilities.copyWithin(from + count, to, this.finalEnd);
+      this.words.copyWithin(from + count, to, this.finalEnd);
     }
-    
-    // Check if new text extends existing (common case)
-    const existingLower = existingTrimmed.toLowerCase();
-    const newLower = newTrimmed.toLowerCase();
-    
-    if (newLower.startsWith(existingLower)) {
-      // Simple extension - new text is longer and starts with existing
-      return newTrimmed;
+    for (let k = 0; k < count; k++) {
+      const word = incoming[skip + k];
+      this.words[from + k] = word.word;
+      this.starts[from + k] = word.startMs;
+      this.ends[from + k] = word.endMs;
+      this.stabilities[from + k] = 1;
     }
-    
-    // Check for overlap (handles cases where ASR rewrites tail)
-    const overlap = this._findOverlap(existingTrimmed, newTrimmed);
-    if (overlap > 0) {
-      // Merge: existing + new part after overlap
-      const newPart = newTrimmed.substring(overlap).trim();
-      if (newPart) {
-        return existingTrimmed + ' ' + newPart;
-      }
-      return existingTrimmed; // No new part
+    this.stats.recordsWritten += count;
+    this.finalEnd = this.length = newFinalEnd;
+    this.scanIndex = Math.min(this.scanIndex, from);
+  }
+
+  /**
+   * First record in [lo, hi) whose midpoint is at or after `ms`
+   * @private
+   */
+  _lowerBound(lo, hi, ms) {
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if ((this.starts[mid] + this.ends[mid]) / 2 < ms) lo = mid + 1;
+      else hi = mid;
     }
-    
-    // No clear relationship - prefer longer text (ASR may have rewritten)
-    return newTrimmed.length > existingTrimmed.length ? newTrimmed : existingTrimmed;
+    return lo;
   }
 
   /**
-   * Find overlap between two texts (for merging)
+   * Commit every finished segment among the final records not scanned yet
    * @private
    */
-  _findOverlap(text1, text2) {
-    const t1 = text1.toLowerCase();
-    const t2 = text2.toLowerCase();
-    
-    // Try progressively smaller suffixes to find overlap
-    const maxCheck = Math.min(t1.length, t2.length, 100);
-    for (let i = Math.min(maxCheck, 50); i >= 10; i--) {
-      const suffix = t1.substring(t1.length - i).trim();
-      if (t2.startsWith(suffix)) {
-        return t1.length - i; // Return position where overlap starts
+  _collectSegments() {
+    const segments = [];
+    for (let i = Math.max(this.scanIndex, this.head); i < this.finalEnd; i++) {
+      let reason = null;
+      if (SENTENCE_END.test(this.words[i])) {
+        reason = 'sentence_end';
+      } else if (i + 1 < this.finalEnd && this.starts[i + 1] - this.ends[i] >= this.pauseBoundaryMs) {
+        reason = 'pause';
+      } else if (i + 1 - this.head >= this.maxSegmentWords) {
+        reason = 'max_words';
       }
+      if (reason) segments.push(this._commit(i + 1, reason, false));
     }
-    
-    return 0; // No overlap found
+    // The pause after the last final word is only known once the next one arrives
+    this.scanIndex = Math.max(this.head, this.finalEnd - 1);
+    return segments;
+  }
+
+  /**
+   * Commit all open final records as one segment
+   * @private
+   */
+  _commitOpen(reason, isForced = false) {
+    if (this.finalEnd <= this.head) return [];
+    const segment = this._commit(this.finalEnd, reason, isForced);
+    this.scanIndex = this.head;
+    return [segment];
   }
 
   /**
-   * Create a new open segment
+   * Commit records [head, endIndex)
    * @private
    */
-  _createSegment(text, isFinal = false) {
-    const segmentId = `seg_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
-    const normalizedPrefix = this._normalizePrefix(text);
-    
+  _commit(endIndex, reason, isForced) {
     const segment = {
-      segmentId,
-      text: text.trim(),
-      normalizedPrefix,
-      createdAt: Date.now(),
-      lastUpdatedAt: Date.now(),
-      hasStableTokens: isFinal,
-      lastFinalText: isFinal ? text.trim() : null,
-      finalCount: isFinal ? 1 : 0
+      segmentId: `seg_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`,
+      text: this.words.slice(this.head, endIndex).join(' '),
+      startMs: this.starts[this.head],
+      endMs: this.ends[endIndex - 1],
+      wordCount: endIndex - this.head,
+      isComplete: true,
+      isForced,
+      reason
     };
-    
-    this.openSegments.set(segmentId, segment);
-    this.mostRecentSegmentId = segmentId;
-    
-    console.log(`[SegmentAssembler] 🆕 Created new segment ${segmentId} (prefix: "${normalizedPrefix.substring(0, 50)}...")`);
-    
+    this.committedEndMs = Math.max(this.committedEndMs, segment.endMs);
+    this.head = endIndex;
+    this.stats.segmentsCommitted++;
     return segment;
   }
 
   /**
-   * Process an ASR result (partial or final)
-   * 
-   * @param {string} text - Text from ASR
-   * @param {boolean} isFinal - Whether this is a FINAL result from Google
-   * @param {Object} [meta] - Additional metadata
-   * @returns {AssembledSegment[]} Array of complete segments ready for finalization (may be empty)
+   * Grow the record arrays to hold `size` records
+   * @private
    */
-  processAsrResult(text, isFinal = false, meta = {}) {
-    if (!text || text.trim().length === 0) {
-      return []; // Ignore empty text
-    }
-    
-    const trimmedText = text.trim();
-    const now = Date.now();
-    
-    // Find matching segment or create new one
-    let segment = this._findMatchingSegment(trimmedText);
-    
-    if (!segment) {
-      // No matching segment - check if this is a new segment or continuation
-      // If we have a recent segment and this doesn't share prefix, it's a new segment
-      if (this.mostRecentSegmentId) {
-        const recentSegment = this.openSegments.get(this.mostRecentSegmentId);
-        if (recentSegment && !this._sharesPrefix(trimmedText, recentSegment.text)) {
-          // New segment detected - finalize previous segment
-          const completed = this._finalizeSegment(this.mostRecentSegmentId, 'new_segment');
-          if (completed) {
-            // Create new segment for this text
-            segment = this._createSegment(trimmedText, isFinal);
-            return [completed];
-          }
-        }
-      }
-      
-      // Create new segment
-      segment = this._createSegment(trimmedText, isFinal);
-      return []; // New segment, not complete yet
-    }
-    
-    // Merge text into existing segment
-    const mergedText = this._mergeText(segment.text, trimmedText);
-    const textGrew = mergedText.length > segment.text.length;
-    
-    // INVARIANT CHECK: Monotonic growth
-    if (mergedText.length < segment.text.length) {
-      console.error(`[SegmentAssembler] 🔴 INVARIANT VIOLATION: Segment ${segment.segmentId} text shrank!`);
-      console.error(`[SegmentAssembler]   Old: "${segment.text.substring(0, 80)}..."`);
-      console.error(`[SegmentAssembler]   New: "${mergedText.substring(0, 80)}..."`);
-      // Use longer text to maintain monotonic growth
-      return [];
-    }
-    
-    // Update segment
-    segment.text = mergedText;
-    segment.lastUpdatedAt = now;
-    
-    if (isFinal) {
-      segment.hasStableTokens = true;
-      segment.lastFinalText = trimmedText;
-      segment.finalCount++;
-      
-      console.log(`[SegmentAssembler] 📝 FINAL merged into segment ${segment.segmentId} (finalCount: ${segment.finalCount})`);
-      console.log(`[SegmentAssembler]   Text: "${mergedText.substring(0, 80)}..."`);
-    } else {
-      console.log(`[SegmentAssembler] 📝 PARTIAL merged into segment ${segment.segmentId}${textGrew ? ' (grew)' : ''}`);
-      console.log(`[SegmentAssembler]   Text: "${mergedText.substring(0, 80)}..."`);
-    }
-    
-    // CRITICAL: FINAL ≠ CLOSE
-    // Google FINAL flags mark tokens as stable but don't close the segment
-    // Segment only closes on structural boundaries (new segment start, hard silence, etc.)
-    
-    return []; // Segment still open, not complete yet
+  _ensureCapacity(size) {
+    if (size <= this.capacity) return;
+    let capacity = this.capacity * 2;
+    while (capacity < size) capacity *= 2;
+    const grow = (Type, source) => {
+      const target = new Type(capacity);
+      target.set(source.subarray(0, this.length));
+      return target;
+    };
+    this.starts = grow(Float64Array, this.starts);
+    this.ends = grow(Float64Array, this.ends);
+    this.stabilities = grow(Float32Array, this.stabilities);
+    this.words.length = capacity;
+    this.words.fill('', this.length);
+    this.capacity = capacity;
   }
 
   /**
-   * Finalize a segment (mark as complete)
-   * Called when a structural boundary is detected
+   * Move open records to the front once committed ones fill half the arrays
    * @private
    */
-  _finalizeSegment(segmentId, reason) {
-    const segment = this.openSegments.get(segmentId);
-    if (!segment) {
-      return null;
-    }
-    
-    // Only finalize if segment has content
-    if (!segment.text || segment.text.trim().length === 0) {
-      this.openSegments.delete(segmentId);
-      return null;
+  _compact() {
+    if (this.head === 0 || (this.head < this.capacity / 2 && this.head < this.length)) return;
+    const shift = this.head;
+    if (this.length > shift) {
+      this.starts.copyWithin(0, shift, this.length);
+      this.ends.copyWithin(0, shift, this.length);
+      this.stabilities.copyWithin(0, shift, this.length);
+      this.words.copyWithin(0, shift, this.length);
     }
-    
-    const assembled = {
-      segmentId: segment.segmentId,
-      text: segment.text.trim(),
-      isComplete: true,
-      reason
-    };
-    
-    // Remove from open segments
-    this.openSegments.delete(segmentId);
-    
-    console.log(`[SegmentAssembler] ✅ Finalized segment ${segmentId} (reason: ${reason})`);
-    console.log(`[SegmentAssembler]   Text: "${assembled.text.substring(0, 80)}..."`);
-    console.log(`[SegmentAssembler]   FinalCount: ${segment.finalCount}, HasStableTokens: ${segment.hasStableTokens}`);
-    
-    return assembled;
+    this.words.fill('', this.length - shift, this.length);
+    this.head = 0;
+    this.finalEnd -= shift;
+    this.length -= shift;
+    this.scanIndex = Math.max(0, this.scanIndex - shift);
+    this.stats.compactions++;
   }
 
   /**
-   * Signal a hard boundary (silence gap, speaker change, etc.)
-   * Finalizes the current segment
-   * 
-   * @param {string} [segmentId] - Specific segment to finalize, or null for most recent
-   * @returns {AssembledSegment|null} Finalized segment, or null if none
+   * Whether any uncommitted words (final or partial) are held
+   * @returns {boolean}
    */
-  signalHardBoundary(segmentId = null) {
-    const targetId = segmentId || this.mostRecentSegmentId;
-    if (!targetId) {
-      return null;
-    }
-    
-    return this._finalizeSegment(targetId, 'hard_boundary');
+  hasOpenWords() {
+    return this.length > this.head;
   }
 
   /**
-   * Signal an explicit boundary (speaker change, utterance boundary, etc.)
-   * Finalizes the current segment
-   * 
-   * @param {string} [segmentId] - Specific segment to finalize, or null for most recent
-   * @returns {AssembledSegment|null} Finalized segment, or null if none
+   * Whether any uncommitted final words are held (what flush() would commit)
+   * @returns {boolean}
    */
-  signalExplicitBoundary(segmentId = null) {
-    const targetId = segmentId || this.mostRecentSegmentId;
-    if (!targetId) {
-      return null;
-    }
-    
-    return this._finalizeSegment(targetId, 'explicit_boundary');
+  hasOpenFinalWords() {
+    return this.finalEnd > this.head;
   }
 
   /**
-   * Get current open segment
-   * 
-   * @param {string} [segmentId] - Specific segment ID, or null for most recent
-   * @returns {OpenSegment|null} Open segment, or null if not found
+   * Commit the open final words regardless of boundaries (end of stream)
+   *
+   * @param {string} [reason] - Commit reason
+   * @returns {AssembledSegment[]} Committed segment, if any
    */
-  getOpenSegment(segmentId = null) {
-    const targetId = segmentId || this.mostRecentSegmentId;
-    if (!targetId) {
-      return null;
-    }
-    
-    return this.openSegments.get(targetId) || null;
+  flush(reason = 'flush') {
+    const segments = this._commitOpen(reason);
+    this._compact();
+    return segments;
   }
 
   /**
-   * Get all open segments
-   * 
-   * @returns {OpenSegment[]} Array of open segments
+   * Signal a hard boundary (silence gap, speaker change, etc.)
+   * Commits the open final words; the partial tail stays open
+   *
+   * @returns {AssembledSegment|null} Committed segment, or null if none
    */
-  getAllOpenSegments() {
-    return Array.from(this.openSegments.values());
+  signalHardBoundary() {
+    return this.flush('hard_boundary')[0] || null;
   }
 
   /**
-   * Cleanup stale segments (older than MAX_SEGMENT_AGE_MS)
-   * @private
+   * Signal an explicit boundary (speaker change, utterance boundary, etc.)
+   * Commits the open final words; the partial tail stays open
+   *
+   * @returns {AssembledSegment|null} Committed segment, or null if none
    */
-  _cleanupStaleSegments() {
-    const now = Date.now();
-    const staleIds = [];
-    
-    for (const [segmentId, segment] of this.openSegments.entries()) {
-      const age = now - segment.lastUpdatedAt;
-      if (age > this.MAX_SEGMENT_AGE_MS) {
-        staleIds.push(segmentId);
-      }
-    }
-    
-    for (const segmentId of staleIds) {
-      console.log(`[SegmentAssembler] 🧹 Cleaning up stale segment ${segmentId}`);
-      this.openSegments.delete(segmentId);
-    }
-    
-    if (staleIds.length > 0) {
-      console.log(`[SegmentAssembler] 🧹 Cleaned up ${staleIds.length} stale segment(s)`);
-    }
+  signalExplicitBoundary() {
+    return this.flush('explicit_boundary')[0] || null;
   }
 
   /**
-   * Start periodic cleanup interval
-   * @private
+   * Get the open (uncommitted) transcript
+   *
+   * @returns {Object|null} { text, finalText, partialText, startMs, endMs, finalWords, partialWords }, or null if empty
    */
-  startCleanupInterval() {
-    setInterval(() => {
-      try {
-        this._cleanupStaleSegments();
-      } catch (error) {
-        console.error(`[SegmentAssembler] ❌ Error in cleanup:`, error);
-      }
-    }, 10000); // Check every 10 seconds
+  getOpenSegment() {
+    if (!this.hasOpenWords()) return null;
+    const finalText = this.words.slice(this.head, this.finalEnd).join(' ');
+    const partialText = this.words.slice(this.finalEnd, this.length).join(' ');
+    return {
+      text: [finalText, partialText].filter(Boolean).join(' '),
+      finalText,
+      partialText,
+      startMs: this.starts[this.head],
+      endMs: this.ends[this.length - 1],
+      finalWords: this.finalEnd - this.head,
+      partialWords: this.length - this.finalEnd
+    };
+  }
+
+  /**
+   * Get assembler state
+   * @returns {Object}
+   */
+  getState() {
+    return {
+      finalWords: this.finalEnd - this.head,
+      partialWords: this.length - this.finalEnd,
+      committedEndMs: this.committedEndMs,
+      finalEndMs: this.finalEndMs,
+      capacity: this.capacity,
+      ...this.stats
+    };
   }
 
   /**
    * Reset all state (for testing or error recovery)
    */
   reset() {
-    this.openSegments.clear();
-    this.mostRecentSegmentId = null;
+    this.words.fill('', 0, this.length);
+    this.head = 0;
+    this.finalEnd = 0;
+    this.length = 0;
+    this.scanIndex = 0;
+    this.finalEndMs = 0;
+    this.committedEndMs = -1;
   }
 }
 
 export default SegmentAssembler;
-
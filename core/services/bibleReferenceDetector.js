@@ -6,14 +6,13 @@
  * 2. AI-based verse matching using GPT-4o-mini (medium-high confidence)
  * 
  * Architecture: Hybrid approach
- * - Fast regex for explicit references
+ * - Fast single-pass scan for explicit references (ReferenceScanner)
  * - AI matching for paraphrased/heavy context references
  * - Never uses AI to generate Scripture text (only matches references)
  */
 
 import { normalizeTranscript } from './bibleReferenceNormalizer.js';
-import { findAllSpokenNumbers } from './spokenNumberParser.js';
-import { detectBookName, findAllBookNames } from './bookNameDetector.js';
+import { ReferenceScanner } from './referenceScanner.js';
 import { CONTEXT_TRIGGERS } from '../data/contextTriggers.js';
 
 /**
@@ -35,6 +34,9 @@ export class BibleReferenceDetector {
       lastCall: 0,
       minInterval: 0 // No rate limiting - Bible verse detection is infrequent
     };
+    
+    // Incremental book/chapter/verse scanner for explicit references
+    this.referenceScanner = new ReferenceScanner();
   }
   
   /**
@@ -107,165 +109,9 @@ export class BibleReferenceDetector {
    * @returns {Array<Object>} Array of detected references
    */
   detectExplicitReferences(normalized, originalText) {
-    const results = [];
-    const { tokens, normalizedText } = normalized;
-    
-    // Find all book names
-    const bookDetections = findAllBookNames(tokens);
-    
-    for (const bookDetection of bookDetections) {
-      const startIndex = bookDetection.startIndex;
-      
-      // Look for chapter/verse patterns after book name
-      // Pattern 1: "Acts 2:38" or "Acts 2 38"
-      if (startIndex + 1 < tokens.length) {
-        const nextToken = tokens[startIndex + bookDetection.tokenCount];
-        
-        // Try to parse as chapter number
-        let chapter = null;
-        let verse = null;
-        
-        // Check if next token is a number
-        const chapterMatch = nextToken?.match(/^(\d+)$/);
-        if (chapterMatch) {
-          chapter = parseInt(chapterMatch[1], 10);
-          
-          // Look for verse (next token after colon or space)
-          if (startIndex + bookDetection.tokenCount + 1 < tokens.length) {
-            const verseToken = tokens[startIndex + bookDetection.tokenCount + 1];
-            const verseMatch = verseToken?.match(/^(\d+)$/);
-            if (verseMatch) {
-              verse = parseInt(verseMatch[1], 10);
-            }
-          }
-        } else {
-          // Try spoken numbers
-          const spokenNumbers = findAllSpokenNumbers(
-            tokens.slice(startIndex + bookDetection.tokenCount).join(' ')
-          );
-          if (spokenNumbers.length > 0) {
-            chapter = spokenNumbers[0].value;
-            if (spokenNumbers.length > 1) {
-              verse = spokenNumbers[1].value;
-            }
-          }
-        }
-        
-        if (chapter !== null) {
-          results.push({
-            book: bookDetection.book,
-            chapter: chapter,
-            verse: verse || undefined,
-            method: 'regex',
-            confidence: verse !== null ? 0.9 : 0.75,
-            displayText: verse !== null 
-              ? `${bookDetection.book} ${chapter}:${verse}`
-              : `${bookDetection.book} ${chapter}`
-          });
-        }
-      }
-      
-      // Pattern 2: "Acts chapter two verse thirty eight"
-      const chapterWords = ['chapter', 'ch', 'chap'];
-      const verseWords = ['verse', 'v', 'verses'];
-      
-      for (let i = startIndex + bookDetection.tokenCount; i < Math.min(startIndex + bookDetection.tokenCount + 8, tokens.length); i++) {
-        if (chapterWords.includes(tokens[i])) {
-            // Found "chapter" - next should be number (could be multiple tokens for spoken numbers)
-            if (i + 1 < tokens.length) {
-              // Try numeric first
-              let chapterNum = parseInt(tokens[i + 1], 10);
-              let chapterTokenCount = 1;
-              
-              // If not a number, try parsing as spoken number (could be multiple tokens)
-              if (!chapterNum) {
-                // Try two tokens first (e.g., "thirty eight") - prefer compound numbers
-                if (i + 2 < tokens.length) {
-                  const twoTokens = `${tokens[i + 1]} ${tokens[i + 2]}`;
-                  const twoNum = findAllSpokenNumbers(twoTokens);
-                  if (twoNum.length > 0) {
-                    chapterNum = twoNum[0].value;
-                    chapterTokenCount = 2;
-                  }
-                }
-                
-                // If two-token didn't work, try single token
-                if (!chapterNum) {
-                  const singleNum = findAllSpokenNumbers(tokens[i + 1]);
-                  if (singleNum.length > 0) {
-                    chapterNum = singleNum[0].value;
-                    chapterTokenCount = 1;
-                  }
-                }
-              }
-            
-            if (chapterNum) {
-              // chapterTokenCount is already set above
-              
-              // Look for verse (start after chapter word + chapter number tokens)
-              const verseSearchStart = i + 1 + chapterTokenCount;
-              
-              for (let j = verseSearchStart; j < Math.min(verseSearchStart + 6, tokens.length); j++) {
-                if (verseWords.includes(tokens[j])) {
-                  // Found "verse" - next should be the verse number
-                  if (j + 1 < tokens.length) {
-                    // Try numeric first
-                    let verseNum = parseInt(tokens[j + 1], 10);
-                    let verseTokenCount = 1;
-                    
-                    if (!verseNum) {
-                      // Try two tokens first (e.g., "thirty eight") - prefer compound numbers
-                      if (j + 2 < tokens.length) {
-                        const twoVerseTokens = `${tokens[j + 1]} ${tokens[j + 2]}`;
-                        const twoVerse = findAllSpokenNumbers(twoVerseTokens);
-                        if (twoVerse.length > 0) {
-                          verseNum = twoVerse[0].value;
-                          verseTokenCount = 2;
-                        }
-                      }
-                      
-                      // If two-token didn't work, try single token
-                      if (!verseNum) {
-                        const singleVerse = findAllSpokenNumbers(tokens[j + 1]);
-                        if (singleVerse.length > 0) {
-                          verseNum = singleVerse[0].value;
-                          verseTokenCount = 1;
-                        }
-                      }
-                    }
-                    
-                    if (verseNum) {
-                      results.push({
-                        book: bookDetection.book,
-                        chapter: chapterNum,
-                        verse: verseNum,
-                        method: 'regex',
-                        confidence: 0.85,
-                        displayText: `${bookDetection.book} ${chapterNum}:${verseNum}`
-                      });
-                      break; // Found verse, exit loop
-                    }
-                  }
-                }
-              }
-              
-              // Chapter only (no verse found)
-              if (!results.some(r => r.chapter === chapterNum && r.book === bookDetection.book && r.verse)) {
-                results.push({
-                  book: bookDetection.book,
-                  chapter: chapterNum,
-                  method: 'regex',
-                  confidence: 0.7,
-                  displayText: `${bookDetection.book} ${chapterNum}`
-                });
-              }
-            }
-          }
-        }
-      }
-    }
-    
-    return results;
+    // The scanner keeps its per-token work between calls, so consecutive windows
+    // (growing partials, or the engine's sliding window) only scan new tokens
+    return this.referenceScanner.update(normalized.tokens).references();
   }
   
   /**
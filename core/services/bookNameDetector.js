@@ -3,6 +3,10 @@
  * 
  * Detects Bible book names from text tokens and returns canonical book names
  * with confidence scores.
+ * 
+ * The alias table is compiled once into a token trie (exact and ordinal forms)
+ * and a substring index (fuzzy fallback), so detecting a book at a position
+ * costs a few Map lookups instead of a scan over every alias.
  */
 
 /**
@@ -110,6 +114,100 @@ const ORDINAL_MAP = {
   'fifth': 5, '5th': 5, '5': 5
 };
 
+const ORDINAL_WORDS = { 1: 'first', 2: 'second', 3: 'third' };
+
+/**
+ * Build the token trie for exact lookups. Each node holds the match detectBookName
+ * reports when the lookup ends there: one token (0.9), two tokens (0.95), an
+ * ordinal spelling of a "first/second/third X" alias (0.9), three tokens (0.95).
+ * Earlier lookups win, so a walk can stop at the first node with a match.
+ * 
+ * @returns {Map} Root node: token -> { next: Map, match: Object|null }
+ */
+function compileBookTrie() {
+  const root = new Map();
+  const nodeAt = (path) => {
+    let next = root;
+    let node = null;
+    for (const token of path) {
+      node = next.get(token);
+      if (!node) {
+        node = { next: new Map(), match: null };
+        next.set(token, node);
+      }
+      next = node.next;
+    }
+    return node;
+  };
+
+  for (const [alias, book] of Object.entries(BOOK_ALIASES)) {
+    const path = alias.split(' ');
+    if (path.length > 3) continue;
+    nodeAt(path).match = { book, confidence: path.length === 1 ? 0.9 : 0.95, tokenCount: path.length };
+  }
+
+  // "1 samuel", "1st samuel" and "first samuel" all reach the "first samuel" alias
+  for (const [token, ordinal] of Object.entries(ORDINAL_MAP)) {
+    const word = ORDINAL_WORDS[ordinal];
+    if (!word) continue;
+    for (const [alias, book] of Object.entries(BOOK_ALIASES)) {
+      const path = alias.split(' ');
+      if (path.length !== 2 || path[0] !== word) continue;
+      const node = nodeAt([token, path[1]]);
+      if (!node.match) node.match = { book, confidence: 0.9, tokenCount: 2 };
+    }
+  }
+  return root;
+}
+
+/**
+ * Build the fuzzy index: every substring (3+ chars) of every alias, mapped to the
+ * first alias containing it, plus the aliases grouped by first character
+ * 
+ * @returns {Object} { aliases, containedIn, byFirstChar }
+ */
+function compileFuzzyIndex() {
+  const aliases = Object.entries(BOOK_ALIASES);
+  const containedIn = new Map();
+  const byFirstChar = new Map();
+  aliases.forEach(([alias], index) => {
+    for (let start = 0; start < alias.length; start++) {
+      for (let end = start + 3; end <= alias.length; end++) {
+        const part = alias.slice(start, end);
+        if (!containedIn.has(part)) containedIn.set(part, index);
+      }
+    }
+    if (!byFirstChar.has(alias[0])) byFirstChar.set(alias[0], []);
+    byFirstChar.get(alias[0]).push(index);
+  });
+  return { aliases, containedIn, byFirstChar };
+}
+
+const BOOK_TRIE = compileBookTrie();
+const FUZZY_INDEX = compileFuzzyIndex();
+
+/**
+ * Fuzzy book match for one token: the first alias (in table order) that contains
+ * the token or is contained in it
+ * 
+ * @param {string} token - Lowercase token
+ * @returns {string|null} Canonical book name
+ */
+function fuzzyBookName(token) {
+  if (token.length < 3) return null;
+  const { aliases, containedIn, byFirstChar } = FUZZY_INDEX;
+  let best = containedIn.get(token) ?? aliases.length;
+  for (let i = 0; i < token.length; i++) {
+    const candidates = byFirstChar.get(token[i]);
+    if (!candidates) continue;
+    for (const index of candidates) {
+      if (index >= best) break;
+      if (token.startsWith(aliases[index][0], i)) best = index;
+    }
+  }
+  return best < aliases.length ? aliases[best][1] : null;
+}
+
 /**
  * Detect book name from tokens
  * 
@@ -120,70 +218,27 @@ const ORDINAL_MAP = {
 export function detectBookName(tokens, startIndex = 0) {
   if (!tokens || tokens.length === 0 || startIndex >= tokens.length) return null;
   
-  // Try single token
-  const single = tokens[startIndex]?.toLowerCase();
-  if (single && BOOK_ALIASES[single]) {
-    return {
-      book: BOOK_ALIASES[single],
-      confidence: 0.9,
-      tokenCount: 1
-    };
+  // Exact and ordinal forms: walk the trie until the first node with a match
+  let next = BOOK_TRIE;
+  for (let i = startIndex; i < Math.min(startIndex + 3, tokens.length); i++) {
+    const node = next.get(tokens[i]?.toLowerCase());
+    if (!node) break;
+    if (node.match) return { ...node.match };
+    next = node.next;
   }
   
-  // Try two tokens (for books like "1 Samuel", "Song of")
-  if (startIndex + 1 < tokens.length) {
-    const two = `${tokens[startIndex]} ${tokens[startIndex + 1]}`.toLowerCase();
-    if (BOOK_ALIASES[two]) {
-      return {
-        book: BOOK_ALIASES[two],
-        confidence: 0.95,
-        tokenCount: 2
-      };
-    }
-    
-    // Try with ordinal (e.g., "first samuel")
-    const ordinal = ORDINAL_MAP[tokens[startIndex]?.toLowerCase()];
-    if (ordinal) {
-      const second = tokens[startIndex + 1]?.toLowerCase();
-      const ordinalKey = `${ordinal === 1 ? 'first' : ordinal === 2 ? 'second' : ordinal === 3 ? 'third' : ''} ${second}`;
-      if (BOOK_ALIASES[ordinalKey]) {
-        return {
-          book: BOOK_ALIASES[ordinalKey],
-          confidence: 0.9,
-          tokenCount: 2
-        };
-      }
-    }
-  }
-  
-  // Try three tokens (e.g., "Song of Solomon")
-  if (startIndex + 2 < tokens.length) {
-    const three = `${tokens[startIndex]} ${tokens[startIndex + 1]} ${tokens[startIndex + 2]}`.toLowerCase();
-    if (BOOK_ALIASES[three]) {
+  // Fuzzy match: check if any token closely matches a book name
+  for (let i = startIndex; i < Math.min(startIndex + 3, tokens.length); i++) {
+    const book = fuzzyBookName(tokens[i].toLowerCase());
+    if (book) {
       return {
-        book: BOOK_ALIASES[three],
-        confidence: 0.95,
-        tokenCount: 3
+        book,
+        confidence: 0.4, // Lower confidence for fuzzy match
+        tokenCount: 1
       };
     }
   }
   
-  // Fuzzy match: check if any token closely matches a book name
-  for (const token of tokens.slice(startIndex, Math.min(startIndex + 3, tokens.length))) {
-    const lower = token.toLowerCase();
-    for (const [alias, canonical] of Object.entries(BOOK_ALIASES)) {
-      if (lower.includes(alias) || alias.includes(lower)) {
-        if (lower.length >= 3) { // Minimum length for confidence
-          return {
-            book: canonical,
-            confidence: 0.4, // Lower confidence for fuzzy match
-            tokenCount: 1
-          };
-        }
-      }
-    }
-  }
-  
   return null;
 }
 
@@ -0,0 +1,353 @@
+/**
+ * Reference Scanner
+ *
+ * Finds explicit Bible references (book name + chapter/verse) in a token list
+ * in one left-to-right pass, and keeps its work across calls so a growing
+ * partial or a sliding transcript window only pays for the tokens that changed.
+ *
+ * Per position it caches the two lookups that only depend on the next three
+ * tokens: detectBookName() and the spoken number starting there. A scan then
+ * walks those caches once to pick book names (same left-to-right, skip-ahead
+ * rule as findAllBookNames) and the next spoken number after each of them.
+ *
+ * Results are identical to the per-book rescans BibleReferenceDetector used to
+ * run (findAllBookNames + findAllSpokenNumbers over the rest of the transcript).
+ */
+
+import { detectBookName } from './bookNameDetector.js';
+import { parseSpokenNumber } from './spokenNumberParser.js';
+
+// Cached lookups at a position read at most this many tokens
+const LOOKAHEAD = 3;
+
+// How many alignments update() checks when a window drops tokens from the front
+const MAX_SHIFT_CANDIDATES = 4;
+
+const DIGITS = /^(\d+)$/;
+const CHAPTER_WORDS = ['chapter', 'ch', 'chap'];
+const VERSE_WORDS = ['verse', 'v', 'verses'];
+
+/**
+ * First spoken number in "a b" (what findAllSpokenNumbers returns first)
+ *
+ * @param {string} a - First token
+ * @param {string} b - Second token
+ * @returns {Object|null} Parsed number or null
+ */
+function firstSpokenNumber(a, b) {
+  return parseSpokenNumber(`${a} ${b}`) || parseSpokenNumber(a) || parseSpokenNumber(b);
+}
+
+/**
+ * Reference Scanner class
+ */
+export class ReferenceScanner {
+  constructor() {
+    this.tokens = [];
+    this.bookAt = []; // detectBookName(tokens, i)
+    this.numberAt = []; // { value, tokenCount } of the spoken number starting at i
+    this.settled = 0; // Positions whose cached lookups no longer depend on tokens being added
+    this.scan = null; // { bookNames, nextNumber } for the current tokens
+
+    this.stats = {
+      updates: 0,
+      tokensScanned: 0,
+      tokensReused: 0
+    };
+  }
+
+  /**
+   * Replace the token list, reusing cached work for the part that did not change:
+   * a common prefix (growing or revised partials) or, for a window that dropped
+   * tokens from the front, the overlap between the old tail and the new head
+   *
+   * @param {Array<string>} tokens - Normalized tokens
+   * @returns {ReferenceScanner} this
+   */
+  update(tokens) {
+    this.stats.updates++;
+    const old = this.tokens;
+    const max = Math.min(old.length, tokens.length);
+    let prefix = 0;
+    while (prefix < max && old[prefix] === tokens[prefix]) prefix++;
+
+    if (prefix < old.length) {
+      const shift = this.findShift(tokens);
+      if (shift > 0 && old.length - shift > prefix) {
+        this.dropFront(shift);
+        prefix = this.tokens.length;
+      } else {
+        this.truncate(prefix);
+      }
+    }
+    this.stats.tokensReused += prefix;
+    if (prefix < tokens.length) this.append(tokens.slice(prefix));
+    return this;
+  }
+
+  /**
+   * Smallest shift at which the old tokens' tail is the start of tokens
+   *
+   * @private
+   * @param {Array<string>} tokens - New token list
+   * @returns {number} Shift, or 0 if none of the checked alignments fit
+   */
+  findShift(tokens) {
+    const old = this.tokens;
+    let candidates = 0;
+    for (let shift = 1; shift < old.length && candidates < MAX_SHIFT_CANDIDATES; shift++) {
+      if (old[shift] !== tokens[0]) continue;
+      candidates++;
+      const overlap = old.length - shift;
+      if (overlap > tokens.length) continue;
+      let i = 1;
+      while (i < overlap && old[shift + i] === tokens[i]) i++;
+      if (i === overlap) return shift;
+    }
+    return 0;
+  }
+
+  /**
+   * Add tokens at the end
+   *
+   * @param {Array<string>} tokens - Normalized tokens
+   * @returns {ReferenceScanner} this
+   */
+  append(tokens) {
+    if (tokens.length === 0) return this;
+    for (const token of tokens) this.tokens.push(token);
+    this.scan = null;
+    return this;
+  }
+
+  /**
+   * Keep only the first `length` tokens
+   *
+   * @param {number} length - Tokens to keep
+   * @returns {ReferenceScanner} this
+   */
+  truncate(length) {
+    if (length >= this.tokens.length) return this;
+    this.tokens.length = length;
+    this.settled = Math.min(this.settled, Math.max(0, length - LOOKAHEAD + 1));
+    this.scan = null;
+    return this;
+  }
+
+  /**
+   * Drop tokens from the front (cached lookups only look ahead, so they stay valid)
+   *
+   * @param {number} count - Tokens to drop
+   * @returns {ReferenceScanner} this
+   */
+  dropFront(count) {
+    if (count <= 0) return this;
+    this.tokens.splice(0, count);
+    this.bookAt.splice(0, count);
+    this.numberAt.splice(0, count);
+    this.settled = Math.max(0, this.settled - count);
+    this.scan = null;
+    return this;
+  }
+
+  /**
+   * Clear all tokens and cached work
+   */
+  reset() {
+    this.tokens = [];
+    this.bookAt = [];
+    this.numberAt = [];
+    this.settled = 0;
+    this.scan = null;
+  }
+
+  /**
+   * Fill the per-position caches and run the scan
+   *
+   * @private
+   * @returns {Object} { bookNames, nextNumber }
+   */
+  ensureScan() {
+    if (this.scan) return this.scan;
+    const { tokens, bookAt, numberAt } = this;
+    const n = tokens.length;
+
+    bookAt.length = this.settled;
+    numberAt.length = this.settled;
+    for (let i = this.settled; i < n; i++) {
+      bookAt.push(detectBookName(tokens, i));
+
+      // Longest spoken number first, as findAllSpokenNumbers does
+      let number = null;
+      for (let count = Math.min(LOOKAHEAD, n - i); count >= 1 && !number; count--) {
+        const parsed = parseSpokenNumber(tokens.slice(i, i + count).join(' '));
+        if (parsed) number = { value: parsed.value, tokenCount: count };
+      }
+      numberAt.push(number);
+    }
+    this.stats.tokensScanned += n - this.settled;
+    this.settled = Math.max(0, n - LOOKAHEAD + 1);
+
+    const bookNames = [];
+    for (let i = 0; i < n; i++) {
+      const detection = bookAt[i];
+      if (detection) {
+        bookNames.push({ ...detection, startIndex: i });
+        i += detection.tokenCount - 1;
+      }
+    }
+
+    const nextNumber = new Int32Array(n + 1).fill(-1);
+    for (let i = n - 1; i >= 0; i--) {
+      nextNumber[i] = numberAt[i] ? i : nextNumber[i + 1];
+    }
+
+    this.scan = { bookNames, nextNumber };
+    return this.scan;
+  }
+
+  /**
+   * Book names in the current tokens (same result as findAllBookNames)
+   *
+   * @returns {Array<Object>} Book detections with startIndex
+   */
+  bookNames() {
+    return this.ensureScan().bookNames.map(detection => ({ ...detection }));
+  }
+
+  /**
+   * Explicit references in the current tokens: "acts 2 38", "acts two thirty eight",
+   * "acts chapter two verse thirty eight"
+   *
+   * @returns {Array<Object>} References ({ book, chapter, verse, method, confidence, displayText })
+   */
+  references() {
+    const { bookNames, nextNumber } = this.ensureScan();
+    const { tokens, numberAt } = this;
+    const results = [];
+
+    for (const bookDetection of bookNames) {
+      const startIndex = bookDetection.startIndex;
+      const afterBook = startIndex + bookDetection.tokenCount;
+
+      // Pattern 1: "Acts 2:38" / "Acts 2 38", or the first two spoken numbers after the book
+      if (startIndex + 1 < tokens.length) {
+        let chapter = null;
+        let verse = null;
+
+        if (DIGITS.test(tokens[afterBook])) {
+          chapter = parseInt(tokens[afterBook], 10);
+          if (afterBook + 1 < tokens.length && DIGITS.test(tokens[afterBook + 1])) {
+            verse = parseInt(tokens[afterBook + 1], 10);
+          }
+        } else if (afterBook < tokens.length && nextNumber[afterBook] !== -1) {
+          const first = numberAt[nextNumber[afterBook]];
+          chapter = first.value;
+          const after = nextNumber[afterBook] + first.tokenCount;
+          if (after < tokens.length && nextNumber[after] !== -1) {
+            verse = numberAt[nextNumber[after]].value;
+          }
+        }
+
+        if (chapter !== null) {
+          results.push({
+            book: bookDetection.book,
+            chapter: chapter,
+            verse: verse || undefined,
+            method: 'regex',
+            confidence: verse !== null ? 0.9 : 0.75,
+            displayText: verse !== null
+              ? `${bookDetection.book} ${chapter}:${verse}`
+              : `${bookDetection.book} ${chapter}`
+          });
+        }
+      }
+
+      // Pattern 2: "Acts chapter two verse thirty eight"
+      for (let i = afterBook; i < Math.min(afterBook + 8, tokens.length); i++) {
+        if (!CHAPTER_WORDS.includes(tokens[i]) || i + 1 >= tokens.length) continue;
+
+        const chapter = this.numberAfter(i);
+        if (!chapter) continue;
+
+        // Look for verse (start after chapter word + chapter number tokens)
+        const verseSearchStart = i + 1 + chapter.tokenCount;
+        for (let j = verseSearchStart; j < Math.min(verseSearchStart + 6, tokens.length); j++) {
+          if (!VERSE_WORDS.includes(tokens[j]) || j + 1 >= tokens.length) continue;
+          const verse = this.numberAfter(j);
+          if (verse) {
+            results.push({
+              book: bookDetection.book,
+              chapter: chapter.value,
+              verse: verse.value,
+              method: 'regex',
+              confidence: 0.85,
+              displayText: `${bookDetection.book} ${chapter.value}:${verse.value}`
+            });
+            break; // Found verse, exit loop
+          }
+        }
+
+        // Chapter only (no verse found)
+        if (!results.some(r => r.chapter === chapter.value && r.book === bookDetection.book && r.verse)) {
+          results.push({
+            book: bookDetection.book,
+            chapter: chapter.value,
+            method: 'regex',
+            confidence: 0.7,
+            displayText: `${bookDetection.book} ${chapter.value}`
+          });
+        }
+      }
+    }
+
+    return results;
+  }
+
+  /**
+   * Number following a "chapter"/"verse" word: digits, else a two-token spoken
+   * number (preferred, e.g. "thirty eight"), else a one-token spoken number
+   *
+   * @private
+   * @param {number} index - Index of the chapter/verse word
+   * @returns {Object|null} { value, tokenCount } (a zero value counts as not found)
+   */
+  numberAfter(index) {
+    const tokens = this.tokens;
+    const digits = parseInt(tokens[index + 1], 10);
+    if (digits) return { value: digits, tokenCount: 1 };
+
+    let number = null;
+    if (index + 2 < tokens.length) {
+      const two = firstSpokenNumber(tokens[index + 1], tokens[index + 2]);
+      if (two) number = { value: two.value, tokenCount: 2 };
+    }
+    if (!number?.value) {
+      const one = parseSpokenNumber(tokens[index + 1]);
+      if (one) number = { value: one.value, tokenCount: 1 };
+    }
+    return number?.value ? number : null;
+  }
+
+  /**
+   * @returns {Object} Scanner stats
+   */
+  getStats() {
+    return { tokens: this.tokens.length, settled: this.settled, ...this.stats };
+  }
+}
+
+/**
+ * Explicit references in a token list (one-shot scan)
+ *
+ * @param {Array<string>} tokens - Normalized tokens
+ * @returns {Array<Object>} References
+ */
+export function scanReferences(tokens) {
+  return new ReferenceScanner().update(tokens || []).references();
+}
+
+export default {
+  ReferenceScanner,
+  scanReferences
+};
@@ -66,6 +66,16 @@ export const AUDIO_BUFFER_CONSTANTS = {
   MAX_CHUNKS: 200                          // Safety limit for chunks
 };
 
+/**
+ * Segment assembly constants (word timeline)
+ */
+export const SEGMENT_ASSEMBLY_CONSTANTS = {
+  PAUSE_BOUNDARY_MS: 700,                  // Gap between final words that ends a segment
+  MAX_SEGMENT_WORDS: 60,                   // Commit a run-on segment at this many words
+  IDLE_FLUSH_MS: 1500,                     // No result for this long: commit the open final words
+  INITIAL_CAPACITY: 256                    // Word records preallocated per assembler
+};
+
 /**
  * Create default engine configuration
  * @param {Partial<EngineConfig>} overrides - Configuration overrides
@@ -94,6 +104,7 @@ export default {
   RTT_CONSTANTS,
   PARTIAL_TRACKING_CONSTANTS,
   AUDIO_BUFFER_CONSTANTS,
+  SEGMENT_ASSEMBLY_CONSTANTS,
   createDefaultConfig
 };
 
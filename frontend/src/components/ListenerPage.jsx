@@ -17,7 +17,7 @@ import { Play, Square, Settings } from 'lucide-react';
 import { TtsSettingsModal } from './TtsSettingsModal';
 import { TtsMode, TtsPlayerState } from '../tts/types.js';
 import { getDeliveryStyle, voiceSupportsSSML } from '../config/ssmlConfig.js';
-import { CaptionClientEngine, SentenceSegmenter } from '@jkang1643/caption-engine';
+import { CaptionClientEngine, PartialDeltaDecoder, SentenceSegmenter } from '@jkang1643/caption-engine';
 import { useTtsStreaming } from '../hooks/useTtsStreaming';
 import TtsStreamingControl from './tts/TtsStreamingControl';
 
@@ -884,8 +884,11 @@ export function ListenerPage({ sessionCodeProp, onBackToHome }) {
       localStorage.setItem('exbabel_listener_id', listenerId);
     }
 
+    // One decoder per connection: the backend starts a joining listener's language group on a keyframe
+    const deltaDecoder = new PartialDeltaDecoder();
+
     const ws = new WebSocket(
-      `${finalWsUrl}?role=listener&sessionId=${sessionId}&targetLang=${lang}&userName=${encodeURIComponent(name)}&listenerId=${listenerId}`
+      `${finalWsUrl}?role=listener&sessionId=${sessionId}&targetLang=${lang}&userName=${encodeURIComponent(name)}&listenerId=${listenerId}&partialEncoding=delta`
     );
     wsRef.current = ws;
 
@@ -913,7 +916,7 @@ export function ListenerPage({ sessionCodeProp, onBackToHome }) {
 
     ws.onmessage = (event) => {
       try {
-        const message = JSON.parse(event.data);
+        let message = JSON.parse(event.data);
 
         // Forward TTS-related control messages to the controller
         // (voices, defaults, audio, etc.) regardless of engine mode
@@ -935,6 +938,10 @@ export function ListenerPage({ sessionCodeProp, onBackToHome }) {
           return;
         }
 
+        // Expand delta-encoded partials (the shared engine decodes its own)
+        message = deltaDecoder.decode(message);
+        if (!message) return; // Base was missed; the next keyframe resyncs
+
         // Track last stable key for onFlush correlation
         lastStableKeyRef.current = (message.sourceSeqId ?? message.seqId ?? null);
 
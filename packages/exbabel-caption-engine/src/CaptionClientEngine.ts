@@ -6,6 +6,7 @@
  * 
  * Responsibilities:
  * - WebSocket event handling (ingest)
+ * - Delta-encoded partial decoding (opt-in wire format)
  * - Out-of-order partial detection and dropping
  * - Partial/final processing with deduplication
  * - State management (liveLine, committedLines)
@@ -13,6 +14,7 @@
  */
 
 import { TypedEmitter } from './utils/emitter.js';
+import { PartialDeltaDecoder } from './utils/partialDelta.js';
 import type {
     CaptionEvent,
     CaptionViewModel,
@@ -84,6 +86,9 @@ export class CaptionClientEngine extends TypedEmitter<CaptionEngineEvents> {
     private longestCorrectedText = '';
     private longestCorrectedOriginal = '';
 
+    // Delta-encoded partials (per connection)
+    private partialDecoder = new PartialDeltaDecoder();
+
     // Throttling (for high-frequency partials)
     private lastRenderTime = 0;
     private lastTextLength = 0;
@@ -155,6 +160,7 @@ export class CaptionClientEngine extends TypedEmitter<CaptionEngineEvents> {
         }
 
         this.ws = ws;
+        this.partialDecoder.reset();
         this.status = 'connecting';
         this.emitState();
 
@@ -212,6 +218,15 @@ export class CaptionClientEngine extends TypedEmitter<CaptionEngineEvents> {
     ingest(event: CaptionEvent): void {
         this.debug.lastEventType = event.type;
 
+        // Expand delta-encoded partials back into full events
+        const decoded = this.partialDecoder.decode(event);
+        if (!decoded) {
+            this.debug.deltaBaseMismatches = this.partialDecoder.getStats().baseMismatches;
+            this.emitDebug('drop_delta_partial', { seqId: (event as TranslationEvent).seqId });
+            return;
+        }
+        event = decoded;
+
         // Track fingerprints for dedup debugging
         if (isTranslationEvent(event)) {
             if (event.translatedText) {
@@ -5,7 +5,7 @@
  * 
  * @example Browser usage with auto-connect
  * ```typescript
- * import { CaptionClientEngine } from '@exbabel/caption-engine';
+ * import { CaptionClientEngine } from '@jkang1643/caption-engine';
  * 
  * const engine = new CaptionClientEngine({
  *   segmenter: new SentenceSegmenter(),
@@ -18,7 +18,7 @@
  * 
  * @example Manual WebSocket usage (Node.js/Electron main)
  * ```typescript
- * import { CaptionClientEngine } from '@exbabel/caption-engine';
+ * import { CaptionClientEngine } from '@jkang1643/caption-engine';
  * import WebSocket from 'ws';
  * 
  * const engine = new CaptionClientEngine({ segmenter, lang: 'es' });
@@ -41,6 +41,7 @@ export type {
     // Event types
     CaptionEvent,
     TranslationEvent,
+    PartialDelta,
     SessionJoinedEvent,
     SessionReadyEvent,
     SessionEndedEvent,
@@ -71,3 +72,5 @@ export {
 
 // Utilities
 export { TypedEmitter } from './utils/emitter.js';
+export { PartialDeltaDecoder } from './utils/partialDelta.js';
+export type { PartialDeltaStats } from './utils/partialDelta.js';
@@ -47,6 +47,27 @@ export interface TranslationEvent extends BaseCaptionEvent {
     // Pipeline metadata
     pipeline?: string;
     recoveryEpoch?: number;
+
+    // API-compatibility copies of the text fields
+    transcript?: string;
+    translation?: string;
+
+    // Delta-encoded partials (opt-in with `partialEncoding: 'delta'` on init)
+    keyframe?: boolean;
+    delta?: PartialDelta;
+}
+
+/**
+ * Delta payload of an encoded partial.
+ * Each changed text field is `[prefixLength, suffix]` against the partial
+ * with seqId `baseSeqId`; `null` removes the field, absent fields are unchanged.
+ */
+export interface PartialDelta {
+    baseSeqId: number;
+    fields: Partial<Record<
+        'originalText' | 'correctedText' | 'translatedText' | 'transcript' | 'translation',
+        [number, string] | null
+    >>;
 }
 
 /**
@@ -170,6 +191,9 @@ export interface DebugInfo {
 
     /** Fingerprints of recently seen texts (for dedup debugging) */
     recentFingerprints?: string[];
+
+    /** Count of delta partials dropped because their base was missed */
+    deltaBaseMismatches?: number;
 }
 
 /**
@@ -0,0 +1,113 @@
+/**
+ * Delta-encoded partial decoder
+ *
+ * Rebuilds full partial `translation` events from the opt-in delta wire format
+ * (backend/utils/partialDelta.js). Delta events carry `[prefixLength, suffix]`
+ * per changed text field against one of the last few partials; keyframes and
+ * plain partials replace all bases.
+ *
+ * No external dependencies, works in browser and Node.js.
+ */
+
+import type { CaptionEvent, PartialDelta, TranslationEvent } from '../types.js';
+
+/** Text fields that may be delta-encoded */
+export const DELTA_FIELDS = ['originalText', 'correctedText', 'translatedText', 'transcript', 'translation'] as const;
+
+type DeltaField = typeof DELTA_FIELDS[number];
+type TextFields = Partial<Record<DeltaField, string>>;
+
+/** Recent partials kept as candidate bases (must match the backend encoder) */
+export const MAX_BASES = 4;
+
+/**
+ * Decoder statistics
+ */
+export interface PartialDeltaStats {
+    keyframes: number;
+    deltas: number;
+    /** Deltas dropped because their base was never seen (resyncs on next keyframe) */
+    baseMismatches: number;
+}
+
+/**
+ * Stateful decoder for one WebSocket connection
+ */
+export class PartialDeltaDecoder {
+    private bases: Array<{ seqId: number | null; fields: TextFields }> = [];
+    private stats: PartialDeltaStats = { keyframes: 0, deltas: 0, baseMismatches: 0 };
+
+    /**
+     * Decode an incoming event
+     *
+     * @returns The full event, or null if a delta cannot be applied
+     */
+    decode<T extends CaptionEvent>(event: T): T | null {
+        if (event.type !== 'translation') {
+            return event;
+        }
+
+        const message = event as unknown as TranslationEvent;
+        if (!message.isPartial) {
+            // Finals are always sent in full and don't move the base
+            return event;
+        }
+
+        if (!message.delta) {
+            this.bases = [this.toBase(message)];
+            this.stats.keyframes++;
+            return event;
+        }
+
+        const delta: PartialDelta = message.delta;
+        const base = this.bases.find(candidate => candidate.seqId !== null && candidate.seqId === delta.baseSeqId);
+        if (!base) {
+            this.stats.baseMismatches++;
+            return null;
+        }
+
+        const decoded: TranslationEvent = { ...message };
+        delete decoded.delta;
+
+        for (const field of DELTA_FIELDS) {
+            const previous = base.fields[field];
+            if (!(field in delta.fields)) {
+                if (previous !== undefined) decoded[field] = previous;
+                continue;
+            }
+            const change = delta.fields[field];
+            if (change === null || change === undefined) {
+                continue;
+            }
+            const [prefixLength, suffix] = change;
+            decoded[field] = (previous || '').substring(0, prefixLength) + suffix;
+        }
+
+        this.bases.push(this.toBase(decoded));
+        if (this.bases.length > MAX_BASES) this.bases.shift();
+        this.stats.deltas++;
+        return decoded as unknown as T;
+    }
+
+    /**
+     * Forget all bases (e.g. after reconnecting); deltas are dropped until the next keyframe
+     */
+    reset(): void {
+        this.bases = [];
+    }
+
+    getStats(): PartialDeltaStats {
+        return { ...this.stats };
+    }
+
+    private toBase(message: TranslationEvent): { seqId: number | null; fields: TextFields } {
+        const fields: TextFields = {};
+        for (const field of DELTA_FIELDS) {
+            const value = message[field];
+            if (typeof value === 'string') {
+                fields[field] = value;
+            }
+        }
+        return { seqId: message.seqId ?? null, fields };
+    }
+}
@@ -0,0 +1,168 @@
+/**
+ * Delta-Encoded Partial Tests
+ *
+ * Verifies the decoder against hand-built wire messages in the format
+ * produced by backend/utils/partialDelta.js, and against what the backend
+ * broadcasts to a listener that opted in.
+ */
+
+import { describe, test, expect, beforeEach } from 'vitest';
+import { CaptionClientEngine } from '../src/CaptionClientEngine.js';
+import { PartialDeltaDecoder } from '../src/utils/partialDelta.js';
+import { createMockSegmenter } from './helpers/replayTrace.js';
+import type { CaptionEvent, TranslationEvent } from '../src/types.js';
+
+function keyframe(seqId: number, originalText: string, translatedText = originalText): TranslationEvent {
+    return { type: 'translation', seqId, isPartial: true, keyframe: true, originalText, translatedText };
+}
+
+describe('PartialDeltaDecoder', () => {
+    let decoder: PartialDeltaDecoder;
+
+    beforeEach(() => {
+        decoder = new PartialDeltaDecoder();
+    });
+
+    test('applies prefix/suffix deltas against the previous partial', () => {
+        decoder.decode(keyframe(1, 'In the beginning', 'En el principio'));
+
+        const decoded = decoder.decode({
+            type: 'translation',
+            seqId: 2,
+            isPartial: true,
+            delta: {
+                baseSeqId: 1,
+                fields: {
+                    originalText: [16, ' God created'],
+                    translatedText: [15, ' Dios creó'],
+                },
+            },
+        } as TranslationEvent);
+
+        expect(decoded?.originalText).toBe('In the beginning God created');
+        expect(decoded?.translatedText).toBe('En el principio Dios creó');
+        expect(decoded?.delta).toBeUndefined();
+    });
+
+    test('keeps unchanged fields, removes null fields, replaces suffixes', () => {
+        decoder.decode({ ...keyframe(5, 'Blessed are the poor'), correctedText: 'Blessed are the poor' });
+
+        const decoded = decoder.decode({
+            type: 'translation',
+            seqId: 6,
+            isPartial: true,
+            delta: { baseSeqId: 5, fields: { originalText: [16, 'meek'], correctedText: null } },
+        } as TranslationEvent);
+
+        expect(decoded?.originalText).toBe('Blessed are the meek');
+        expect(decoded?.translatedText).toBe('Blessed are the poor');
+        expect(decoded?.correctedText).toBeUndefined();
+    });
+
+    test('drops deltas whose base was missed until the next keyframe', () => {
+        decoder.decode(keyframe(1, 'Hello'));
+        const missed = decoder.decode({
+            type: 'translation',
+            seqId: 3,
+            isPartial: true,
+            delta: { baseSeqId: 2, fields: { originalText: [5, ' world'] } },
+        } as TranslationEvent);
+
+        expect(missed).toBeNull();
+        expect(decoder.getStats().baseMismatches).toBe(1);
+
+        expect(decoder.decode(keyframe(4, 'Hello world again'))?.originalText).toBe('Hello world again');
+    });
+
+    test('passes finals and other events through untouched', () => {
+        decoder.decode(keyframe(1, 'Hello'));
+        const final: CaptionEvent = { type: 'translation', seqId: 2, isPartial: false, originalText: 'Hello.' } as TranslationEvent;
+        expect(decoder.decode(final)).toBe(final);
+
+        const delta = decoder.decode({
+            type: 'translation',
+            seqId: 3,
+            isPartial: true,
+            delta: { baseSeqId: 1, fields: { originalText: [5, ' there'] } },
+        } as TranslationEvent);
+        expect(delta?.originalText).toBe('Hello there');
+
+        const stats: CaptionEvent = { type: 'session_stats' };
+        expect(decoder.decode(stats)).toBe(stats);
+    });
+});
+
+describe('CaptionClientEngine with delta partials', () => {
+    test('renders decoded partials on the live line', () => {
+        const engine = new CaptionClientEngine({
+            segmenter: createMockSegmenter(),
+            lang: 'es',
+            sourceLang: 'en',
+            debug: true,
+        });
+
+        engine.ingest({ ...keyframe(1, 'For God so', 'Porque de tal'), sourceSeqId: 1, targetLang: 'es', hasTranslation: true });
+        engine.ingest({
+            type: 'translation',
+            seqId: 2,
+            sourceSeqId: 1,
+            isPartial: true,
+            targetLang: 'es',
+            hasTranslation: true,
+            delta: { baseSeqId: 1, fields: { originalText: [10, ' loved'], translatedText: [13, ' manera amó'] } },
+        } as TranslationEvent);
+
+        const state = engine.getState();
+        expect(state.liveOriginal).toBe('For God so loved');
+        expect(state.liveLine).toBe('Porque de tal manera amó');
+    });
+});
+
+describe('listener opt-in, backend to decoder', () => {
+    /** ws socket stand-in that keeps every frame the fan-out sends */
+    class FakeSocket {
+        readyState = 1;
+        bufferedAmount = 0;
+        frames: string[] = [];
+        send(data: Buffer | string) {
+            this.frames.push(data.toString());
+        }
+    }
+
+    test('a listener that joins with partialEncoding=delta decodes the same events a plain listener gets', async () => {
+        const { default: sessionStore } = await import('../../../backend/sessionStore.js');
+        const { sessionId } = await sessionStore.createSession(null, null, 'DELTA1', 'delta-listener-test');
+        const plain = new FakeSocket();
+        const delta = new FakeSocket();
+        sessionStore.addListener(sessionId, 'plain', plain, 'es', 'Plain');
+        sessionStore.addListener(sessionId, 'delta', delta, 'es', 'Delta', 'delta');
+
+        // Source partials go to every listener, translated partials to the language group
+        const source = 'For God so loved the world that he gave his one and only Son that whoever believes in him shall not perish'.split(' ');
+        const target = 'Porque de tal manera amó Dios al mundo que ha dado a su Hijo unigénito para que todo aquel que en él cree no se pierda'.split(' ');
+        let seqId = 0;
+        for (let i = 1; i <= source.length; i++) {
+            const originalText = source.slice(0, i).join(' ');
+            sessionStore.broadcastToListeners(sessionId, { type: 'translation', seqId: ++seqId, isPartial: true, targetLang: 'en', originalText, translatedText: originalText });
+            const translatedText = target.slice(0, Math.ceil((i * target.length) / source.length)).join(' ');
+            sessionStore.broadcastToListeners(sessionId, { type: 'translation', seqId: ++seqId, isPartial: true, targetLang: 'es', originalText, translatedText, hasTranslation: true }, 'es');
+        }
+        sessionStore.broadcastToListeners(sessionId, { type: 'translation', seqId: ++seqId, isPartial: false, targetLang: 'es', originalText: `${source.join(' ')}.`, translatedText: `${target.join(' ')}.` }, 'es');
+
+        const received = delta.frames.map(frame => JSON.parse(frame) as TranslationEvent);
+        expect(received.some(event => event.delta)).toBe(true);
+        expect(delta.frames.join('').length).toBeLessThan(plain.frames.join('').length);
+
+        const decoder = new PartialDeltaDecoder();
+        const decoded = received.map(event => {
+            const full = decoder.decode(event);
+            if (full) delete full.keyframe;
+            return full;
+        });
+        expect(decoded).toEqual(plain.frames.map(frame => JSON.parse(frame)));
+        expect(decoder.getStats().baseMismatches).toBe(0);
+
+        sessionStore.removeListener(sessionId, 'plain');
+        sessionStore.removeListener(sessionId, 'delta');
+    });
+});